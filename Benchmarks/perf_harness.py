@@ -0,0 +1,754 @@
+#!/usr/bin/env python3
+# Vera/Benchmarks/perf_harness.py
+
+"""
+End-to-end performance harness.
+
+Drives Vera's real LLM pool (MultiInstanceOllamaManager / PooledOllamaLLM),
+toolchain planner, chunking pipeline and Redis Streams event bus against the
+local stand-ins in stand_ins.py, so chat-turn latency, memory-write
+throughput and toolchain overhead can be measured without Ollama, Neo4j or
+Redis.
+
+Scenarios
+    triage_fast   triage model classifies the query, fast model answers;
+                  user/assistant turns are written to the graph
+    deep_tools    ToolChainPlanner plans with a reasoning model, runs graph
+                  and file tools, synthesises with deep_llm, goal-checks
+    bulk_ingest   content-defined chunking → dedupe → batched embeddings →
+                  File/Chunk nodes, one memory event per file
+
+Each scenario reports p50/p99 latency, throughput and peak RSS; the run is
+written as JSON (commit, settings, per-scenario results) so two commits can
+be compared with ``--compare``:
+
+    python -m Vera.Benchmarks.perf_harness
+    python -m Vera.Benchmarks.perf_harness --quick --isolate
+    python -m Vera.Benchmarks.perf_harness --compare Output/benchmarks/perf_<sha>.json
+
+With ``--isolate`` each scenario runs in a fresh interpreter so its peak RSS
+is not inflated by the scenarios before it.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from Vera.Benchmarks.stand_ins import (
+    GraphDouble, ModelProfile, StubOllama, _default_script, fake_event_bus,
+)
+
+TRIAGE_MODEL = "triage-agent:latest"
+FAST_MODEL = "gemma2:latest"
+DEEP_MODEL = "deepseek-r1:latest"
+EMBED_MODEL = "nomic-embed-text:latest"
+
+DEFAULT_PROFILES = {
+    TRIAGE_MODEL: ModelProfile(token_rate=400, first_token_latency=0.02, tokens=6),
+    FAST_MODEL: ModelProfile(token_rate=150, first_token_latency=0.05, tokens=96),
+    DEEP_MODEL: ModelProfile(token_rate=60, first_token_latency=0.15, tokens=128, think_tokens=48),
+    EMBED_MODEL: ModelProfile(first_token_latency=0.005, embedding_dim=768),
+}
+
+SCENARIOS = ("triage_fast", "deep_tools", "bulk_ingest")
+
+
+# ── Measurement helpers ───────────────────────────────────────────────────────
+
+def _percentile(data: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0 for empty input)."""
+    if not data:
+        return 0.0
+    ordered = sorted(data)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _summary(samples_s: List[float]) -> Dict[str, float]:
+    """p50/p99/mean/max in milliseconds."""
+    ms = [s * 1000 for s in samples_s]
+    return {
+        "n": len(ms),
+        "p50_ms": round(_percentile(ms, 50), 2),
+        "p99_ms": round(_percentile(ms, 99), 2),
+        "mean_ms": round(sum(ms) / len(ms), 2) if ms else 0.0,
+        "max_ms": round(max(ms), 2) if ms else 0.0,
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_commit() -> Optional[str]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root,
+            capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class _Timed:
+    """Accumulates wall time spent inside wrapped calls/streams (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.total += seconds
+
+    def stream(self, chunks: Iterator[str]) -> Iterator[str]:
+        t0 = time.perf_counter()
+        try:
+            for chunk in chunks:
+                self.add(time.perf_counter() - t0)
+                yield chunk
+                t0 = time.perf_counter()
+        finally:
+            self.add(time.perf_counter() - t0)
+
+
+# ── Event bus runner ──────────────────────────────────────────────────────────
+
+class _BusRunner:
+    """
+    Runs the fakeredis-backed EnhancedRedisEventBus and its StreamConsumer
+    on a private event loop, and measures publish → handler latency.
+    ``available`` is False when fakeredis is not installed; publishing is
+    then a no-op.
+    """
+
+    def __init__(self):
+        self.available = False
+        self.latencies: List[float] = []
+        self.published = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="bench-bus")
+        self._bus = None
+        self._consumer_task = None
+
+    def start(self) -> "_BusRunner":
+        self._thread.start()
+        self._bus = self._call(fake_event_bus())
+        if self._bus is None:
+            return self
+        self._bus.subscribe("*", self._handle)
+        self._consumer_task = asyncio.run_coroutine_threadsafe(self._bus.start(), self._loop)
+        self.available = True
+        return self
+
+    def _call(self, coro, timeout: float = 30.0):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _handle(self, event):
+        sent = event.payload.get("sent_at")
+        if sent is not None:
+            self.latencies.append(time.perf_counter() - sent)
+
+    def publish(self, event_type: str, payload: Dict[str, Any], session_id: Optional[str] = None):
+        if not self.available:
+            return
+        from Vera.EventBus.event_model import Event
+        event = Event(
+            type=event_type, source="benchmark",
+            payload={**payload, "sent_at": time.perf_counter()},
+            meta={"session_id": session_id} if session_id else {},
+        )
+        self.published += 1
+        self._call(self._bus.publish(event))
+
+    def drain(self, timeout: float = 10.0):
+        deadline = time.perf_counter() + timeout
+        while len(self.latencies) < self.published and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def report(self) -> Dict[str, Any]:
+        if not self.available:
+            return {"available": False}
+        self.drain()
+        return {
+            "available": True,
+            "published": self.published,
+            "dispatched": len(self.latencies),
+            "dispatch_latency": _summary(self.latencies),
+        }
+
+    def stop(self):
+        if self.available:
+            try:
+                self._call(self._bus.close())
+                self._consumer_task.result(5)
+            except Exception:
+                pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+# ── Environment ───────────────────────────────────────────────────────────────
+
+class BenchEnv:
+    """Stub Ollama + real instance pool + graph double + event bus for one scenario."""
+
+    def __init__(
+        self,
+        instances: int = 2,
+        max_concurrent: int = 4,
+        profiles: Optional[Dict[str, ModelProfile]] = None,
+        graph_write_latency: float = 0.0,
+        script: Optional[Callable[[str, str, int], List[str]]] = None,
+    ):
+        from Vera.Ollama.multi_instance_manager import MultiInstanceOllamaManager
+
+        self.stubs = [StubOllama(profiles or DEFAULT_PROFILES, script=script).start() for _ in range(instances)]
+        config = SimpleNamespace(
+            instances=[
+                SimpleNamespace(name=f"stub{i}", api_url=stub.url, enabled=True,
+                                priority=1, max_concurrent=max_concurrent)
+                for i, stub in enumerate(self.stubs)
+            ],
+            load_balance_strategy="least_loaded",
+            max_queue_size=64,
+            enable_request_queue=False,
+            timeout=60,
+            enable_thought_capture=True,
+            gpu_instances=[],
+        )
+        self.manager = MultiInstanceOllamaManager(config)
+        self.manager.pool.probe_instances()
+        self.graph = GraphDouble(write_latency=graph_write_latency)
+        self.bus = _BusRunner().start()
+
+    def llm(self, model: str, **kwargs):
+        return self.manager.create_llm(model, **kwargs)
+
+    def stub_stats(self) -> Dict[str, int]:
+        total: Dict[str, int] = {}
+        for stub in self.stubs:
+            for key, value in stub.stats.items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def close(self):
+        self.bus.stop()
+        self.manager.pool.stop()
+        for stub in self.stubs:
+            stub.stop()
+
+
+def _memory_node(node_id: str, node_type: str, labels: List[str], props: Dict[str, Any]):
+    """Duck-typed Node for GraphDouble (Memory.memory.Node needs neo4j installed)."""
+    return SimpleNamespace(id=node_id, type=node_type, labels=labels, properties=props)
+
+
+def _save_turn(graph: GraphDouble, session_id: str, turn: int, role: str, text: str, prev: Optional[str]) -> str:
+    """Same graph writes as VeraChat._save_session: node, session link, FOLLOWS chain."""
+    node_id = f"mem_{session_id}_{turn}_{role}"
+    graph.upsert_entity(_memory_node(node_id, role, [role.capitalize()], {
+        "text": text, "session_id": session_id, "created_at": datetime.now().isoformat(),
+    }))
+    graph.link_session_to_entity(session_id, node_id, "HAS_MEMORY")
+    if prev:
+        graph.upsert_edge(SimpleNamespace(src=node_id, dst=prev, rel="FOLLOWS", properties={}))
+    return node_id
+
+
+# ── Scenario: triage + fast answer ────────────────────────────────────────────
+
+_QUERIES = [
+    "what is on my calendar tomorrow",
+    "summarise the last network scan",
+    "remind me what we decided about the archive schema",
+    "which ollama instances are healthy right now",
+    "give me a one line status of the focus board",
+]
+
+
+def scenario_triage_fast(env: BenchEnv, turns: int = 40, concurrency: int = 4) -> Dict[str, Any]:
+    """
+    One chat turn = triage stream (routing label) → fast-model stream
+    (answer) → two memory nodes + edges.  ``concurrency`` sessions run in
+    parallel, each with its own sequential turns.
+    """
+    triage = env.llm(TRIAGE_MODEL, temperature=0.1)
+    fast = env.llm(FAST_MODEL)
+    latencies, ttfts, tokens = [], [], [0]
+    lock = threading.Lock()
+
+    def session(worker: int, count: int):
+        sid = f"bench_sess_{worker}"
+        env.graph.upsert_session(SimpleNamespace(id=sid, started_at=datetime.now().isoformat(), metadata={}))
+        prev = None
+        for turn in range(count):
+            query = _QUERIES[(worker + turn) % len(_QUERIES)]
+            t0 = time.perf_counter()
+            label = "".join(triage.stream(f"Classify: {query}")).strip()
+            first = None
+            answer = []
+            for chunk in fast.stream(f"[{label}] {query}"):
+                if first is None:
+                    first = time.perf_counter() - t0
+                answer.append(chunk)
+            text = "".join(answer)
+            prev = _save_turn(env.graph, sid, turn, "query", query, prev)
+            prev = _save_turn(env.graph, sid, turn, "response", text, prev)
+            elapsed = time.perf_counter() - t0
+            env.bus.publish("llm.complete", {"model": FAST_MODEL, "output_chars": len(text)}, sid)
+            with lock:
+                latencies.append(elapsed)
+                ttfts.append(first or elapsed)
+                tokens[0] += len(answer)
+
+    per_worker = [turns // concurrency + (1 if i < turns % concurrency else 0) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda a: session(*a), enumerate(per_worker)))
+    wall = time.perf_counter() - t0
+
+    return {
+        "turn_latency": _summary(latencies),
+        "ttft": _summary(ttfts),
+        "throughput": {
+            "turns_per_s": round(len(latencies) / wall, 2),
+            "answer_chunks_per_s": round(tokens[0] / wall, 1),
+        },
+        "settings": {"turns": turns, "concurrency": concurrency},
+    }
+
+
+# ── Scenario: deep reasoning with tools ───────────────────────────────────────
+
+_DEEP_PLAN = [
+    {"tool": "search_memory", "input": "archive sync changes"},
+    {"tool": "read_file", "input": "{notes}"},
+    {"tool": "llm", "input": {"prompt": "Summarise what changed", "context": "{prev}", "mode": "reason"}},
+]
+
+
+def _tool_script(plan: List[Dict[str, Any]]) -> Callable[[str, str, int], List[str]]:
+    """Stub script: planning prompts get ``plan`` as JSON, goal checks get YES."""
+    plan_json = json.dumps(plan)
+
+    def script(model: str, prompt: str, tokens: int) -> List[str]:
+        if "Generate ONLY a JSON array" in prompt:
+            return [plan_json[i:i + 8] for i in range(0, len(plan_json), 8)]
+        if "Reply with a single word: YES or NO" in prompt:
+            return ["YES"]
+        if model.startswith("triage"):
+            return ["simple"]
+        return _default_script(model, prompt, tokens)
+
+    return script
+
+
+class _BenchTool:
+    """Minimal LangChain-style tool: ``name``, ``description``, ``run``."""
+
+    def __init__(self, name: str, description: str, func: Callable[[str], Any]):
+        self.name = name
+        self.description = description
+        self.run = func
+
+
+class _BenchMemory:
+    """HybridMemory surface the toolchain touches, writing to the graph double."""
+
+    def __init__(self, graph: GraphDouble):
+        self.graph = graph
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def add_session_memory(self, session_id, text, node_type, metadata=None, **_):
+        with self._lock:
+            self._seq += 1
+            node_id = f"mem_{session_id}_{self._seq}"
+        self.graph.upsert_entity(_memory_node(node_id, node_type, [node_type.capitalize()], {
+            "text": text, "session_id": session_id, **(metadata or {}),
+        }))
+        self.graph.link_session_to_entity(session_id, node_id, "HAS_MEMORY")
+        return SimpleNamespace(id=node_id)
+
+
+def _seed_graph(graph: GraphDouble, entities: int = 500, fanout: int = 4):
+    """Synthetic entity graph for the search_memory tool to traverse."""
+    for i in range(entities):
+        graph.upsert_entity(_memory_node(f"ent_{i}", "entity", ["Entity"], {"name": f"entity {i}"}))
+    for i in range(entities):
+        for j in range(1, fanout + 1):
+            graph.upsert_edge(SimpleNamespace(
+                src=f"ent_{i}", dst=f"ent_{(i * 7 + j) % entities}", rel="RELATED_TO", properties={},
+            ))
+
+
+def scenario_deep_tools(env: BenchEnv, turns: int = 6, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs ToolChainPlanner.execute_tool_chain (sequential mode) end to end:
+    plan (reasoning model) → search_memory (embedding + 2-hop subgraph) →
+    read_file → llm/reason synthesis → goal check, saving every step to
+    memory.  LLM and tool time are measured separately; the remainder is
+    toolchain overhead (planning parse, placeholder resolution, memory
+    writes).  The planner saves ./Configuration/last_tool_plan.json, so
+    run_scenario switches into a scratch directory first.
+    """
+    from Vera.Toolchain.toolchain import ToolChainPlanner
+
+    _seed_graph(env.graph)
+    notes = os.path.join(workdir or tempfile.gettempdir(), "bench_notes.txt")
+    with open(notes, "w", encoding="utf-8") as f:
+        f.write("Archive sync runs hourly; scan results are kept for 30 days.\n" * 200)
+
+    llm_time, tool_time = _Timed(), _Timed()
+    deep = env.llm(DEEP_MODEL)
+    fast = env.llm(FAST_MODEL)
+    embeddings = env.manager.create_embeddings(EMBED_MODEL)
+
+    def search_memory(query: str) -> str:
+        t0 = time.perf_counter()
+        embeddings.embed_query(query)
+        seed = f"ent_{sum(map(ord, query)) % 500}"
+        sub = env.graph.get_subgraph([seed], depth=2)
+        tool_time.add(time.perf_counter() - t0)
+        return json.dumps({"nodes": [n["id"] for n in sub["nodes"][:50]], "rels": len(sub["rels"])})
+
+    def read_file(path: str) -> str:
+        t0 = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        tool_time.add(time.perf_counter() - t0)
+        return text[:4000]
+
+    def deep_llm(query: str) -> Iterator[str]:
+        return llm_time.stream(deep.stream(query))
+
+    def fast_llm(query: str) -> Iterator[str]:
+        return llm_time.stream(fast.stream(query))
+
+    class _TimedLLM:
+        """Planner/goal-check LLM wrapper so their time counts as LLM time."""
+
+        def __init__(self, llm):
+            self._llm = llm
+
+        def stream(self, prompt):
+            return llm_time.stream(self._llm.stream(prompt))
+
+        def invoke(self, prompt):
+            t0 = time.perf_counter()
+            try:
+                return self._llm.invoke(prompt)
+            finally:
+                llm_time.add(time.perf_counter() - t0)
+
+    agent = SimpleNamespace(
+        buffer_memory=SimpleNamespace(load_memory_variables=lambda _: {"chat_history": []}),
+        tool_llm=_TimedLLM(deep),
+        fast_llm=_TimedLLM(fast),
+        mem=_BenchMemory(env.graph),
+        sess=SimpleNamespace(id="bench_tools"),
+        save_to_memory=lambda *a, **k: None,
+        stream_llm=lambda llm, prompt: llm.stream(prompt),
+    )
+    env.graph.upsert_session(SimpleNamespace(id="bench_tools", started_at=datetime.now().isoformat(), metadata={}))
+    tools = [
+        _BenchTool("search_memory", "Search the knowledge graph", search_memory),
+        _BenchTool("read_file", "Read a file from disk", read_file),
+        _BenchTool("deep_llm", "Deep reasoning LLM", deep_llm),
+        _BenchTool("fast_llm", "Fast LLM", fast_llm),
+    ]
+    planner = ToolChainPlanner(agent, tools)
+
+    latencies, ttfts, llm_s, tool_s, overhead_s = [], [], [], [], []
+    for turn in range(turns):
+        llm_before, tool_before = llm_time.total, tool_time.total
+        t0 = time.perf_counter()
+        first = None
+        for _ in planner.execute_tool_chain(f"What changed in the archive? ({turn})"):
+            if first is None:
+                first = time.perf_counter() - t0
+        elapsed = time.perf_counter() - t0
+        env.bus.publish("orchestrator.task.completed", {"task_name": "toolchain", "turn": turn}, "bench_tools")
+        turn_llm = llm_time.total - llm_before
+        turn_tools = tool_time.total - tool_before
+        latencies.append(elapsed)
+        ttfts.append(first or elapsed)
+        llm_s.append(turn_llm)
+        tool_s.append(turn_tools)
+        overhead_s.append(max(0.0, elapsed - turn_llm - turn_tools))
+
+    return {
+        "turn_latency": _summary(latencies),
+        "ttft": _summary(ttfts),
+        "llm_time": _summary(llm_s),
+        "tool_time": _summary(tool_s),
+        "toolchain_overhead": _summary(overhead_s),
+        "throughput": {"turns_per_s": round(len(latencies) / sum(latencies), 3) if latencies else 0.0},
+        "settings": {"turns": turns, "plan_steps": len(_DEEP_PLAN)},
+    }
+
+
+# ── Scenario: bulk file ingest ────────────────────────────────────────────────
+
+def _write_corpus(directory: str, files: int, size_kb: int, shared_fraction: float = 0.3) -> List[str]:
+    """Synthetic text files; ``shared_fraction`` of each file is common boilerplate (dedupes)."""
+    import random
+
+    rng = random.Random(1234)
+    words = "vera graph memory session entity archive vector chunk node edge tool plan".split()
+    shared = "\n".join(
+        " ".join(rng.choice(words) for _ in range(12)) for _ in range(int(size_kb * 1024 * shared_fraction) // 80)
+    )
+    paths = []
+    for i in range(files):
+        lines = [
+            " ".join(rng.choice(words) for _ in range(12)) + f" {i}-{n}"
+            for n in range(int(size_kb * 1024 * (1 - shared_fraction)) // 80)
+        ]
+        path = os.path.join(directory, f"doc_{i:04d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(shared + "\n" + "\n".join(lines))
+        paths.append(path)
+    return paths
+
+
+def scenario_bulk_ingest(
+    env: BenchEnv,
+    files: int = 60,
+    size_kb: int = 48,
+    embed_batch: int = 32,
+    workers: int = 4,
+    workdir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    The HybridMemory.store_file pipeline against the stand-ins:
+    content-defined sections → RecursiveCharacterTextSplitter → SHA-256
+    dedupe across files → batched embeddings on the pool → File node with
+    chunk manifest + Chunk nodes/edges → memory.store_file event.
+    ``workers`` files are ingested concurrently.
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from Vera.Memory.content_chunks import chunk_digest, content_defined_sections
+
+    corpus_dir = tempfile.mkdtemp(prefix="bench_corpus_", dir=workdir)
+    paths = _write_corpus(corpus_dir, files, size_kb)
+    embeddings = env.manager.create_embeddings(EMBED_MODEL)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+    known: set = set()
+    known_lock = threading.Lock()
+    latencies, counts = [], {"chunks": 0, "embedded": 0, "bytes": 0}
+    lock = threading.Lock()
+
+    def ingest(path: str):
+        t0 = time.perf_counter()
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+        chunks: List[str] = []
+        for section in content_defined_sections(text, avg_size=8000, min_size=2000, max_size=32000):
+            chunks.extend(splitter.split_text(section))
+        manifest = [chunk_digest(c) for c in chunks]
+        unique = dict(zip(manifest, chunks))
+        with known_lock:
+            new_hashes = [h for h in unique if h not in known]
+            known.update(new_hashes)
+        for start in range(0, len(new_hashes), embed_batch):
+            batch = new_hashes[start:start + embed_batch]
+            embeddings.embed_documents([unique[h] for h in batch])
+        file_id = f"file_{chunk_digest(path)[:16]}"
+        env.graph.upsert_entity(_memory_node(file_id, "file", ["File"], {
+            "name": os.path.basename(path), "path": path,
+            "content_hash": chunk_digest(text), "chunk_manifest": manifest,
+            "chunk_count": len(manifest),
+        }))
+        for h in new_hashes:
+            env.graph.upsert_entity(_memory_node(f"chunk_{h[:32]}", "chunk", ["Chunk"], {"chunk_hash": h}))
+        for h in unique:
+            env.graph.upsert_edge(SimpleNamespace(src=file_id, dst=f"chunk_{h[:32]}", rel="HAS_CHUNK", properties={}))
+        env.bus.publish("memory.store_file", {"file_id": file_id, "chunks": len(manifest)})
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+            counts["chunks"] += len(manifest)
+            counts["embedded"] += len(new_hashes)
+            counts["bytes"] += len(text.encode("utf-8"))
+
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(ingest, paths))
+        wall = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    return {
+        "file_latency": _summary(latencies),
+        "throughput": {
+            "files_per_s": round(files / wall, 2),
+            "chunks_per_s": round(counts["chunks"] / wall, 1),
+            "mb_per_s": round(counts["bytes"] / wall / 1e6, 2),
+            "graph_writes_per_s": round(env.graph.writes / wall, 1),
+        },
+        "chunks": counts["chunks"],
+        "embedded_chunks": counts["embedded"],
+        "dedupe_ratio": round(1 - counts["embedded"] / counts["chunks"], 3) if counts["chunks"] else 0.0,
+        "settings": {"files": files, "size_kb": size_kb, "embed_batch": embed_batch, "workers": workers},
+    }
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def run_scenario(name: str, quick: bool = False, instances: int = 2,
+                 latency_scale: float = 1.0, rate_scale: float = 1.0) -> Dict[str, Any]:
+    """Build a fresh environment, run one scenario, attach bus/stub/RSS figures."""
+    profiles = {
+        model: ModelProfile(
+            token_rate=p.token_rate * rate_scale,
+            first_token_latency=p.first_token_latency * latency_scale,
+            tokens=p.tokens, think_tokens=p.think_tokens, embedding_dim=p.embedding_dim,
+        )
+        for model, p in DEFAULT_PROFILES.items()
+    }
+    workdir = tempfile.mkdtemp(prefix="vera_bench_")
+    script = None
+    if name == "deep_tools":
+        plan = json.loads(json.dumps(_DEEP_PLAN).replace("{notes}", os.path.join(workdir, "bench_notes.txt")))
+        script = _tool_script(plan)
+    env = BenchEnv(instances=instances, profiles=profiles, script=script)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        started = time.perf_counter()
+        if name == "triage_fast":
+            result = scenario_triage_fast(env, turns=12 if quick else 40)
+        elif name == "deep_tools":
+            result = scenario_deep_tools(env, turns=2 if quick else 6, workdir=workdir)
+        elif name == "bulk_ingest":
+            result = scenario_bulk_ingest(env, files=12 if quick else 60, workdir=workdir)
+        else:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        result["wall_s"] = round(time.perf_counter() - started, 2)
+        result["events"] = env.bus.report()
+        result["graph"] = env.graph.stats()
+        result["stub_requests"] = env.stub_stats()
+        result["peak_rss_mb"] = _peak_rss_mb()
+        return result
+    finally:
+        os.chdir(cwd)
+        env.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_isolated(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario in a fresh interpreter and read its JSON from stdout."""
+    cmd = [
+        sys.executable, "-m", "Vera.Benchmarks.perf_harness", "--scenario", name, "--stdout",
+        "--instances", str(args.instances),
+        "--latency-scale", str(args.latency_scale), "--rate-scale", str(args.rate_scale),
+    ]
+    if args.quick:
+        cmd.append("--quick")
+    out = subprocess.run(cmd, capture_output=True, text=True)
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"exit {out.returncode}"}
+    return json.loads(out.stdout)["scenarios"][name]
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Human-readable deltas for every p50/p99/throughput/RSS figure both runs share."""
+    lines = [f"baseline {baseline.get('commit')} → current {current.get('commit')}"]
+
+    def walk(cur: Any, base: Any, path: str):
+        if isinstance(cur, dict) and isinstance(base, dict):
+            for key in cur:
+                if key in base and key not in ("settings", "stub_requests", "graph"):
+                    walk(cur[key], base[key], f"{path}.{key}" if path else key)
+        elif isinstance(cur, (int, float)) and isinstance(base, (int, float)) and base:
+            leaf = path.rsplit(".", 1)[-1]
+            if leaf.startswith(("p50", "p99")) or "per_s" in leaf or leaf == "peak_rss_mb":
+                change = (cur - base) / base * 100
+                lines.append(f"  {path:<55} {base:>10} → {cur:>10}  ({change:+.1f}%)")
+
+    walk(current.get("scenarios", {}), baseline.get("scenarios", {}), "")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vera end-to-end performance harness")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a smoke run")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Run each scenario in its own interpreter (per-scenario peak RSS)")
+    parser.add_argument("--instances", type=int, default=2, help="Stub Ollama instances")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply first-token latencies")
+    parser.add_argument("--rate-scale", type=float, default=1.0, help="Multiply token rates")
+    parser.add_argument("--out", default="Output/benchmarks", help="Directory for the JSON result")
+    parser.add_argument("--stdout", action="store_true", help="Print the JSON result instead of writing a file")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="Print deltas against an earlier result")
+    args = parser.parse_args(argv)
+
+    names = args.scenario or list(SCENARIOS)
+    run = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "quick": args.quick, "isolated": args.isolate, "instances": args.instances,
+            "latency_scale": args.latency_scale, "rate_scale": args.rate_scale,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        if args.isolate:
+            run["scenarios"][name] = _run_isolated(name, args)
+        else:
+            run["scenarios"][name] = run_scenario(
+                name, quick=args.quick, instances=args.instances,
+                latency_scale=args.latency_scale, rate_scale=args.rate_scale,
+            )
+        if not args.stdout:
+            result = run["scenarios"][name]
+            headline = result.get("turn_latency") or result.get("file_latency") or {}
+            print(f"{name:<12} p50={headline.get('p50_ms')}ms p99={headline.get('p99_ms')}ms "
+                  f"throughput={result.get('throughput')} peak_rss={result.get('peak_rss_mb')}MB"
+                  + (f" error={result['error']}" if "error" in result else ""))
+
+    if args.stdout:
+        print(json.dumps(run, indent=2))
+    else:
+        os.makedirs(args.out, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(args.out, f"perf_{run['commit'] or 'nogit'}_{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"✓ Results written to {path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(run, baseline)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
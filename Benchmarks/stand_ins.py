@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# Vera/Benchmarks/stand_ins.py
+
+"""
+Local stand-ins for the services Vera talks to, for benchmarking without a
+live cluster:
+
+    StubOllama      HTTP server speaking the Ollama endpoints Vera uses
+                    (/api/tags, /api/show, /api/generate, /api/chat,
+                    /api/embeddings, /api/embed) with a configurable token
+                    rate and first-token latency, per model if needed.
+    GraphDouble     In-memory replacement for Memory.memory.GraphClient
+                    (same public methods and write-listener contract).
+    fake_event_bus  EnhancedRedisEventBus wired to fakeredis instead of a
+                    Redis server (None when fakeredis is not installed).
+
+Timings from the stubs are deterministic, so differences between two runs of
+the harness come from Vera's own code paths, not the services.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+_WORDS = (
+    "the graph memory links each session to entities it mentions and the "
+    "orchestrator routes work across instances while tools return results "
+    "that are summarised into a concise answer for the user"
+).split()
+
+
+# ── Stub Ollama ───────────────────────────────────────────────────────────────
+
+@dataclass
+class ModelProfile:
+    """Generation behaviour of one stub model."""
+    token_rate: float = 200.0           # tokens per second after the first
+    first_token_latency: float = 0.05   # seconds before the first token
+    tokens: int = 64                    # response tokens per request
+    think_tokens: int = 0               # streamed in the ``thinking`` field first
+    embedding_dim: int = 768
+
+
+def _default_script(model: str, prompt: str, tokens: int) -> List[str]:
+    """Deterministic filler text; the prompt only picks the starting word."""
+    start = len(prompt) % len(_WORDS)
+    return [_WORDS[(start + i) % len(_WORDS)] + " " for i in range(tokens)]
+
+
+class StubOllama:
+    """
+    Threaded Ollama look-alike on 127.0.0.1.
+
+    ``profiles`` maps model name → ModelProfile; unknown models use
+    ``default``.  ``script(model, prompt, tokens)`` returns the response
+    tokens, so scenarios can make e.g. the triage model answer with a
+    routing label.  ``stats`` counts requests per path and tokens served.
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, ModelProfile]] = None,
+        default: Optional[ModelProfile] = None,
+        script: Optional[Callable[[str, str, int], List[str]]] = None,
+    ):
+        self.profiles = dict(profiles or {})
+        self.default = default or ModelProfile()
+        self.script = script or _default_script
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.url = ""
+
+    def profile(self, model: str) -> ModelProfile:
+        return self.profiles.get(model) or self.profiles.get(model.split(":")[0]) or self.default
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def start(self) -> "StubOllama":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, payload: Dict[str, Any], status: int = 200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+            def do_GET(self):
+                stub._count(self.path)
+                if self.path == "/api/tags":
+                    names = sorted(set(stub.profiles) | {"llama3:latest"})
+                    self._json({"models": [{"name": n, "model": n} for n in names]})
+                elif self.path == "/api/version":
+                    self._json({"version": "stub"})
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                stub._count(self.path)
+                req = self._body()
+                model = req.get("model") or req.get("name") or ""
+                if self.path == "/api/show":
+                    self._json({"modelfile": "", "details": {"family": "stub"}, "model_info": {}})
+                elif self.path in ("/api/embeddings", "/api/embed"):
+                    self._embed(model, req)
+                elif self.path in ("/api/generate", "/api/chat"):
+                    self._generate(model, req, chat=self.path == "/api/chat")
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def _embed(self, model: str, req: Dict[str, Any]):
+                dim = stub.profile(model).embedding_dim
+                texts = req.get("input", req.get("prompt", ""))
+                texts = texts if isinstance(texts, list) else [texts]
+                vectors = []
+                for text in texts:
+                    seed = hashlib.sha256(str(text).encode()).digest()
+                    vectors.append([seed[i % 32] / 255.0 for i in range(dim)])
+                stub._count("embedded_texts", len(texts))
+                if self.path == "/api/embeddings":
+                    self._json({"embedding": vectors[0]})
+                else:
+                    self._json({"model": model, "embeddings": vectors})
+
+            def _generate(self, model: str, req: Dict[str, Any], chat: bool):
+                prof = stub.profile(model)
+                prompt = req.get("prompt") or json.dumps(req.get("messages", []))
+                tokens = stub.script(model, prompt, prof.tokens)
+                gap = 1.0 / prof.token_rate if prof.token_rate > 0 else 0.0
+                time.sleep(prof.first_token_latency)
+
+                def chunk(text: str, done: bool, thinking: str = "") -> Dict[str, Any]:
+                    data: Dict[str, Any] = {"model": model, "done": done}
+                    if chat:
+                        data["message"] = {"role": "assistant", "content": text}
+                    else:
+                        data["response"] = text
+                    if thinking:
+                        data["thinking"] = thinking
+                    return data
+
+                if not req.get("stream", True):
+                    time.sleep(gap * (len(tokens) + prof.think_tokens))
+                    stub._count("tokens", len(tokens))
+                    self._json(chunk("".join(tokens), True))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def send(data: Dict[str, Any]):
+                    line = json.dumps(data).encode() + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+
+                try:
+                    for i in range(prof.think_tokens):
+                        send(chunk("", False, thinking=_WORDS[i % len(_WORDS)] + " "))
+                        time.sleep(gap)
+                    for tok in tokens:
+                        send(chunk(tok, False))
+                        time.sleep(gap)
+                    send(chunk("", True))
+                    self.wfile.write(b"0\r\n\r\n")
+                    stub._count("tokens", len(tokens) + prof.think_tokens)
+                except (BrokenPipeError, ConnectionResetError):
+                    stub._count("aborted_streams")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubOllama":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ── Graph double ──────────────────────────────────────────────────────────────
+
+class GraphDouble:
+    """
+    In-memory stand-in for ``GraphClient``.
+
+    Implements the methods HybridMemory and the ingest paths call on
+    ``memory.graph`` (upsert_entity / upsert_session / end_session /
+    upsert_edge / link_session_to_entity / get_subgraph /
+    list_subgraph_seeds) and fires the same write-listener payloads, so
+    GraphStatsCounters, the delta feed and archive sync can be attached
+    unchanged.  There is no Cypher engine and no ``_driver``.
+    """
+
+    def __init__(self, write_latency: float = 0.0):
+        self.write_latency = write_latency
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.edges: Dict[tuple, Dict[str, Any]] = {}
+        self._adj: Dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._write_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.writes = 0
+
+    def close(self):
+        pass
+
+    def add_write_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        if callback not in self._write_listeners:
+            self._write_listeners.append(callback)
+
+    def remove_write_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        if callback in self._write_listeners:
+            self._write_listeners.remove(callback)
+
+    def _notify_write(self, kind: str, payload: Dict[str, Any]):
+        for callback in list(self._write_listeners):
+            try:
+                callback(kind, payload)
+            except Exception:
+                pass
+
+    def _write(self):
+        self.writes += 1
+        if self.write_latency:
+            time.sleep(self.write_latency)
+
+    def upsert_entity(self, node):
+        labels = ["Entity"] + [l for l in (node.labels or []) if l != "Entity"]
+        now = int(time.time() * 1000)
+        with self._lock:
+            self._write()
+            existing = self.nodes.get(node.id)
+            created = existing is None
+            record = existing or {"id": node.id, "created_ts": now}
+            record.update(node.properties or {})
+            record.update({"type": node.type, "labels": labels, "updated_at": now})
+            self.nodes[node.id] = record
+        self._notify_write("node", {
+            "id": node.id, "type": node.type, "labels": labels,
+            "properties": node.properties or {}, "created": created,
+        })
+        return {"n": record, "created": created}
+
+    def upsert_session(self, session):
+        with self._lock:
+            self._write()
+            record = self.sessions.setdefault(session.id, {
+                "id": session.id, "started_at": session.started_at, "metadata": {},
+            })
+            record["metadata"].update(session.metadata or {})
+
+    def end_session(self, session_id: str):
+        with self._lock:
+            self._write()
+            if session_id in self.sessions:
+                self.sessions[session_id]["ended_at"] = time.time()
+
+    def _merge_edge(self, src: str, dst: str, rel: str, props: Dict[str, Any]):
+        key = (src, dst, rel)
+        with self._lock:
+            self._write()
+            created = key not in self.edges
+            record = self.edges.setdefault(key, {"src": src, "dst": dst, "rel": rel})
+            record.update(props)
+            record["updated_at"] = int(time.time() * 1000)
+            self._adj[src].add(dst)
+            self._adj[dst].add(src)
+        self._notify_write("edge", {
+            "src": src, "dst": dst, "rel": rel, "properties": props, "created": created,
+        })
+        return {"r": record, "created": created}
+
+    def upsert_edge(self, edge):
+        if edge.src not in self.nodes or edge.dst not in self.nodes:
+            return None     # MATCH found nothing, as with the real client
+        return self._merge_edge(edge.src, edge.dst, edge.rel, dict(edge.properties or {}))
+
+    def link_session_to_entity(self, session_id: str, entity_id: str, rel: str = "FOCUSES_ON"):
+        if session_id in self.sessions and entity_id in self.nodes:
+            self._merge_edge(session_id, entity_id, rel, {})
+
+    def get_subgraph(self, seed_ids: List[str], depth: int = 2) -> Dict[str, Any]:
+        with self._lock:
+            seen = {s for s in seed_ids if s in self.nodes}
+            frontier = deque((s, 0) for s in seen)
+            while frontier:
+                node_id, d = frontier.popleft()
+                if d >= depth:
+                    continue
+                for nxt in self._adj.get(node_id, ()):
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        frontier.append((nxt, d + 1))
+            nodes = [
+                {"id": n, "labels": list(self.nodes[n]["labels"]), "properties": dict(self.nodes[n])}
+                for n in seen if n in self.nodes
+            ]
+            rels = [
+                {"type": "REL", "start": s, "end": t, "properties": dict(r)}
+                for (s, t, _), r in self.edges.items() if s in seen and t in seen
+            ]
+        return {"nodes": nodes, "rels": rels}
+
+    def list_subgraph_seeds(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {
+                "entity_ids": list(self.nodes) + list(self.sessions),
+                "entity_types": sorted({n["type"] for n in self.nodes.values()} | {"session"}),
+                "sessions": list(self.sessions),
+            }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "nodes": len(self.nodes), "edges": len(self.edges),
+                "sessions": len(self.sessions), "writes": self.writes,
+            }
+
+
+# ── Event bus on fakeredis ────────────────────────────────────────────────────
+
+async def fake_event_bus(consumer_name: str = "bench"):
+    """
+    Connected EnhancedRedisEventBus backed by fakeredis, or None when
+    fakeredis (or redis-py) is not installed.  Postgres logging and memory
+    promotion are not attached; the caller subscribes its own handlers and
+    starts the consumer with ``bus.start()``.
+    """
+    try:
+        import fakeredis
+        from Vera.EventBus.config import STREAM_EVENTS, STREAM_PRIORITY
+        from Vera.EventBus.redis_bus import EnhancedRedisEventBus
+    except ImportError:
+        return None
+
+    bus = EnhancedRedisEventBus(consumer_name=consumer_name)
+    bus.redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    await bus._create_group(STREAM_EVENTS)
+    await bus._create_group(STREAM_PRIORITY)
+    return bus
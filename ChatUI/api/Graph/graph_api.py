@@ -1,13 +1,25 @@
 # ============================================================
 # Imports
 # ============================================================
+import asyncio
+import json
 import logging
+import math
 import re
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from Vera.ChatUI.api.session import sessions, get_or_create_vera
 from Vera.ChatUI.api.schemas import GraphResponse, GraphNode, GraphEdge 
+from Vera.ChatUI.api.Graph.graph_store import GraphStore
+from Vera.ChatUI.api.Graph.graph_export import (
+    MAX_HOPS, MAX_NODE_BUDGET, ExportCursor, expand_session, fetch_edge_page, fetch_node_page,
+    node_color, stream_session_export
+)
+from Vera.ChatUI.api.Graph.graph_feed import RESYNC, GraphDeltaFeed
+from Vera.ChatUI.api.Graph.graph_lod import GLOBAL_SCOPE, GraphLODEngine
+from Vera.Memory.graph_stats import NO_TIMESTAMP, GraphStatsCounters, backfill_created_ts, live_time_stats
 import time
 
 # ============================================================
@@ -181,12 +193,145 @@ def get_cypher_time_filter_multifield(
 # ============================================================
 router = APIRouter(prefix="/api/graph", tags=["graph"])
 
+# ============================================================
+# Graph Store
+# ============================================================
+# All blocking Neo4j work goes through graph_store so a slow query only
+# ties up a pool thread, never the event loop (see graph_store.py).
+
+def _active_vera():
+    """First live Vera instance, for routes that are not session-scoped."""
+    for session_id in sessions:
+        return get_or_create_vera(session_id)
+    return None
+
+
+def _default_driver():
+    vera = _active_vera()
+    if not vera:
+        raise HTTPException(status_code=500, detail="No active session")
+    return vera.mem.graph._driver
+
+
+graph_store = GraphStore(_default_driver)
+lod_engine = GraphLODEngine(graph_store)
+stats_counters = GraphStatsCounters()
+graph_feed = GraphDeltaFeed()
+_stats_refresh: Optional[asyncio.Future] = None
+
+
+def _attach_write_listeners():
+    """Make every live session's GraphClient feed the LOD engine, stats counters and delta feed."""
+    for sid in list(sessions):
+        try:
+            vera = get_or_create_vera(sid)
+            graph = vera.mem.graph
+        except Exception:
+            continue
+        lod_engine.attach(graph)
+        graph.add_write_listener(stats_counters.on_write)
+        graph_feed.attach(graph, vera)
+
+
+async def _ensure_stats_counters():
+    """
+    Keep stats_counters fresh: the first call waits for the recount, later
+    ones serve the cached figures and refresh in the background.
+    """
+    global _stats_refresh
+    _attach_write_listeners()
+    if not stats_counters.needs_refresh():
+        return
+    if _stats_refresh is None or _stats_refresh.done():
+        _stats_refresh = asyncio.ensure_future(graph_store.run("stats_refresh", stats_counters.refresh))
+        _stats_refresh.add_done_callback(
+            lambda f: f.cancelled() or not f.exception() or logger.warning(f"Stats refresh failed: {f.exception()}")
+        )
+    if not stats_counters.ready:
+        try:
+            await asyncio.shield(_stats_refresh)
+        except Exception:
+            pass  # callers fall back to the scanning queries
+
+_fallback_driver = None
+
+
+def _get_fallback_driver():
+    """Temporary connection used by /cypher when no session exists."""
+    global _fallback_driver
+    if _fallback_driver is None:
+        # Adjust this to match your Neo4j connection setup
+        from neo4j import GraphDatabase
+        _fallback_driver = GraphDatabase.driver(
+            "bolt://localhost:7687",  # Adjust your Neo4j URI
+            auth=("neo4j", "password")  # Adjust credentials
+        )
+    return _fallback_driver
+
+
+@router.get("/pool")
+async def get_graph_pool_stats():
+    """Concurrency, queue and latency counters of the graph executor."""
+    return graph_store.stats()
+
+
 # ============================================================
 # Graph Endpoints
 # ============================================================
+def _load_session_graph(db_sess, actual_session_id: str, hops: int, node_budget: int,
+                        page_size: int = 500) -> GraphResponse:
+    """
+    Session subgraph (runs on the graph pool).  Uses the export's bounded
+    breadth-first expansion and fetches nodes and edges in pages, so a large
+    session costs at most ``node_budget`` nodes rather than an unbounded
+    variable-length path match.
+    """
+    snapshot = expand_session(db_sess, actual_session_id, hops, node_budget)
+    ids = snapshot.element_ids
+    
+    nodes_list = []
+    edges = []
+    seen_nodes = set()
+    seen_edges = set()
+    
+    for start in range(0, len(ids), page_size):
+        for node in fetch_node_page(db_sess, ids[start:start + page_size], include_properties=True):
+            if node["id"] not in seen_nodes:
+                seen_nodes.add(node["id"])
+                nodes_list.append(GraphNode(**node))
+    
+    for start in range(0, len(ids), page_size):
+        for edge in fetch_edge_page(db_sess, ids[start:start + page_size], snapshot.members):
+            edge_key = (edge["from"], edge["label"], edge["to"])
+            if edge_key not in seen_edges:
+                seen_edges.add(edge_key)
+                edges.append(GraphEdge(**edge))
+    
+    logger.info(f"Returning {len(nodes_list)} nodes and {len(edges)} edges for session {actual_session_id}")
+    return GraphResponse(
+        nodes=nodes_list,
+        edges=edges,
+        stats={
+            "node_count": len(nodes_list),
+            "edge_count": len(edges),
+            "session_id": actual_session_id,
+            "hops_reached": snapshot.hops_reached,
+            "truncated": snapshot.truncated,
+        }
+    )
+
+
 @router.get("/session/{session_id}", response_model=GraphResponse)
-async def get_session_graph(session_id: str):
-    """Get the knowledge graph for a session."""
+async def get_session_graph(
+    session_id: str,
+    hops: int = Query(3, description="Expansion depth from the session's nodes", ge=0, le=MAX_HOPS),
+    node_budget: int = Query(2000, description="Maximum nodes returned", ge=1, le=MAX_NODE_BUDGET),
+):
+    """
+    Get the knowledge graph for a session, capped at ``node_budget`` nodes
+    (``stats.truncated`` says when the cap was hit).  Use
+    /session/{id}/export to stream larger graphs page by page.
+    """
     if session_id not in sessions:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -195,121 +340,15 @@ async def get_session_graph(session_id: str):
     
     try:
         driver = vera.mem.graph._driver
-        
-        with driver.session() as db_sess:
-            # Get all nodes matching session_id and connected nodes within 3 hops
-            result = db_sess.run("""
-                MATCH (n)
-                WHERE n.session_id = $session_id OR n.extracted_from_session = $session_id
-                OPTIONAL MATCH path = (n)-[r*0..3]-(connected)
-                WITH collect(DISTINCT connected) + collect(DISTINCT n) AS nodes,
-                     collect(DISTINCT relationships(path)) AS rels
-                UNWIND rels AS rel_list
-                UNWIND rel_list AS rel
-                RETURN DISTINCT nodes, collect(DISTINCT rel) AS relationships
-            """, {"session_id": actual_session_id})
-            
-            nodes_list = []
-            edges = []
-            seen_nodes = set()
-            seen_edges = set()
-            
-            # Process the query results
-            for record in result:
-                # Process all nodes
-                all_nodes = record.get("nodes", [])
-                for node in all_nodes:
-                    if node and node.get("id"):
-                        node_id = node.get("id", "")
-                        if node_id and node_id not in seen_nodes:
-                            seen_nodes.add(node_id)
-                            
-                            properties = dict(node)
-                            logger.debug(properties)
-                            text = properties.get("text", properties.get("name", node_id))
-                            node_type = properties.get("type", "node")
-                            
-                            # Determine color based on type
-                            color = "#3b82f6"  # Default blue
-                            if node_type in ["thought", "memory", "Thought","Memory"]:
-                                color = "#f59e0b"  # Orange
-                            elif node_type in ["decision", "Decision"]:
-                                color = "#ef4444"  # Red
-                            elif node_type in ["class", "Class"]:
-                                color = "#2d8cf0"  # Blue
-                            elif node_type in ["Plan", "plan"]:
-                                color = "#8b5cf6"  # Purple
-                            elif node_type in ["Tool", "tool"]:
-                                color = "#f97316"  # Deep Orange  
-                            elif node_type in ["Process", "process"]:
-                                color = "#e879f9"  # Pink
-                            elif node_type in ["File", "file"]:
-                                color = "#f43f5e"  # Rose
-                            elif node_type in ["Webpage", "webpage"]:
-                                color = "#60a5fa"  # Light Blue
-                            elif node_type in ["Document", "document"]:
-                                color = "#34d399"  # Emerald
-                            elif node_type in ["Query", "query"]:
-                                color = "#32B39D"  # Turquoise
-                            elif node_type == "extracted_entity":
-                                color = "#07c3e4"  # Cyan
-                            elif node_type == ["Session", "session"]:
-                                color = "#3f1b92"  # Purple
-                            elif "Entity" in properties.get("labels", []):
-                                color = "#10b93a"  # Green
-
-                            
-                            nodes_list.append(GraphNode(
-                                id=node_id,
-                                label=node_type,
-                                title=f"{node_type}: {text[:min(len(text), 20)]}",
-                                color=node.get("color", color),
-                                properties=properties,
-                                size=min(properties.get("importance", 20), 40)
-                            ))
-                
-                # Process all relationships
-                all_relationships = record.get("relationships", [])
-                for rel in all_relationships:
-                    if rel:
-                        try:
-                            # Get source and target nodes
-                            start_node = rel.start_node
-                            end_node = rel.end_node
-                            
-                            start_id = start_node.get("id", "") if start_node else ""
-                            end_id = end_node.get("id", "") if end_node else ""
-                            
-                            if start_id and end_id:
-                                # Get relationship label
-                                rel_props = dict(rel) if hasattr(rel, 'items') else {}
-                                rel_label = rel_props.get("rel", getattr(rel, "type", "RELATED"))
-                                
-                                edge_key = f"{start_id}-{rel_label}->{end_id}"
-                                if edge_key not in seen_edges:
-                                    seen_edges.add(edge_key)
-                                    edges.append(GraphEdge(
-                                        **{
-                                            "from": start_id,
-                                            "to": end_id,
-                                            "label": str(rel_label)
-                                        }
-                                    ))
-                        except Exception as e:
-                            logger.debug(f"Error processing relationship: {e}")
-                            continue
-            
-            logger.info(f"Returning {len(nodes_list)} nodes and {len(edges)} edges for session {actual_session_id}")
-            return GraphResponse(
-                nodes=nodes_list,
-                edges=edges,
-                stats={
-                    "node_count": len(nodes_list),
-                    "edge_count": len(edges),
-                    "session_id": actual_session_id
-                }
-            )
-            
+        # Deltas after this seq may or may not be in the snapshot; re-applying them is harmless
+        feed_seq = graph_feed.current_seq(actual_session_id)
+        graph = await graph_store.run(
+            "session", _load_session_graph, actual_session_id, hops, node_budget, driver=driver
+        )
+        graph.stats["feed_seq"] = feed_seq
+        return graph
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Graph error: {str(e)}", exc_info=True)
         # Return minimal graph with session node only
@@ -326,6 +365,117 @@ async def get_session_graph(session_id: str):
             stats={"node_count": 1, "edge_count": 0, "session_id": actual_session_id}
         )
 
+
+@router.websocket("/ws/session/{session_id}")
+async def graph_delta_websocket(websocket: WebSocket, session_id: str, since: Optional[int] = None):
+    """
+    Push coalesced graph deltas for a session (see graph_feed.py for the protocol).
+    Pass ``since`` (last applied seq) when reconnecting to replay missed batches.
+    """
+    await websocket.accept()
+    if session_id not in sessions:
+        await websocket.close(code=4404, reason="Session not found")
+        return
+    
+    _attach_write_listeners()
+    session_id = get_or_create_vera(session_id).sess.id
+    queue, hello = graph_feed.subscribe(session_id, since)
+    
+    async def sender():
+        await websocket.send_json(hello)
+        while True:
+            message = await queue.get()
+            if message is RESYNC:
+                message = graph_feed.resync_message(session_id, "gap")
+            if not isinstance(message, str):
+                message = json.dumps(message)
+            await websocket.send_text(message)
+            graph_feed.count_sent(message)
+    
+    async def receiver():
+        while True:
+            message = await websocket.receive_json()
+            if message.get("type") == "ping":
+                try:
+                    queue.put_nowait({"type": "pong", "seq": graph_feed.current_seq(session_id)})
+                except asyncio.QueueFull:
+                    pass
+    
+    tasks = [asyncio.ensure_future(sender()), asyncio.ensure_future(receiver())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        logger.debug(f"Graph feed disconnected: {session_id}")
+    except Exception as e:
+        logger.warning(f"Graph feed error for {session_id}: {e}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        graph_feed.unsubscribe(session_id, queue)
+
+
+@router.get("/feed/stats")
+async def get_graph_feed_stats():
+    """Delta feed counters: events in/coalesced, batches, bytes sent, resyncs per channel."""
+    return graph_feed.stats()
+
+
+@router.get("/session/{session_id}/export")
+async def export_session_graph(
+    session_id: str,
+    hops: int = Query(2, description="Expansion depth from the session's nodes", ge=0, le=MAX_HOPS),
+    node_budget: int = Query(2000, description="Maximum nodes in the export", ge=1, le=MAX_NODE_BUDGET),
+    page_size: int = Query(500, description="Nodes (or edge source nodes) per page", ge=1, le=5000),
+    max_pages: int = Query(0, description="Pages to send in this response (0 = all)", ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous response"),
+    include_properties: bool = Query(True, description="Include raw node properties"),
+    format: str = Query("ndjson", description="'ndjson' (one record per line) or 'json' (chunked document)")
+):
+    """
+    Stream the session graph page by page instead of as one document.
+    
+    Records: meta, then node pages, then edge pages, then end (with
+    next_cursor when max_pages cut the export short). Every page reports
+    its payload bytes and server time.
+    
+    Examples:
+    - /api/graph/session/{id}/export?hops=2&node_budget=5000
+    - /api/graph/session/{id}/export?max_pages=4&include_properties=false
+    - /api/graph/session/{id}/export?cursor=<next_cursor>&max_pages=4
+    """
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if format not in ("ndjson", "json"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'json'")
+    
+    vera = get_or_create_vera(session_id)
+    actual_session_id = vera.sess.id
+    
+    if cursor:
+        try:
+            export_cursor = ExportCursor.decode(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if export_cursor.session_id != actual_session_id:
+            raise HTTPException(status_code=400, detail="Cursor belongs to a different session")
+    else:
+        export_cursor = ExportCursor(actual_session_id, hops, node_budget)
+    
+    return StreamingResponse(
+        stream_session_export(
+            graph_store,
+            vera.mem.graph._driver,
+            export_cursor,
+            page_size=page_size,
+            max_pages=max_pages,
+            include_properties=include_properties,
+            fmt=format,
+        ),
+        media_type="application/x-ndjson" if format == "ndjson" else "application/json"
+    )
+
 # ============================================================
 # Cypher Query Endpoint 
 # ============================================================
@@ -352,6 +502,106 @@ class CypherQueryResponse(BaseModel):
 # ============================================================
 # Cypher Query Endpoint
 # ============================================================
+def _run_cypher_query(db_sess, query: str, parameters: dict) -> CypherQueryResponse:
+    """Execute a read-only query and extract nodes/edges (runs on the graph pool)."""
+    nodes_list = []
+    edges = []
+    raw_results = []
+    seen_nodes = set()
+    seen_edges = set()
+    
+    result = db_sess.run(query, parameters)
+    
+    for record in result:
+        # Store raw result
+        raw_record = {}
+        
+        for key in record.keys():
+            value = record[key]
+            
+            # Process the value based on type
+            if hasattr(value, 'labels'):  # It's a Node
+                node = value
+                node_id = node.get("id", str(node.element_id))
+                
+                if node_id not in seen_nodes:
+                    seen_nodes.add(node_id)
+                    properties = dict(node)
+                    labels = list(node.labels) if hasattr(node, 'labels') else []
+                    
+                    # Determine display text and color
+                    text = properties.get("text", properties.get("name", node_id))
+                    node_type = properties.get("type", labels[0] if labels else "node")
+                    
+                    color = get_node_color(node_type, properties, labels)
+                    
+                    properties["labels"] = labels
+                    logger.debug(properties)
+                    nodes_list.append(GraphNode(
+                        id=node_id,
+                        label=node_type,
+                        title=f"{node_type}: {text[:100] if len(str(text)) > 100 else text}",
+                        color=properties.get("color", color),
+                        properties=properties,
+                        size=min(properties.get("importance", 25), 40)
+                    ))
+                
+                raw_record[key] = {"type": "node", "id": node_id, "labels": labels}
+            
+            elif hasattr(value, 'type'):  # It's a Relationship
+                rel = value
+                try:
+                    start_node = rel.start_node
+                    end_node = rel.end_node
+                    
+                    start_id = start_node.get("id", str(rel.start_node.element_id))
+                    end_id = end_node.get("id", str(rel.end_node.element_id))
+                    rel_type = rel.type
+                    
+                    edge_key = f"{start_id}-{rel_type}->{end_id}"
+                    if edge_key not in seen_edges:
+                        seen_edges.add(edge_key)
+                        edges.append(GraphEdge(
+                            **{
+                                "from": start_id,
+                                "to": end_id,
+                                "label": str(rel_type)
+                            }
+                        ))
+                    
+                    raw_record[key] = {"type": "relationship", "rel_type": rel_type}
+                except Exception as e:
+                    logger.debug(f"Error processing relationship: {e}")
+            
+            elif hasattr(value, '__iter__') and not isinstance(value, (str, dict)):
+                # It's a path or list
+                for item in value:
+                    if hasattr(item, 'labels'):  # Node in path
+                        process_node_from_path(item, nodes_list, seen_nodes)
+                    elif hasattr(item, 'type'):  # Relationship in path
+                        process_rel_from_path(item, edges, seen_edges)
+                raw_record[key] = {"type": "path/list", "length": len(list(value))}
+            
+            else:
+                # Scalar value
+                raw_record[key] = value
+        
+        raw_results.append(raw_record)
+    
+    return CypherQueryResponse(
+        nodes=nodes_list,
+        edges=edges,
+        raw_results=raw_results[:100],  # Limit raw results for response size
+        stats={
+            "node_count": len(nodes_list),
+            "edge_count": len(edges),
+            "result_count": len(raw_results)
+        },
+        query_executed=query,
+        success=True
+    )
+
+
 @router.post("/cypher", response_model=CypherQueryResponse)
 async def execute_cypher_query(request: CypherQueryRequest):
     """
@@ -391,122 +641,15 @@ async def execute_cypher_query(request: CypherQueryRequest):
         query = f"{query} LIMIT {request.limit}"
     
     try:
-        # Get a Vera instance to access the graph driver
-        # You might need to adjust this based on your session management
-        vera = None
-        for session_id in sessions:
-            vera = get_or_create_vera(session_id)
-            break
-        
-        if not vera:
-            # Create a temporary connection if no session exists
-            # Adjust this to match your Neo4j connection setup
-            from neo4j import GraphDatabase
-            driver = GraphDatabase.driver(
-                "bolt://localhost:7687",  # Adjust your Neo4j URI
-                auth=("neo4j", "password")  # Adjust credentials
-            )
-        else:
-            driver = vera.mem.graph._driver
-        
-        nodes_list = []
-        edges = []
-        raw_results = []
-        seen_nodes = set()
-        seen_edges = set()
-        
-        with driver.session() as db_sess:
-            result = db_sess.run(query, request.parameters or {})
-            
-            for record in result:
-                # Store raw result
-                raw_record = {}
-                
-                for key in record.keys():
-                    value = record[key]
-                    
-                    # Process the value based on type
-                    if hasattr(value, 'labels'):  # It's a Node
-                        node = value
-                        node_id = node.get("id", str(node.element_id))
-                        
-                        if node_id not in seen_nodes:
-                            seen_nodes.add(node_id)
-                            properties = dict(node)
-                            labels = list(node.labels) if hasattr(node, 'labels') else []
-                            
-                            # Determine display text and color
-                            text = properties.get("text", properties.get("name", node_id))
-                            node_type = properties.get("type", labels[0] if labels else "node")
-                            
-                            color = get_node_color(node_type, properties, labels)
-                            
-                            properties["labels"] = labels
-                            logger.debug(properties)
-                            nodes_list.append(GraphNode(
-                                id=node_id,
-                                label=node_type,
-                                title=f"{node_type}: {text[:100] if len(str(text)) > 100 else text}",
-                                color=properties.get("color", color),
-                                properties=properties,
-                                size=min(properties.get("importance", 25), 40)
-                            ))
-                        
-                        raw_record[key] = {"type": "node", "id": node_id, "labels": labels}
-                    
-                    elif hasattr(value, 'type'):  # It's a Relationship
-                        rel = value
-                        try:
-                            start_node = rel.start_node
-                            end_node = rel.end_node
-                            
-                            start_id = start_node.get("id", str(rel.start_node.element_id))
-                            end_id = end_node.get("id", str(rel.end_node.element_id))
-                            rel_type = rel.type
-                            
-                            edge_key = f"{start_id}-{rel_type}->{end_id}"
-                            if edge_key not in seen_edges:
-                                seen_edges.add(edge_key)
-                                edges.append(GraphEdge(
-                                    **{
-                                        "from": start_id,
-                                        "to": end_id,
-                                        "label": str(rel_type)
-                                    }
-                                ))
-                            
-                            raw_record[key] = {"type": "relationship", "rel_type": rel_type}
-                        except Exception as e:
-                            logger.debug(f"Error processing relationship: {e}")
-                    
-                    elif hasattr(value, '__iter__') and not isinstance(value, (str, dict)):
-                        # It's a path or list
-                        for item in value:
-                            if hasattr(item, 'labels'):  # Node in path
-                                process_node_from_path(item, nodes_list, seen_nodes)
-                            elif hasattr(item, 'type'):  # Relationship in path
-                                process_rel_from_path(item, edges, seen_edges)
-                        raw_record[key] = {"type": "path/list", "length": len(list(value))}
-                    
-                    else:
-                        # Scalar value
-                        raw_record[key] = value
-                
-                raw_results.append(raw_record)
-        
-        return CypherQueryResponse(
-            nodes=nodes_list,
-            edges=edges,
-            raw_results=raw_results[:100],  # Limit raw results for response size
-            stats={
-                "node_count": len(nodes_list),
-                "edge_count": len(edges),
-                "result_count": len(raw_results)
-            },
-            query_executed=query,
-            success=True
+        # Fall back to a temporary connection if no session exists
+        driver = None if _active_vera() else _get_fallback_driver()
+        return await graph_store.run(
+            "cypher", _run_cypher_query, query, request.parameters or {}, driver=driver
         )
         
+    except HTTPException:
+        # Busy (503) / timeout (504) from graph_store must reach the client as-is
+        raise
     except Exception as e:
         logger.error(f"Cypher query error: {str(e)}", exc_info=True)
         return CypherQueryResponse(
@@ -521,45 +664,8 @@ async def execute_cypher_query(request: CypherQueryRequest):
 
 
 def get_node_color(node_type: str, properties: dict, labels: list) -> str:
-    """Determine node color based on type and labels."""
-    color_map = {
-        "thought": "#f59e0b",
-        "memory": "#f59e0b",
-        "decision": "#ef4444",
-        "class": "#2d8cf0",
-        "plan": "#8b5cf6",
-        "tool": "#f97316",
-        "process": "#e879f9",
-        "file": "#f43f5e",
-        "webpage": "#60a5fa",
-        "document": "#34d399",
-        "query": "#32B39D",
-        "extracted_entity": "#07c3e4",
-        "session": "#3f1b92",
-        "entity": "#10b93a",
-        "person": "#ec4899",
-        "organization": "#8b5cf6",
-        "location": "#14b8a6",
-        "event": "#f97316",
-        "concept": "#6366f1",
-    }
-    
-    # Check node_type
-    type_lower = node_type.lower() if node_type else ""
-    if type_lower in color_map:
-        return color_map[type_lower]
-    
-    # Check labels
-    for label in labels:
-        label_lower = label.lower() if label else ""
-        if label_lower in color_map:
-            return color_map[label_lower]
-    
-    # Check if Entity is in labels
-    if "Entity" in labels or "entity" in labels:
-        return "#10b93a"
-    
-    return "#3b82f6"  # Default blue
+    """Determine node color based on type and labels (see graph_export.NODE_COLORS)."""
+    return node_color(node_type, labels)
 
 
 def process_node_from_path(node, nodes_list, seen_nodes):
@@ -607,6 +713,217 @@ def process_rel_from_path(rel, edges, seen_edges):
 # ============================================================
 # Time-Based Query Endpoints
 # ============================================================
+def _load_timerange_graph(db_sess, query: str, params: dict):
+    """Run a time-range query and collect nodes/edges (runs on the graph pool)."""
+    nodes_list = []
+    edges = []
+    seen_nodes = set()
+    seen_edges = set()
+    
+    result = db_sess.run(query, params)
+    
+    for record in result:
+        # Process main node
+        node = record["n"]
+        if node:
+            node_id = node.get("id", str(node.element_id))
+            if node_id not in seen_nodes:
+                seen_nodes.add(node_id)
+                properties = dict(node)
+                labels = list(node.labels) if hasattr(node, 'labels') else []
+                
+                text = properties.get("text", properties.get("name", node_id))
+                node_type = properties.get("type", labels[0] if labels else "node")
+                color = get_node_color(node_type, properties, labels)
+                
+                # Extract timestamp for display (try all sources)
+                timestamp = extract_timestamp_from_id(node_id)
+                if timestamp:
+                    properties["_timestamp"] = format_timestamp(timestamp)
+                    properties["_timestamp_source"] = "id"
+                elif properties.get("created_at"):
+                    try:
+                        dt = datetime.fromisoformat(str(properties["created_at"]))
+                        properties["_timestamp"] = dt.strftime("%Y-%m-%d %H:%M:%S")
+                        properties["_timestamp_source"] = "created_at"
+                    except:
+                        pass
+                elif properties.get("updated_at"):
+                    try:
+                        dt = datetime.fromisoformat(str(properties["updated_at"]))
+                        properties["_timestamp"] = dt.strftime("%Y-%m-%d %H:%M:%S")
+                        properties["_timestamp_source"] = "updated_at"
+                    except:
+                        pass
+                elif properties.get("timestamp"):
+                    try:
+                        dt = datetime.fromisoformat(str(properties["timestamp"]))
+                        properties["_timestamp"] = dt.strftime("%Y-%m-%d %H:%M:%S")
+                        properties["_timestamp_source"] = "timestamp"
+                    except:
+                        pass
+                
+                nodes_list.append(GraphNode(
+                    id=node_id,
+                    label=node_type,
+                    title=f"{node_type}: {text[:100] if len(str(text)) > 100 else text}",
+                    color=properties.get("color", color),
+                    properties=properties,
+                    size=min(properties.get("importance", 25), 40)
+                ))
+        
+        # Process connected nodes
+        for connected in record.get("connected_nodes", []):
+            if connected:
+                node_id = connected.get("id", str(connected.element_id))
+                if node_id not in seen_nodes:
+                    seen_nodes.add(node_id)
+                    properties = dict(connected)
+                    labels = list(connected.labels) if hasattr(connected, 'labels') else []
+                    
+                    text = properties.get("text", properties.get("name", node_id))
+                    node_type = properties.get("type", labels[0] if labels else "node")
+                    color = get_node_color(node_type, properties, labels)
+                    
+                    timestamp = extract_timestamp_from_id(node_id)
+                    if timestamp:
+                        properties["_timestamp"] = format_timestamp(timestamp)
+                    
+                    nodes_list.append(GraphNode(
+                        id=node_id,
+                        label=node_type,
+                        title=f"{node_type}: {text[:100] if len(str(text)) > 100 else text}",
+                        color=properties.get("color", color),
+                        properties=properties,
+                        size=min(properties.get("importance", 25), 40)
+                    ))
+        
+        # Process relationships
+        for rel in record.get("relationships", []):
+            if rel:
+                try:
+                    start_id = rel.start_node.get("id", str(rel.start_node.element_id))
+                    end_id = rel.end_node.get("id", str(rel.end_node.element_id))
+                    rel_type = rel.type
+                    
+                    edge_key = f"{start_id}-{rel_type}->{end_id}"
+                    if edge_key not in seen_edges:
+                        seen_edges.add(edge_key)
+                        edges.append(GraphEdge(
+                            **{
+                                "from": start_id,
+                                "to": end_id,
+                                "label": str(rel_type)
+                            }
+                        ))
+                except Exception as e:
+                    logger.debug(f"Error processing relationship: {e}")
+    
+    return nodes_list, edges
+
+
+def _scan_timerange_query(after_dt, before_dt, node_types: Optional[str], time_field: str):
+    """Time-range query that derives each node's time in Cypher (full scan)."""
+    # Get time filter with multi-field support
+    time_where, time_params = get_cypher_time_filter_multifield(
+        node_var="n",
+        time_field=time_field,
+        after=after_dt,
+        before=before_dt
+    )
+    
+    # Build type filter
+    type_filter = ""
+    if node_types:
+        types_list = [t.strip() for t in node_types.split(',')]
+        type_filter = "n.type IN $types"
+        time_params["types"] = types_list
+    
+    # Combine filters
+    where_clause = f"WHERE {time_where}" if time_where else ""
+    if type_filter:
+        where_clause = f"{where_clause} AND {type_filter}" if where_clause else f"WHERE {type_filter}"
+    
+    # Build ordering based on time_field
+    if time_field == "id":
+        order_expr = "toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13))"
+    elif time_field in ["created_at", "updated_at", "timestamp"]:
+        # Handle numeric timestamps or datetime strings
+        order_expr = f"""CASE
+            WHEN toString(n.{time_field}) =~ '[-+]?[0-9.eE]+' AND size(toString(n.{time_field})) >= 10
+                 THEN datetime({{epochMillis: toInteger(n.{time_field})}})
+            WHEN toString(n.{time_field}) CONTAINS 'T' THEN datetime(toString(n.{time_field}))
+            ELSE datetime(replace(toString(n.{time_field}), ' ', 'T'))
+        END"""
+    else:  # auto
+        # Use COALESCE for ordering too
+        id_ts_expr = "toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13))"
+        
+        # Helper to create timestamp expression with numeric handling
+        def make_order_ts_expr(field):
+            return f"""toInteger(CASE
+                WHEN toString(n.{field}) =~ '[-+]?[0-9.eE]+' AND size(toString(n.{field})) >= 10
+                     THEN datetime({{epochMillis: toInteger(n.{field})}})
+                WHEN toString(n.{field}) CONTAINS 'T' THEN datetime(toString(n.{field}))
+                ELSE datetime(replace(toString(n.{field}), ' ', 'T'))
+            END.epochMillis)"""
+        
+        created_ts_expr = make_order_ts_expr("created_at")
+        updated_ts_expr = make_order_ts_expr("updated_at")
+        timestamp_ts_expr = make_order_ts_expr("timestamp")
+        
+        order_expr = f"""COALESCE(
+            CASE WHEN n.id =~ '.*_\\d{{13}}.*' THEN {id_ts_expr} ELSE null END,
+            CASE WHEN n.created_at IS NOT NULL THEN {created_ts_expr} ELSE null END,
+            CASE WHEN n.updated_at IS NOT NULL THEN {updated_ts_expr} ELSE null END,
+            CASE WHEN n.timestamp IS NOT NULL THEN {timestamp_ts_expr} ELSE null END
+        )"""
+    
+    # Build query
+    query = f"""
+        MATCH (n)
+        {where_clause}
+        WITH n, {order_expr} as sort_time
+        ORDER BY sort_time DESC
+        LIMIT $max_nodes
+        OPTIONAL MATCH (n)-[r]-(connected)
+        RETURN n, collect(DISTINCT r) as relationships, collect(DISTINCT connected) as connected_nodes
+    """
+    
+    return query, time_params
+
+
+def _indexed_timerange_query(after_dt, before_dt, node_types: Optional[str]):
+    """
+    Same rows as the "auto" scan, from the created_ts range indexes: one
+    ordered, limited index seek per indexed label, merged.
+    """
+    params = {
+        "after_ms": datetime_to_timestamp(after_dt) if after_dt else NO_TIMESTAMP + 1,
+        "before_ms": datetime_to_timestamp(before_dt) if before_dt else 2 ** 62,
+    }
+    type_filter = ""
+    if node_types:
+        params["types"] = [t.strip() for t in node_types.split(',')]
+        type_filter = "AND n.type IN $types"
+    
+    query = f"""
+        CALL {{
+            MATCH (n:Entity)
+            WHERE n.created_ts >= $after_ms AND n.created_ts <= $before_ms {type_filter}
+            RETURN n ORDER BY n.created_ts DESC LIMIT $max_nodes
+            UNION
+            MATCH (n:Session)
+            WHERE n.created_ts >= $after_ms AND n.created_ts <= $before_ms {type_filter}
+            RETURN n ORDER BY n.created_ts DESC LIMIT $max_nodes
+        }}
+        WITH n ORDER BY n.created_ts DESC LIMIT $max_nodes
+        OPTIONAL MATCH (n)-[r]-(connected)
+        RETURN n, collect(DISTINCT r) as relationships, collect(DISTINCT connected) as connected_nodes
+    """
+    return query, params
+
+
 @router.get("/timerange", response_model=GraphResponse)
 async def get_nodes_by_timerange(
     after: Optional[str] = Query(None, description="ISO format datetime (e.g., 2024-01-01T00:00:00)"),
@@ -619,7 +936,9 @@ async def get_nodes_by_timerange(
     Get nodes created within a specific time range based on multiple timestamp sources.
     
     Time field options:
-    - auto: Try id -> created_at -> updated_at -> timestamp (default)
+    - auto: Try id -> created_at -> updated_at -> timestamp (default); served from
+      the created_ts index once the backfill has run
+    - created_ts: Indexed creation time (epoch ms)
     - id: Extract timestamp from node ID only
     - created_at: Use created_at property
     - updated_at: Use updated_at property  
@@ -630,194 +949,34 @@ async def get_nodes_by_timerange(
     - /api/graph/timerange?after=2024-01-01T00:00:00&time_field=created_at
     - /api/graph/timerange?after=2024-01-01T00:00:00&before=2024-01-31T23:59:59&node_types=thought,memory
     """
+    return await _query_timerange("timerange", after, before, node_types, time_field, max_nodes)
+
+
+async def _query_timerange(
+    endpoint: str,
+    after: Optional[str],
+    before: Optional[str],
+    node_types: Optional[str],
+    time_field: str,
+    max_nodes: int
+) -> GraphResponse:
+    """Shared body of /timerange and /recent; ``endpoint`` selects the pool limits."""
     try:
         # Parse datetime parameters
         after_dt = datetime.fromisoformat(after) if after else None
         before_dt = datetime.fromisoformat(before) if before else None
         
-        # Get time filter with multi-field support
-        time_where, time_params = get_cypher_time_filter_multifield(
-            node_var="n",
-            time_field=time_field,
-            after=after_dt,
-            before=before_dt
-        )
-        
-        # Build type filter
-        type_filter = ""
-        if node_types:
-            types_list = [t.strip() for t in node_types.split(',')]
-            type_filter = "n.type IN $types"
-            time_params["types"] = types_list
-        
-        # Combine filters
-        where_clause = f"WHERE {time_where}" if time_where else ""
-        if type_filter:
-            where_clause = f"{where_clause} AND {type_filter}" if where_clause else f"WHERE {type_filter}"
-        
-        # Build ordering based on time_field
-        if time_field == "id":
-            order_expr = "toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13))"
-        elif time_field in ["created_at", "updated_at", "timestamp"]:
-            # Handle numeric timestamps or datetime strings
-            order_expr = f"""CASE
-                WHEN toString(n.{time_field}) =~ '[-+]?[0-9.eE]+' AND size(toString(n.{time_field})) >= 10
-                     THEN datetime({{epochMillis: toInteger(n.{time_field})}})
-                WHEN toString(n.{time_field}) CONTAINS 'T' THEN datetime(toString(n.{time_field}))
-                ELSE datetime(replace(toString(n.{time_field}), ' ', 'T'))
-            END"""
-        else:  # auto
-            # Use COALESCE for ordering too
-            id_ts_expr = "toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13))"
-            
-            # Helper to create timestamp expression with numeric handling
-            def make_order_ts_expr(field):
-                return f"""toInteger(CASE
-                    WHEN toString(n.{field}) =~ '[-+]?[0-9.eE]+' AND size(toString(n.{field})) >= 10
-                         THEN datetime({{epochMillis: toInteger(n.{field})}})
-                    WHEN toString(n.{field}) CONTAINS 'T' THEN datetime(toString(n.{field}))
-                    ELSE datetime(replace(toString(n.{field}), ' ', 'T'))
-                END.epochMillis)"""
-            
-            created_ts_expr = make_order_ts_expr("created_at")
-            updated_ts_expr = make_order_ts_expr("updated_at")
-            timestamp_ts_expr = make_order_ts_expr("timestamp")
-            
-            order_expr = f"""COALESCE(
-                CASE WHEN n.id =~ '.*_\\d{{13}}.*' THEN {id_ts_expr} ELSE null END,
-                CASE WHEN n.created_at IS NOT NULL THEN {created_ts_expr} ELSE null END,
-                CASE WHEN n.updated_at IS NOT NULL THEN {updated_ts_expr} ELSE null END,
-                CASE WHEN n.timestamp IS NOT NULL THEN {timestamp_ts_expr} ELSE null END
-            )"""
-        
-        # Build query
-        query = f"""
-            MATCH (n)
-            {where_clause}
-            WITH n, {order_expr} as sort_time
-            ORDER BY sort_time DESC
-            LIMIT $max_nodes
-            OPTIONAL MATCH (n)-[r]-(connected)
-            RETURN n, collect(DISTINCT r) as relationships, collect(DISTINCT connected) as connected_nodes
-        """
+        # Index-backed path once created_ts covers the graph (see Memory/graph_stats.py)
+        if time_field in ("auto", "created_ts"):
+            await _ensure_stats_counters()
+        if time_field == "created_ts" or (time_field == "auto" and stats_counters.fully_indexed):
+            query, time_params = _indexed_timerange_query(after_dt, before_dt, node_types)
+        else:
+            query, time_params = _scan_timerange_query(after_dt, before_dt, node_types, time_field)
         
         time_params["max_nodes"] = max_nodes
         
-        # Get Vera instance
-        vera = None
-        for session_id in sessions:
-            vera = get_or_create_vera(session_id)
-            break
-        
-        if not vera:
-            raise HTTPException(status_code=500, detail="No active session")
-        
-        driver = vera.mem.graph._driver
-        
-        nodes_list = []
-        edges = []
-        seen_nodes = set()
-        seen_edges = set()
-        
-        with driver.session() as db_sess:
-            result = db_sess.run(query, time_params)
-            
-            for record in result:
-                # Process main node
-                node = record["n"]
-                if node:
-                    node_id = node.get("id", str(node.element_id))
-                    if node_id not in seen_nodes:
-                        seen_nodes.add(node_id)
-                        properties = dict(node)
-                        labels = list(node.labels) if hasattr(node, 'labels') else []
-                        
-                        text = properties.get("text", properties.get("name", node_id))
-                        node_type = properties.get("type", labels[0] if labels else "node")
-                        color = get_node_color(node_type, properties, labels)
-                        
-                        # Extract timestamp for display (try all sources)
-                        timestamp = extract_timestamp_from_id(node_id)
-                        if timestamp:
-                            properties["_timestamp"] = format_timestamp(timestamp)
-                            properties["_timestamp_source"] = "id"
-                        elif properties.get("created_at"):
-                            try:
-                                dt = datetime.fromisoformat(str(properties["created_at"]))
-                                properties["_timestamp"] = dt.strftime("%Y-%m-%d %H:%M:%S")
-                                properties["_timestamp_source"] = "created_at"
-                            except:
-                                pass
-                        elif properties.get("updated_at"):
-                            try:
-                                dt = datetime.fromisoformat(str(properties["updated_at"]))
-                                properties["_timestamp"] = dt.strftime("%Y-%m-%d %H:%M:%S")
-                                properties["_timestamp_source"] = "updated_at"
-                            except:
-                                pass
-                        elif properties.get("timestamp"):
-                            try:
-                                dt = datetime.fromisoformat(str(properties["timestamp"]))
-                                properties["_timestamp"] = dt.strftime("%Y-%m-%d %H:%M:%S")
-                                properties["_timestamp_source"] = "timestamp"
-                            except:
-                                pass
-                        
-                        nodes_list.append(GraphNode(
-                            id=node_id,
-                            label=node_type,
-                            title=f"{node_type}: {text[:100] if len(str(text)) > 100 else text}",
-                            color=properties.get("color", color),
-                            properties=properties,
-                            size=min(properties.get("importance", 25), 40)
-                        ))
-                
-                # Process connected nodes
-                for connected in record.get("connected_nodes", []):
-                    if connected:
-                        node_id = connected.get("id", str(connected.element_id))
-                        if node_id not in seen_nodes:
-                            seen_nodes.add(node_id)
-                            properties = dict(connected)
-                            labels = list(connected.labels) if hasattr(connected, 'labels') else []
-                            
-                            text = properties.get("text", properties.get("name", node_id))
-                            node_type = properties.get("type", labels[0] if labels else "node")
-                            color = get_node_color(node_type, properties, labels)
-                            
-                            timestamp = extract_timestamp_from_id(node_id)
-                            if timestamp:
-                                properties["_timestamp"] = format_timestamp(timestamp)
-                            
-                            nodes_list.append(GraphNode(
-                                id=node_id,
-                                label=node_type,
-                                title=f"{node_type}: {text[:100] if len(str(text)) > 100 else text}",
-                                color=properties.get("color", color),
-                                properties=properties,
-                                size=min(properties.get("importance", 25), 40)
-                            ))
-                
-                # Process relationships
-                for rel in record.get("relationships", []):
-                    if rel:
-                        try:
-                            start_id = rel.start_node.get("id", str(rel.start_node.element_id))
-                            end_id = rel.end_node.get("id", str(rel.end_node.element_id))
-                            rel_type = rel.type
-                            
-                            edge_key = f"{start_id}-{rel_type}->{end_id}"
-                            if edge_key not in seen_edges:
-                                seen_edges.add(edge_key)
-                                edges.append(GraphEdge(
-                                    **{
-                                        "from": start_id,
-                                        "to": end_id,
-                                        "label": str(rel_type)
-                                    }
-                                ))
-                        except Exception as e:
-                            logger.debug(f"Error processing relationship: {e}")
+        nodes_list, edges = await graph_store.run(endpoint, _load_timerange_graph, query, time_params)
         
         return GraphResponse(
             nodes=nodes_list,
@@ -832,6 +991,8 @@ async def get_nodes_by_timerange(
             }
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid datetime format: {str(e)}")
     except Exception as e:
@@ -858,7 +1019,8 @@ async def get_recent_nodes(
     after = now - timedelta(hours=hours)
     
     # Reuse the timerange endpoint logic
-    return await get_nodes_by_timerange(
+    return await _query_timerange(
+        "recent",
         after=after.isoformat(),
         before=None,
         node_types=node_types,
@@ -868,146 +1030,297 @@ async def get_recent_nodes(
 # ============================================================
 # Additional Utility Endpoints
 # ============================================================
+def _read_schema(db_sess) -> dict:
+    """Labels, relationship types and counts (runs on the graph pool)."""
+    # Get all node labels
+    labels_result = db_sess.run("CALL db.labels()")
+    labels = [record[0] for record in labels_result]
+    
+    # Get all relationship types
+    rels_result = db_sess.run("CALL db.relationshipTypes()")
+    rel_types = [record[0] for record in rels_result]
+    
+    # Get property keys
+    props_result = db_sess.run("CALL db.propertyKeys()")
+    property_keys = [record[0] for record in props_result]
+    
+    # Get node counts per label
+    label_counts = {}
+    for label in labels:
+        count_result = db_sess.run(f"MATCH (n:`{label}`) RETURN count(n) as count")
+        label_counts[label] = count_result.single()["count"]
+    
+    return {
+        "labels": labels,
+        "relationship_types": rel_types,
+        "property_keys": property_keys,
+        "label_counts": label_counts,
+        "total_nodes": sum(label_counts.values()),
+        "total_relationships": db_sess.run("MATCH ()-[r]->() RETURN count(r) as count").single()["count"]
+    }
+
+
 @router.get("/schema")
 async def get_database_schema():
     """Get the database schema (node labels and relationship types)."""
     try:
-        vera = None
-        for session_id in sessions:
-            vera = get_or_create_vera(session_id)
-            break
-        
-        if not vera:
-            raise HTTPException(status_code=500, detail="No active session to query schema")
-        
-        driver = vera.mem.graph._driver
-        
-        with driver.session() as db_sess:
-            # Get all node labels
-            labels_result = db_sess.run("CALL db.labels()")
-            labels = [record[0] for record in labels_result]
-            
-            # Get all relationship types
-            rels_result = db_sess.run("CALL db.relationshipTypes()")
-            rel_types = [record[0] for record in rels_result]
-            
-            # Get property keys
-            props_result = db_sess.run("CALL db.propertyKeys()")
-            property_keys = [record[0] for record in props_result]
-            
-            # Get node counts per label
-            label_counts = {}
-            for label in labels:
-                count_result = db_sess.run(f"MATCH (n:`{label}`) RETURN count(n) as count")
-                label_counts[label] = count_result.single()["count"]
-            
-            return {
-                "labels": labels,
-                "relationship_types": rel_types,
-                "property_keys": property_keys,
-                "label_counts": label_counts,
-                "total_nodes": sum(label_counts.values()),
-                "total_relationships": db_sess.run("MATCH ()-[r]->() RETURN count(r) as count").single()["count"]
-            }
-            
+        return await graph_store.run("schema", _read_schema)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Schema error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _read_stats(db_sess) -> dict:
+    """Node/relationship totals and timestamp metrics (runs on the graph pool)."""
+    stats = {}
+    
+    # Total nodes
+    stats["total_nodes"] = db_sess.run(
+        "MATCH (n) RETURN count(n) as count"
+    ).single()["count"]
+    
+    # Total relationships
+    stats["total_relationships"] = db_sess.run(
+        "MATCH ()-[r]->() RETURN count(r) as count"
+    ).single()["count"]
+    
+    # Nodes by type
+    type_result = db_sess.run("""
+        MATCH (n)
+        WITH coalesce(n.type, labels(n)[0], 'unknown') as type
+        RETURN type, count(*) as count
+        ORDER BY count DESC
+        LIMIT 20
+    """)
+    stats["nodes_by_type"] = {r["type"]: r["count"] for r in type_result}
+    
+    # Relationships by type
+    rel_result = db_sess.run("""
+        MATCH ()-[r]->()
+        RETURN type(r) as type, count(*) as count
+        ORDER BY count DESC
+        LIMIT 20
+    """)
+    stats["relationships_by_type"] = {r["type"]: r["count"] for r in rel_result}
+    
+    # Time-based statistics
+    # Get oldest and newest nodes based on ID timestamps
+    time_stats_query = """
+        MATCH (n)
+        WHERE n.id IS NOT NULL AND n.id =~ '.*_\\d{13}.*'
+        WITH n, toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13)) as ts
+        WHERE ts IS NOT NULL AND ts > 0
+        RETURN 
+            min(ts) as oldest_timestamp,
+            max(ts) as newest_timestamp,
+            count(*) as nodes_with_timestamps
+    """
+    
+    time_result = db_sess.run(time_stats_query).single()
+    if time_result and time_result["nodes_with_timestamps"] > 0:
+        oldest_ts = time_result["oldest_timestamp"]
+        newest_ts = time_result["newest_timestamp"]
+        
+        stats["time_range"] = {
+            "oldest": format_timestamp(oldest_ts),
+            "newest": format_timestamp(newest_ts),
+            "oldest_timestamp_ms": oldest_ts,
+            "newest_timestamp_ms": newest_ts,
+            "nodes_with_timestamps": time_result["nodes_with_timestamps"]
+        }
+        
+        # Activity over last 24 hours
+        now_ts = datetime_to_timestamp(datetime.now())
+        day_ago_ts = now_ts - (24 * 60 * 60 * 1000)
+        
+        activity_result = db_sess.run("""
+            MATCH (n)
+            WHERE n.id IS NOT NULL AND n.id =~ '.*_\\d{13}.*'
+            WITH n, toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13)) as ts
+            WHERE ts IS NOT NULL AND ts >= $day_ago_ts
+            RETURN count(*) as count_24h
+        """, {"day_ago_ts": day_ago_ts}).single()
+        
+        stats["time_range"]["nodes_last_24h"] = activity_result["count_24h"] if activity_result else 0
+    
+    return stats
+
+
 @router.get("/stats")
 async def get_database_stats():
-    """Get database statistics including timestamp-based metrics."""
+    """
+    Get database statistics including timestamp-based metrics.
+    
+    Totals come from the Neo4j count store, time metrics from the created_ts
+    indexes and per-type figures from cached counters, so no call scans the
+    graph. Until created_ts is backfilled the scanning queries are used.
+    """
     try:
-        vera = None
-        for session_id in sessions:
-            vera = get_or_create_vera(session_id)
-            break
-        
-        if not vera:
-            raise HTTPException(status_code=500, detail="No active session")
+        await _ensure_stats_counters()
+        if not stats_counters.fully_indexed:
+            stats = await graph_store.run("stats", _read_stats)
+            stats["counters"] = stats_counters.snapshot().get("counters", {})
+            return stats
         
-        driver = vera.mem.graph._driver
+        day_ago_ts = datetime_to_timestamp(datetime.now()) - (24 * 60 * 60 * 1000)
+        live = await graph_store.run("stats", live_time_stats, day_ago_ts)
+        counters = stats_counters.snapshot()
+        nodes_with_timestamps = counters.pop("nodes_with_timestamps", 0)
         
-        with driver.session() as db_sess:
-            stats = {}
-            
-            # Total nodes
-            stats["total_nodes"] = db_sess.run(
-                "MATCH (n) RETURN count(n) as count"
-            ).single()["count"]
-            
-            # Total relationships
-            stats["total_relationships"] = db_sess.run(
-                "MATCH ()-[r]->() RETURN count(r) as count"
-            ).single()["count"]
-            
-            # Nodes by type
-            type_result = db_sess.run("""
-                MATCH (n)
-                WITH coalesce(n.type, labels(n)[0], 'unknown') as type
-                RETURN type, count(*) as count
-                ORDER BY count DESC
-                LIMIT 20
-            """)
-            stats["nodes_by_type"] = {r["type"]: r["count"] for r in type_result}
-            
-            # Relationships by type
-            rel_result = db_sess.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) as type, count(*) as count
-                ORDER BY count DESC
-                LIMIT 20
-            """)
-            stats["relationships_by_type"] = {r["type"]: r["count"] for r in rel_result}
-            
-            # Time-based statistics
-            # Get oldest and newest nodes based on ID timestamps
-            time_stats_query = """
-                MATCH (n)
-                WHERE n.id IS NOT NULL AND n.id =~ '.*_\\d{13}.*'
-                WITH n, toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13)) as ts
-                WHERE ts IS NOT NULL AND ts > 0
-                RETURN 
-                    min(ts) as oldest_timestamp,
-                    max(ts) as newest_timestamp,
-                    count(*) as nodes_with_timestamps
-            """
-            
-            time_result = db_sess.run(time_stats_query).single()
-            if time_result and time_result["nodes_with_timestamps"] > 0:
-                oldest_ts = time_result["oldest_timestamp"]
-                newest_ts = time_result["newest_timestamp"]
-                
-                stats["time_range"] = {
-                    "oldest": format_timestamp(oldest_ts),
-                    "newest": format_timestamp(newest_ts),
-                    "oldest_timestamp_ms": oldest_ts,
-                    "newest_timestamp_ms": newest_ts,
-                    "nodes_with_timestamps": time_result["nodes_with_timestamps"]
-                }
-                
-                # Activity over last 24 hours
-                now_ts = datetime_to_timestamp(datetime.now())
-                day_ago_ts = now_ts - (24 * 60 * 60 * 1000)
-                
-                activity_result = db_sess.run("""
-                    MATCH (n)
-                    WHERE n.id IS NOT NULL AND n.id =~ '.*_\\d{13}.*'
-                    WITH n, toInteger(substring(n.id, size(split(n.id, '_')[0]) + 1, 13)) as ts
-                    WHERE ts IS NOT NULL AND ts >= $day_ago_ts
-                    RETURN count(*) as count_24h
-                """, {"day_ago_ts": day_ago_ts}).single()
-                
-                stats["time_range"]["nodes_last_24h"] = activity_result["count_24h"] if activity_result else 0
-            
-            return stats
-            
+        stats = {
+            "total_nodes": live["total_nodes"],
+            "total_relationships": live["total_relationships"],
+            **counters,
+        }
+        if live["oldest_timestamp_ms"] is not None:
+            stats["time_range"] = {
+                "oldest": format_timestamp(live["oldest_timestamp_ms"]),
+                "newest": format_timestamp(live["newest_timestamp_ms"]),
+                "oldest_timestamp_ms": live["oldest_timestamp_ms"],
+                "newest_timestamp_ms": live["newest_timestamp_ms"],
+                "nodes_with_timestamps": nodes_with_timestamps,
+                "nodes_last_24h": live["nodes_since"],
+            }
+        return stats
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Stats error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-        # ============================================================
+
+@router.post("/stats/backfill")
+async def backfill_timestamps():
+    """One-off migration: derive created_ts for nodes that lack it (id timestamp first)."""
+    try:
+        driver = _default_driver()
+        result = await graph_store.call("backfill", backfill_created_ts, driver)
+        await graph_store.run("stats_refresh", stats_counters.refresh)
+        return {**result, "fully_indexed": stats_counters.fully_indexed}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Backfill error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================
+# Level-of-Detail Endpoints
+# ============================================================
+def _lod_scope(session_id: Optional[str]):
+    """Resolve (scope, driver) and make sure every live GraphClient feeds the LOD engine."""
+    _attach_write_listeners()
+    
+    if not session_id:
+        return GLOBAL_SCOPE, None
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    vera = get_or_create_vera(session_id)
+    return vera.sess.id, vera.mem.graph._driver
+
+
+def _cluster_node(cluster: dict) -> GraphNode:
+    return GraphNode(
+        id=cluster["id"],
+        label=f"{cluster['dominant_type']} ({cluster['size']})",
+        title=f"{cluster['size']} nodes: {cluster['representative_name']}",
+        color=cluster["color"],
+        properties={**cluster, "is_cluster": True},
+        size=min(20 + int(6 * math.log2(cluster["size"])), 80)
+    )
+
+
+@router.get("/lod/clusters", response_model=GraphResponse)
+async def get_lod_clusters(
+    session_id: Optional[str] = Query(None, description="Session scope; omit for the global graph"),
+    limit: int = Query(200, description="Largest clusters to return", ge=1, le=2000),
+    min_size: int = Query(1, description="Hide clusters smaller than this", ge=1)
+):
+    """
+    Low-zoom view: one super-node per community with aggregate counts, and
+    edges between communities weighted by the node pairs linking them.
+    Expand a super-node with /lod/cluster/{id}.
+    """
+    scope, driver = _lod_scope(session_id)
+    try:
+        view = await lod_engine.clusters(scope, limit=limit, min_size=min_size, driver=driver)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"LOD cluster error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return GraphResponse(
+        nodes=[_cluster_node(c) for c in view["clusters"]],
+        edges=[
+            GraphEdge(**{"from": e["from"], "to": e["to"], "label": str(e["weight"])})
+            for e in view["edges"]
+        ],
+        stats={
+            **view["stats"],
+            "level": "clusters",
+            "node_count": len(view["clusters"]),
+            "edge_count": len(view["edges"]),
+            "hidden_clusters": view["hidden_clusters"],
+            "hidden_nodes": view["hidden_nodes"],
+        }
+    )
+
+
+@router.get("/lod/cluster/{cluster_id:path}", response_model=GraphResponse)
+async def expand_lod_cluster(
+    cluster_id: str,
+    session_id: Optional[str] = Query(None, description="Session scope; omit for the global graph"),
+    limit: int = Query(500, description="Maximum members to return (highest degree first)", ge=1, le=5000)
+):
+    """Expanded view of one cluster: its members, their edges, and links to neighbouring clusters."""
+    scope, driver = _lod_scope(session_id)
+    try:
+        view = await lod_engine.expand(cluster_id, scope, limit=limit, driver=driver)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"LOD expand error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    if view is None:
+        raise HTTPException(status_code=404, detail="Cluster not found (the partition may have been rebuilt)")
+    
+    nodes = [GraphNode(**n) for n in view["nodes"]]
+    nodes += [_cluster_node(c) for c in view["neighbours"]]
+    edges = [GraphEdge(**{"from": e["from"], "to": e["to"], "label": str(e["label"])}) for e in view["edges"]]
+    edges += [GraphEdge(**{"from": l["from"], "to": l["to"], "label": "cluster"}) for l in view["links"]]
+    
+    return GraphResponse(
+        nodes=nodes,
+        edges=edges,
+        stats={
+            **view["stats"],
+            "level": "members",
+            "cluster": view["cluster"],
+            "node_count": len(nodes),
+            "edge_count": len(edges),
+            "hidden_members": view["hidden_members"],
+        }
+    )
+
+
+@router.post("/lod/rebuild")
+async def rebuild_lod(session_id: Optional[str] = Query(None, description="Session scope; omit for the global graph")):
+    """Re-export and re-cluster a scope now instead of waiting for max_age."""
+    scope, driver = _lod_scope(session_id)
+    index = await lod_engine.rebuild(scope, driver)
+    return index.stats()
+
+
+@router.get("/lod/stats")
+async def get_lod_stats():
+    """Per-scope index sizes, versions and incremental-update counters."""
+    return lod_engine.stats()
+
+
+# ============================================================
 # Node and Edge Creation Endpoints
 # ============================================================
 
@@ -1027,6 +1340,25 @@ class CreateEdgeRequest(BaseModel):
     label: Optional[str] = None
     session_id: Optional[str] = None
     properties: Optional[Dict[str, Any]] = None
+
+
+def _find_entity(db_sess, name: str, etype: str):
+    """Existing Entity with the same name and type, or None (runs on the graph pool)."""
+    return db_sess.run("""
+        MATCH (n:Entity)
+        WHERE n.name = $name AND n.type = $type
+        RETURN n.id AS id, n.name AS name, n.type AS type, 
+               labels(n) AS labels, properties(n) AS properties
+        LIMIT 1
+    """, {
+        "name": name,
+        "type": etype
+    }).single()
+
+
+def _find_node_by_id(db_sess, node_id: str):
+    return db_sess.run("MATCH (n {id: $id}) RETURN n", {"id": node_id}).single()
+
     
 @router.post("/node/create")
 async def create_node(request: CreateNodeRequest, force_create: bool = False):
@@ -1048,30 +1380,23 @@ async def create_node(request: CreateNodeRequest, force_create: bool = False):
         
         # Check for duplicate unless force_create is True
         if not force_create:
-            with vera.mem.graph._driver.session() as db_sess:
-                existing = db_sess.run("""
-                    MATCH (n:Entity)
-                    WHERE n.name = $name AND n.type = $type
-                    RETURN n.id AS id, properties(n) AS properties
-                    LIMIT 1
-                """, {
-                    "name": request.label,
-                    "type": request.type
-                }).single()
-                
-                if existing:
-                    logger.warning(f"Duplicate node found: {existing['id']}")
-                    raise HTTPException(
-                        status_code=409,  # Conflict
-                        detail={
-                            "error": "duplicate",
-                            "message": f"Node with name '{request.label}' and type '{request.type}' already exists",
-                            "existing_node": {
-                                "id": existing["id"],
-                                "properties": dict(existing["properties"])
-                            }
+            existing = await graph_store.run(
+                "write", _find_entity, request.label, request.type, driver=vera.mem.graph._driver
+            )
+            
+            if existing:
+                logger.warning(f"Duplicate node found: {existing['id']}")
+                raise HTTPException(
+                    status_code=409,  # Conflict
+                    detail={
+                        "error": "duplicate",
+                        "message": f"Node with name '{request.label}' and type '{request.type}' already exists",
+                        "existing_node": {
+                            "id": existing["id"],
+                            "properties": dict(existing["properties"])
                         }
-                    )
+                    }
+                )
         
         node_id = f"node_{int(time.time() * 1000)}"
         properties = request.properties or {}
@@ -1081,26 +1406,29 @@ async def create_node(request: CreateNodeRequest, force_create: bool = False):
             "type": request.type,
             "description": request.description or "",
             "created_at": datetime.utcnow().isoformat(),
+            # Set explicitly: the caller lookup in upsert_entity would see the pool thread
+            "source_process": "graph_api.py:create_node",
         })
         
         logger.info(f"Creating node {node_id} with properties: {properties}")
         
         # Create node
-        node = vera.mem.upsert_entity(
+        node = await graph_store.call("write", lambda: vera.mem.upsert_entity(
             entity_id=node_id,
             etype=request.type,
             labels=[request.type],
             properties=properties
-        )
+        ))
         
         logger.info(f"Node created: {node}")
         
         # Verify it was created
-        with vera.mem.graph._driver.session() as db_sess:
-            verify = db_sess.run("MATCH (n {id: $id}) RETURN n", {"id": node_id}).single()
-            logger.info(f"Verification query result: {verify}")
-            if not verify:
-                raise Exception("Node creation failed - not found in database")
+        verify = await graph_store.run(
+            "write", _find_node_by_id, node_id, driver=vera.mem.graph._driver
+        )
+        logger.info(f"Verification query result: {verify}")
+        if not verify:
+            raise Exception("Node creation failed - not found in database")
         
         return {
             "success": True,
@@ -1137,12 +1465,12 @@ async def create_edge(request: CreateEdgeRequest):
         })
         
         # Create edge using HybridMemory
-        vera.mem.link(
+        await graph_store.call("write", lambda: vera.mem.link(
             src=request.source_id,
             dst=request.target_id,
             rel=request.relationship_type,
             properties=properties
-        )
+        ))
         
         logger.info(f"Created edge {request.source_id} -[{request.relationship_type}]-> {request.target_id}")
         
@@ -1157,6 +1485,8 @@ async def create_edge(request: CreateEdgeRequest):
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating edge: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -1177,32 +1507,26 @@ async def check_node_duplicate(request: CreateNodeRequest):
         vera = get_or_create_vera(session_id)
         
         # Check for existing node
-        with vera.mem.graph._driver.session() as db_sess:
-            result = db_sess.run("""
-                MATCH (n:Entity)
-                WHERE n.name = $name AND n.type = $type
-                RETURN n.id AS id, n.name AS name, n.type AS type, 
-                       labels(n) AS labels, properties(n) AS properties
-                LIMIT 1
-            """, {
-                "name": request.label,
-                "type": request.type
-            }).single()
-            
-            if result:
-                return {
-                    "exists": True,
-                    "node": {
-                        "id": result["id"],
-                        "name": result["name"],
-                        "type": result["type"],
-                        "labels": result["labels"],
-                        "properties": dict(result["properties"])
-                    }
+        result = await graph_store.run(
+            "write", _find_entity, request.label, request.type, driver=vera.mem.graph._driver
+        )
+        
+        if result:
+            return {
+                "exists": True,
+                "node": {
+                    "id": result["id"],
+                    "name": result["name"],
+                    "type": result["type"],
+                    "labels": result["labels"],
+                    "properties": dict(result["properties"])
                 }
-            else:
-                return {"exists": False}
+            }
+        else:
+            return {"exists": False}
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error checking duplicate: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
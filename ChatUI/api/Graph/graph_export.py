@@ -0,0 +1,415 @@
+# ============================================================
+# Paginated, streamed session graph export
+# ============================================================
+"""
+``GET /api/graph/session/{id}`` returns the session subgraph as one JSON
+document, so large sessions mean multi-megabyte bodies and nothing on
+screen until the last node is built.
+
+This module exports the same subgraph incrementally (``/session/{id}``
+reuses steps 1-3, capped by its own ``node_budget``, without streaming):
+
+    1. Expansion — breadth-first from the session's seed nodes, one hop per
+       query, collecting element ids only.  Capped by ``hops`` and a
+       ``node_budget``; the result is a deterministic, ordered snapshot.
+    2. Node pages — ``page_size`` nodes per query, looked up by element id.
+    3. Edge pages — outgoing relationships of ``page_size`` source nodes,
+       kept only when the target is inside the snapshot.
+
+Each page is a single NDJSON line (or an element of a chunked JSON array)
+carrying its own ``bytes`` and ``server_ms``, and the final record carries
+a ``next_cursor`` when ``max_pages`` stopped the export early.  Cursors are
+self-contained (session, hops, budget, phase, offset); the snapshot itself
+is cached for a few minutes and re-expanded if the cache has dropped it.
+
+Node colours come from ``NODE_COLORS``, a precomputed type/label -> colour
+map shared with the other graph routes (see ``node_color``).
+"""
+import base64
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Styles
+# ============================================================
+
+DEFAULT_COLOR = "#3b82f6"   # blue
+ENTITY_COLOR = "#10b93a"    # green, any other :Entity node
+
+NODE_COLORS: Dict[str, str] = {
+    "thought": "#f59e0b",
+    "memory": "#f59e0b",
+    "decision": "#ef4444",
+    "class": "#2d8cf0",
+    "plan": "#8b5cf6",
+    "tool": "#f97316",
+    "process": "#e879f9",
+    "file": "#f43f5e",
+    "webpage": "#60a5fa",
+    "document": "#34d399",
+    "query": "#32B39D",
+    "extracted_entity": "#07c3e4",
+    "session": "#3f1b92",
+    "entity": ENTITY_COLOR,
+    "person": "#ec4899",
+    "organization": "#8b5cf6",
+    "location": "#14b8a6",
+    "event": "#f97316",
+    "concept": "#6366f1",
+}
+
+
+@lru_cache(maxsize=4096)
+def _color_for(type_lower: str, labels: Tuple[str, ...]) -> str:
+    if type_lower in NODE_COLORS:
+        return NODE_COLORS[type_lower]
+    for label in labels:
+        color = NODE_COLORS.get(label.lower())
+        if color:
+            return color
+    return DEFAULT_COLOR
+
+
+def node_color(node_type: Optional[str], labels) -> str:
+    """Colour by node type, then by label; memoised per (type, labels)."""
+    return _color_for((node_type or "").lower(), tuple(l for l in labels or () if l))
+
+
+# ============================================================
+# Cursors and snapshots
+# ============================================================
+
+PHASE_NODES = "nodes"
+PHASE_EDGES = "edges"
+
+# Export limits; cursors are client-supplied, so decode() enforces them too
+MAX_HOPS = 3
+MAX_NODE_BUDGET = 20000
+
+
+@dataclass
+class ExportCursor:
+    session_id: str
+    hops: int
+    node_budget: int
+    phase: str = PHASE_NODES
+    offset: int = 0
+    snapshot: Optional[str] = None
+
+    def encode(self) -> str:
+        raw = json.dumps({
+            "s": self.session_id, "h": self.hops, "b": self.node_budget,
+            "p": self.phase, "o": self.offset, "x": self.snapshot,
+        }, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "ExportCursor":
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            cursor = cls(
+                session_id=str(data["s"]), hops=int(data["h"]), node_budget=int(data["b"]),
+                phase=data["p"], offset=int(data["o"]), snapshot=data.get("x"),
+            )
+        except Exception as e:
+            raise ValueError(f"Malformed cursor: {e}")
+        if cursor.phase not in (PHASE_NODES, PHASE_EDGES) or cursor.offset < 0:
+            raise ValueError("Malformed cursor")
+        if not 0 <= cursor.hops <= MAX_HOPS or not 1 <= cursor.node_budget <= MAX_NODE_BUDGET:
+            raise ValueError(
+                f"Cursor out of range: hops must be 0-{MAX_HOPS}, node_budget 1-{MAX_NODE_BUDGET}"
+            )
+        return cursor
+
+
+@dataclass
+class ExportSnapshot:
+    element_ids: List[str]
+    truncated: bool
+    hops_reached: int
+    members: frozenset = field(default_factory=frozenset)
+
+    def __post_init__(self):
+        if not self.members:
+            self.members = frozenset(self.element_ids)
+
+
+class _SnapshotCache:
+    """Small TTL + LRU cache so paging does not re-run the expansion."""
+
+    def __init__(self, max_entries: int = 32, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, ExportSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Optional[str]) -> Optional[ExportSnapshot]:
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, snapshot: ExportSnapshot) -> str:
+        key = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._entries[key] = (time.monotonic(), snapshot)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return key
+
+
+snapshot_cache = _SnapshotCache()
+
+
+# ============================================================
+# Graph work (runs on the graph pool via GraphStore.run)
+# ============================================================
+
+def expand_session(db_sess, session_id: str, hops: int, node_budget: int) -> ExportSnapshot:
+    """Breadth-first expansion from the session's nodes, ids only."""
+    seeds = db_sess.run("""
+        MATCH (n)
+        WHERE n.session_id = $session_id OR n.extracted_from_session = $session_id
+        RETURN elementId(n) AS eid
+        ORDER BY eid
+        LIMIT $budget
+    """, {"session_id": session_id, "budget": node_budget})
+
+    ordered = [r["eid"] for r in seeds]
+    seen = set(ordered)
+    frontier = ordered
+    truncated = len(ordered) >= node_budget
+    hops_reached = 0
+
+    for _ in range(hops):
+        if not frontier or truncated:
+            break
+        remaining = node_budget - len(seen)
+        # Already-seen neighbours come back too and are filtered here rather
+        # than shipping $seen to the server; at most len(seen) of them, so
+        # budget + 1 rows is enough to fill the budget and detect truncation.
+        result = db_sess.run("""
+            UNWIND $frontier AS eid
+            MATCH (a)--(b)
+            WHERE elementId(a) = eid
+            RETURN DISTINCT elementId(b) AS eid
+            ORDER BY eid
+            LIMIT $limit
+        """, {"frontier": frontier, "limit": node_budget + 1})
+
+        fresh = sorted({r["eid"] for r in result} - seen)
+        if len(fresh) > remaining:
+            fresh = fresh[:remaining]
+            truncated = True
+        if not fresh:
+            break
+        seen.update(fresh)
+        ordered.extend(fresh)
+        frontier = fresh
+        hops_reached += 1
+
+    return ExportSnapshot(ordered, truncated, hops_reached)
+
+
+def fetch_node_page(db_sess, element_ids: List[str], include_properties: bool) -> List[Dict[str, Any]]:
+    result = db_sess.run("""
+        UNWIND $eids AS eid
+        MATCH (n)
+        WHERE elementId(n) = eid
+        RETURN n, elementId(n) AS eid
+    """, {"eids": element_ids})
+
+    nodes = []
+    for record in result:
+        node = record["n"]
+        properties = dict(node)
+        labels = list(node.labels) if hasattr(node, "labels") else []
+        node_id = properties.get("id") or record["eid"]
+        node_type = properties.get("type", labels[0] if labels else "node")
+        text = str(properties.get("text", properties.get("name", node_id)))
+        item = {
+            "id": node_id,
+            "label": node_type,
+            "title": f"{node_type}: {text[:20]}",
+            "color": properties.get("color") or node_color(node_type, labels),
+            "size": min(properties.get("importance", 20), 40),
+        }
+        if include_properties:
+            item["properties"] = properties
+        nodes.append(item)
+    return nodes
+
+
+def fetch_edge_page(db_sess, element_ids: List[str], members: frozenset) -> List[Dict[str, Any]]:
+    result = db_sess.run("""
+        UNWIND $eids AS eid
+        MATCH (a)-[r]->(b)
+        WHERE elementId(a) = eid
+        RETURN coalesce(a.id, elementId(a)) AS src,
+               coalesce(b.id, elementId(b)) AS dst,
+               elementId(b) AS dst_eid,
+               coalesce(r.rel, type(r)) AS label
+    """, {"eids": element_ids})
+
+    edges = []
+    seen = set()
+    for record in result:
+        if record["dst_eid"] not in members:
+            continue
+        key = (record["src"], record["label"], record["dst"])
+        if key in seen:
+            continue
+        seen.add(key)
+        edges.append({"from": record["src"], "to": record["dst"], "label": str(record["label"])})
+    return edges
+
+
+# ============================================================
+# Streaming
+# ============================================================
+
+def _dumps(obj: Any) -> str:
+    # default=str covers neo4j temporal types in node properties
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+
+async def stream_session_export(
+    graph_store,
+    driver,
+    cursor: ExportCursor,
+    page_size: int = 500,
+    max_pages: int = 0,
+    include_properties: bool = True,
+    fmt: str = "ndjson",
+) -> AsyncIterator[bytes]:
+    """
+    Yield the export as NDJSON lines (``fmt="ndjson"``) or as one JSON
+    document written in chunks (``fmt="json"``):
+
+        {"type": "meta", ...}
+        {"type": "nodes"|"edges", "page": n, "items": [...], "bytes": .., "server_ms": ..}
+        {"type": "end", "next_cursor": null|"...", ...}
+
+    ``max_pages`` (0 = unlimited) bounds the pages sent in this response;
+    pass ``next_cursor`` back to continue.  Errors after the first byte are
+    reported as a final ``{"type": "error"}`` record.
+    """
+    started = time.perf_counter()
+    totals = {"pages": 0, "nodes": 0, "edges": 0, "bytes": 0, "server_ms": 0.0}
+    json_mode = fmt == "json"
+    opened = False       # json mode: '{"meta":..,"pages":[' already sent
+    first_page = True
+
+    def frame(record: Dict[str, Any]) -> bytes:
+        return (_dumps(record) + "\n").encode()
+
+    try:
+        t0 = time.perf_counter()
+        snapshot = snapshot_cache.get(cursor.snapshot)
+        if snapshot is None:
+            snapshot = await graph_store.run(
+                "session", expand_session, cursor.session_id, cursor.hops, cursor.node_budget, driver=driver
+            )
+            cursor.snapshot = snapshot_cache.put(snapshot)
+        expand_ms = (time.perf_counter() - t0) * 1000
+
+        meta = {
+            "type": "meta",
+            "session_id": cursor.session_id,
+            "hops": cursor.hops,
+            "hops_reached": snapshot.hops_reached,
+            "node_budget": cursor.node_budget,
+            "node_count": len(snapshot.element_ids),
+            "truncated": snapshot.truncated,
+            "page_size": page_size,
+            "phase": cursor.phase,
+            "offset": cursor.offset,
+            "server_ms": round(expand_ms, 2),
+            "colors": NODE_COLORS,
+            "default_color": DEFAULT_COLOR,
+        }
+        if json_mode:
+            opened = True
+            yield ('{"meta":' + _dumps(meta) + ',"pages":[').encode()
+        else:
+            yield frame(meta)
+
+        ids = snapshot.element_ids
+        while cursor.phase == PHASE_NODES or cursor.offset < len(ids):
+            if cursor.offset >= len(ids):
+                cursor.phase, cursor.offset = PHASE_EDGES, 0
+                continue
+            if max_pages and totals["pages"] >= max_pages:
+                break
+
+            chunk = ids[cursor.offset:cursor.offset + page_size]
+            t0 = time.perf_counter()
+            if cursor.phase == PHASE_NODES:
+                items = await graph_store.run(
+                    "session", fetch_node_page, chunk, include_properties, driver=driver
+                )
+            else:
+                items = await graph_store.run(
+                    "session", fetch_edge_page, chunk, snapshot.members, driver=driver
+                )
+            payload = _dumps(items)
+            server_ms = (time.perf_counter() - t0) * 1000
+
+            totals["pages"] += 1
+            totals[cursor.phase] += len(items)
+            totals["bytes"] += len(payload)
+            totals["server_ms"] += server_ms
+
+            record = (
+                '{"type":"%s","page":%d,"offset":%d,"count":%d,"bytes":%d,"server_ms":%.2f,"items":%s}'
+                % (cursor.phase, totals["pages"], cursor.offset, len(items), len(payload), server_ms, payload)
+            )
+            cursor.offset += len(chunk)
+            if json_mode:
+                yield (("" if first_page else ",") + record).encode()
+                first_page = False
+            else:
+                yield (record + "\n").encode()
+
+        done = cursor.phase == PHASE_EDGES and cursor.offset >= len(ids)
+        end = {
+            "type": "end",
+            "next_cursor": None if done else cursor.encode(),
+            "pages": totals["pages"],
+            "nodes_sent": totals["nodes"],
+            "edges_sent": totals["edges"],
+            "bytes": totals["bytes"],
+            "server_ms": round(totals["server_ms"] + expand_ms, 2),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if json_mode:
+            yield ('],"end":' + _dumps(end) + "}").encode()
+        else:
+            yield frame(end)
+
+    except Exception as e:
+        detail = getattr(e, "detail", None) or str(e)
+        logger.error(f"Graph export error for session {cursor.session_id}: {detail}", exc_info=True)
+        error = {"type": "error", "detail": detail, "next_cursor": cursor.encode()}
+        if json_mode and opened:
+            yield (("" if first_page else ",") + _dumps(error) + "]}").encode()
+        elif json_mode:
+            yield _dumps({"error": error}).encode()
+        else:
+            yield frame(error)
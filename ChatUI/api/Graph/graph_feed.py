@@ -0,0 +1,421 @@
+# ============================================================
+# Graph change feed (websocket deltas)
+# ============================================================
+"""
+The graph UI refreshes by re-querying ``GET /api/graph/session/{id}``, so a
+chat turn that adds five entities costs a full reload of the session graph.
+
+``GraphDeltaFeed`` turns ``GraphClient`` writes into compact deltas instead:
+
+    GraphClient.upsert_entity / upsert_edge / link_session_to_entity /
+    HybridMemory.link_by_property / detach_documents
+        -> write listener (writer thread)
+        -> per-session channel: coalesced for ``coalesce_ms`` (last write of
+           a node/edge wins), then stamped with the next sequence number
+        -> every subscriber of that session, JSON-encoded once per batch
+
+Protocol (``/api/graph/ws/session/{session_id}?since=<seq>``):
+
+    server -> {"type": "hello", "seq": S, "replayed": k}
+    server -> {"type": "delta", "seq": n, "nodes": [...], "edges": [...],
+               "removed": [node ids]}
+    server -> {"type": "resync", "seq": S, "reason": ...}
+    client -> {"type": "ping"}   server -> {"type": "pong", "seq": S}
+
+Node/edge entries use the shapes of the session graph (id/label/title/color/
+size, from/to/label) plus ``created``.  ``removed`` lists deleted nodes; the
+client drops them together with their edges.  Deltas are idempotent, so a
+client may apply them on top of any snapshot taken after it subscribed.
+
+A client tracks the last ``seq`` it applied.  On reconnect it passes
+``since``; the server replays from its per-channel log, or answers
+``resync`` when the gap is older than the log (or the client fell more than
+``queue_size`` batches behind), in which case the client reloads the
+snapshot (whose ``stats.feed_seq`` says where the feed stood) and carries on.
+
+Deltas go to the channel of the session that owns the ``GraphClient`` (plus
+the session named as ``src`` of a session link); writes made by another
+session to shared entities are not pushed.
+
+Polling vs feed comparison (no server / Neo4j needed):
+    python -m Vera.ChatUI.api.Graph.graph_feed --simulate
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from Vera.ChatUI.api.Graph.graph_export import node_color
+except ImportError:
+    from ChatUI.api.Graph.graph_export import node_color
+
+logger = logging.getLogger(__name__)
+
+RESYNC = object()  # queue marker: subscriber must reload its snapshot
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+
+def node_delta(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Write-listener node payload -> session-graph node entry."""
+    properties = payload.get("properties") or {}
+    labels = payload.get("labels") or []
+    node_id = payload["id"]
+    node_type = payload.get("type") or (labels[0] if labels else "node")
+    text = str(properties.get("text", properties.get("name", node_id)))
+    return {
+        "id": node_id,
+        "label": node_type,
+        "title": f"{node_type}: {text[:20]}",
+        "color": properties.get("color") or node_color(node_type, labels),
+        "size": min(properties.get("importance", 20), 40),
+        "created": bool(payload.get("created")),
+    }
+
+
+def removal_delta(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": payload["id"], "created": False, "removed": True}
+
+
+def edge_delta(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "from": payload["src"],
+        "to": payload["dst"],
+        "label": str(payload.get("rel")),
+        "created": bool(payload.get("created")),
+    }
+
+
+# ============================================================
+# Channels
+# ============================================================
+
+class _Channel:
+    """One session's sequence counter, replay log, pending batch and subscribers."""
+
+    def __init__(self, log_size: int):
+        self.seq = 0
+        self.log: deque = deque(maxlen=log_size)  # (seq, encoded batch)
+        self.pending: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.idle_since = time.time()
+
+    def replay_from(self, since: int) -> Optional[List[str]]:
+        """Batches after ``since``, or None when the log no longer reaches back that far."""
+        if since >= self.seq:
+            return []
+        if not self.log or self.log[0][0] > since + 1:
+            return None
+        return [batch for seq, batch in self.log if seq > since]
+
+
+class GraphDeltaFeed:
+    """
+    Per-session graph delta channels fed by ``GraphClient`` write listeners.
+
+    Listener callbacks run on whichever thread performed the write; they
+    only hand the event to the event loop (``call_soon_threadsafe``), where
+    coalescing, sequencing and fan-out happen.
+    """
+
+    def __init__(self, coalesce_ms: float = 100.0, max_batch: int = 200,
+                 log_size: int = 256, queue_size: int = 64, channel_ttl: float = 600.0):
+        self.coalesce_ms = coalesce_ms
+        self.max_batch = max_batch
+        self.log_size = log_size
+        self.queue_size = queue_size
+        self.channel_ttl = channel_ttl
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._channels: Dict[str, _Channel] = {}
+        self._clients: "weakref.WeakSet" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._counter_lock = threading.Lock()  # publish() runs on writer threads
+        self._counters = {
+            "events_in": 0, "events_dropped": 0, "events_coalesced": 0,
+            "batches": 0, "messages_sent": 0, "bytes_sent": 0,
+            "resyncs": 0, "replays": 0, "cpu_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------
+    # Write-listener side
+    # ------------------------------------------------------------
+
+    def attach(self, graph_client, owner):
+        """
+        Feed writes made through ``graph_client`` to the channel of
+        ``owner.sess.id`` (re-read per write).  Idempotent per client.
+
+        Only weak references are kept: the listener lives on the client,
+        and holding the owner (a Vera instance, which owns the client)
+        strongly would keep both alive after the session is dropped.
+        """
+        with self._lock:
+            if graph_client in self._clients:
+                return
+            self._clients.add(graph_client)
+
+        owner_ref = weakref.ref(owner)
+
+        def on_write(kind: str, payload: Dict[str, Any]):
+            current = owner_ref()
+            if current is None:
+                return
+            self.publish(current.sess.id, kind, payload)
+
+        graph_client.add_write_listener(on_write)
+
+    def _count(self, key: str, amount: float = 1):
+        with self._counter_lock:
+            self._counters[key] += amount
+
+    def publish(self, session_id: str, kind: str, payload: Dict[str, Any]):
+        """Thread-safe entry point for one write event."""
+        loop = self._loop
+        targets = [session_id]
+        if kind == "edge" and payload.get("src") in self._channels and payload["src"] != session_id:
+            targets.append(payload["src"])
+        if loop is None or loop.is_closed() or not any(t in self._channels for t in targets):
+            self._count("events_dropped")  # nobody has subscribed to these sessions
+            return
+        try:
+            if kind == "node_delete":
+                delta, kind = removal_delta(payload), "node"
+            else:
+                delta = node_delta(payload) if kind == "node" else edge_delta(payload)
+        except (KeyError, TypeError) as e:
+            logger.debug(f"[GraphFeed] Unusable {kind} event: {e}")
+            return
+        for target in targets:
+            loop.call_soon_threadsafe(self._enqueue, target, kind, dict(delta))
+
+    # ------------------------------------------------------------
+    # Event-loop side
+    # ------------------------------------------------------------
+
+    def _enqueue(self, session_id: str, kind: str, delta: Dict[str, Any]):
+        channel = self._channels.get(session_id)
+        if channel is None:
+            return
+        self._count("events_in")
+        key = ("n", delta["id"]) if kind == "node" else ("e", delta["from"], delta["label"], delta["to"])
+        previous = channel.pending.pop(key, None)
+        if previous is not None:
+            self._count("events_coalesced")
+            delta["created"] = delta["created"] or previous["created"]
+        channel.pending[key] = delta
+
+        if len(channel.pending) >= self.max_batch:
+            self._flush(session_id)
+        elif channel.flush_handle is None:
+            channel.flush_handle = self._loop.call_later(self.coalesce_ms / 1000, self._flush, session_id)
+
+    def _flush(self, session_id: str):
+        channel = self._channels.get(session_id)
+        if channel is None:
+            return
+        if channel.flush_handle is not None:
+            channel.flush_handle.cancel()
+            channel.flush_handle = None
+        if not channel.pending:
+            return
+
+        started = time.thread_time()
+        nodes, edges, removed = [], [], []
+        for key, delta in channel.pending.items():
+            if delta.get("removed"):
+                removed.append(delta["id"])
+            else:
+                (nodes if key[0] == "n" else edges).append(delta)
+        channel.pending.clear()
+        channel.seq += 1
+        batch = _dumps({"type": "delta", "seq": channel.seq, "nodes": nodes, "edges": edges,
+                        "removed": removed})
+        channel.log.append((channel.seq, batch))
+        self._count("batches")
+
+        for queue in list(channel.subscribers):
+            self._offer(queue, batch)
+        self._count("cpu_ms", (time.thread_time() - started) * 1000)
+
+    def _offer(self, queue: asyncio.Queue, message: Any):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: drop its backlog, tell it to reload the snapshot
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+            self._count("resyncs")
+
+    # ------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------
+
+    def current_seq(self, session_id: str) -> int:
+        channel = self._channels.get(session_id)
+        return channel.seq if channel else 0
+
+    def subscribe(self, session_id: str, since: Optional[int] = None) -> Tuple[asyncio.Queue, Dict[str, Any]]:
+        """
+        Register a subscriber (call from the event loop).  Returns its queue,
+        pre-filled with any replayed batches or a resync marker, and the
+        ``hello`` message to send first.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._expire_channels()
+        channel = self._channels.setdefault(session_id, _Channel(self.log_size))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        channel.subscribers.add(queue)
+
+        hello = {"type": "hello", "seq": channel.seq, "replayed": 0}
+        if since is not None:
+            replay = channel.replay_from(since)
+            if replay is None or len(replay) >= self.queue_size:
+                queue.put_nowait(RESYNC)
+                self._count("resyncs")
+            else:
+                for batch in replay:
+                    queue.put_nowait(batch)
+                hello["replayed"] = len(replay)
+                self._count("replays")
+        return queue, hello
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue):
+        channel = self._channels.get(session_id)
+        if channel is not None:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers:
+                channel.idle_since = time.time()
+
+    def _expire_channels(self):
+        now = time.time()
+        for sid, channel in list(self._channels.items()):
+            if not channel.subscribers and now - channel.idle_since > self.channel_ttl:
+                if channel.flush_handle is not None:
+                    channel.flush_handle.cancel()
+                del self._channels[sid]
+
+    def count_sent(self, message: str):
+        with self._counter_lock:
+            self._counters["messages_sent"] += 1
+            self._counters["bytes_sent"] += len(message.encode("utf-8"))
+
+    def resync_message(self, session_id: str, reason: str) -> Dict[str, Any]:
+        return {"type": "resync", "seq": self.current_seq(session_id), "reason": reason}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            counters = dict(self._counters)
+        return {
+            **{k: round(v, 2) if isinstance(v, float) else v for k, v in counters.items()},
+            "channels": {
+                sid: {"seq": ch.seq, "subscribers": len(ch.subscribers), "pending": len(ch.pending),
+                      "log": len(ch.log)}
+                for sid, ch in self._channels.items()
+            },
+            "clients": len(self._clients),
+        }
+
+
+# ============================================================
+# Polling vs feed simulation
+# ============================================================
+
+def _fake_session_graph(size: int, extra: int = 0) -> Tuple[List[Dict], List[Dict]]:
+    nodes = [{"id": f"mem_{i}", "type": "memory" if i % 4 else "Tool",
+              "properties": {"text": f"memory text {i} " * 3, "importance": 20}}
+             for i in range(size + extra)]
+    edges = [{"src": f"mem_{i}", "dst": f"mem_{(i * 7 + 1) % (size + extra)}", "rel": "RELATED_TO"}
+             for i in range(size + extra)]
+    return nodes, edges
+
+
+async def simulate(graph_size: int = 2000, turns: int = 20, entities_per_turn: int = 5,
+                   subscribers: int = 1, poll_interval: float = 2.0,
+                   turn_seconds: float = 10.0) -> Dict[str, Any]:
+    """
+    Server CPU and bytes per chat turn: clients polling the full session
+    graph every ``poll_interval`` seconds (serialisation only; the Neo4j
+    query each poll also costs is not included), versus the delta feed pushing
+    ``entities_per_turn`` new entities (each upserted twice, as extraction
+    does, plus one session link and one relation each).
+    """
+    polls_per_turn = max(1, int(turn_seconds / poll_interval))
+
+    # Polling: every poll rebuilds and serialises the whole subgraph
+    cpu = 0.0
+    sent = 0
+    for turn in range(turns):
+        nodes, edges = _fake_session_graph(graph_size, turn * entities_per_turn)
+        for _ in range(polls_per_turn * subscribers):
+            started = time.process_time()
+            body = _dumps({
+                "nodes": [node_delta(n) for n in nodes],
+                "edges": [edge_delta(e) for e in edges],
+                "stats": {"node_count": len(nodes), "edge_count": len(edges)},
+            })
+            sent += len(body.encode("utf-8"))
+            cpu += time.process_time() - started
+    polling = {"cpu_ms_per_turn": round(cpu * 1000 / turns, 3), "bytes_per_turn": sent // turns,
+               "requests_per_turn": polls_per_turn * subscribers}
+
+    # Feed: same writes through the channel to live subscribers
+    feed = GraphDeltaFeed(coalesce_ms=5.0)
+    queues = [feed.subscribe("s1")[0] for _ in range(subscribers)]
+    cpu = 0.0
+    messages = 0
+    for turn in range(turns):
+        started = time.process_time()
+        for k in range(entities_per_turn):
+            node_id = f"mem_new_{turn}_{k}"
+            for created in (True, False):
+                feed.publish("s1", "node", {"id": node_id, "type": "memory", "labels": ["Entity"],
+                                            "properties": {"text": "new entity"}, "created": created})
+            feed.publish("s1", "edge", {"src": "s1", "dst": node_id, "rel": "HAS_MEMORY", "created": True})
+            feed.publish("s1", "edge", {"src": node_id, "dst": f"mem_{k}", "rel": "RELATED_TO", "created": True})
+        cpu += time.process_time() - started
+        await asyncio.sleep(feed.coalesce_ms / 1000 * 2)
+        started = time.process_time()
+        for queue in queues:
+            while not queue.empty():
+                message = queue.get_nowait()
+                feed.count_sent(message)
+                messages += 1
+        cpu += time.process_time() - started
+    stats = feed.stats()
+    # listener side measured here, coalescing/encoding inside _flush (cpu_ms)
+    delta = {"cpu_ms_per_turn": round((cpu * 1000 + stats["cpu_ms"]) / turns, 3),
+             "bytes_per_turn": stats["bytes_sent"] // turns,
+             "messages_per_turn": round(messages / turns, 2),
+             "events_coalesced": stats["events_coalesced"], "batches": stats["batches"]}
+
+    return {
+        "graph_size": graph_size, "turns": turns, "subscribers": subscribers,
+        "polling": polling, "feed": delta,
+        "bytes_ratio": round(polling["bytes_per_turn"] / max(1, delta["bytes_per_turn"]), 1),
+        "cpu_ratio": round(polling["cpu_ms_per_turn"] / max(1e-3, delta["cpu_ms_per_turn"]), 1),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Graph delta feed vs polling")
+    parser.add_argument("--simulate", action="store_true", help="Run the in-process comparison")
+    parser.add_argument("--graph-size", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--subscribers", type=int, default=1)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(simulate(graph_size=args.graph_size, turns=args.turns,
+                                          subscribers=args.subscribers,
+                                          poll_interval=args.poll_interval)), indent=2))
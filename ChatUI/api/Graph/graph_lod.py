@@ -0,0 +1,608 @@
+# ============================================================
+# Level-of-detail graph summarisation
+# ============================================================
+"""
+Raw node/edge views stop being usable (for the browser and for the API)
+once a session or the global graph passes a few thousand nodes.  This
+module keeps a community partition of the graph server-side and serves it
+at two levels of detail:
+
+    * low zoom  — one super-node per cluster (member count, dominant types,
+      representative member) and one aggregated edge per connected pair of
+      clusters, weighted by the number of node pairs linking them;
+    * expanded  — the members of one cluster, their internal edges, and
+      aggregated links out to the neighbouring clusters.
+
+Clustering is label propagation (pure Python, default) or Louvain when
+networkx is installed.  Each scope ("global" or a session id) has its own
+``LODIndex`` built from a Neo4j export.  After that it is kept current
+incrementally: ``GraphClient`` write events are logged with a sequence
+number and replayed into each index, where a new edge only re-evaluates
+the labels around it (bounded local propagation) instead of re-clustering.
+An index is rebuilt in the background when it is older than ``max_age`` or
+has fallen further behind than the event log can replay.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import networkx as nx
+    from networkx.algorithms.community import louvain_communities
+except ImportError:
+    nx = None
+    louvain_communities = None
+
+from Vera.ChatUI.api.Graph.graph_export import expand_session, fetch_node_page, node_color
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+CLUSTER_PREFIX = "cluster:"
+
+
+# ============================================================
+# Index (one scope)
+# ============================================================
+
+class LODIndex:
+    """Adjacency plus community partition for one scope. Not thread-safe on its own."""
+
+    def __init__(self, scope: str, algorithm: str = "label_propagation", seed: int = 7):
+        self.scope = scope
+        self.algorithm = algorithm
+        self._rng = random.Random(seed)
+
+        self.adj: Dict[str, Set[str]] = defaultdict(set)          # undirected, for clustering
+        self.out: Dict[str, Dict[str, str]] = defaultdict(dict)   # src -> dst -> rel, for display
+        self.node_type: Dict[str, str] = {}
+        self.node_name: Dict[str, str] = {}
+        self.node_eid: Dict[str, str] = {}
+
+        self.membership: Dict[str, str] = {}
+        self.members: Dict[str, Set[str]] = defaultdict(set)
+        self.type_counts: Dict[str, Counter] = defaultdict(Counter)
+
+        self.built_at = 0.0
+        self.build_ms = 0.0
+        self.applied_seq = 0
+        self.version = 0
+        self.events_applied = 0
+        self.nodes_moved = 0
+        self._summary_cache: Dict[Tuple[int, int], Tuple[int, Dict[str, Any]]] = {}
+
+    # --------------------------------------------------------
+    # Graph
+    # --------------------------------------------------------
+
+    def add_node(self, node_id: str, node_type: Optional[str] = None, name: Optional[str] = None,
+                 eid: Optional[str] = None) -> bool:
+        """Add or update a node; returns True if it is new."""
+        is_new = node_id not in self.node_type
+        old_type = self.node_type.get(node_id)
+        self.node_type[node_id] = node_type or old_type or "node"
+        if name:
+            self.node_name[node_id] = name[:60]
+        if eid:
+            self.node_eid[node_id] = eid
+
+        if is_new and self.built_at:
+            # Joins as a singleton; edges added later pull it into a cluster.
+            self._join(node_id, node_id)
+        elif old_type != self.node_type[node_id] and node_id in self.membership:
+            counts = self.type_counts[self.membership[node_id]]
+            counts[old_type] -= 1
+            counts[self.node_type[node_id]] += 1
+        return is_new
+
+    def add_edge(self, src: str, dst: str, rel: str = "REL") -> bool:
+        """Add a directed edge; returns True if the node pair was not linked before."""
+        if src == dst:
+            return False
+        for node_id in (src, dst):
+            if node_id not in self.node_type:
+                self.add_node(node_id)
+        self.out[src][dst] = rel
+        if dst in self.adj[src]:
+            return False
+        self.adj[src].add(dst)
+        self.adj[dst].add(src)
+        return True
+
+    def remove_node(self, node_id: str) -> Set[str]:
+        """Drop a node and its edges; returns its former neighbours."""
+        if node_id not in self.node_type:
+            return set()
+        neighbours = self.adj.pop(node_id, set())
+        for m in neighbours:
+            self.adj[m].discard(node_id)
+            self.out[m].pop(node_id, None)
+        self.out.pop(node_id, None)
+
+        cluster_id = self.membership.pop(node_id, None)
+        if cluster_id is not None:
+            self.members[cluster_id].discard(node_id)
+            self.type_counts[cluster_id][self.node_type[node_id]] -= 1
+            if not self.members[cluster_id]:
+                del self.members[cluster_id]
+                del self.type_counts[cluster_id]
+        del self.node_type[node_id]
+        self.node_name.pop(node_id, None)
+        self.node_eid.pop(node_id, None)
+        return neighbours
+
+    # --------------------------------------------------------
+    # Partition
+    # --------------------------------------------------------
+
+    def cluster(self, max_iter: int = 20):
+        started = time.perf_counter()
+        if self.algorithm == "louvain" and louvain_communities is not None:
+            labels = self._louvain()
+        else:
+            labels = self._label_propagation(max_iter)
+
+        self.membership = {}
+        self.members = defaultdict(set)
+        self.type_counts = defaultdict(Counter)
+        for node_id, label in labels.items():
+            self._join(node_id, label)
+
+        self.built_at = time.time()
+        self.build_ms = (time.perf_counter() - started) * 1000
+        self.version += 1
+
+    def _best_label(self, node_id: str, labels: Dict[str, str]) -> str:
+        current = labels[node_id]
+        neighbours = self.adj.get(node_id)
+        if not neighbours:
+            return current
+        votes = Counter(labels[m] for m in neighbours)
+        top = max(votes.values())
+        if votes.get(current) == top:
+            return current
+        return min(label for label, count in votes.items() if count == top)
+
+    def _label_propagation(self, max_iter: int) -> Dict[str, str]:
+        labels = {node_id: node_id for node_id in self.node_type}
+        order = sorted(labels)
+        for _ in range(max_iter):
+            self._rng.shuffle(order)
+            changed = 0
+            for node_id in order:
+                best = self._best_label(node_id, labels)
+                if best != labels[node_id]:
+                    labels[node_id] = best
+                    changed += 1
+            if changed == 0:
+                break
+        return labels
+
+    def _louvain(self) -> Dict[str, str]:
+        g = nx.Graph()
+        g.add_nodes_from(self.node_type)
+        g.add_edges_from((a, b) for a, nbrs in self.adj.items() for b in nbrs if a < b)
+        labels = {}
+        for community in louvain_communities(g, seed=self._rng.randint(0, 2 ** 31)):
+            label = min(community)
+            for node_id in community:
+                labels[node_id] = label
+        return labels
+
+    def _join(self, node_id: str, cluster_id: str):
+        self.membership[node_id] = cluster_id
+        self.members[cluster_id].add(node_id)
+        self.type_counts[cluster_id][self.node_type.get(node_id, "node")] += 1
+
+    def _move(self, node_id: str, cluster_id: str):
+        old = self.membership[node_id]
+        self.members[old].discard(node_id)
+        self.type_counts[old][self.node_type.get(node_id, "node")] -= 1
+        if not self.members[old]:
+            del self.members[old]
+            del self.type_counts[old]
+        self._join(node_id, cluster_id)
+        self.nodes_moved += 1
+
+    def relax(self, seeds, budget: int = 2000):
+        """Local label propagation from ``seeds``; neighbours of moved nodes are revisited."""
+        queue = deque(s for s in seeds if s in self.membership)
+        queued = set(queue)
+        steps = 0
+        while queue and steps < budget:
+            node_id = queue.popleft()
+            queued.discard(node_id)
+            steps += 1
+            best = self._best_label(node_id, self.membership)
+            if best != self.membership[node_id]:
+                self._move(node_id, best)
+                for m in self.adj[node_id]:
+                    if m not in queued:
+                        queued.add(m)
+                        queue.append(m)
+
+    # --------------------------------------------------------
+    # Incremental updates
+    # --------------------------------------------------------
+
+    def accepts(self, kind: str, payload: Dict[str, Any]) -> bool:
+        if self.scope == GLOBAL_SCOPE:
+            return True
+        if kind == "node_delete":
+            return payload.get("id") in self.node_type
+        if kind == "node":
+            props = payload.get("properties") or {}
+            return (payload.get("id") in self.node_type
+                    or self.scope in (props.get("session_id"), props.get("extracted_from_session")))
+        return payload.get("src") in self.node_type or payload.get("dst") in self.node_type
+
+    def apply(self, kind: str, payload: Dict[str, Any]):
+        if kind == "node":
+            props = payload.get("properties") or {}
+            self.add_node(payload["id"], payload.get("type"), str(props.get("name") or props.get("text") or ""))
+        elif kind == "edge":
+            if self.add_edge(payload["src"], payload["dst"], payload.get("rel") or "REL"):
+                self.relax((payload["src"], payload["dst"]))
+        elif kind == "node_delete":
+            # Its cluster may have been held together through it
+            self.relax(self.remove_node(payload["id"]))
+        self.events_applied += 1
+        self.version += 1
+
+    # --------------------------------------------------------
+    # Views
+    # --------------------------------------------------------
+
+    def _cluster_info(self, cluster_id: str) -> Dict[str, Any]:
+        members = self.members[cluster_id]
+        types = self.type_counts[cluster_id]
+        dominant = max(types, key=types.get) if types else "node"
+        representative = max(members, key=lambda m: (len(self.adj.get(m, ())), m))
+        return {
+            "id": CLUSTER_PREFIX + cluster_id,
+            "size": len(members),
+            "dominant_type": dominant,
+            "type_counts": dict(Counter({t: c for t, c in types.items() if c > 0}).most_common(5)),
+            "representative": representative,
+            "representative_name": self.node_name.get(representative, representative),
+            "color": node_color(dominant, ()),
+        }
+
+    def summary(self, limit: int = 200, min_size: int = 1) -> Dict[str, Any]:
+        """Super-nodes for the ``limit`` largest clusters and the edges between them."""
+        cached = self._summary_cache.get((limit, min_size))
+        if cached and cached[0] == self.version:
+            return cached[1]
+
+        ranked = sorted(self.members, key=lambda c: (-len(self.members[c]), c))
+        shown = [c for c in ranked if len(self.members[c]) >= min_size][:limit]
+        shown_set = set(shown)
+
+        internal: Counter = Counter()
+        between: Counter = Counter()
+        for a, neighbours in self.adj.items():
+            ca = self.membership.get(a)
+            for b in neighbours:
+                if a >= b:
+                    continue
+                cb = self.membership.get(b)
+                if ca == cb:
+                    internal[ca] += 1
+                elif ca in shown_set and cb in shown_set:
+                    between[(ca, cb) if ca < cb else (cb, ca)] += 1
+
+        clusters = []
+        for cluster_id in shown:
+            info = self._cluster_info(cluster_id)
+            info["internal_edges"] = internal[cluster_id]
+            clusters.append(info)
+
+        result = {
+            "clusters": clusters,
+            "edges": [
+                {"from": CLUSTER_PREFIX + a, "to": CLUSTER_PREFIX + b, "weight": w}
+                for (a, b), w in between.most_common()
+            ],
+            "hidden_clusters": len(self.members) - len(shown),
+            "hidden_nodes": sum(len(self.members[c]) for c in ranked if c not in shown_set),
+        }
+        self._summary_cache = {(limit, min_size): (self.version, result)}
+        return result
+
+    def expand(self, cluster_id: str, limit: int = 500) -> Optional[Dict[str, Any]]:
+        """Members of one cluster (highest degree first) plus links to neighbouring clusters."""
+        if cluster_id.startswith(CLUSTER_PREFIX):
+            cluster_id = cluster_id[len(CLUSTER_PREFIX):]
+        members = self.members.get(cluster_id)
+        if not members:
+            return None
+
+        ranked = sorted(members, key=lambda m: (-len(self.adj.get(m, ())), m))
+        shown = ranked[:limit]
+        shown_set = set(shown)
+
+        edges = []
+        outward: Counter = Counter()
+        crossings: Set[Tuple[str, str]] = set()
+        for src in shown:
+            for dst, rel in self.out.get(src, {}).items():
+                if dst in shown_set:
+                    edges.append({"from": src, "to": dst, "label": rel})
+            for m in self.adj.get(src, ()):
+                other = self.membership.get(m)
+                if other and other != cluster_id:
+                    outward[other] += 1
+                    crossings.add((src, other))
+
+        neighbours = []
+        for other, weight in outward.most_common(50):
+            info = self._cluster_info(other)
+            info["weight"] = weight
+            neighbours.append(info)
+        shown_neighbours = {info["id"] for info in neighbours}
+        links = [
+            {"from": src, "to": CLUSTER_PREFIX + other}
+            for src, other in sorted(crossings)
+            if CLUSTER_PREFIX + other in shown_neighbours
+        ]
+
+        return {
+            "cluster": self._cluster_info(cluster_id),
+            "members": [
+                {"id": m, "eid": self.node_eid.get(m), "type": self.node_type.get(m, "node"),
+                 "name": self.node_name.get(m, m)}
+                for m in shown
+            ],
+            "edges": edges,
+            "neighbours": neighbours,
+            "links": links,
+            "hidden_members": len(members) - len(shown),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "algorithm": "louvain" if self.algorithm == "louvain" and louvain_communities else "label_propagation",
+            "nodes": len(self.node_type),
+            "links": sum(len(n) for n in self.adj.values()) // 2,
+            "clusters": len(self.members),
+            "version": self.version,
+            "built_at": self.built_at,
+            "build_ms": round(self.build_ms, 1),
+            "events_applied": self.events_applied,
+            "nodes_moved": self.nodes_moved,
+        }
+
+
+# ============================================================
+# Loading (runs on the graph pool via GraphStore.run)
+# ============================================================
+
+_NODE_FIELDS = """
+    coalesce(n.id, elementId(n)) AS id,
+    elementId(n) AS eid,
+    coalesce(n.type, labels(n)[0], 'node') AS type,
+    left(toString(coalesce(n.name, n.text, '')), 60) AS name
+"""
+
+
+def load_scope(db_sess, scope: str, session_hops: int, session_budget: int):
+    """Export (nodes, edges) for a scope as plain tuples."""
+    if scope == GLOBAL_SCOPE:
+        nodes = [(r["id"], r["type"], r["name"], r["eid"])
+                 for r in db_sess.run(f"MATCH (n) RETURN {_NODE_FIELDS}")]
+        edges = [(r["src"], r["dst"], r["rel"]) for r in db_sess.run("""
+            MATCH (a)-[r]->(b)
+            RETURN coalesce(a.id, elementId(a)) AS src,
+                   coalesce(b.id, elementId(b)) AS dst,
+                   coalesce(r.rel, type(r)) AS rel
+        """)]
+        return nodes, edges
+
+    snapshot = expand_session(db_sess, scope, session_hops, session_budget)
+    eids = snapshot.element_ids
+    nodes = [(r["id"], r["type"], r["name"], r["eid"]) for r in db_sess.run(f"""
+        UNWIND $eids AS eid
+        MATCH (n)
+        WHERE elementId(n) = eid
+        RETURN {_NODE_FIELDS}
+    """, {"eids": eids})]
+    edges = [(r["src"], r["dst"], r["rel"]) for r in db_sess.run("""
+        UNWIND $eids AS eid
+        MATCH (a)-[r]->(b)
+        WHERE elementId(a) = eid
+        RETURN coalesce(a.id, elementId(a)) AS src,
+               coalesce(b.id, elementId(b)) AS dst,
+               elementId(b) AS dst_eid,
+               coalesce(r.rel, type(r)) AS rel
+    """, {"eids": eids}) if r["dst_eid"] in snapshot.members]
+    return nodes, edges
+
+
+def fetch_members(db_sess, members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Full node records for expanded members (by element id where known)."""
+    eids = [m["eid"] for m in members if m.get("eid")]
+    ids = [m["id"] for m in members if not m.get("eid")]
+    nodes = fetch_node_page(db_sess, eids, True) if eids else []
+    if ids:
+        nodes += fetch_node_page(db_sess, [r["eid"] for r in db_sess.run("""
+            UNWIND $ids AS id
+            MATCH (n:Entity {id: id})
+            RETURN elementId(n) AS eid
+        """, {"ids": ids})], True)
+    return nodes
+
+
+# ============================================================
+# Engine
+# ============================================================
+
+class GraphLODEngine:
+    """
+    Owns the per-scope indices and the write-event log.
+
+    Args:
+        graph_store: ``GraphStore`` used for exports and for all index work
+            (clustering is CPU-bound, so it stays off the event loop too).
+        algorithm: "label_propagation" or "louvain" (needs networkx).
+        max_age: Seconds before an index is rebuilt in the background, to
+            pick up writes that bypassed ``GraphClient``.
+        log_size: Write events kept for replay; an index further behind is
+            rebuilt instead.
+        max_scopes: Session indices kept (LRU); the global index is pinned.
+    """
+
+    def __init__(
+        self,
+        graph_store,
+        algorithm: str = "label_propagation",
+        max_age: float = 900.0,
+        log_size: int = 20000,
+        max_scopes: int = 8,
+        session_hops: int = 2,
+        session_budget: int = 20000,
+    ):
+        self._store = graph_store
+        self.algorithm = algorithm
+        self.max_age = max_age
+        self.max_scopes = max_scopes
+        self.session_hops = session_hops
+        self.session_budget = session_budget
+
+        self._indices: "OrderedDict[str, LODIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._log: deque = deque(maxlen=log_size)
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+        self._attached = weakref.WeakSet()
+        self._builds: Dict[str, asyncio.Future] = {}
+
+    # --------------------------------------------------------
+    # Write events
+    # --------------------------------------------------------
+
+    def attach(self, graph_client):
+        """Subscribe to a ``GraphClient``'s writes (idempotent)."""
+        if graph_client is None or graph_client in self._attached:
+            return
+        graph_client.add_write_listener(self._on_write)
+        self._attached.add(graph_client)
+
+    def _on_write(self, kind: str, payload: Dict[str, Any]):
+        with self._seq_lock:
+            self._seq += 1
+            self._log.append((self._seq, kind, payload))
+
+    def _replay(self, index: LODIndex) -> bool:
+        """Apply logged events newer than the index; False if the log no longer covers it."""
+        events = list(self._log)
+        if not events or events[-1][0] <= index.applied_seq:
+            return True
+        if events[0][0] > index.applied_seq + 1:
+            return False
+        for seq, kind, payload in events:
+            if seq > index.applied_seq and index.accepts(kind, payload):
+                try:
+                    index.apply(kind, payload)
+                except Exception as e:
+                    logger.debug(f"[GraphLOD] Skipping event {seq}: {e}")
+        index.applied_seq = events[-1][0]
+        return True
+
+    # --------------------------------------------------------
+    # Index lifecycle
+    # --------------------------------------------------------
+
+    def _build(self, scope: str, nodes, edges, start_seq: int) -> LODIndex:
+        index = LODIndex(scope, self.algorithm)
+        for node_id, node_type, name, eid in nodes:
+            index.add_node(node_id, node_type, name, eid)
+        for src, dst, rel in edges:
+            index.add_edge(src, dst, rel)
+        index.cluster()
+        # Replays from the export's start; events already in the export
+        # re-apply harmlessly (node/edge upserts are idempotent here).
+        index.applied_seq = start_seq
+        with self._lock:
+            self._replay(index)
+            self._indices[scope] = index
+            self._indices.move_to_end(scope)
+            while len(self._indices) > self.max_scopes + 1:
+                oldest = next(s for s in self._indices if s != GLOBAL_SCOPE)
+                del self._indices[oldest]
+        logger.info(f"[GraphLOD] Built {scope}: {index.stats()}")
+        return index
+
+    async def rebuild(self, scope: str = GLOBAL_SCOPE, driver=None) -> LODIndex:
+        running = self._builds.get(scope)
+        if running is not None:
+            return await asyncio.shield(running)
+
+        async def _do():
+            start_seq = self._seq
+            nodes, edges = await self._store.run(
+                "lod", load_scope, scope, self.session_hops, self.session_budget, driver=driver
+            )
+            return await self._store.call("lod", self._build, scope, nodes, edges, start_seq)
+
+        task = asyncio.ensure_future(_do())
+        self._builds[scope] = task
+        task.add_done_callback(lambda _: self._builds.pop(scope, None))
+        return await asyncio.shield(task)
+
+    async def _ready(self, scope: str, driver=None) -> LODIndex:
+        index = self._indices.get(scope)
+        if index is None:
+            return await self.rebuild(scope, driver)
+
+        caught_up = await self._store.call("lod", self._locked, self._replay, index)
+        if not caught_up:
+            return await self.rebuild(scope, driver)
+        if time.time() - index.built_at > self.max_age and scope not in self._builds:
+            # Serve the current partition; swap in the fresh one when ready.
+            asyncio.ensure_future(self._background_rebuild(scope, driver))
+        return index
+
+    async def _background_rebuild(self, scope: str, driver=None):
+        try:
+            await self.rebuild(scope, driver)
+        except Exception as e:
+            logger.warning(f"[GraphLOD] Background rebuild of {scope} failed: {e}")
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    async def clusters(self, scope: str = GLOBAL_SCOPE, limit: int = 200, min_size: int = 1,
+                       driver=None) -> Dict[str, Any]:
+        index = await self._ready(scope, driver)
+        summary = await self._store.call("lod", self._locked, index.summary, limit, min_size)
+        return {**summary, "stats": index.stats()}
+
+    async def expand(self, cluster_id: str, scope: str = GLOBAL_SCOPE, limit: int = 500,
+                     driver=None) -> Optional[Dict[str, Any]]:
+        index = await self._ready(scope, driver)
+        view = await self._store.call("lod", self._locked, index.expand, cluster_id, limit)
+        if view is None:
+            return None
+        view["nodes"] = await self._store.run("lod", fetch_members, view["members"], driver=driver)
+        view["stats"] = index.stats()
+        return view
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "event_seq": self._seq,
+                "event_log": len(self._log),
+                "attached_clients": len(self._attached),
+                "scopes": {scope: index.stats() for scope, index in self._indices.items()},
+            }
@@ -0,0 +1,416 @@
+# ============================================================
+# Graph data-access layer for the Graph API
+# ============================================================
+"""
+The Neo4j driver shared through ``vera.mem.graph`` is synchronous, so calling
+it from an ``async def`` route blocks the event loop: one slow graph query
+freezes every other request, including chat websockets.
+
+``GraphStore`` runs graph work on a dedicated, bounded thread pool and
+guards each endpoint with:
+
+    * a concurrency limit (``asyncio.Semaphore``) plus a short wait queue —
+      requests beyond it get a 503 instead of piling up;
+    * a timeout, enforced twice: ``asyncio.wait_for`` answers the client
+      with a 504, and the same value is sent to Neo4j as the transaction
+      timeout so the abandoned query is killed server-side and its pool
+      thread is freed.
+
+Usage (inside a route):
+    def _work(db_sess, session_id):
+        return db_sess.run("MATCH ...", {"session_id": session_id}).data()
+
+    rows = await graph_store.run("session", _work, session_id)
+
+Load test against a running server:
+    python -m Vera.ChatUI.api.Graph.graph_store --url http://localhost:8000
+
+In-process simulation (no server / Neo4j needed):
+    python -m Vera.ChatUI.api.Graph.graph_store --simulate
+"""
+import asyncio
+import logging
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+try:
+    from neo4j import Query
+except ImportError:  # driver not installed (e.g. docs / simulation)
+    Query = None
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Limits
+# ============================================================
+
+@dataclass
+class EndpointLimit:
+    concurrency: int      # queries running at once for this endpoint
+    timeout: float        # seconds, client-side and Neo4j transaction timeout
+    queue: int = 16       # callers allowed to wait for a slot before 503
+
+
+DEFAULT_LIMITS: Dict[str, EndpointLimit] = {
+    "session": EndpointLimit(concurrency=4, timeout=20.0),
+    "cypher": EndpointLimit(concurrency=2, timeout=30.0, queue=4),
+    "timerange": EndpointLimit(concurrency=4, timeout=15.0),
+    "recent": EndpointLimit(concurrency=4, timeout=15.0),
+    "schema": EndpointLimit(concurrency=1, timeout=15.0, queue=8),
+    "stats": EndpointLimit(concurrency=1, timeout=15.0, queue=8),
+    "write": EndpointLimit(concurrency=4, timeout=10.0),
+    # full-graph exports and clustering for the level-of-detail views
+    "lod": EndpointLimit(concurrency=2, timeout=120.0),
+    # background stats recount and the one-off created_ts migration
+    "stats_refresh": EndpointLimit(concurrency=1, timeout=300.0, queue=4),
+    "backfill": EndpointLimit(concurrency=1, timeout=3600.0, queue=0),
+}
+
+FALLBACK_LIMIT = EndpointLimit(concurrency=2, timeout=15.0)
+
+
+class _TimeoutSession:
+    """Session proxy that attaches the endpoint timeout to every query."""
+
+    def __init__(self, session, timeout: float):
+        self._session = session
+        self._timeout = timeout
+
+    def run(self, query, parameters=None, **kwargs):
+        if Query is not None and isinstance(query, str):
+            query = Query(query, timeout=self._timeout)
+        return self._session.run(query, parameters, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+# ============================================================
+# Store
+# ============================================================
+
+class GraphStore:
+    """
+    Bounded executor for graph work.
+
+    Args:
+        driver_provider: Callable returning the Neo4j driver (resolved per
+            call, inside the pool, so session lookup never blocks the loop).
+        max_workers: Pool size — the hard cap on concurrent graph calls
+            across all endpoints.
+        limits: Per-endpoint overrides of ``DEFAULT_LIMITS``.
+    """
+
+    def __init__(
+        self,
+        driver_provider: Callable[[], Any],
+        max_workers: int = 8,
+        limits: Optional[Dict[str, EndpointLimit]] = None,
+    ):
+        self._driver_provider = driver_provider
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graph-api")
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._admitted: Dict[str, int] = defaultdict(int)   # waiting + running
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+            "calls": 0, "rejected": 0, "timeouts": 0, "errors": 0,
+            "active": 0, "total_ms": 0.0, "max_ms": 0.0,
+        })
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    async def run(self, endpoint: str, work: Callable, *args, read_only: bool = True,
+                  driver: Any = None) -> Any:
+        """Run ``work(db_sess, *args)`` in the pool with a timeout-aware session."""
+        def bind(timeout):
+            return lambda: self._with_session(work, args, read_only, driver, timeout)
+        return await self._submit(endpoint, bind)
+
+    async def call(self, endpoint: str, fn: Callable, *args) -> Any:
+        """Run a plain blocking ``fn(*args)`` (e.g. ``vera.mem.upsert_entity``) in the pool."""
+        return await self._submit(endpoint, lambda timeout: (lambda: fn(*args)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {}
+            for name, st in self._stats.items():
+                done = st["calls"] - st["active"]
+                endpoints[name] = {
+                    **{k: v for k, v in st.items() if k != "total_ms"},
+                    "avg_ms": round(st["total_ms"] / done, 1) if done else 0.0,
+                    "max_ms": round(st["max_ms"], 1),
+                    "waiting": self._admitted[name] - st["active"],
+                    "limit": asdict(self.limits.get(name, FALLBACK_LIMIT)),
+                }
+        return {"max_workers": self.max_workers, "endpoints": endpoints}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+
+    def _limit(self, endpoint: str) -> EndpointLimit:
+        return self.limits.get(endpoint, FALLBACK_LIMIT)
+
+    def _semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(endpoint)
+        if sem is None:
+            sem = self._semaphores[endpoint] = asyncio.Semaphore(self._limit(endpoint).concurrency)
+        return sem
+
+    def _with_session(self, work, args, read_only, driver, timeout):
+        driver = driver or self._driver_provider()
+        kwargs = {"default_access_mode": "READ"} if read_only else {}
+        with driver.session(**kwargs) as db_sess:
+            return work(_TimeoutSession(db_sess, timeout), *args)
+
+    async def _submit(self, endpoint: str, bind: Callable[[float], Callable[[], Any]]) -> Any:
+        limit = self._limit(endpoint)
+        sem = self._semaphore(endpoint)
+        stats = self._stats[endpoint]
+
+        # Counted on admission (not via sem.locked()) so a burst arriving in
+        # the same loop tick is still held to concurrency + queue.
+        if self._admitted[endpoint] >= limit.concurrency + limit.queue:
+            stats["rejected"] += 1
+            raise HTTPException(status_code=503, detail=f"Graph endpoint '{endpoint}' is busy, retry shortly")
+
+        started = time.perf_counter()
+        self._admitted[endpoint] += 1
+        try:
+            await asyncio.wait_for(sem.acquire(), limit.timeout)
+        except BaseException as exc:
+            self._admitted[endpoint] -= 1
+            if isinstance(exc, asyncio.TimeoutError):
+                stats["timeouts"] += 1
+                raise HTTPException(status_code=504, detail=f"Graph endpoint '{endpoint}' timed out waiting for a slot")
+            raise
+
+        remaining = max(0.1, limit.timeout - (time.perf_counter() - started))
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            stats["calls"] += 1
+            stats["active"] += 1
+
+        fut = loop.run_in_executor(self._executor, bind(remaining))
+
+        def _finished(_):
+            # The slot is held until the thread really finishes, so timed-out
+            # queries still count against the endpoint until Neo4j kills them.
+            sem.release()
+            self._admitted[endpoint] -= 1
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                stats["active"] -= 1
+                stats["total_ms"] += elapsed
+                stats["max_ms"] = max(stats["max_ms"], elapsed)
+
+        fut.add_done_callback(_finished)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), remaining)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            logger.warning(f"[GraphStore] {endpoint} query exceeded {limit.timeout}s")
+            raise HTTPException(status_code=504, detail=f"Graph query timed out after {limit.timeout}s")
+        except HTTPException:
+            raise
+        except Exception:
+            stats["errors"] += 1
+            raise
+
+
+# ============================================================
+# Load test / simulation
+# ============================================================
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def _http(host: str, port: int, method: str, path: str, body: Optional[bytes] = None,
+                timeout: float = 60.0) -> int:
+    """Minimal HTTP/1.1 client (keeps the load test dependency-free)."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        headers = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
+        if body is not None:
+            headers += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        writer.write(headers.encode() + b"\r\n" + (body or b""))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        await asyncio.wait_for(reader.read(), timeout)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def load_test(
+    url: str = "http://localhost:8000",
+    probe_path: str = "/health",
+    heavy_query: str = "MATCH (a)-[*1..4]-(b) RETURN count(*) AS paths",
+    heavy_clients: int = 8,
+    duration: float = 20.0,
+    probe_interval: float = 0.05,
+) -> Dict[str, Any]:
+    """
+    Sample ``probe_path`` latency (the chat-side view of the event loop)
+    with no graph load, then again while ``heavy_clients`` loop on
+    ``/api/graph/cypher`` with ``heavy_query``.
+    """
+    import json
+    from urllib.parse import urlparse
+
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+
+    async def probe_for(seconds: float) -> List[float]:
+        samples = []
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            await _http(host, port, "GET", probe_path)
+            samples.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(probe_interval)
+        return samples
+
+    baseline = await probe_for(duration / 2)
+
+    outcomes: Dict[int, int] = defaultdict(int)
+    stop = asyncio.Event()
+    body = json.dumps({"query": heavy_query, "parameters": {}}).encode()
+
+    async def heavy():
+        while not stop.is_set():
+            try:
+                outcomes[await _http(host, port, "POST", "/api/graph/cypher", body)] += 1
+            except Exception:
+                outcomes[0] += 1
+
+    clients = [asyncio.ensure_future(heavy()) for _ in range(heavy_clients)]
+    loaded = await probe_for(duration)
+    stop.set()
+    await asyncio.gather(*clients, return_exceptions=True)
+
+    return {
+        "probe": probe_path,
+        "baseline": _percentiles(baseline),
+        "under_graph_load": _percentiles(loaded),
+        "heavy_responses": dict(outcomes),
+    }
+
+
+class _SlowDriver:
+    """Stand-in driver whose queries block for ``delay`` seconds (simulation only)."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        driver = self
+
+        class _Session:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def run(self, query, parameters=None, **kwargs):
+                time.sleep(driver.delay)
+                return []
+
+        self._session_cls = _Session
+
+    def session(self, **kwargs):
+        return self._session_cls()
+
+
+async def simulate(heavy_clients: int = 8, query_seconds: float = 0.5,
+                   duration: float = 4.0, tick: float = 0.01) -> Dict[str, Any]:
+    """
+    Measure event-loop lag (how late a 10 ms ticker wakes up — what a chat
+    websocket would see) while ``heavy_clients`` issue blocking graph
+    queries, first called directly on the loop, then through ``GraphStore``.
+    """
+    driver = _SlowDriver(query_seconds)
+
+    async def ticker(seconds: float) -> List[float]:
+        lags = []
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            await asyncio.sleep(tick)
+            lags.append((time.perf_counter() - t0 - tick) * 1000)
+        return lags
+
+    async def direct_query():
+        with driver.session() as s:
+            s.run("MATCH (n) RETURN n")
+
+    store = GraphStore(lambda: driver, max_workers=heavy_clients,
+                       limits={"cypher": EndpointLimit(heavy_clients, 30.0, queue=heavy_clients)})
+
+    async def stored_query():
+        await store.run("cypher", lambda s: s.run("MATCH (n) RETURN n"))
+
+    results = {}
+    for name, query in (("direct", direct_query), ("graph_store", stored_query)):
+        stop = asyncio.Event()
+        done = 0
+
+        async def client():
+            nonlocal done
+            while not stop.is_set():
+                await query()
+                done += 1
+                await asyncio.sleep(0)
+
+        clients = [asyncio.ensure_future(client()) for _ in range(heavy_clients)]
+        lags = await ticker(duration)
+        stop.set()
+        await asyncio.gather(*clients)
+        results[name] = {"loop_lag": _percentiles(lags), "queries_completed": done}
+
+    store.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Graph API event-loop load test")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--probe", default="/health", help="Light endpoint standing in for chat traffic")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--simulate", action="store_true", help="Run the in-process simulation instead")
+    args = parser.parse_args()
+
+    if args.simulate:
+        result = asyncio.run(simulate(heavy_clients=args.clients))
+    else:
+        result = asyncio.run(load_test(args.url, args.probe, heavy_clients=args.clients,
+                                       duration=args.duration))
+    print(json.dumps(result, indent=2))
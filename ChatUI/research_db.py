@@ -5,8 +5,11 @@ db.py  —  Vera Research Agent persistence layer  (v2, PostgreSQL-native)
 Primary backend: PostgreSQL via asyncpg.
   pip install asyncpg
 
-Dev fallback: SQLite via aiosqlite (zero config, file-based).
-  pip install aiosqlite
+Dev fallback: SQLite via the stdlib sqlite3 module (zero config, file-based).
+  WAL journal, one writer connection with group commit, a pool of read-only
+  connections (VERA_SQLITE_READERS, default 4).  Benchmark against the old
+  single shared connection:
+    python -m Vera.ChatUI.research_db --bench        (needs aiosqlite)
 
 Configuration
 ─────────────
@@ -42,11 +45,14 @@ Quick-start with Docker
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import re
+import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
@@ -66,10 +72,6 @@ if _USE_PG:
         _USE_PG = False
 
 if not _USE_PG:
-    try:
-        import aiosqlite  # type: ignore
-    except ImportError as e:
-        raise ImportError("Install aiosqlite for SQLite support: pip install aiosqlite") from e
     _SQLITE_PATH = Path(os.environ.get("VERA_SQLITE_PATH", "vera_research.db"))
     log.info("DB backend: SQLite  (%s)", _SQLITE_PATH.resolve())
 
@@ -279,7 +281,7 @@ CREATE TABLE IF NOT EXISTS research_jobs (
 );
 
 CREATE INDEX IF NOT EXISTS idx_jobs_created ON research_jobs (created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_jobs_project ON research_jobs (project_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_project_created ON research_jobs (project_id, created_at DESC);
 
 CREATE TABLE IF NOT EXISTS citations (
     id               TEXT    PRIMARY KEY,
@@ -293,7 +295,7 @@ CREATE TABLE IF NOT EXISTS citations (
     fetched_at       REAL
 );
 
-CREATE INDEX IF NOT EXISTS idx_cits_job ON citations (job_id);
+CREATE INDEX IF NOT EXISTS idx_cits_job_fetched ON citations (job_id, fetched_at);
 
 CREATE TABLE IF NOT EXISTS projects (
     id               TEXT    PRIMARY KEY,
@@ -306,6 +308,8 @@ CREATE TABLE IF NOT EXISTS projects (
     updated_at       REAL    NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects (updated_at DESC);
+
 CREATE TABLE IF NOT EXISTS project_rounds (
     id          TEXT    PRIMARY KEY,
     project_id  TEXT    NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
@@ -317,6 +321,8 @@ CREATE TABLE IF NOT EXISTS project_rounds (
     created_at  REAL    NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_rounds_project ON project_rounds (project_id, round_num);
+
 CREATE TABLE IF NOT EXISTS source_configs (
     id         TEXT    PRIMARY KEY,
     label      TEXT    NOT NULL,
@@ -377,9 +383,8 @@ CREATE TABLE IF NOT EXISTS generated_files (
     created_at  REAL    NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_gf_job     ON generated_files (job_id);
-CREATE INDEX IF NOT EXISTS idx_gf_project ON generated_files (project_id);
-CREATE INDEX IF NOT EXISTS idx_gf_path    ON generated_files (file_path);
+CREATE INDEX IF NOT EXISTS idx_gf_job_path ON generated_files (job_id, file_path);
+CREATE INDEX IF NOT EXISTS idx_gf_project_created ON generated_files (project_id, created_at DESC);
 
 CREATE TABLE IF NOT EXISTS notebooks (
     id          TEXT    PRIMARY KEY,
@@ -391,6 +396,9 @@ CREATE TABLE IF NOT EXISTS notebooks (
     updated_at  REAL    NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_nb_updated ON notebooks (updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_nb_project ON notebooks (project_id, updated_at DESC);
+
 CREATE TABLE IF NOT EXISTS notebook_cells (
     id           TEXT    PRIMARY KEY,
     notebook_id  TEXT    NOT NULL REFERENCES notebooks (id) ON DELETE CASCADE,
@@ -446,12 +454,242 @@ def _jload(v: Any) -> Any:
         return v
 
 
+# Applied to every SQLite connection.  WAL lets readers run alongside the
+# writer; synchronous=NORMAL is durable across crashes in WAL mode (only the
+# last commits can be lost on power failure) and drops the fsync per commit.
+_SQLITE_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",        # 16 MB page cache
+    "PRAGMA mmap_size=134217728",     # 128 MB
+)
+
+_SQLITE_MIGRATIONS = [
+    "ALTER TABLE citations ADD COLUMN full_text TEXT DEFAULT ''",
+    "ALTER TABLE notebook_cells ADD COLUMN citations TEXT DEFAULT '[]'",
+    "ALTER TABLE notebook_cells ADD COLUMN parse_mode TEXT DEFAULT 'whole'",
+    "ALTER TABLE notebook_cells ADD COLUMN agent_mode TEXT DEFAULT 'single'",
+    "ALTER TABLE notebook_cells ADD COLUMN page_id TEXT DEFAULT NULL",
+    "ALTER TABLE notebook_cells ADD COLUMN title TEXT DEFAULT ''",
+    ("CREATE TABLE IF NOT EXISTS notebook_pages ("
+     "id TEXT PRIMARY KEY, notebook_id TEXT NOT NULL, "
+     "title TEXT NOT NULL DEFAULT 'Page', sort_order INT NOT NULL DEFAULT 0, "
+     "created_at REAL NOT NULL, updated_at REAL NOT NULL)"),
+    "CREATE INDEX IF NOT EXISTS idx_pages_nb ON notebook_pages (notebook_id)",
+    "CREATE INDEX IF NOT EXISTS idx_cells_page ON notebook_cells (page_id)",
+    # superseded by the composite indexes in _SQLITE_SCHEMA
+    "DROP INDEX IF EXISTS idx_jobs_project",
+    "DROP INDEX IF EXISTS idx_cits_job",
+    "DROP INDEX IF EXISTS idx_gf_job",
+    "DROP INDEX IF EXISTS idx_gf_project",
+    "DROP INDEX IF EXISTS idx_gf_path",
+]
+
+
 class _SQLitePool:
+    """
+    WAL-mode SQLite backend.
+
+    Writes go through one writer connection on its own thread.  Callers
+    queue their statements and await the commit; the writer drains
+    everything queued so far into a single BEGIN IMMEDIATE … COMMIT (group
+    commit), each caller's statements isolated in a SAVEPOINT so one failure
+    only rolls back that caller.  Reads use a pool of read-only connections.
+    sqlite3's per-connection statement cache (cached_statements) keeps the
+    prepared statements for the fixed SQL strings used by DB.
+    """
+
+    def __init__(self, path: Path, readers: int = 4, max_batch: int = 256):
+        self._path = path
+        self._n_readers = max(1, readers)
+        self._max_batch = max_batch
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._write_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vera-db-writer")
+        self._read_exec = ThreadPoolExecutor(max_workers=self._n_readers, thread_name_prefix="vera-db-reader")
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stats = {"writes": 0, "commits": 0, "max_batch": 0, "write_errors": 0, "reads": 0}
+
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        if readonly:
+            conn = sqlite3.connect(f"file:{self._path}?mode=ro", uri=True,
+                                   check_same_thread=False, cached_statements=256)
+        else:
+            # isolation_level=None: transactions are issued explicitly
+            conn = sqlite3.connect(str(self._path), isolation_level=None,
+                                   check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        for pragma in _SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("PRAGMA query_only=ON" if readonly else "PRAGMA foreign_keys=ON")
+        return conn
+
+    def _init_sync(self):
+        self._writer = self._connect()
+        for stmt in _SQLITE_SCHEMA.split(";"):
+            s = stmt.strip()
+            if s:
+                self._writer.execute(s)
+        # Column / table migrations (safe to run repeatedly — errors silently ignored)
+        for m in _SQLITE_MIGRATIONS:
+            try:
+                self._writer.execute(m)
+            except sqlite3.Error:
+                pass  # column/table already exists
+        self._writer.execute("PRAGMA optimize")
+        self._reader_conns = [self._connect(readonly=True) for _ in range(self._n_readers)]
+
+    async def init(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._write_exec, self._init_sync)
+        self._readers = asyncio.Queue()
+        for conn in self._reader_conns:
+            self._readers.put_nowait(conn)
+        self._writes = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        log.info("SQLite ready (WAL, 1 writer + %d readers): %s", self._n_readers, self._path.resolve())
+
+    # ── writes ────────────────────────────────────────────────────────────────
+
+    async def _submit(self, stmts: list[tuple[str, Any, bool]]):
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((stmts, future))
+        return await future
+
+    async def execute(self, sql: str, params: tuple = ()):
+        await self._submit([(sql, params, False)])
+
+    async def executemany(self, sql: str, rows: list[tuple]):
+        await self._submit([(sql, rows, True)])
+
+    async def batch(self, stmts: list[tuple[str, Any, bool]]):
+        """Run [(sql, params_or_rows, many), …] atomically (one savepoint)."""
+        await self._submit(stmts)
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._writes.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self._max_batch and not self._writes.empty():
+                nxt = self._writes.get_nowait()
+                if nxt is None:
+                    self._writes.put_nowait(None)  # finish this batch, then stop
+                    break
+                batch.append(nxt)
+            try:
+                errors = await loop.run_in_executor(self._write_exec, self._commit_batch,
+                                                    [stmts for stmts, _ in batch])
+            except Exception as e:
+                errors = [e] * len(batch)
+            for (_, future), err in zip(batch, errors):
+                if future.done():
+                    continue
+                if err is None:
+                    future.set_result(None)
+                else:
+                    self._stats["write_errors"] += 1
+                    future.set_exception(err)
+
+    def _commit_batch(self, ops: list[list[tuple[str, Any, bool]]]) -> list[Optional[Exception]]:
+        conn = self._writer
+        errors: list[Optional[Exception]] = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for stmts in ops:
+                conn.execute("SAVEPOINT op")
+                try:
+                    for sql, params, many in stmts:
+                        if many:
+                            conn.executemany(sql, params)
+                        else:
+                            conn.execute(sql, params)
+                    conn.execute("RELEASE op")
+                    errors.append(None)
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    errors.append(e)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self._stats["writes"] += len(ops)
+        self._stats["commits"] += 1
+        self._stats["max_batch"] = max(self._stats["max_batch"], len(ops))
+        return errors
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, sql: str, params: tuple, one: bool):
+        cur = conn.execute(sql, params)
+        try:
+            if one:
+                row = cur.fetchone()
+                return dict(row) if row else None
+            return [dict(r) for r in cur.fetchall()]
+        finally:
+            cur.close()
+
+    async def _run_read(self, sql: str, params: tuple, one: bool):
+        conn = await self._readers.get()
+        try:
+            self._stats["reads"] += 1
+            return await asyncio.get_running_loop().run_in_executor(
+                self._read_exec, self._read, conn, sql, params, one)
+        finally:
+            self._readers.put_nowait(conn)
+
+    async def fetchall(self, sql: str, params: tuple = ()) -> list[dict]:
+        return await self._run_read(sql, params, False)
+
+    async def fetchone(self, sql: str, params: tuple = ()) -> Optional[dict]:
+        return await self._run_read(sql, params, True)
+
+    def stats(self) -> dict:
+        s = dict(self._stats)
+        s["avg_batch"] = round(s["writes"] / s["commits"], 2) if s["commits"] else 0.0
+        s["readers"] = self._n_readers
+        s["queued_writes"] = self._writes.qsize() if self._writes else 0
+        return s
+
+    async def close(self):
+        if self._writer_task:
+            await self._writes.put(None)
+            await self._writer_task
+            self._writer_task = None
+
+        def _close_all():
+            if self._writer:
+                self._writer.execute("PRAGMA optimize")
+                self._writer.close()
+            for conn in self._reader_conns:
+                conn.close()
+
+        await asyncio.get_running_loop().run_in_executor(self._write_exec, _close_all)
+        self._write_exec.shutdown(wait=False)
+        self._read_exec.shutdown(wait=False)
+
+
+class _SingleConnSQLitePool:
+    """
+    Previous SQLite backend: one shared aiosqlite connection, commit after
+    every statement.  Kept only as the baseline for benchmark().
+    """
+
     def __init__(self, path: Path):
         self._path = path
         self._conn: Optional[Any] = None
 
     async def init(self):
+        import aiosqlite  # type: ignore
         self._conn = await aiosqlite.connect(str(self._path))
         self._conn.row_factory = aiosqlite.Row
         for stmt in _SQLITE_SCHEMA.split(";"):
@@ -459,27 +697,12 @@ class _SQLitePool:
             if s:
                 await self._conn.execute(s)
         await self._conn.commit()
-        # Column / table migrations (safe to run repeatedly — errors silently ignored)
-        _migrations = [
-            "ALTER TABLE citations ADD COLUMN full_text TEXT DEFAULT ''",
-            "ALTER TABLE notebook_cells ADD COLUMN citations TEXT DEFAULT '[]'",
-            "ALTER TABLE notebook_cells ADD COLUMN parse_mode TEXT DEFAULT 'whole'",
-            "ALTER TABLE notebook_cells ADD COLUMN agent_mode TEXT DEFAULT 'single'",
-            "ALTER TABLE notebook_cells ADD COLUMN page_id TEXT DEFAULT NULL",
-            "ALTER TABLE notebook_cells ADD COLUMN title TEXT DEFAULT ''",
-            ("CREATE TABLE IF NOT EXISTS notebook_pages ("
-             "id TEXT PRIMARY KEY, notebook_id TEXT NOT NULL, "
-             "title TEXT NOT NULL DEFAULT 'Page', sort_order INT NOT NULL DEFAULT 0, "
-             "created_at REAL NOT NULL, updated_at REAL NOT NULL)"),
-            "CREATE INDEX IF NOT EXISTS idx_pages_nb ON notebook_pages (notebook_id)",
-        ]
-        for m in _migrations:
+        for m in _SQLITE_MIGRATIONS:
             try:
                 await self._conn.execute(m)
                 await self._conn.commit()
             except Exception:
-                pass  # column/table already exists
-        log.info("SQLite ready: %s", self._path.resolve())
+                pass
 
     async def execute(self, sql: str, params: tuple = ()):
         await self._conn.execute(sql, params)
@@ -489,6 +712,10 @@ class _SQLitePool:
         await self._conn.executemany(sql, rows)
         await self._conn.commit()
 
+    async def batch(self, stmts: list[tuple[str, Any, bool]]):
+        for sql, params, many in stmts:
+            await (self.executemany if many else self.execute)(sql, params)
+
     async def fetchall(self, sql: str, params: tuple = ()) -> list[dict]:
         async with self._conn.execute(sql, params) as cur:
             rows = await cur.fetchall()
@@ -550,6 +777,16 @@ class _PgPool:
         async with self._pool.acquire() as conn:
             await conn.executemany(self._ph(sql), rows)
 
+    async def batch(self, stmts: list[tuple[str, Any, bool]]):
+        """Run [(sql, params_or_rows, many), …] in one transaction."""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                for sql, params, many in stmts:
+                    if many:
+                        await conn.executemany(self._ph(sql), params)
+                    else:
+                        await conn.execute(self._ph(sql), *params)
+
     async def fetchall(self, sql: str, params: tuple = ()) -> list[dict]:
         async with self._pool.acquire() as conn:
             rows = await conn.fetch(self._ph(sql), *params)
@@ -685,7 +922,8 @@ class DB:
     @staticmethod
     async def init():
         global _pool
-        _pool = _PgPool(_DB_URL) if _USE_PG else _SQLitePool(_SQLITE_PATH)
+        _pool = (_PgPool(_DB_URL) if _USE_PG else
+                 _SQLitePool(_SQLITE_PATH, readers=int(os.environ.get("VERA_SQLITE_READERS", "4"))))
         await _pool.init()
 
     @staticmethod
@@ -711,8 +949,7 @@ class DB:
             job.created_at,
             job.finished_at,
         )
-        await _pool.execute(_upsert_job(), params)
-
+        stmts = [(_upsert_job(), params, False)]
         if job.citations:
             rows = [
                 (c.id, job.id, c.url, c.title, c.snippet,
@@ -720,7 +957,8 @@ class DB:
                  c.source_type, c.screenshot_path, c.domain, c.fetched_at)
                 for c in job.citations
             ]
-            await _pool.executemany(_upsert_citation(), rows)
+            stmts.append((_upsert_citation(), rows, True))
+        await _pool.batch(stmts)
 
         # Save full file contents to generated_files table
         if job.file_tree:
@@ -738,10 +976,7 @@ class DB:
         """Save full file contents, upserting by (job_id, file_path)."""
         if not file_tree:
             return
-        # Delete old versions for this job first (clean upsert)
-        await _pool.execute(
-            "DELETE FROM generated_files WHERE job_id=?", (job_id,)
-        )
+        # Delete old versions for this job first (clean upsert), same transaction
         rows = [
             (
                 f"{job_id}:{path}",   # deterministic id
@@ -752,14 +987,14 @@ class DB:
             )
             for path, content in file_tree.items()
         ]
-        if rows:
-            await _pool.executemany(
-                "INSERT INTO generated_files "
-                "(id,job_id,project_id,file_path,content,size_bytes,created_at) "
-                "VALUES (?,?,?,?,?,?,?) "
-                "ON CONFLICT(id) DO UPDATE SET content=excluded.content, size_bytes=excluded.size_bytes",
-                rows,
-            )
+        await _pool.batch([
+            ("DELETE FROM generated_files WHERE job_id=?", (job_id,), False),
+            ("INSERT INTO generated_files "
+             "(id,job_id,project_id,file_path,content,size_bytes,created_at) "
+             "VALUES (?,?,?,?,?,?,?) "
+             "ON CONFLICT(id) DO UPDATE SET content=excluded.content, size_bytes=excluded.size_bytes",
+             rows, True),
+        ])
 
     @staticmethod
     async def load_generated_files(job_id: str) -> dict[str, str]:
@@ -997,9 +1232,9 @@ class DB:
 
     @staticmethod
     async def save_sources(sources: list) -> None:
-        await _pool.execute("DELETE FROM source_configs")
+        stmts = [("DELETE FROM source_configs", (), False)]
         if sources:
-            await _pool.executemany(
+            stmts.append((
                 "INSERT INTO source_configs (id,label,type,enabled,config,status,sort_order) "
                 "VALUES (?,?,?,?,?,?,?)",
                 [
@@ -1009,7 +1244,9 @@ class DB:
                      s.status, i)
                     for i, s in enumerate(sources)
                 ],
-            )
+                True,
+            ))
+        await _pool.batch(stmts)
 
     @staticmethod
     async def load_sources() -> list[dict]:
@@ -1057,9 +1294,9 @@ class DB:
 
     @staticmethod
     async def save_instances(instances: list) -> None:
-        await _pool.execute("DELETE FROM instance_configs")
+        stmts = [("DELETE FROM instance_configs", (), False)]
         if instances:
-            await _pool.executemany(
+            stmts.append((
                 "INSERT INTO instance_configs "
                 "(name,host,port,tier,model,ctx_size,enabled,sort_order) "
                 "VALUES (?,?,?,?,?,?,?,?)",
@@ -1068,7 +1305,9 @@ class DB:
                      (i.enabled if _USE_PG else int(i.enabled)), idx)
                     for idx, i in enumerate(instances)
                 ],
-            )
+                True,
+            ))
+        await _pool.batch(stmts)
 
     @staticmethod
     async def load_instances() -> list[dict]:
@@ -1118,7 +1357,8 @@ class DB:
         )
         # DB size
         if not _USE_PG and _SQLITE_PATH.exists():
-            db_size = _SQLITE_PATH.stat().st_size
+            wal = _SQLITE_PATH.with_name(_SQLITE_PATH.name + "-wal")
+            db_size = _SQLITE_PATH.stat().st_size + (wal.stat().st_size if wal.exists() else 0)
         elif _USE_PG:
             sz = await _pool.fetchone(
                 "SELECT pg_database_size(current_database()) AS n"
@@ -1136,6 +1376,7 @@ class DB:
             "last_at":         (last  or {}).get("created_at"),
             "db_backend":      "postgresql" if _USE_PG else "sqlite",
             "db_size_bytes":   db_size,
+            "pool":            _pool.stats() if hasattr(_pool, "stats") else {},
         }
 
     # ── bookmarks ─────────────────────────────────────────────────────────────
@@ -1228,7 +1469,7 @@ class DB:
     @staticmethod
     async def save_cell(cell: dict) -> None:
         _j_or = lambda v: _j(v) if not _USE_PG else json.dumps(v)
-        await _pool.execute(
+        await _pool.batch([(
             """INSERT INTO notebook_cells
                 (id,notebook_id,sort_order,cell_type,lang,tag,content,generated,thread,
                  page_id,title,citations,parse_mode,agent_mode,created_at,updated_at)
@@ -1248,17 +1489,18 @@ class DB:
              cell.get("page_id") or None, cell.get("title",""),
              _j_or(cell.get("citations",[])),
              cell.get("parse_mode","whole"), cell.get("agent_mode","single"),
-             cell.get("created_at", time.time()), cell.get("updated_at", time.time()))
-        )
-        await _pool.execute(
+             cell.get("created_at", time.time()), cell.get("updated_at", time.time())),
+            False,
+        ), (
             "UPDATE notebooks SET updated_at=? WHERE id=?",
-            (time.time(), cell["notebook_id"])
-        )
+            (time.time(), cell["notebook_id"]),
+            False,
+        )])
 
     @staticmethod
     async def save_cells_bulk(cells: list[dict]) -> None:
-        for cell in cells:
-            await DB.save_cell(cell)
+        # concurrent saves land in the same group commit
+        await asyncio.gather(*[DB.save_cell(cell) for cell in cells])
 
     @staticmethod
     async def delete_cell(cell_id: str) -> None:
@@ -1295,8 +1537,10 @@ class DB:
 
     @staticmethod
     async def delete_page(page_id: str) -> None:
-        await _pool.execute("DELETE FROM notebook_pages WHERE id=?", (page_id,))
-        await _pool.execute("UPDATE notebook_cells SET page_id=NULL WHERE page_id=?", (page_id,))
+        await _pool.batch([
+            ("DELETE FROM notebook_pages WHERE id=?", (page_id,), False),
+            ("UPDATE notebook_cells SET page_id=NULL WHERE page_id=?", (page_id,), False),
+        ])
 
     @staticmethod
     async def export_all(limit: int = 500) -> dict:
@@ -1313,4 +1557,93 @@ class DB:
             "web_search_config": ws_cfg,
             "exported_at":       time.time(),
             "db_backend":        "postgresql" if _USE_PG else "sqlite",
-        }
\ No newline at end of file
+        }
+
+# ════════════════════════════════════════════════════════════════════════════
+# BENCHMARK  (python -m Vera.ChatUI.research_db --bench)
+# ════════════════════════════════════════════════════════════════════════════
+
+async def benchmark(writers: int = 8, readers: int = 8, seconds: float = 5.0,
+                    citations: int = 5) -> dict:
+    """
+    Mixed workload against a throwaway database: ``writers`` tasks upsert a
+    job plus its citations (save_job), ``readers`` tasks run the history
+    listing (load_history).  Runs the old single-connection backend and the
+    pooled one on separate files and returns ops/s for each.
+    """
+    import tempfile
+    import uuid
+
+    async def run(pool_cls) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = pool_cls(Path(tmp) / "bench.db")
+            await pool.init()
+            counts = {"writes": 0, "reads": 0}
+            deadline = time.perf_counter() + seconds
+
+            async def writer(w: int):
+                while time.perf_counter() < deadline:
+                    job_id = f"bench_{w}_{uuid.uuid4().hex[:8]}"
+                    now = time.time()
+                    await pool.batch([
+                        (_upsert_job(),
+                         (job_id, f"query {w}", "deep", "report", "done", "x" * 2000, None,
+                          "[]", "[]", "{}", None, 1200, now, now), False),
+                        (_upsert_citation(),
+                         [(f"{job_id}_c{i}", job_id, f"https://example.com/{i}", "title",
+                           "snippet", "body " * 200, "web", None, "example.com", now)
+                          for i in range(citations)], True),
+                    ])
+                    counts["writes"] += 1
+
+            async def reader():
+                while time.perf_counter() < deadline:
+                    await pool.fetchall(
+                        f"""SELECT id, query, status, created_at,
+                               substr(coalesce(result,''),1,200) AS result_snippet,
+                               (SELECT COUNT(*) FROM citations WHERE job_id=research_jobs.id) AS citation_count,
+                               {_count_col()}
+                           FROM research_jobs ORDER BY created_at DESC LIMIT 50"""
+                    )
+                    counts["reads"] += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*[writer(w) for w in range(writers)],
+                                 *[reader() for _ in range(readers)])
+            elapsed = time.perf_counter() - started
+            out = {
+                "writes_per_s": round(counts["writes"] / elapsed, 1),
+                "reads_per_s":  round(counts["reads"] / elapsed, 1),
+            }
+            if hasattr(pool, "stats"):
+                out["pool"] = pool.stats()
+            await pool.close()
+            return out
+
+    baseline = await run(_SingleConnSQLitePool)
+    pooled = await run(_SQLitePool)
+    return {
+        "workload": {"writers": writers, "readers": readers, "seconds": seconds,
+                     "citations_per_job": citations},
+        "single_connection": baseline,
+        "pooled": pooled,
+        "write_speedup": round(pooled["writes_per_s"] / max(baseline["writes_per_s"], 0.1), 2),
+        "read_speedup":  round(pooled["reads_per_s"] / max(baseline["reads_per_s"], 0.1), 2),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vera research DB utilities")
+    parser.add_argument("--bench", action="store_true", help="compare SQLite backends")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.bench:
+        logging.basicConfig(level=logging.WARNING)
+        print(json.dumps(asyncio.run(benchmark(args.writers, args.readers, args.seconds)), indent=2))
+    else:
+        parser.print_help()
@@ -91,6 +91,10 @@ class OrchestratorConfig:
     toolchain_timeout: float = 120.0
     llm_timeout: float = 60.0
     fast_llm_timeout: float = 30.0
+    
+    # Speculative routing: start the predicted continuation route alongside triage
+    speculative_routing: bool = True
+    speculation_min_confidence: float = 0.6
 
 
 @dataclass
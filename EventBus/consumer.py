@@ -0,0 +1,423 @@
+"""
+Vera EventBus — Multi-Stream Consumer Engine
+=============================================
+
+Replaces the round-robin ``_consume_stream`` loop with a single reader that:
+
+  1. Reads every subscribed stream in one ``XREADGROUP`` call, so a busy
+     stream never waits behind idle ones.  Streams are listed in priority
+     order and entries from earlier streams are queued first.
+
+  2. Adapts ``COUNT`` to the backlog — a full read doubles the batch size
+     (up to ``max_count``), a sparse read halves it (down to ``min_count``).
+     The count is also capped by free worker-queue capacity.
+
+  3. Dispatches on a bounded worker pool — a fixed number of worker tasks
+     drain a bounded ``asyncio.Queue``; the reader blocks when the queue is
+     full, giving natural backpressure.
+
+  4. Batches acknowledgements — processed ids are collected per stream and
+     flushed with one multi-id ``XACK`` when ``ack_batch`` is reached or
+     every ``ack_interval`` seconds.
+
+  5. Reclaims stale pending entries — ``XAUTOCLAIM`` periodically takes over
+     messages left pending by crashed consumers (idle > ``claim_idle_ms``).
+     Entries this consumer still holds locally (queued, in flight or
+     awaiting their batched ack) are skipped, never processed twice.
+
+  6. Exposes per-stream metrics — local counters plus server-side lag and
+     pending counts from ``XINFO GROUPS``.
+
+Usage:
+    consumer = StreamConsumer(
+        redis, CONSUMER_GROUP, "node-1",
+        streams=[STREAM_PRIORITY, STREAM_EVENTS],
+        handler=process_message,          # async (stream, message_id, fields)
+    )
+    await consumer.run()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from Vera.EventBus.config import (
+    CONSUMER_WORKERS,
+    CONSUMER_MIN_COUNT,
+    CONSUMER_MAX_COUNT,
+    CONSUMER_BLOCK_MS,
+    CONSUMER_ACK_BATCH,
+    CONSUMER_ACK_INTERVAL_SEC,
+    CONSUMER_CLAIM_IDLE_MS,
+    CONSUMER_CLAIM_INTERVAL_SEC,
+)
+
+log = logging.getLogger("vera.eventbus.consumer")
+
+MessageHandler = Callable[[str, str, Dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class StreamStats:
+    read: int = 0
+    processed: int = 0
+    failed: int = 0
+    acked: int = 0
+    claimed: int = 0
+    handler_time: float = 0.0
+    last_read_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg_ms = (self.handler_time / self.processed * 1000) if self.processed else 0.0
+        return {
+            "read": self.read,
+            "processed": self.processed,
+            "failed": self.failed,
+            "acked": self.acked,
+            "claimed": self.claimed,
+            "avg_handler_ms": round(avg_ms, 3),
+            "last_read_at": self.last_read_at,
+        }
+
+
+@dataclass
+class _Entry:
+    stream: str
+    message_id: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+class StreamConsumer:
+    """
+    Single-reader, multi-worker Redis Streams consumer.
+
+    ``handler`` is awaited once per message.  Whether it succeeds or raises,
+    the message is acknowledged afterwards — retry / DLQ policy belongs to
+    the handler (see ``EnhancedRedisEventBus._handle_failure``).  Messages
+    whose handler never completes (process crash) stay pending and are
+    picked up again by ``XAUTOCLAIM``.
+    """
+
+    def __init__(
+        self,
+        redis,
+        group: str,
+        consumer_name: str,
+        streams: List[str],
+        handler: MessageHandler,
+        workers: int = CONSUMER_WORKERS,
+        min_count: int = CONSUMER_MIN_COUNT,
+        max_count: int = CONSUMER_MAX_COUNT,
+        block_ms: int = CONSUMER_BLOCK_MS,
+        ack_batch: int = CONSUMER_ACK_BATCH,
+        ack_interval: float = CONSUMER_ACK_INTERVAL_SEC,
+        claim_idle_ms: int = CONSUMER_CLAIM_IDLE_MS,
+        claim_interval: float = CONSUMER_CLAIM_INTERVAL_SEC,
+    ):
+        self.redis = redis
+        self.group = group
+        self.consumer_name = consumer_name
+        self.streams = list(streams)
+        self.handler = handler
+
+        self.workers = max(1, workers)
+        self.min_count = max(1, min_count)
+        self.max_count = max(self.min_count, max_count)
+        self.block_ms = block_ms
+        self.ack_batch = ack_batch
+        self.ack_interval = ack_interval
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+
+        self.count = self.min_count
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_count * 2)
+        self._pending_acks: Dict[str, List[str]] = {s: [] for s in self.streams}
+        self._ack_lock = asyncio.Lock()
+        self._stats: Dict[str, StreamStats] = {s: StreamStats() for s in self.streams}
+        # Ids read but not yet acked — XAUTOCLAIM must not hand them out again
+        self._held: Dict[str, set] = {s: set() for s in self.streams}
+        self._in_flight = 0
+        self._running = False
+        self._tasks: List[asyncio.Task] = []
+        self._stopped = asyncio.Event()
+        self._stopped.set()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def run(self):
+        """Run reader, workers, ack flusher and reclaimer until ``stop()``."""
+        self._running = True
+        self._stopped.clear()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._ack_loop()))
+        if self.claim_idle_ms > 0:
+            self._tasks.append(asyncio.create_task(self._claim_loop()))
+
+        log.info(
+            f"[Consumer] {self.consumer_name} reading {self.streams} "
+            f"with {self.workers} workers"
+        )
+        try:
+            await self._read_loop()
+        finally:
+            try:
+                await self._shutdown()
+            finally:
+                self._stopped.set()
+
+    async def stop(self):
+        """Ask ``run()`` to finish; see ``wait_closed()`` to wait for it."""
+        self._running = False
+
+    async def wait_closed(self, timeout: Optional[float] = None):
+        """
+        Wait until ``run()`` has drained its queue and flushed its acks.
+        Call this before closing the Redis connection.
+        """
+        await asyncio.wait_for(self._stopped.wait(), timeout)
+
+    async def _shutdown(self):
+        # Let workers drain what has already been read
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=5)
+        except asyncio.TimeoutError:
+            log.warning(f"[Consumer] {self._queue.qsize()} messages left unprocessed")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush_acks()
+
+    # ------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------
+
+    async def _read_loop(self):
+        while self._running:
+            # COUNT applies per stream, so split the batch budget across them
+            free = self._queue.maxsize - self._queue.qsize()
+            count = max(1, min(self.count, free) // len(self.streams))
+            try:
+                response = await self.redis.xreadgroup(
+                    groupname=self.group,
+                    consumername=self.consumer_name,
+                    streams={s: ">" for s in self.streams},
+                    count=count,
+                    block=self.block_ms,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log.error(f"[Consumer] XREADGROUP failed: {exc}")
+                await asyncio.sleep(1)
+                continue
+
+            fullest = await self._enqueue_response(response)
+            self._adapt_count(fullest, count)
+
+    async def _enqueue_response(self, response) -> int:
+        """Queue entries in stream priority order; return the largest per-stream batch."""
+        if not response:
+            return 0
+
+        by_stream: Dict[str, list] = {}
+        for stream, messages in response:
+            by_stream[_decode(stream)] = messages
+
+        now = time.time()
+        fullest = 0
+        # Priority order: streams earlier in self.streams are queued first
+        for stream in self.streams:
+            messages = by_stream.get(stream)
+            if not messages:
+                continue
+            stats = self._stats[stream]
+            stats.read += len(messages)
+            stats.last_read_at = now
+            held = self._held.setdefault(stream, set())
+            for message_id, fields in messages:
+                message_id = _decode(message_id)
+                held.add(message_id)
+                await self._queue.put(_Entry(stream, message_id, fields or {}))
+            fullest = max(fullest, len(messages))
+        return fullest
+
+    def _adapt_count(self, received: int, requested: int):
+        """
+        Grow the batch budget while reads come back full; shrink it when they
+        are sparse.  ``received`` and ``requested`` are per-stream figures.
+        """
+        if received >= requested:
+            self.count = min(self.max_count, self.count * 2)
+        elif received < requested // 4:
+            self.count = max(self.min_count, self.count // 2)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def _worker(self, index: int):
+        while True:
+            entry: _Entry = await self._queue.get()
+            stats = self._stats.setdefault(entry.stream, StreamStats())
+            self._in_flight += 1
+            started = time.perf_counter()
+            try:
+                await self.handler(entry.stream, entry.message_id, entry.fields)
+                stats.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                stats.failed += 1
+                log.error(f"[Consumer] Handler error on {entry.stream}/{entry.message_id}: {exc}")
+            finally:
+                stats.handler_time += time.perf_counter() - started
+                self._in_flight -= 1
+            try:
+                await self._queue_ack(entry.stream, entry.message_id)
+            finally:
+                self._queue.task_done()
+
+    # ------------------------------------------------------------------
+    # Batched acknowledgements
+    # ------------------------------------------------------------------
+
+    async def _queue_ack(self, stream: str, message_id: str):
+        batch = self._pending_acks.setdefault(stream, [])
+        batch.append(message_id)
+        if len(batch) >= self.ack_batch:
+            await self._flush_stream_acks(stream)
+
+    async def _ack_loop(self):
+        while True:
+            await asyncio.sleep(self.ack_interval)
+            await self._flush_acks()
+
+    async def _flush_acks(self):
+        for stream in list(self._pending_acks):
+            await self._flush_stream_acks(stream)
+
+    async def _flush_stream_acks(self, stream: str):
+        async with self._ack_lock:
+            ids = self._pending_acks.get(stream)
+            if not ids:
+                return
+            self._pending_acks[stream] = []
+        try:
+            await self.redis.xack(stream, self.group, *ids)
+            self._stats[stream].acked += len(ids)
+        except Exception as exc:
+            # Leave them pending; XAUTOCLAIM will redeliver if needed
+            log.error(f"[Consumer] XACK of {len(ids)} ids on {stream} failed: {exc}")
+        finally:
+            self._held.get(stream, set()).difference_update(ids)
+
+    # ------------------------------------------------------------------
+    # Pending-entry reclaim
+    # ------------------------------------------------------------------
+
+    async def _claim_loop(self):
+        while True:
+            await asyncio.sleep(self.claim_interval)
+            for stream in self.streams:
+                try:
+                    await self.reclaim(stream)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    log.error(f"[Consumer] XAUTOCLAIM on {stream} failed: {exc}")
+
+    async def reclaim(self, stream: str) -> int:
+        """
+        Claim entries idle longer than ``claim_idle_ms`` and queue them.
+
+        Entries this consumer already holds (a slow handler, or an ack still
+        waiting for its batch) can go idle too; XAUTOCLAIM hands them back to
+        us unchanged, and they are skipped rather than queued a second time.
+        """
+        start_id = "0-0"
+        claimed = 0
+        held = self._held.setdefault(stream, set())
+        while True:
+            result = await self.redis.xautoclaim(
+                stream,
+                self.group,
+                self.consumer_name,
+                min_idle_time=self.claim_idle_ms,
+                start_id=start_id,
+                count=self.max_count,
+            )
+            next_id, messages = result[0], result[1]
+            for message_id, fields in messages:
+                message_id = _decode(message_id)
+                if message_id in held:
+                    continue
+                held.add(message_id)
+                if fields is None:
+                    # Entry was trimmed from the stream; nothing to process
+                    await self._queue_ack(stream, message_id)
+                    continue
+                await self._queue.put(_Entry(stream, message_id, fields))
+                claimed += 1
+            next_id = _decode(next_id)
+            if next_id in ("0-0", "0") or not messages:
+                break
+            start_id = next_id
+
+        if claimed:
+            self._stats[stream].claimed += claimed
+            log.warning(f"[Consumer] Reclaimed {claimed} stale entries from {stream}")
+        return claimed
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        """Local counters — cheap, no Redis round trip."""
+        return {
+            "consumer": self.consumer_name,
+            "count": self.count,
+            "queue_depth": self._queue.qsize(),
+            "in_flight": self._in_flight,
+            "pending_acks": {s: len(ids) for s, ids in self._pending_acks.items()},
+            "streams": {s: st.to_dict() for s, st in self._stats.items()},
+        }
+
+    async def lag(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Server-side lag per stream from ``XINFO GROUPS``.
+
+        ``lag`` (entries not yet delivered to the group) requires Redis 7+;
+        on older servers it is reported as ``None``.
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        for stream in self.streams:
+            try:
+                groups = await self.redis.xinfo_groups(stream)
+            except Exception as exc:
+                out[stream] = {"error": str(exc)}
+                continue
+            info = next((g for g in groups if _decode(g.get("name")) == self.group), None)
+            if info is None:
+                out[stream] = {"lag": None, "pending": None}
+                continue
+            out[stream] = {
+                "lag": info.get("lag"),
+                "pending": info.get("pending"),
+                "last_delivered_id": _decode(info.get("last-delivered-id")),
+                "consumers": info.get("consumers"),
+            }
+        return out
+
+
+def _decode(value):
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
@@ -17,6 +17,14 @@ Drop-in replacement for the original RedisEventBus that adds:
   4. Graceful degradation — if Postgres is unavailable the bus still works;
      if Redis is unavailable the bus raises on ``connect()``.
 
+  5. Indexed dispatch     — subscriptions live in a ``SubscriptionIndex``
+     (exact hash + segment trie + per-type memo) so dispatch no longer
+     fnmatch-scans every pattern for every event.
+
+  6. Concurrent consumer  — ``StreamConsumer`` reads both streams in one
+     XREADGROUP with an adaptive COUNT, dispatches on a worker pool, batches
+     XACKs and reclaims stale pending entries with XAUTOCLAIM.
+
 Wire-up (in run_event_bus.py or Vera.__init__):
     bus = EnhancedRedisEventBus(
         consumer_name="node-1",
@@ -33,7 +41,6 @@ Wire-up (in run_event_bus.py or Vera.__init__):
 from __future__ import annotations
 
 import asyncio
-import fnmatch
 import json
 import logging
 from typing import Any, Callable, Dict, List, Optional
@@ -53,6 +60,8 @@ from Vera.EventBus.config import (
 )
 from Vera.EventBus.postgres import PostgresPool, EventLogger, SyncLogBridge
 from Vera.EventBus.promoter import MemoryPromoter
+from Vera.EventBus.subscription_index import SubscriptionIndex
+from Vera.EventBus.consumer import StreamConsumer
 
 log = logging.getLogger("vera.eventbus")
 
@@ -91,7 +100,7 @@ class EnhancedRedisEventBus:
         self.consumer_name = consumer_name
         self._redis_url = redis_url
         self.redis: Optional[aioredis.Redis] = None
-        self.subscribers: Dict[str, List[Callable]] = {}
+        self._subscriptions = SubscriptionIndex()
 
         # Postgres
         self._pg_pool = PostgresPool(postgres_dsn)
@@ -109,6 +118,9 @@ class EnhancedRedisEventBus:
         # Internal flag so VeraLogger patching only happens once
         self._logger_patched = False
 
+        # Consumer engine (created by start())
+        self._consumer: Optional[StreamConsumer] = None
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
@@ -149,6 +161,13 @@ class EnhancedRedisEventBus:
         log.info("[EventBus] Postgres EventLogger attached.")
 
     async def close(self):
+        if self._consumer:
+            # Let the consumer drain and flush its acks while Redis is still open
+            await self._consumer.stop()
+            try:
+                await self._consumer.wait_closed(timeout=self._consumer.block_ms / 1000 + 10)
+            except asyncio.TimeoutError:
+                log.warning("[EventBus] Consumer did not stop in time; closing anyway.")
         if self.redis:
             await self.redis.close()
         await self._pg_pool.close()
@@ -158,8 +177,17 @@ class EnhancedRedisEventBus:
     # Pub / Sub
     # ------------------------------------------------------------------
 
+    @property
+    def subscribers(self) -> Dict[str, List[Callable]]:
+        """Snapshot of pattern → handlers (read-only view)."""
+        return self._subscriptions.as_dict()
+
     def subscribe(self, topic_pattern: str, handler: Callable):
-        self.subscribers.setdefault(topic_pattern, []).append(handler)
+        self._subscriptions.add(topic_pattern, handler)
+
+    def unsubscribe(self, topic_pattern: str, handler: Optional[Callable] = None) -> bool:
+        """Remove one handler (or every handler) for a pattern."""
+        return self._subscriptions.remove(topic_pattern, handler)
 
     async def publish(self, event: Event, priority: bool = False):
         """Publish an event to Redis Streams."""
@@ -253,40 +281,47 @@ class EnhancedRedisEventBus:
     # Consumer loop
     # ------------------------------------------------------------------
 
-    async def start(self):
-        """Main consumer loop — reads from both streams round-robin."""
+    async def start(self, **consumer_options):
+        """
+        Main consumer loop — one XREADGROUP across both streams (priority
+        first), dispatched on a bounded worker pool with batched acks.
+        ``consumer_options`` are passed through to ``StreamConsumer``.
+        """
         log.info("[EventBus] Consumer loop started.")
-        while True:
-            await self._consume_stream(STREAM_PRIORITY)
-            await self._consume_stream(STREAM_EVENTS)
-
-    async def _consume_stream(self, stream: str):
-        response = await self.redis.xreadgroup(
-            groupname=CONSUMER_GROUP,
-            consumername=self.consumer_name,
-            streams={stream: ">"},
-            count=10,
-            block=100,          # short block so priority stream is checked often
+        self._consumer = StreamConsumer(
+            self.redis,
+            CONSUMER_GROUP,
+            self.consumer_name,
+            streams=[STREAM_PRIORITY, STREAM_EVENTS],
+            handler=self._process_message,
+            **consumer_options,
         )
-        if not response:
+        await self._consumer.run()
+
+    async def _process_message(self, stream: str, message_id: str, data: Dict[str, Any]):
+        """Handle one stream entry.  The consumer acks it once this returns."""
+        try:
+            event = Event.model_validate_json(data["event"])
+        except Exception as exc:
+            log.error(f"[EventBus] Dropping malformed entry {stream}/{message_id}: {exc}")
             return
+        try:
+            await self._dispatch(event)
+        except Exception as exc:
+            await self._handle_failure(event, message_id, stream, exc)
+
+    def consumer_metrics(self) -> Dict[str, Any]:
+        """Local consumer counters (batch size, queue depth, per-stream stats)."""
+        return self._consumer.metrics() if self._consumer else {}
 
-        for _, messages in response:
-            for message_id, data in messages:
-                event = Event.model_validate_json(data["event"])
-                try:
-                    await self._dispatch(event)
-                    await self.redis.xack(stream, CONSUMER_GROUP, message_id)
-                except Exception as exc:
-                    await self._handle_failure(event, message_id, stream, exc)
+    async def stream_lag(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stream group lag / pending counts from Redis."""
+        return await self._consumer.lag() if self._consumer else {}
 
     async def _dispatch(self, event: Event):
-        tasks = []
-        for pattern, handlers in self.subscribers.items():
-            if fnmatch.fnmatch(event.type, pattern):
-                for handler in handlers:
-                    tasks.append(asyncio.create_task(handler(event)))
-        if tasks:
+        handlers = self._subscriptions.resolve(event.type)
+        if handlers:
+            tasks = [asyncio.create_task(handler(event)) for handler in handlers]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             for r in results:
                 if isinstance(r, Exception):
@@ -299,15 +334,14 @@ class EnhancedRedisEventBus:
         event.retries += 1
         event.meta["last_error"] = str(error)
 
+        # The original entry is acked by the consumer once this returns
         if event.retries >= MAX_RETRIES:
             log.error(f"[EventBus] DLQ: {event.type} after {event.retries} retries")
             await self.redis.xadd(STREAM_DLQ, {"event": event.model_dump_json()})
-            await self.redis.xack(stream, CONSUMER_GROUP, message_id)
         else:
             log.warning(f"[EventBus] Retry {event.retries}/{MAX_RETRIES}: {event.type}")
             await asyncio.sleep(RETRY_DELAY_SEC)
             await self.publish(event)
-            await self.redis.xack(stream, CONSUMER_GROUP, message_id)
 
     # ------------------------------------------------------------------
     # Redis group helpers
@@ -0,0 +1,325 @@
+"""
+Vera EventBus — Subscription Index
+===================================
+
+Resolves an event type to its subscribed handlers without running
+``fnmatch`` against every pattern on every dispatch.
+
+Patterns keep their existing fnmatch semantics (``*`` also matches dots, so
+``system.*`` matches ``system.cpu.high``).  They are bucketed three ways:
+
+  1. Exact       — patterns with no wildcard characters live in a dict and
+                   are resolved with a single hash lookup.
+
+  2. Segment trie — wildcard patterns are keyed on their literal dotted
+                   prefix (the segments before the first wildcard).  A
+                   lookup walks the event type's segments, so only patterns
+                   whose prefix matches are ever tested.  Patterns of the
+                   form ``prefix.*`` match anything under their node and
+                   need no regex at all; other wildcard patterns are tested
+                   with a precompiled regex.
+
+  3. Memo        — the resolved handler tuple for each event type is cached
+                   and the whole memo is dropped on subscribe/unsubscribe.
+
+Usage:
+    index = SubscriptionIndex()
+    index.add("system.*", handler)
+    for handler in index.resolve("system.cpu.high"):
+        ...
+
+Benchmark:
+    python -m Vera.EventBus.subscription_index
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+_WILDCARD_CHARS = ("*", "?", "[")
+
+
+def _has_wildcard(text: str) -> bool:
+    return any(c in text for c in _WILDCARD_CHARS)
+
+
+class _TrieNode:
+    __slots__ = ("children", "catch_all", "patterns")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # pattern -> True for "prefix.*" style patterns (match everything below)
+        self.catch_all: Dict[str, bool] = {}
+        # pattern -> compiled fnmatch regex for everything else
+        self.patterns: Dict[str, Pattern] = {}
+
+
+class SubscriptionIndex:
+    """
+    Pattern → handler index with exact, trie and memoised lookups.
+
+    Handlers are returned in subscription order per pattern, and patterns
+    are returned in the order they were first subscribed, matching the
+    behaviour of iterating the old ``subscribers`` dict.
+    """
+
+    def __init__(self, memo_size: int = 4096):
+        self._handlers: Dict[str, List[Callable]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+        self._exact: Dict[str, bool] = {}
+        self._root = _TrieNode()
+
+        self._memo: Dict[str, Tuple[Callable, ...]] = {}
+        self._memo_size = memo_size
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def add(self, pattern: str, handler: Callable):
+        if pattern not in self._handlers:
+            self._handlers[pattern] = []
+            self._order[pattern] = self._next_order
+            self._next_order += 1
+            self._insert(pattern)
+        self._handlers[pattern].append(handler)
+        self._memo.clear()
+
+    def remove(self, pattern: str, handler: Optional[Callable] = None) -> bool:
+        """
+        Remove ``handler`` from ``pattern`` (or every handler when ``None``).
+        Returns True if anything was removed.
+        """
+        handlers = self._handlers.get(pattern)
+        if not handlers:
+            return False
+
+        if handler is None:
+            handlers.clear()
+        else:
+            try:
+                handlers.remove(handler)
+            except ValueError:
+                return False
+
+        if not handlers:
+            del self._handlers[pattern]
+            del self._order[pattern]
+            self._delete(pattern)
+        self._memo.clear()
+        return True
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def resolve(self, event_type: str) -> Tuple[Callable, ...]:
+        cached = self._memo.get(event_type)
+        if cached is not None:
+            return cached
+
+        patterns = self.match_patterns(event_type)
+        handlers: List[Callable] = []
+        for pattern in patterns:
+            handlers.extend(self._handlers[pattern])
+        resolved = tuple(handlers)
+
+        if len(self._memo) >= self._memo_size:
+            self._memo.clear()
+        self._memo[event_type] = resolved
+        return resolved
+
+    def match_patterns(self, event_type: str) -> List[str]:
+        """Return every subscribed pattern matching ``event_type`` (ordered)."""
+        matched: List[str] = []
+
+        if event_type in self._exact:
+            matched.append(event_type)
+
+        segments = event_type.split(".")
+        node = self._root
+        self._collect(node, event_type, matched, True)
+        for depth, segment in enumerate(segments, start=1):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            # "prefix.*" needs at least one more segment after the prefix
+            self._collect(node, event_type, matched, depth < len(segments))
+
+        if len(matched) > 1:
+            matched.sort(key=self._order.__getitem__)
+        return matched
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def as_dict(self) -> Dict[str, List[Callable]]:
+        return {p: list(h) for p, h in self._handlers.items()}
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._handlers
+
+    # ------------------------------------------------------------------
+    # Trie internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _split(pattern: str) -> Tuple[List[str], str]:
+        """Split a pattern into its literal prefix segments and the remainder."""
+        segments = pattern.split(".")
+        prefix: List[str] = []
+        for i, seg in enumerate(segments):
+            if _has_wildcard(seg):
+                return prefix, ".".join(segments[i:])
+            prefix.append(seg)
+        return prefix, ""
+
+    def _insert(self, pattern: str):
+        if not _has_wildcard(pattern):
+            self._exact[pattern] = True
+            return
+
+        prefix, rest = self._split(pattern)
+        node = self._root
+        for seg in prefix:
+            node = node.children.setdefault(seg, _TrieNode())
+
+        if rest == "*":
+            node.catch_all[pattern] = True
+        else:
+            node.patterns[pattern] = re.compile(fnmatch.translate(pattern))
+
+    def _delete(self, pattern: str):
+        if not _has_wildcard(pattern):
+            self._exact.pop(pattern, None)
+            return
+
+        prefix, _ = self._split(pattern)
+        path = [self._root]
+        for seg in prefix:
+            child = path[-1].children.get(seg)
+            if child is None:
+                return
+            path.append(child)
+
+        node = path[-1]
+        node.catch_all.pop(pattern, None)
+        node.patterns.pop(pattern, None)
+
+        # Prune empty branches
+        for depth in range(len(prefix), 0, -1):
+            child = path[depth]
+            if child.children or child.catch_all or child.patterns:
+                break
+            del path[depth - 1].children[prefix[depth - 1]]
+
+    @staticmethod
+    def _collect(node: _TrieNode, event_type: str, out: List[str], below: bool):
+        if below and node.catch_all:
+            out.extend(node.catch_all)
+        for pattern, regex in node.patterns.items():
+            if regex.match(event_type):
+                out.append(pattern)
+
+
+# ----------------------------------------------------------------------
+# Microbenchmark
+# ----------------------------------------------------------------------
+
+def _fnmatch_resolve(subscribers: Dict[str, List[Callable]], event_type: str) -> List[Callable]:
+    handlers: List[Callable] = []
+    for pattern, hs in subscribers.items():
+        if fnmatch.fnmatch(event_type, pattern):
+            handlers.extend(hs)
+    return handlers
+
+
+def benchmark_dispatch(sizes=(10, 1_000, 10_000), events: int = 20_000, seed: int = 7) -> List[Dict]:
+    """
+    Compare linear fnmatch resolution against ``SubscriptionIndex`` for
+    several subscription counts.  Returns one result dict per size.
+    """
+    import random
+    import time
+
+    rng = random.Random(seed)
+    domains = ["system", "memory", "llm", "tool", "agent", "focus", "network", "orchestrator"]
+    results = []
+
+    def _handler(_event):
+        return None
+
+    for size in sizes:
+        subscribers: Dict[str, List[Callable]] = {}
+        index = SubscriptionIndex()
+        for i in range(size):
+            domain = rng.choice(domains)
+            kind = i % 4
+            if kind == 0:
+                pattern = f"{domain}.sensor{i}.reading"
+            elif kind == 1:
+                pattern = f"{domain}.sensor{i}.*"
+            elif kind == 2:
+                pattern = f"{domain}.*.alert{i}"
+            else:
+                pattern = f"{domain}.group{i % 97}.*"
+            subscribers.setdefault(pattern, []).append(_handler)
+            index.add(pattern, _handler)
+        subscribers.setdefault("*", []).append(_handler)
+        index.add("*", _handler)
+
+        # Event types drawn from a bounded vocabulary, like real traffic
+        vocab = [
+            f"{rng.choice(domains)}.sensor{rng.randrange(size)}.reading"
+            for _ in range(200)
+        ] + [f"{rng.choice(domains)}.group{rng.randrange(97)}.tick" for _ in range(50)]
+        stream = [rng.choice(vocab) for _ in range(events)]
+
+        # Sanity: both strategies agree
+        for et in vocab[:50]:
+            assert sorted(map(id, _fnmatch_resolve(subscribers, et))) == \
+                sorted(map(id, index.resolve(et))), et
+
+        linear_events = min(events, max(200, 2_000_000 // max(size, 1)))
+        t0 = time.perf_counter()
+        for et in stream[:linear_events]:
+            _fnmatch_resolve(subscribers, et)
+        linear = (time.perf_counter() - t0) / linear_events
+
+        index._memo.clear()
+        t0 = time.perf_counter()
+        for et in stream:
+            index.resolve(et)
+        indexed = (time.perf_counter() - t0) / events
+
+        index._memo.clear()
+        t0 = time.perf_counter()
+        for et in stream:
+            index.match_patterns(et)
+        unmemoised = (time.perf_counter() - t0) / events
+
+        results.append({
+            "subscriptions": size + 1,
+            "fnmatch_us": round(linear * 1e6, 3),
+            "index_us": round(indexed * 1e6, 3),
+            "index_nomemo_us": round(unmemoised * 1e6, 3),
+            "speedup": round(linear / indexed, 1) if indexed else None,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    for row in benchmark_dispatch():
+        print(
+            f"{row['subscriptions']:>6} subs | fnmatch {row['fnmatch_us']:>10.3f} us/event"
+            f" | index {row['index_us']:>7.3f} us/event"
+            f" (no memo {row['index_nomemo_us']:.3f}) | x{row['speedup']}"
+        )
@@ -6,15 +6,26 @@ Vera Unified Logging System
 Provides structured, configurable logging with rich formatting and metadata.
 Enhanced with provenance tracking, full stack trace capabilities, token tracking,
 and comprehensive system resource monitoring.
+
+Output is asynchronous by default: callers build the message and push a
+small tuple into a ring buffer; a writer thread creates the LogRecord and
+runs the handlers (formatting, JSON serialisation, file and console I/O).
+Provenance is captured for every WARNING and above and sampled below that.
 """
 
 import sys
+import atexit
+import itertools
+import linecache
 import logging
+import random
 import threading
 import time
 import json
 import inspect
-from typing import Optional, Dict, Any, List, Tuple
+import importlib.util
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, field
@@ -30,11 +41,8 @@ except ImportError:
     HAS_PSUTIL = False
     print("Warning: psutil not available. Install with: pip install psutil")
 
-try:
-    import GPUtil
-    HAS_GPUTIL = True
-except ImportError:
-    HAS_GPUTIL = False
+# GPU sampling lives in the telemetry service; only report availability here
+HAS_GPUTIL = importlib.util.find_spec("GPUtil") is not None
 
 try:
     import torch
@@ -42,6 +50,8 @@ try:
 except ImportError:
     HAS_TORCH = False
 
+from Vera.Logging.telemetry import TelemetryService, TelemetrySample, get_telemetry
+
 
 class LogLevel(Enum):
     """Enhanced log levels for Vera"""
@@ -394,9 +404,15 @@ class ColorCodes:
 
 
 class SystemMonitor:
-    """Monitor system resources"""
+    """
+    Monitor system resources.
+
+    Readings come from the shared TelemetryService, so get_metrics() is a
+    snapshot read rather than a fresh (blocking) psutil sweep.
+    """
     
-    def __init__(self):
+    def __init__(self, telemetry: Optional[TelemetryService] = None):
+        self._telemetry = telemetry
         self.platform = platform.system()
         self.has_psutil = HAS_PSUTIL
         self.has_gputil = HAS_GPUTIL
@@ -409,116 +425,54 @@ class SystemMonitor:
         # Check CUDA availability once
         self._cuda_available = torch.cuda.is_available() if HAS_TORCH else False
     
-    def get_metrics(self) -> SystemMetrics:
-        """Get current system metrics"""
+    @property
+    def telemetry(self) -> TelemetryService:
+        if self._telemetry is None:
+            self._telemetry = get_telemetry()
+        return self._telemetry
+    
+    def get_metrics(self, max_age: Optional[float] = None) -> SystemMetrics:
+        """Get current system metrics from the latest telemetry sample"""
+        return self.from_sample(self.telemetry.snapshot(max_age=max_age))
+    
+    def from_sample(self, sample: TelemetrySample) -> SystemMetrics:
+        """Map a telemetry sample onto SystemMetrics"""
         metrics = SystemMetrics(
-            timestamp=time.time(),
+            timestamp=sample.timestamp,
             cpu_count_physical=self._cpu_count_physical,
             cpu_count_logical=self._cpu_count_logical,
-            cpu_percent=0.0,
+            cpu_percent=sample.cpu_percent,
+            cpu_freq_current=sample.cpu_freq_mhz,
+            cpu_freq_max=sample.cpu_freq_max_mhz,
+            ram_total_gb=sample.memory_total_mb / 1024,
+            ram_available_gb=sample.memory_available_mb / 1024,
+            ram_used_gb=sample.memory_used_mb / 1024,
+            ram_percent=sample.memory_percent,
+            swap_total_gb=sample.swap_total_mb / 1024,
+            swap_used_gb=sample.swap_used_mb / 1024,
+            swap_percent=sample.swap_percent,
+            cuda_available=self._cuda_available,
+            power_plugged=sample.power_plugged,
+            battery_percent=sample.battery_percent,
+            battery_time_left=sample.battery_time_left,
+            disk_total_gb=sample.disk_total_gb,
+            disk_free_gb=sample.disk_free_gb,
+            disk_usage_percent=sample.disk_percent,
         )
         
-        if not HAS_PSUTIL:
-            return metrics
-        
-        # CPU metrics
-        try:
-            metrics.cpu_percent = psutil.cpu_percent(interval=0.1)
-            cpu_freq = psutil.cpu_freq()
-            if cpu_freq:
-                metrics.cpu_freq_current = cpu_freq.current
-                metrics.cpu_freq_max = cpu_freq.max
-        except Exception:
-            pass
-        
-        # Memory metrics
-        try:
-            mem = psutil.virtual_memory()
-            metrics.ram_total_gb = mem.total / (1024**3)
-            metrics.ram_available_gb = mem.available / (1024**3)
-            metrics.ram_used_gb = mem.used / (1024**3)
-            metrics.ram_percent = mem.percent
-            
-            swap = psutil.swap_memory()
-            metrics.swap_total_gb = swap.total / (1024**3)
-            metrics.swap_used_gb = swap.used / (1024**3)
-            metrics.swap_percent = swap.percent
-        except Exception:
-            pass
-        
-        # GPU metrics
-        self._collect_gpu_metrics(metrics)
-        
-        # Power metrics
-        try:
-            battery = psutil.sensors_battery()
-            if battery:
-                metrics.power_plugged = battery.power_plugged
-                metrics.battery_percent = battery.percent
-                metrics.battery_time_left = battery.secsleft if battery.secsleft != -1 else None
-        except Exception:
-            pass
-        
-        # Disk metrics
-        try:
-            disk = psutil.disk_usage('/')
-            metrics.disk_total_gb = disk.total / (1024**3)
-            metrics.disk_free_gb = disk.free / (1024**3)
-            metrics.disk_usage_percent = disk.percent
-        except Exception:
-            pass
+        if sample.gpus:
+            metrics.gpu_available = True
+            metrics.gpu_count = len(sample.gpus)
+            for gpu in sample.gpus:
+                metrics.gpu_names.append(gpu['name'])
+                metrics.gpu_memory_total_gb.append(gpu['memory_total_gb'])
+                metrics.gpu_memory_used_gb.append(gpu['memory_used_gb'])
+                metrics.gpu_memory_percent.append(gpu['memory_percent'])
+                metrics.gpu_utilization.append(gpu['utilization'])
+                metrics.gpu_temperature.append(gpu['temperature'])
         
         return metrics
     
-    def _collect_gpu_metrics(self, metrics: SystemMetrics):
-        """Collect GPU metrics using available libraries"""
-        # Check CUDA via PyTorch
-        metrics.cuda_available = self._cuda_available
-        
-        # Try GPUtil first (more detailed)
-        if HAS_GPUTIL:
-            try:
-                gpus = GPUtil.getGPUs()
-                if gpus:
-                    metrics.gpu_available = True
-                    metrics.gpu_count = len(gpus)
-                    
-                    for gpu in gpus:
-                        metrics.gpu_names.append(gpu.name)
-                        metrics.gpu_memory_total_gb.append(gpu.memoryTotal / 1024)
-                        metrics.gpu_memory_used_gb.append(gpu.memoryUsed / 1024)
-                        metrics.gpu_memory_percent.append(gpu.memoryUtil * 100)
-                        metrics.gpu_utilization.append(gpu.load * 100)
-                        metrics.gpu_temperature.append(gpu.temperature)
-                    return
-            except Exception:
-                pass
-        
-        # Fallback to PyTorch CUDA info
-        if HAS_TORCH and self._cuda_available:
-            try:
-                metrics.gpu_available = True
-                metrics.gpu_count = torch.cuda.device_count()
-                
-                for i in range(metrics.gpu_count):
-                    metrics.gpu_names.append(torch.cuda.get_device_name(i))
-                    
-                    # Memory info
-                    mem_allocated = torch.cuda.memory_allocated(i) / (1024**3)
-                    mem_reserved = torch.cuda.memory_reserved(i) / (1024**3)
-                    
-                    # Get total memory (this is a rough estimate)
-                    props = torch.cuda.get_device_properties(i)
-                    mem_total = props.total_memory / (1024**3)
-                    
-                    metrics.gpu_memory_total_gb.append(mem_total)
-                    metrics.gpu_memory_used_gb.append(mem_allocated)
-                    metrics.gpu_memory_percent.append((mem_allocated / mem_total) * 100 if mem_total > 0 else 0)
-                    metrics.gpu_utilization.append(0.0)  # Not available via PyTorch
-                    metrics.gpu_temperature.append(0.0)  # Not available via PyTorch
-            except Exception:
-                pass
-    
     def get_system_info(self) -> Dict[str, Any]:
         """Get static system information"""
         info = {
@@ -570,6 +524,14 @@ class LoggingConfig:
     stack_trace_on_error: bool = True  # Always include stack on errors
     trace_mode: bool = False  # Master switch for full trace capabilities
     trace_exclude_modules: List[str] = field(default_factory=lambda: ['logging', 'threading'])  # Modules to exclude from traces
+    provenance_min_level: LogLevel = LogLevel.WARNING  # Always capture provenance at/above this level
+    provenance_sample_rate: float = 0.05  # Fraction of lower-level calls that capture provenance
+    
+    # Asynchronous output
+    async_logging: bool = True  # Hand records to a background writer thread
+    async_buffer_size: int = 10000  # Ring buffer capacity (records)
+    async_overflow_policy: str = "drop_oldest"  # drop_oldest | drop_newest | block
+    async_flush_on_error: bool = True  # ERROR/CRITICAL wait until written
     
     # System monitoring
     enable_system_monitoring: bool = True  # Monitor system resources
@@ -625,6 +587,7 @@ class LoggingConfig:
         """Apply trace mode settings if enabled"""
         if self.trace_mode:
             self.enable_provenance = True
+            self.provenance_sample_rate = 1.0
             self.enable_stack_traces = True
             self.global_level = LogLevel.TRACE
             self.enable_thread_info = True
@@ -635,6 +598,125 @@ class LoggingConfig:
             self.enable_llm_metrics = True
 
 
+class AsyncLogDispatcher:
+    """
+    Ring buffer between VeraLogger callers and the handlers of its logger.
+    
+    submit() only appends a tuple to a deque (append/popleft are atomic, so
+    the hot path takes no lock); the writer thread builds LogRecords with the
+    caller's timestamp and thread and runs the handlers.  When the buffer is
+    full the overflow policy applies: drop_oldest evicts the oldest record,
+    drop_newest discards the new one, block waits for the writer.
+    """
+    
+    POLICIES = ("drop_oldest", "drop_newest", "block")
+    
+    def __init__(self, logger: logging.Logger, capacity: int = 10000, overflow: str = "drop_oldest"):
+        if overflow not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {self.POLICIES}")
+        self.logger = logger
+        self.capacity = capacity
+        self.overflow = overflow
+        self._buffer = deque(maxlen=capacity if overflow == "drop_oldest" else None)
+        self._wake = threading.Event()
+        self._running = True
+        self._seq = itertools.count(1)
+        self._enqueued = 0
+        self._counter_lock = threading.Lock()
+        self.counters = {'written': 0, 'dropped': 0, 'write_errors': 0, 'high_water': 0}
+        self._thread = threading.Thread(target=self._run, name=f"{logger.name}-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, levelno: int, msg: str, exc_info=None, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """Enqueue one record; returns False if it was dropped"""
+        buffer = self._buffer
+        if len(buffer) >= self.capacity:
+            if self.overflow == "drop_newest":
+                self._count_drop()
+                return False
+            if self.overflow == "block":
+                while len(buffer) >= self.capacity and self._running:
+                    self._wake.set()
+                    time.sleep(0.001)
+            else:
+                self._count_drop()  # deque(maxlen) evicts the oldest on append
+        thread = threading.current_thread()
+        buffer.append((time.time(), levelno, msg, exc_info, extra, thread.ident, thread.name))
+        self._enqueued = next(self._seq)
+        self._wake.set()
+        return True
+    
+    def _count_drop(self):
+        with self._counter_lock:
+            self.counters['dropped'] += 1
+    
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until everything submitted so far has been written"""
+        if not self._thread.is_alive():
+            return False
+        marker = threading.Event()
+        self._buffer.append(marker)
+        self._wake.set()
+        return marker.wait(timeout)
+    
+    def close(self, timeout: float = 2.0):
+        if not self._running:
+            return
+        self.flush(timeout)
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            counters = dict(self.counters)
+        counters.update({
+            'enqueued': self._enqueued,
+            'depth': len(self._buffer),
+            'capacity': self.capacity,
+            'overflow_policy': self.overflow,
+        })
+        return counters
+    
+    def _run(self):
+        buffer = self._buffer
+        while self._running or buffer:
+            if not buffer:
+                self._wake.wait(0.1)
+                self._wake.clear()
+                continue
+            depth = len(buffer)
+            if depth > self.counters['high_water']:
+                self.counters['high_water'] = depth
+            while buffer:
+                try:
+                    item = buffer.popleft()
+                except IndexError:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+                    continue
+                self._write(item)
+    
+    def _write(self, item):
+        created, levelno, msg, exc_info, extra, thread_id, thread_name = item
+        try:
+            record = self.logger.makeRecord(
+                self.logger.name, levelno, __file__, 0, msg, None, exc_info, extra=extra
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            record.relativeCreated = (created - logging._startTime) * 1000
+            record.thread = thread_id
+            record.threadName = thread_name
+            self.logger.handle(record)
+            self.counters['written'] += 1
+        except Exception:
+            self.counters['write_errors'] += 1
+
+
 class VeraLogger:
     """
     Unified logger for Vera with structured output and rich formatting
@@ -652,7 +734,7 @@ class VeraLogger:
         # System monitoring
         self.system_monitor = SystemMonitor() if config.enable_system_monitoring else None
         self._last_system_metrics: Optional[SystemMetrics] = None
-        self._system_metrics_timer: Optional[threading.Timer] = None
+        self._system_metrics_subscription: Optional[Callable[[], None]] = None
         
         # LLM metrics tracking
         self._llm_operation_start: Optional[float] = None
@@ -661,6 +743,13 @@ class VeraLogger:
         # Setup Python logging
         self.logger = logging.getLogger(f"vera.{component}")
         self._setup_logging()
+        self._dispatcher: Optional[AsyncLogDispatcher] = None
+        if config.async_logging:
+            self._dispatcher = AsyncLogDispatcher(
+                self.logger,
+                capacity=config.async_buffer_size,
+                overflow=config.async_overflow_policy,
+            )
         
         # Statistics
         self.stats = {
@@ -669,6 +758,7 @@ class VeraLogger:
             'thoughts_captured': 0,
             'tools_executed': 0,
             'stack_traces_captured': 0,
+            'provenance_captured': 0,
             'llm_calls': 0,
             'total_tokens': 0,
             'total_llm_time': 0.0,
@@ -705,30 +795,25 @@ class VeraLogger:
             self.debug("GPU: Not available")
     
     def _start_system_metrics_logging(self):
-        """Start periodic system metrics logging"""
-        def log_metrics():
+        """Log system metrics from the shared telemetry sampler every interval"""
+        def log_metrics(sample: TelemetrySample):
             if self.system_monitor:
-                metrics = self.system_monitor.get_metrics()
+                metrics = self.system_monitor.from_sample(sample)
                 self._last_system_metrics = metrics
                 self.info(f"System metrics: {metrics.format_summary()}")
-                
-                # Schedule next log
-                if self.config.system_metrics_interval > 0:
-                    self._system_metrics_timer = threading.Timer(
-                        self.config.system_metrics_interval,
-                        log_metrics
-                    )
-                    self._system_metrics_timer.daemon = True
-                    self._system_metrics_timer.start()
         
-        # Start the timer
-        log_metrics()
+        telemetry = self.system_monitor.telemetry
+        log_metrics(telemetry.snapshot())
+        self._system_metrics_subscription = telemetry.subscribe(
+            log_metrics, every=self.config.system_metrics_interval
+        )
     
     def stop_system_metrics_logging(self):
         """Stop periodic system metrics logging"""
-        if self._system_metrics_timer:
-            self._system_metrics_timer.cancel()
-            self._system_metrics_timer = None
+        unsubscribe = getattr(self, '_system_metrics_subscription', None)
+        if unsubscribe:
+            unsubscribe()
+            self._system_metrics_subscription = None
     
     def get_current_system_metrics(self) -> Optional[SystemMetrics]:
         """Get current system metrics"""
@@ -829,12 +914,11 @@ class VeraLogger:
     
     def _capture_provenance(self, skip_frames: int = 2) -> ProvenanceInfo:
         """Capture provenance information from call stack"""
-        frame = inspect.currentframe()
-        
-        # Skip internal frames
-        for _ in range(skip_frames):
-            if frame is not None:
-                frame = frame.f_back
+        # sys._getframe + code attributes: no source read, unlike inspect.getframeinfo
+        try:
+            frame = sys._getframe(skip_frames)
+        except ValueError:
+            frame = None
         
         if frame is None:
             return ProvenanceInfo(
@@ -844,60 +928,75 @@ class VeraLogger:
                 module_name="<unknown>"
             )
         
-        frame_info = inspect.getframeinfo(frame)
+        code = frame.f_code
         
         # Try to get class name if method
         class_name = None
-        if 'self' in frame.f_locals:
-            class_name = frame.f_locals['self'].__class__.__name__
-        elif 'cls' in frame.f_locals:
-            class_name = frame.f_locals['cls'].__name__
+        if code.co_argcount and code.co_varnames[0] in ('self', 'cls'):
+            first = frame.f_locals.get(code.co_varnames[0])
+            if first is not None:
+                class_name = first.__name__ if isinstance(first, type) else first.__class__.__name__
         
+        self.stats['provenance_captured'] += 1
         return ProvenanceInfo(
-            filename=frame_info.filename,
-            line_number=frame_info.lineno,
-            function_name=frame_info.function,
+            filename=code.co_filename,
+            line_number=frame.f_lineno,
+            function_name=code.co_name,
             module_name=frame.f_globals.get('__name__', '<unknown>'),
             class_name=class_name
         )
     
+    def _wants_provenance(self, level: Optional[LogLevel]) -> bool:
+        """Provenance for every call at/above provenance_min_level, sampled below it"""
+        if not self.config.enable_provenance:
+            return False
+        if level is not None and level.value >= self.config.provenance_min_level.value:
+            return True
+        rate = self.config.provenance_sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+    
     def _capture_stack_trace(self, skip_frames: int = 2) -> StackTrace:
         """Capture full stack trace"""
-        stack = inspect.stack()
+        try:
+            frame = sys._getframe(skip_frames)
+        except ValueError:
+            frame = None
         
-        # Skip internal frames and excluded modules
+        # Walk frames directly: module names from f_globals instead of
+        # inspect.getmodule, and source lines only for the frames kept
         frames = []
-        for frame_info in stack[skip_frames:]:
-            module = inspect.getmodule(frame_info.frame)
-            module_name = module.__name__ if module else '<unknown>'
+        while frame is not None:
+            module_name = frame.f_globals.get('__name__', '<unknown>')
             
             # Skip excluded modules
-            if any(excluded in module_name for excluded in self.config.trace_exclude_modules):
-                continue
-            
-            frames.append((
-                frame_info.filename,
-                frame_info.lineno,
-                frame_info.function,
-                frame_info.code_context[0] if frame_info.code_context else ""
-            ))
+            if not any(excluded in module_name for excluded in self.config.trace_exclude_modules):
+                code = frame.f_code
+                frames.append((
+                    code.co_filename,
+                    frame.f_lineno,
+                    code.co_name,
+                    linecache.getline(code.co_filename, frame.f_lineno, frame.f_globals)
+                ))
+                
+                if len(frames) >= self.config.stack_trace_depth:
+                    break
             
-            if len(frames) >= self.config.stack_trace_depth:
-                break
+            frame = frame.f_back
         
         self.stats['stack_traces_captured'] += 1
         return StackTrace(frames=frames)
     
     def _enrich_context(self, context: Optional[LogContext], 
                        capture_provenance: bool = True,
-                       capture_stack: bool = False) -> LogContext:
+                       capture_stack: bool = False,
+                       level: Optional[LogLevel] = None) -> LogContext:
         """Enrich context with provenance and stack trace if configured"""
         # Start with provided context or create new one
         if context is None:
             context = LogContext()
         
-        # Add provenance if enabled and not already present
-        if capture_provenance and self.config.enable_provenance and context.provenance is None:
+        # Add provenance if enabled (level-gated / sampled) and not already present
+        if capture_provenance and context.provenance is None and self._wants_provenance(level):
             context.provenance = self._capture_provenance(skip_frames=3)
         
         # Add stack trace if enabled and not already present
@@ -906,6 +1005,33 @@ class VeraLogger:
         
         return context
     
+    def _emit(self, levelno: int, msg: str, exc_info=False, **kwargs):
+        """Hand a built message to the handlers, through the ring buffer when async"""
+        if self._dispatcher is None:
+            self.logger.log(levelno, msg, exc_info=exc_info, **kwargs)
+            return
+        
+        # Exception info must be taken on the calling thread
+        if exc_info:
+            if isinstance(exc_info, BaseException):
+                exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+            elif not isinstance(exc_info, tuple):
+                exc_info = sys.exc_info()
+            if exc_info[0] is None:
+                exc_info = None
+        else:
+            exc_info = None
+        
+        self._dispatcher.submit(levelno, msg, exc_info, kwargs.get('extra'))
+        if levelno >= logging.ERROR and self.config.async_flush_on_error:
+            self._dispatcher.flush(timeout=1.0)
+    
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Block until queued records are written (no-op when synchronous)"""
+        if self._dispatcher is None:
+            return True
+        return self._dispatcher.flush(timeout)
+    
     def _format_context(self, context: Optional[LogContext] = None) -> str:
         """Format context information"""
         if not context and not self.context_stack:
@@ -1080,20 +1206,20 @@ class VeraLogger:
     def trace(self, message: str, context: Optional[LogContext] = None, **kwargs):
         """Log trace message (most verbose)"""
         if self._should_log(LogLevel.TRACE):
-            context = self._enrich_context(context, capture_stack=True)
+            context = self._enrich_context(context, capture_stack=True, level=LogLevel.TRACE)
             ctx_str = self._format_context(context)
             
             msg = f"{ctx_str}{message}"
             if context and context.stack_trace:
                 msg += self._format_stack_trace(context.stack_trace)
             
-            self.logger.log(LogLevel.TRACE.value, msg, **kwargs)
+            self._emit(LogLevel.TRACE.value, msg, **kwargs)
             self.stats['messages_logged'] += 1
     
     def debug(self, message: str, context: Optional[LogContext] = None, **kwargs):
         """Log debug message"""
         if self._should_log(LogLevel.DEBUG):
-            context = self._enrich_context(context, capture_stack=self.config.trace_mode)
+            context = self._enrich_context(context, capture_stack=self.config.trace_mode, level=LogLevel.DEBUG)
             ctx_str = self._format_context(context)
             
             msg = f"{ctx_str}{message}"
@@ -1101,30 +1227,31 @@ class VeraLogger:
                 msg += self._format_stack_trace(context.stack_trace)
             
             msg = self._colorize(msg, ColorCodes.BRIGHT_BLACK)
-            self.logger.debug(msg, **kwargs)
+            self._emit(LogLevel.DEBUG.value, msg, **kwargs)
             self.stats['messages_logged'] += 1
     
     def info(self, message: str, context: Optional[LogContext] = None, **kwargs):
         """Log info message"""
         if self._should_log(LogLevel.INFO):
-            context = self._enrich_context(context, capture_stack=False)
+            context = self._enrich_context(context, capture_stack=False, level=LogLevel.INFO)
             ctx_str = self._format_context(context)
-            self.logger.info(f"{ctx_str}{message}", **kwargs)
+            self._emit(LogLevel.INFO.value, f"{ctx_str}{message}", **kwargs)
             self.stats['messages_logged'] += 1
     
     def success(self, message: str, context: Optional[LogContext] = None, **kwargs):
         """Log success message"""
         if self._should_log(LogLevel.SUCCESS):
-            context = self._enrich_context(context, capture_stack=False)
+            context = self._enrich_context(context, capture_stack=False, level=LogLevel.SUCCESS)
             ctx_str = self._format_context(context)
             msg = self._colorize(f"✓ {ctx_str}{message}", ColorCodes.GREEN)
-            self.logger.log(LogLevel.SUCCESS.value, msg, **kwargs)
+            self._emit(LogLevel.SUCCESS.value, msg, **kwargs)
             self.stats['messages_logged'] += 1
     
     def warning(self, message: str, context: Optional[LogContext] = None, **kwargs):
         """Log warning message"""
         if self._should_log(LogLevel.WARNING):
-            context = self._enrich_context(context, capture_stack=self.config.stack_trace_on_error)
+            context = self._enrich_context(context, capture_stack=self.config.stack_trace_on_error,
+                                           level=LogLevel.WARNING)
             ctx_str = self._format_context(context)
             
             msg = f"⚠ {ctx_str}{message}"
@@ -1132,13 +1259,13 @@ class VeraLogger:
                 msg += self._format_stack_trace(context.stack_trace)
             
             msg = self._colorize(msg, ColorCodes.YELLOW)
-            self.logger.warning(msg, **kwargs)
+            self._emit(LogLevel.WARNING.value, msg, **kwargs)
             self.stats['messages_logged'] += 1
     
     def error(self, message: str, exc_info: bool = False, context: Optional[LogContext] = None, **kwargs):
         """Log error message"""
         if self._should_log(LogLevel.ERROR):
-            context = self._enrich_context(context, capture_stack=True)
+            context = self._enrich_context(context, capture_stack=True, level=LogLevel.ERROR)
             ctx_str = self._format_context(context)
             
             msg = f"✗ {ctx_str}{message}"
@@ -1146,13 +1273,13 @@ class VeraLogger:
                 msg += self._format_stack_trace(context.stack_trace)
             
             msg = self._colorize(msg, ColorCodes.RED)
-            self.logger.error(msg, exc_info=exc_info, **kwargs)
+            self._emit(LogLevel.ERROR.value, msg, exc_info=exc_info, **kwargs)
             self.stats['errors_logged'] += 1
     
     def critical(self, message: str, exc_info: bool = True, context: Optional[LogContext] = None, **kwargs):
         """Log critical message"""
         if self._should_log(LogLevel.CRITICAL):
-            context = self._enrich_context(context, capture_stack=True)
+            context = self._enrich_context(context, capture_stack=True, level=LogLevel.CRITICAL)
             ctx_str = self._format_context(context)
             
             msg = f"🔥 {ctx_str}{message}"
@@ -1160,7 +1287,7 @@ class VeraLogger:
                 msg += self._format_stack_trace(context.stack_trace)
             
             msg = self._colorize(msg, ColorCodes.BG_RED + ColorCodes.WHITE)
-            self.logger.critical(msg, exc_info=exc_info, **kwargs)
+            self._emit(LogLevel.CRITICAL.value, msg, exc_info=exc_info, **kwargs)
             self.stats['errors_logged'] += 1
     
     def thought(self, content: str, context: Optional[LogContext] = None):
@@ -1377,10 +1504,15 @@ class VeraLogger:
             stats['avg_time_per_call'] = stats['total_llm_time'] / stats['llm_calls']
             stats['avg_tokens_per_second'] = stats['total_tokens'] / stats['total_llm_time'] if stats['total_llm_time'] > 0 else 0
         
+        # Ring buffer depth, drops and writer errors
+        if self._dispatcher is not None:
+            stats['async_logging'] = self._dispatcher.stats()
+        
         # Add current system metrics if available
         if self.system_monitor:
             metrics = self.system_monitor.get_metrics()
             stats['current_system_metrics'] = metrics.to_dict()
+            stats['telemetry'] = self.system_monitor.telemetry.overhead()
         
         return stats
     
@@ -1398,6 +1530,11 @@ class VeraLogger:
         print(f"  Thoughts captured: {stats['thoughts_captured']}")
         print(f"  Tools executed: {stats['tools_executed']}")
         print(f"  Stack traces captured: {stats['stack_traces_captured']}")
+        print(f"  Provenance captured: {stats['provenance_captured']}")
+        if 'async_logging' in stats:
+            a = stats['async_logging']
+            print(f"  Async writer: {a['written']} written, {a['dropped']} dropped, "
+                  f"high water {a['high_water']}/{a['capacity']}")
         
         # LLM stats
         if stats['llm_calls'] > 0:
@@ -1422,6 +1559,9 @@ class VeraLogger:
     def __del__(self):
         """Cleanup on deletion"""
         self.stop_system_metrics_logging()
+        dispatcher = getattr(self, '_dispatcher', None)
+        if dispatcher is not None:
+            dispatcher.close()
 
 
 class JSONFormatter(logging.Formatter):
@@ -1474,8 +1614,77 @@ def configure_logging(config: LoggingConfig):
     _global_logger = VeraLogger(config, "vera")
 
 
+def benchmark_logging(n: int = 20000) -> Dict[str, Any]:
+    """
+    Caller-side cost per VeraLogger.info() call: synchronous output with
+    provenance on every call (the previous behaviour) against the async
+    ring buffer with sampled provenance.  Console output goes to an
+    in-memory stream; file and JSON output to a temp directory.
+    """
+    import io
+    import os
+    import tempfile
+    
+    variants = {
+        "sync_full_provenance": dict(async_logging=False, provenance_sample_rate=1.0),
+        "async_sampled_provenance": dict(async_logging=True),
+    }
+    results: Dict[str, Any] = {"calls": n}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, overrides in variants.items():
+            config = LoggingConfig(
+                global_level=LogLevel.DEBUG,
+                enable_system_monitoring=False,
+                log_system_info_on_start=False,
+                system_metrics_interval=0,
+                log_file=os.path.join(tmp, f"{name}.log"),
+                log_to_json=True,
+                json_log_file=os.path.join(tmp, f"{name}.jsonl"),
+                async_buffer_size=n * 2,
+                **overrides,
+            )
+            stdout, sys.stdout = sys.stdout, io.StringIO()
+            try:
+                bench_logger = VeraLogger(config, component=f"bench.{name}")
+                t0 = time.perf_counter()
+                for i in range(n):
+                    bench_logger.info(f"benchmark message {i}")
+                caller_s = time.perf_counter() - t0
+                bench_logger.flush(timeout=120)
+                total_s = time.perf_counter() - t0
+            finally:
+                sys.stdout = stdout
+            results[name] = {
+                "caller_us_per_call": round(caller_s / n * 1e6, 2),
+                "until_written_us_per_call": round(total_s / n * 1e6, 2),
+                "provenance_captured": bench_logger.stats['provenance_captured'],
+            }
+            if bench_logger._dispatcher is not None:
+                results[name]["writer"] = bench_logger._dispatcher.stats()
+                bench_logger._dispatcher.close()
+    
+    # Provenance capture alone: previous inspect.getframeinfo path vs frame attributes
+    frame_n = min(n, 5000)
+    t0 = time.perf_counter()
+    for _ in range(frame_n):
+        inspect.getframeinfo(sys._getframe(0))
+    results["getframeinfo_us"] = round((time.perf_counter() - t0) / frame_n * 1e6, 2)
+    probe = VeraLogger.__new__(VeraLogger)
+    probe.stats = {'provenance_captured': 0}
+    probe._system_metrics_subscription = None
+    t0 = time.perf_counter()
+    for _ in range(frame_n):
+        probe._capture_provenance(skip_frames=0)
+    results["frame_attrs_us"] = round((time.perf_counter() - t0) / frame_n * 1e6, 2)
+    return results
+
+
 # Example usage and tests
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        print(json.dumps(benchmark_logging(), indent=2))
+        sys.exit(0)
+    
     print("=" * 80)
     print("VERA LOGGING SYSTEM - ENHANCED WITH SYSTEM MONITORING & TOKEN TRACKING")
     print("=" * 80)
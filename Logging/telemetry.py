@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+# Vera/Logging/telemetry.py
+
+"""
+Process-wide system telemetry.
+
+One sampler thread reads CPU, memory, swap, disk, network, load average and
+(optionally) GPU once per interval and keeps the samples in a ring buffer.
+Consumers never touch psutil themselves:
+
+    snapshot()      latest sample (a reference read, no syscalls)
+    history()       samples from the ring buffer, oldest first
+    wait_for(pred)  block until a sample satisfies ``pred`` (woken by the sampler)
+    subscribe(cb)   called on the sampler thread after each sample
+
+SystemMonitor (Logging/logging.py), ResourceMonitor (ProactiveFocus/manager.py),
+the orchestrator's TaskQueue CPU throttle and the focus manager's CPU pause
+all read the shared instance from ``get_telemetry()``, so the host is
+measured once per interval and every consumer sees the same reading.
+
+CPU usage is computed from ``cpu_times()`` deltas held by the service, so
+sampling never blocks and is not disturbed by other code calling
+``psutil.cpu_percent()``.  Slow sources — GPU (GPUtil shells out to
+nvidia-smi), battery, disk usage, CPU frequency — refresh every
+``slow_interval`` seconds and are carried forward in between.
+
+Overhead of the shared sampler vs the independent monitors it replaces:
+    python -m Vera.Logging.telemetry --bench
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import GPUtil
+    HAS_GPUTIL = True
+except ImportError:
+    HAS_GPUTIL = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProcessReading:
+    """Aggregate of the processes whose name contains a watched fragment."""
+    count: int = 0
+    cpu_percent: float = 0.0
+
+
+@dataclass
+class TelemetrySample:
+    """One reading of the host, taken by the sampler thread."""
+    timestamp: float
+    cpu_percent: float = 0.0
+    cpu_per_core: List[float] = field(default_factory=list)
+    load_avg: Optional[Tuple[float, float, float]] = None
+    cpu_freq_mhz: Optional[float] = None
+    cpu_freq_max_mhz: Optional[float] = None
+
+    memory_total_mb: float = 0.0
+    memory_used_mb: float = 0.0
+    memory_available_mb: float = 0.0
+    memory_percent: float = 0.0
+    swap_total_mb: float = 0.0
+    swap_used_mb: float = 0.0
+    swap_percent: float = 0.0
+
+    disk_total_gb: Optional[float] = None
+    disk_free_gb: Optional[float] = None
+    disk_percent: Optional[float] = None
+    disk_read_bps: float = 0.0
+    disk_write_bps: float = 0.0
+    net_sent_bps: float = 0.0
+    net_recv_bps: float = 0.0
+
+    # name, utilization, memory_used_gb, memory_total_gb, memory_percent, temperature
+    gpus: List[Dict[str, Any]] = field(default_factory=list)
+    battery_percent: Optional[float] = None
+    power_plugged: Optional[bool] = None
+    battery_time_left: Optional[int] = None
+
+    processes: Dict[str, ProcessReading] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timestamp': self.timestamp,
+            'cpu': {
+                'percent': round(self.cpu_percent, 1),
+                'per_core': [round(c, 1) for c in self.cpu_per_core],
+                'load_avg': self.load_avg,
+                'freq_mhz': self.cpu_freq_mhz,
+            },
+            'memory': {
+                'total_mb': round(self.memory_total_mb),
+                'used_mb': round(self.memory_used_mb),
+                'available_mb': round(self.memory_available_mb),
+                'percent': round(self.memory_percent, 1),
+                'swap_percent': round(self.swap_percent, 1),
+            },
+            'disk': {
+                'percent': self.disk_percent,
+                'free_gb': round(self.disk_free_gb, 2) if self.disk_free_gb is not None else None,
+                'read_bps': round(self.disk_read_bps),
+                'write_bps': round(self.disk_write_bps),
+            },
+            'network': {'sent_bps': round(self.net_sent_bps), 'recv_bps': round(self.net_recv_bps)},
+            'gpus': self.gpus,
+            'processes': {k: {'count': v.count, 'cpu_percent': round(v.cpu_percent, 1)}
+                          for k, v in self.processes.items()},
+        }
+
+
+def _cpu_busy(times) -> Tuple[float, float]:
+    """(busy, total) seconds from a cpu_times() tuple, psutil's accounting."""
+    total = sum(times)
+    # guest time is already included in user/nice on Linux
+    total -= getattr(times, 'guest', 0.0) + getattr(times, 'guest_nice', 0.0)
+    idle = times.idle + getattr(times, 'iowait', 0.0)
+    return total - idle, total
+
+
+def _cpu_delta(prev, cur) -> float:
+    busy0, total0 = _cpu_busy(prev)
+    busy1, total1 = _cpu_busy(cur)
+    if total1 <= total0:
+        return 0.0
+    return max(0.0, min(100.0, 100.0 * (busy1 - busy0) / (total1 - total0)))
+
+
+class _Subscription:
+    __slots__ = ('callback', 'every', 'last')
+
+    def __init__(self, callback: Callable[[TelemetrySample], None], every: Optional[float]):
+        self.callback = callback
+        self.every = every
+        self.last = 0.0
+
+
+class TelemetryService:
+    """
+    Shared sampler with a time-series ring buffer.
+
+    ``interval`` is the sampling period; consumers that need fresher data
+    call ``request_interval()`` and the fastest outstanding request wins.
+    The period runs from the latest sample, whoever took it, so on-demand
+    samples never leave a short CPU delta window behind them.  Processes are
+    tracked only for fragments registered with ``watch_process()``, using
+    cached ``psutil.Process`` handles so only new PIDs are inspected.
+    """
+
+    def __init__(
+        self,
+        interval: float = 2.0,
+        history_size: int = 900,
+        slow_interval: float = 15.0,
+        disk_path: Optional[str] = None,
+        enable_gpu: bool = True,
+        process_rescan_interval: float = 60.0,
+    ):
+        self.interval = interval
+        self._base_interval = interval
+        self._interval_requests: Dict[int, float] = {}
+        self.slow_interval = slow_interval
+        self.disk_path = disk_path or os.path.abspath(os.sep)
+        self.enable_gpu = enable_gpu
+        self.process_rescan_interval = process_rescan_interval
+
+        self._history: Deque[TelemetrySample] = deque(maxlen=history_size)
+        self._latest: Optional[TelemetrySample] = None
+        self._cond = threading.Condition()
+        self._sample_lock = threading.Lock()   # one sampler at a time
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._subscribers: Dict[int, _Subscription] = {}
+        self._next_sub_id = 0
+
+        # Delta state (owned by the sampler)
+        self._prev_cpu = psutil.cpu_times() if HAS_PSUTIL else None
+        self._prev_cores = psutil.cpu_times(percpu=True) if HAS_PSUTIL else None
+        self._prev_io: Optional[Tuple[float, Any, Any]] = None
+        self._slow: Dict[str, Any] = {}
+        self._last_slow = 0.0
+
+        # Watched processes
+        self._watched: Dict[str, Dict[int, Any]] = {}
+        self._known_pids: Set[int] = set()
+        self._last_rescan = 0.0
+
+        # Overhead
+        self._started_at = time.monotonic()
+        self.counters = {
+            'samples': 0, 'sample_cpu_s': 0.0, 'sample_wall_s': 0.0,
+            'callback_s': 0.0, 'callback_errors': 0, 'snapshots': 0,
+        }
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> "TelemetryService":
+        if self._running:
+            return self
+        self._running = True
+        self._wake.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="vera-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _run(self):
+        while self._running:
+            latest = self._latest
+            delay = (latest.timestamp + self.interval - time.time()) if latest else 0.0
+            if delay > 0:
+                # Woken early by stop() or a new interval: re-check the deadline
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"[Telemetry] Sample failed: {e}")
+
+    def request_interval(self, seconds: float) -> Callable[[], None]:
+        """
+        Sample at least every ``seconds`` until the returned release
+        function is called.
+        """
+        with self._cond:
+            req_id = self._next_sub_id
+            self._next_sub_id += 1
+            if seconds > 0:
+                self._interval_requests[req_id] = seconds
+            self._update_interval()
+
+        def release():
+            with self._cond:
+                if self._interval_requests.pop(req_id, None) is not None:
+                    self._update_interval()
+        return release
+
+    def _update_interval(self):
+        interval = min([self._base_interval, *self._interval_requests.values()])
+        if interval != self.interval:
+            self.interval = interval
+            self._wake.set()
+
+    def watch_process(self, name_fragment: str):
+        """Report count and CPU of processes whose name contains ``name_fragment``."""
+        key = name_fragment.lower()
+        with self._sample_lock:
+            if key not in self._watched:
+                self._watched[key] = {}
+                self._known_pids = set()   # inspect every PID once for the new fragment
+
+    # ── Sampling ──────────────────────────────────────────────────────────────
+
+    def sample(self) -> TelemetrySample:
+        """Take a sample now, publish it and run subscribers."""
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        with self._sample_lock:
+            sample = self._read()
+        with self._cond:
+            self._history.append(sample)
+            self._latest = sample
+            self.counters['samples'] += 1
+            self.counters['sample_cpu_s'] += time.process_time() - cpu_start
+            self.counters['sample_wall_s'] += time.perf_counter() - wall_start
+            self._cond.notify_all()
+            subscribers = list(self._subscribers.values())
+
+        cb_start = time.perf_counter()
+        # Half an interval of slack so jitter doesn't skip a due callback
+        slack = self.interval / 2
+        for sub in subscribers:
+            if sub.every and sample.timestamp - sub.last < sub.every - slack:
+                continue
+            sub.last = sample.timestamp
+            try:
+                sub.callback(sample)
+            except Exception as e:
+                self.counters['callback_errors'] += 1
+                logger.error(f"[Telemetry] Subscriber failed: {e}")
+        self.counters['callback_s'] += time.perf_counter() - cb_start
+        return sample
+
+    def _read(self) -> TelemetrySample:
+        now = time.time()
+        sample = TelemetrySample(timestamp=now)
+        if not HAS_PSUTIL:
+            return sample
+
+        cpu = psutil.cpu_times()
+        cores = psutil.cpu_times(percpu=True)
+        sample.cpu_percent = _cpu_delta(self._prev_cpu, cpu)
+        sample.cpu_per_core = [_cpu_delta(p, c) for p, c in zip(self._prev_cores, cores)]
+        self._prev_cpu, self._prev_cores = cpu, cores
+        if hasattr(os, 'getloadavg'):
+            sample.load_avg = os.getloadavg()
+
+        mem = psutil.virtual_memory()
+        sample.memory_total_mb = mem.total / 2**20
+        sample.memory_used_mb = mem.used / 2**20
+        sample.memory_available_mb = mem.available / 2**20
+        sample.memory_percent = mem.percent
+        swap = psutil.swap_memory()
+        sample.swap_total_mb = swap.total / 2**20
+        sample.swap_used_mb = swap.used / 2**20
+        sample.swap_percent = swap.percent
+
+        self._read_io(sample)
+        if self._watched:
+            self._read_processes(sample)
+
+        if now - self._last_slow >= self.slow_interval:
+            self._slow = self._read_slow()
+            self._last_slow = now
+        for key, value in self._slow.items():
+            setattr(sample, key, value)
+        return sample
+
+    def _read_io(self, sample: TelemetrySample):
+        mono = time.monotonic()
+        try:
+            disk = psutil.disk_io_counters()
+        except Exception:
+            disk = None
+        try:
+            net = psutil.net_io_counters()
+        except Exception:
+            net = None
+        if self._prev_io is not None:
+            prev_t, prev_disk, prev_net = self._prev_io
+            dt = max(mono - prev_t, 1e-6)
+            if disk and prev_disk:
+                sample.disk_read_bps = max(0, disk.read_bytes - prev_disk.read_bytes) / dt
+                sample.disk_write_bps = max(0, disk.write_bytes - prev_disk.write_bytes) / dt
+            if net and prev_net:
+                sample.net_sent_bps = max(0, net.bytes_sent - prev_net.bytes_sent) / dt
+                sample.net_recv_bps = max(0, net.bytes_recv - prev_net.bytes_recv) / dt
+        self._prev_io = (mono, disk, net)
+
+    def _read_processes(self, sample: TelemetrySample):
+        mono = time.monotonic()
+        if mono - self._last_rescan > self.process_rescan_interval:
+            # Forget unmatched PIDs now and then so reused PIDs are re-checked
+            self._known_pids = {pid for handles in self._watched.values() for pid in handles}
+            self._last_rescan = mono
+
+        pids = set(psutil.pids())
+        for pid in pids - self._known_pids:
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name().lower()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            for fragment, handles in self._watched.items():
+                if fragment in name:
+                    proc.cpu_percent(None)  # start the per-process delta
+                    handles[pid] = proc
+        self._known_pids = pids
+
+        for fragment, handles in self._watched.items():
+            reading = ProcessReading()
+            for pid, proc in list(handles.items()):
+                if pid not in pids:
+                    del handles[pid]
+                    continue
+                try:
+                    reading.cpu_percent += proc.cpu_percent(None)
+                    reading.count += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    del handles[pid]
+            sample.processes[fragment] = reading
+
+    def _read_slow(self) -> Dict[str, Any]:
+        slow: Dict[str, Any] = {}
+        try:
+            freq = psutil.cpu_freq()
+            if freq:
+                slow['cpu_freq_mhz'] = freq.current
+                slow['cpu_freq_max_mhz'] = freq.max
+        except Exception:
+            pass
+        try:
+            disk = psutil.disk_usage(self.disk_path)
+            slow['disk_total_gb'] = disk.total / 2**30
+            slow['disk_free_gb'] = disk.free / 2**30
+            slow['disk_percent'] = disk.percent
+        except Exception:
+            pass
+        try:
+            battery = psutil.sensors_battery()
+            if battery:
+                slow['battery_percent'] = battery.percent
+                slow['power_plugged'] = battery.power_plugged
+                slow['battery_time_left'] = battery.secsleft if battery.secsleft >= 0 else None
+        except Exception:
+            pass
+        if self.enable_gpu:
+            slow['gpus'] = self._read_gpus()
+        return slow
+
+    def _read_gpus(self) -> List[Dict[str, Any]]:
+        if HAS_GPUTIL:
+            try:
+                return [
+                    {
+                        'name': gpu.name,
+                        'utilization': gpu.load * 100,
+                        'memory_used_gb': gpu.memoryUsed / 1024,
+                        'memory_total_gb': gpu.memoryTotal / 1024,
+                        'memory_percent': gpu.memoryUtil * 100,
+                        'temperature': gpu.temperature,
+                    }
+                    for gpu in GPUtil.getGPUs()
+                ]
+            except Exception:
+                pass
+        # PyTorch fallback, only if the process already loaded it
+        torch = sys.modules.get('torch')
+        if torch is not None:
+            try:
+                if torch.cuda.is_available():
+                    gpus = []
+                    for i in range(torch.cuda.device_count()):
+                        total = torch.cuda.get_device_properties(i).total_memory / 2**30
+                        used = torch.cuda.memory_allocated(i) / 2**30
+                        gpus.append({
+                            'name': torch.cuda.get_device_name(i),
+                            'utilization': 0.0,     # not available via PyTorch
+                            'memory_used_gb': used,
+                            'memory_total_gb': total,
+                            'memory_percent': used / total * 100 if total else 0.0,
+                            'temperature': 0.0,
+                        })
+                    return gpus
+            except Exception:
+                pass
+        return []
+
+    # ── Consumers ─────────────────────────────────────────────────────────────
+
+    def snapshot(self, max_age: Optional[float] = None) -> TelemetrySample:
+        """
+        Latest sample.  Samples synchronously only when there is none yet,
+        or when ``max_age`` is given and the latest is older than that.  A
+        sample younger than half an interval is always reused: CPU is a delta
+        since the previous sample and a shorter window reads as 0% or 100%.
+        """
+        latest = self._latest
+        self.counters['snapshots'] += 1
+        if latest is None:
+            return self.sample()
+        age = time.time() - latest.timestamp
+        if max_age is not None and age > max(max_age, self.interval / 2):
+            return self.sample()
+        return latest
+
+    def history(self, seconds: Optional[float] = None, limit: Optional[int] = None) -> List[TelemetrySample]:
+        """Ring-buffer samples, oldest first, optionally limited by age or count."""
+        with self._cond:
+            samples = list(self._history)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            samples = [s for s in samples if s.timestamp >= cutoff]
+        return samples[-limit:] if limit else samples
+
+    def wait_for(
+        self,
+        predicate: Callable[[TelemetrySample], bool],
+        timeout: Optional[float] = None,
+    ) -> Optional[TelemetrySample]:
+        """
+        Block until a sample satisfies ``predicate``; returns it, or None on
+        timeout.  When the sampler thread is not running the caller samples
+        once per interval itself.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        latest = self.snapshot()
+        while not predicate(latest):
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return None
+            wait = self.interval if remaining is None else min(self.interval, remaining)
+            if self._running:
+                with self._cond:
+                    if self._latest is latest:
+                        self._cond.wait(wait)
+                latest = self._latest
+            else:
+                time.sleep(wait)
+                latest = self.sample()
+        return latest
+
+    def subscribe(
+        self,
+        callback: Callable[[TelemetrySample], None],
+        every: Optional[float] = None,
+    ) -> Callable[[], None]:
+        """
+        Call ``callback(sample)`` on the sampler thread after each sample (at
+        most once per ``every`` seconds).  Returns the unsubscribe function.
+        Callbacks should be quick; slow work belongs on the consumer's thread.
+        """
+        with self._cond:
+            sub_id = self._next_sub_id
+            self._next_sub_id += 1
+            self._subscribers[sub_id] = _Subscription(callback, every)
+
+        def unsubscribe():
+            with self._cond:
+                self._subscribers.pop(sub_id, None)
+        return unsubscribe
+
+    def overhead(self) -> Dict[str, Any]:
+        """Cost of the sampler itself: per-sample CPU/wall time and CPU share."""
+        c = self.counters
+        n = max(c['samples'], 1)
+        uptime = max(time.monotonic() - self._started_at, 1e-6)
+        return {
+            'samples': c['samples'],
+            'interval_s': self.interval,
+            'cpu_ms_per_sample': round(1000 * c['sample_cpu_s'] / n, 3),
+            'wall_ms_per_sample': round(1000 * c['sample_wall_s'] / n, 3),
+            'callback_ms_per_sample': round(1000 * c['callback_s'] / n, 3),
+            'cpu_share_percent': round(100 * c['sample_cpu_s'] / uptime, 4),
+            'subscribers': len(self._subscribers),
+            'callback_errors': c['callback_errors'],
+            'snapshots_served': c['snapshots'],
+            'watched_processes': {k: len(v) for k, v in self._watched.items()},
+        }
+
+
+_telemetry: Optional[TelemetryService] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> TelemetryService:
+    """The process-wide telemetry service, started on first use."""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = TelemetryService().start()
+    return _telemetry
+
+
+def benchmark_telemetry(ticks: int = 10) -> Dict[str, Any]:
+    """
+    Per tick, the independent monitors this service replaces each measured
+    the host themselves: SystemMonitor.get_metrics (blocking 0.1s CPU
+    window + memory/swap/disk/freq), TaskQueue.get_next (blocking 0.1s),
+    the focus manager's CPU check (blocking 0.1s) and ResourceMonitor
+    (non-blocking delta + memory).  Compares that with one shared sample
+    plus four snapshot reads, and reports how far the CPU readings of the
+    independent monitors disagreed within the same tick.
+    """
+    def legacy_tick() -> List[float]:
+        readings = [psutil.cpu_percent(interval=0.1)]          # SystemMonitor
+        psutil.cpu_freq()
+        psutil.virtual_memory()
+        psutil.swap_memory()
+        psutil.disk_usage(os.path.abspath(os.sep))
+        readings.append(psutil.cpu_percent(interval=0.1))      # TaskQueue
+        readings.append(psutil.cpu_percent(interval=0.1))      # focus manager
+        readings.append(psutil.cpu_percent(interval=None))     # ResourceMonitor
+        psutil.virtual_memory()
+        return readings
+
+    service = TelemetryService(enable_gpu=False)
+    service.sample()
+
+    def shared_tick() -> List[float]:
+        service.sample()
+        return [service.snapshot().cpu_percent for _ in range(4)]
+
+    def measure(fn) -> Dict[str, float]:
+        spreads = []
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for _ in range(ticks):
+            readings = fn()
+            spreads.append(max(readings) - min(readings))
+        return {
+            'cpu_ms_per_tick': round(1000 * (time.process_time() - cpu_start) / ticks, 2),
+            'wall_ms_per_tick': round(1000 * (time.perf_counter() - wall_start) / ticks, 2),
+            'max_cpu_reading_spread_pct': round(max(spreads), 1),
+        }
+
+    return {
+        'ticks': ticks,
+        'independent_monitors': measure(legacy_tick),
+        'shared_telemetry': measure(shared_tick),
+        'overhead': service.overhead(),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Shared system telemetry sampler")
+    parser.add_argument("--bench", action="store_true", help="compare with independent monitors")
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--watch", type=float, default=0, help="print samples for N seconds")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark_telemetry(args.ticks), indent=2))
+    elif args.watch:
+        service = TelemetryService(interval=1.0).start()
+        unsubscribe = service.subscribe(lambda s: print(json.dumps(s.to_dict())))
+        time.sleep(args.watch)
+        unsubscribe()
+        service.stop()
+        print(json.dumps(service.overhead(), indent=2))
+    else:
+        parser.print_help()
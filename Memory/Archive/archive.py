@@ -27,12 +27,17 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
+try:
+    from Vera.Memory.content_chunks import iter_content_defined_chunks, chunk_digest
+except ImportError:
+    from Memory.content_chunks import iter_content_defined_chunks, chunk_digest
+
 import psycopg2
 from psycopg2.extras import execute_values, Json
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, Boolean, 
+    create_engine, Column, Integer, BigInteger, String, Text, Boolean, 
     Float, DateTime, JSON, LargeBinary, ForeignKey, Index,
-    UniqueConstraint, CheckConstraint, Table, MetaData
+    UniqueConstraint, CheckConstraint, Table, MetaData, text as text_sql
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
@@ -90,7 +95,7 @@ class Version(Base):
     # Metadata
     entity_count = Column(Integer, default=0)
     change_count = Column(Integer, default=0)
-    size_bytes = Column(Integer, default=0)
+    size_bytes = Column(BigInteger, default=0)
     metadata = Column(JSONB, default={})
     
     # Relationships
@@ -147,7 +152,7 @@ class Snapshot(Base):
     vector_state = Column(LargeBinary)      # Compressed Chroma export
     metadata_state = Column(JSONB)
     
-    size_bytes = Column(Integer)
+    size_bytes = Column(BigInteger)  # streamed snapshot files can exceed 2 GiB
     compressed = Column(Boolean, default=True)
     
     version = relationship("Version", back_populates="snapshots")
@@ -227,7 +232,7 @@ class FileArchive(Base):
     
     # File metadata
     mime_type = Column(String(255))
-    size_bytes = Column(Integer)
+    size_bytes = Column(BigInteger)
     chunk_count = Column(Integer, default=0)
     checksum = Column(String(64))  # SHA-256
     
@@ -270,6 +275,36 @@ class FileChunk(Base):
     )
 
 
+class ContentChunk(Base):
+    """Content-addressed chunk storage (one row per unique chunk)"""
+    __tablename__ = "content_chunks"
+    
+    chunk_hash = Column(String(64), primary_key=True)  # SHA-256 of raw bytes
+    data = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer)      # raw size
+    stored_bytes = Column(Integer)    # size after compression
+    compressed = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class FileManifest(Base):
+    """A file version described as an ordered list of chunk hashes"""
+    __tablename__ = "file_manifests"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    file_id = Column(Integer, ForeignKey('file_archive.id', ondelete='CASCADE'), nullable=False, index=True)
+    checksum = Column(String(64), nullable=False)  # SHA-256 of the whole file
+    chunk_hashes = Column(ARRAY(String(64)), nullable=False)
+    size_bytes = Column(BigInteger)
+    new_chunks = Column(Integer, default=0)   # chunks first stored by this version
+    version_id = Column(Integer, ForeignKey('versions.id', ondelete='SET NULL'), index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        Index('idx_manifest_file_time', 'file_id', 'created_at'),
+    )
+
+
 class SystemMetrics(Base):
     """System performance and health metrics"""
     __tablename__ = "system_metrics"
@@ -435,17 +470,23 @@ class PostgresArchive:
     Comprehensive PostgreSQL archive system with version control.
     """
     
+    CHUNK_BATCH = 64  # unique chunks buffered per store_file existence check / flush
+    
     def __init__(
         self,
         connection_string: str,
         chunk_size: int = 1024 * 1024,  # 1MB chunks
         auto_commit: bool = True,
-        enable_compression: bool = True
+        enable_compression: bool = True,
+        snapshot_dir: str = "./Output/snapshots",
+        cdc_avg_size: int = 64 * 1024  # target content-defined chunk size
     ):
         self.connection_string = connection_string
         self.chunk_size = chunk_size
         self.auto_commit = auto_commit
         self.enable_compression = enable_compression
+        self.snapshot_dir = snapshot_dir
+        self.cdc_avg_size = cdc_avg_size
         
         # SQLAlchemy setup
         self.engine = create_engine(connection_string, pool_pre_ping=True)
@@ -453,6 +494,7 @@ class PostgresArchive:
         
         # Create tables
         Base.metadata.create_all(self.engine)
+        self._migrate_schema()
         
         # Current working state
         self.current_branch = "main"
@@ -461,6 +503,27 @@ class PostgresArchive:
         
         logger.info(f"PostgresArchive initialized on branch '{self.current_branch}'")
     
+    # Columns widened after their tables were first created; create_all
+    # does not alter existing tables, so older databases are upgraded here.
+    _BIGINT_COLUMNS = (
+        ("versions", "size_bytes"),
+        ("snapshots", "size_bytes"),
+        ("file_archive", "size_bytes"),
+        ("file_manifests", "size_bytes"),
+    )
+    
+    def _migrate_schema(self):
+        """Bring tables created by older releases up to the current models"""
+        with self.engine.begin() as conn:
+            for table, column in self._BIGINT_COLUMNS:
+                data_type = conn.execute(text_sql(
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_name = :t AND column_name = :c"
+                ), {"t": table, "c": column}).scalar()
+                if data_type == "integer":
+                    conn.execute(text_sql(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT"))
+                    logger.info(f"Migrated {table}.{column} to BIGINT")
+    
     # ================================================================
     # VERSION CONTROL
     # ================================================================
@@ -693,6 +756,19 @@ class PostgresArchive:
     # GRAPH ARCHIVING
     # ================================================================
     
+    @staticmethod
+    def _deactivate(session, query) -> bool:
+        """Retire the active row(s) a new version replaces; True if one existed.
+        
+        The partial unique indexes from sync.py allow one active row per
+        entity, so this must run in the same transaction as the insert.
+        """
+        replaced = query.filter_by(is_active=True).update(
+            {"is_active": False, "deleted_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        return bool(replaced)
+    
     def archive_graph_entity(
         self,
         entity_id: str,
@@ -701,9 +777,13 @@ class PostgresArchive:
         properties: Dict[str, Any],
         version_id: Optional[int] = None
     ) -> GraphArchive:
-        """Archive a Neo4j entity"""
+        """Archive a Neo4j entity (replaces its active archive row)"""
         session = self.Session()
         try:
+            replaced = self._deactivate(session, session.query(GraphArchive).filter(
+                GraphArchive.entity_id == entity_id,
+                GraphArchive.entity_type != EntityType.EDGE.value
+            ))
             entity = GraphArchive(
                 entity_id=entity_id,
                 entity_type=entity_type,
@@ -716,7 +796,7 @@ class PostgresArchive:
             
             # Track change
             self._track_change(
-                change_type=ChangeType.CREATE,
+                change_type=ChangeType.UPDATE if replaced else ChangeType.CREATE,
                 entity_type=EntityType.NODE,
                 entity_id=entity_id,
                 after_state={"labels": labels, "properties": properties}
@@ -743,9 +823,13 @@ class PostgresArchive:
         properties: Dict[str, Any],
         version_id: Optional[int] = None
     ) -> GraphArchive:
-        """Archive a Neo4j relationship"""
+        """Archive a Neo4j relationship (replaces its active archive row)"""
         session = self.Session()
         try:
+            replaced = self._deactivate(session, session.query(GraphArchive).filter(
+                GraphArchive.entity_id == edge_id,
+                GraphArchive.entity_type == EntityType.EDGE.value
+            ))
             edge = GraphArchive(
                 entity_id=edge_id,
                 entity_type=EntityType.EDGE.value,
@@ -760,7 +844,7 @@ class PostgresArchive:
             
             # Track change
             self._track_change(
-                change_type=ChangeType.CREATE,
+                change_type=ChangeType.UPDATE if replaced else ChangeType.CREATE,
                 entity_type=EntityType.EDGE,
                 entity_id=edge_id,
                 after_state={
@@ -832,9 +916,12 @@ class PostgresArchive:
         metadata: Dict[str, Any],
         version_id: Optional[int] = None
     ) -> VectorArchive:
-        """Archive a Chroma vector"""
+        """Archive a Chroma vector (replaces its active archive row)"""
         session = self.Session()
         try:
+            replaced = self._deactivate(session, session.query(VectorArchive).filter_by(
+                vector_id=vector_id, collection=collection
+            ))
             vector = VectorArchive(
                 vector_id=vector_id,
                 collection=collection,
@@ -848,7 +935,7 @@ class PostgresArchive:
             
             # Track change
             self._track_change(
-                change_type=ChangeType.CREATE,
+                change_type=ChangeType.UPDATE if replaced else ChangeType.CREATE,
                 entity_type=EntityType.DOCUMENT,
                 entity_id=vector_id,
                 after_state={
@@ -909,7 +996,16 @@ class PostgresArchive:
         metadata: Optional[Dict[str, Any]] = None,
         compress: Optional[bool] = None
     ) -> FileArchive:
-        """Store a large file with chunking"""
+        """
+        Store a file as content-addressed chunks.
+        
+        The file is split with content-defined boundaries, each unique chunk
+        is stored once in ``content_chunks`` and the version is recorded as a
+        ``FileManifest``.  Re-ingesting an unchanged file only updates its
+        metadata; a small edit only stores the chunks it touched.  The file
+        is streamed (one checksum pass, one chunking pass), so memory use is
+        bounded by ``CHUNK_BATCH`` chunks rather than the file size.
+        """
         session = self.Session()
         try:
             if not os.path.isfile(file_path):
@@ -919,68 +1015,119 @@ class PostgresArchive:
             file_name = os.path.basename(file_path)
             file_id = file_id or f"file_{hashlib.sha256(file_path.encode()).hexdigest()[:16]}"
             
-            # Calculate checksum
-            hasher = hashlib.sha256()
-            file_size = 0
-            
+            file_size = os.path.getsize(file_path)
             with open(file_path, 'rb') as f:
-                while chunk := f.read(self.chunk_size):
-                    hasher.update(chunk)
-                    file_size += len(chunk)
-            
+                hasher = hashlib.sha256()
+                while block := f.read(self.chunk_size):
+                    hasher.update(block)
             checksum = hasher.hexdigest()
             
-            # Create file record
-            file_record = FileArchive(
-                file_id=file_id,
-                file_name=file_name,
-                file_path=file_path,
-                size_bytes=file_size,
-                checksum=checksum,
-                compressed=compress,
-                version_id=self.current_version.id if self.current_version else None,
-                metadata=metadata or {}
-            )
+            file_record = session.query(FileArchive).filter_by(file_id=file_id).first()
             
-            session.add(file_record)
+            # Unchanged re-ingest: metadata-only
+            if file_record and file_record.checksum == checksum:
+                if metadata:
+                    file_record.metadata = {**(file_record.metadata or {}), **metadata}
+                file_record.file_path = file_path
+                session.commit()
+                logger.info(f"File {file_name} unchanged ({checksum[:8]}); metadata updated only")
+                return file_record
+            
+            hashes: List[str] = []
+            seen: Set[str] = set()
+            new_hashes: List[str] = []
+            new_bytes = 0
+            
+            def write_batch(batch: Dict[str, bytes]):
+                # Only chunks never seen before are written
+                nonlocal new_bytes
+                existing = {h for (h,) in session.query(ContentChunk.chunk_hash).filter(
+                    ContentChunk.chunk_hash.in_(list(batch))
+                )}
+                written = []
+                for h, raw in batch.items():
+                    if h in existing:
+                        continue
+                    stored = gzip.compress(raw) if compress else raw
+                    new_bytes += len(stored)
+                    new_hashes.append(h)
+                    written.append(session.merge(ContentChunk(
+                        chunk_hash=h,
+                        data=stored,
+                        size_bytes=len(raw),
+                        stored_bytes=len(stored),
+                        compressed=compress
+                    )))
+                session.flush()
+                for row in written:
+                    session.expunge(row)   # drop the chunk bytes from the identity map
+            
+            pending: Dict[str, bytes] = {}
+            with open(file_path, 'rb') as f:
+                for chunk in iter_content_defined_chunks(
+                    f, avg_size=min(self.cdc_avg_size, self.chunk_size),
+                    min_size=min(self.cdc_avg_size // 4, self.chunk_size), max_size=self.chunk_size
+                ):
+                    h = chunk_digest(chunk)
+                    hashes.append(h)
+                    if h not in seen:
+                        seen.add(h)
+                        pending[h] = chunk
+                        if len(pending) >= self.CHUNK_BATCH:
+                            write_batch(pending)
+                            pending = {}
+            if pending:
+                write_batch(pending)
+            
+            version_id = self.current_version.id if self.current_version else None
+            change_type = ChangeType.UPDATE if file_record else ChangeType.CREATE
+            if file_record is None:
+                file_record = FileArchive(
+                    file_id=file_id,
+                    file_name=file_name,
+                    metadata=metadata or {}
+                )
+                session.add(file_record)
+            elif metadata:
+                file_record.metadata = {**(file_record.metadata or {}), **metadata}
+            
+            file_record.file_name = file_name
+            file_record.file_path = file_path
+            file_record.size_bytes = file_size
+            file_record.checksum = checksum
+            file_record.chunk_count = len(hashes)
+            file_record.compressed = compress
+            file_record.compression_algo = "cas-gzip" if compress else "cas"
+            file_record.version_id = version_id
             session.flush()
             
-            # Store chunks
-            chunk_index = 0
-            with open(file_path, 'rb') as f:
-                while chunk_data := f.read(self.chunk_size):
-                    if compress:
-                        chunk_data = gzip.compress(chunk_data)
-                    
-                    chunk_checksum = hashlib.sha256(chunk_data).hexdigest()
-                    
-                    chunk = FileChunk(
-                        file_id=file_record.id,
-                        chunk_index=chunk_index,
-                        data=chunk_data,
-                        size_bytes=len(chunk_data),
-                        checksum=chunk_checksum
-                    )
-                    
-                    session.add(chunk)
-                    chunk_index += 1
-            
-            file_record.chunk_count = chunk_index
+            session.add(FileManifest(
+                file_id=file_record.id,
+                checksum=checksum,
+                chunk_hashes=hashes,
+                size_bytes=file_size,
+                new_chunks=len(new_hashes),
+                version_id=version_id
+            ))
             
             # Track change
             self._track_change(
-                change_type=ChangeType.CREATE,
+                change_type=change_type,
                 entity_type=EntityType.FILE,
                 entity_id=file_id,
                 after_state={
                     "file_name": file_name,
                     "size_bytes": file_size,
-                    "chunk_count": chunk_index
+                    "chunk_count": len(hashes),
+                    "new_chunks": len(new_hashes)
                 }
             )
             
             session.commit()
-            logger.info(f"Stored file {file_name} ({file_size} bytes, {chunk_index} chunks)")
+            logger.info(
+                f"Stored file {file_name} ({file_size} bytes, {len(hashes)} chunks, "
+                f"{len(new_hashes)} new / {new_bytes} bytes written)"
+            )
             
             return file_record
             
@@ -1003,18 +1150,34 @@ class PostgresArchive:
             if not file_record:
                 raise ValueError(f"File {file_id} not found")
             
-            # Retrieve chunks in order
-            chunks = session.query(FileChunk).filter_by(
+            manifest = session.query(FileManifest).filter_by(
                 file_id=file_record.id
-            ).order_by(FileChunk.chunk_index).all()
-            
-            # Reconstruct file
-            file_data = b''
-            for chunk in chunks:
-                chunk_data = chunk.data
-                if file_record.compressed:
-                    chunk_data = gzip.decompress(chunk_data)
-                file_data += chunk_data
+            ).order_by(FileManifest.created_at.desc(), FileManifest.id.desc()).first()
+            
+            parts = []
+            if manifest:
+                # Content-addressed layout
+                rows = session.query(ContentChunk).filter(
+                    ContentChunk.chunk_hash.in_(set(manifest.chunk_hashes))
+                ).all()
+                by_hash = {r.chunk_hash: r for r in rows}
+                for h in manifest.chunk_hashes:
+                    row = by_hash.get(h)
+                    if row is None:
+                        raise ValueError(f"Missing chunk {h[:12]} for file {file_id}")
+                    parts.append(gzip.decompress(row.data) if row.compressed else row.data)
+            else:
+                # Legacy per-file chunks
+                chunks = session.query(FileChunk).filter_by(
+                    file_id=file_record.id
+                ).order_by(FileChunk.chunk_index).all()
+                for chunk in chunks:
+                    chunk_data = chunk.data
+                    if file_record.compressed:
+                        chunk_data = gzip.decompress(chunk_data)
+                    parts.append(chunk_data)
+            
+            file_data = b''.join(parts)
             
             # Verify checksum
             checksum = hashlib.sha256(file_data).hexdigest()
@@ -1052,6 +1215,26 @@ class PostgresArchive:
         finally:
             session.close()
     
+    def prune_unreferenced_chunks(self) -> int:
+        """Delete content chunks no longer referenced by any file manifest"""
+        session = self.Session()
+        try:
+            result = session.execute(text_sql("""
+                DELETE FROM content_chunks c
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM file_manifests m WHERE c.chunk_hash = ANY(m.chunk_hashes)
+                )
+            """))
+            session.commit()
+            logger.info(f"Pruned {result.rowcount} unreferenced chunks")
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error pruning chunks: {e}")
+            raise
+        finally:
+            session.close()
+    
     # ================================================================
     # SNAPSHOTS
     # ================================================================
@@ -1061,9 +1244,21 @@ class PostgresArchive:
         name: str,
         description: Optional[str] = None,
         include_graph: bool = True,
-        include_vectors: bool = True
+        include_vectors: bool = True,
+        stream: bool = True,
+        compression: Optional[str] = None
     ) -> Snapshot:
-        """Create a complete system snapshot"""
+        """
+        Create a complete system snapshot.
+
+        By default the snapshot is streamed to an NDJSON file under
+        ``snapshot_dir`` (see snapshot_stream.py) and the Snapshot row only
+        records its path; ``stream=False`` keeps the legacy in-row blobs.
+        """
+        if stream:
+            return self._create_stream_snapshot(name, description, include_graph,
+                                                include_vectors, compression)
+        
         session = self.Session()
         try:
             logger.info(f"Creating snapshot: {name}")
@@ -1122,10 +1317,111 @@ class PostgresArchive:
         finally:
             session.close()
     
+    def _create_stream_snapshot(
+        self,
+        name: str,
+        description: Optional[str],
+        include_graph: bool,
+        include_vectors: bool,
+        compression: Optional[str]
+    ) -> Snapshot:
+        """Stream archive rows to a compressed NDJSON file with bounded memory"""
+        try:
+            from Vera.Memory.Archive.snapshot_stream import (
+                SnapshotWriter, export_to_file, snapshot_path, SNAPSHOT_FORMAT
+            )
+        except ImportError:
+            from Memory.Archive.snapshot_stream import (
+                SnapshotWriter, export_to_file, snapshot_path, SNAPSHOT_FORMAT
+            )
+        
+        logger.info(f"Creating streamed snapshot: {name}")
+        path = snapshot_path(self.snapshot_dir, name, compression)
+        version_id = self.current_version.id if self.current_version else None
+        started = time.time()
+        
+        conn = self.engine.raw_connection()
+        try:
+            with SnapshotWriter(path, compression, meta={
+                "name": name,
+                "graph_included": include_graph,
+                "vectors_included": include_vectors,
+            }) as writer:
+                counts = export_to_file(conn, writer, include_graph, include_vectors)
+            conn.rollback()  # read-only; release the server-side cursors' snapshot
+        finally:
+            conn.close()
+        
+        size_bytes = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            hasher = hashlib.sha256()
+            while block := f.read(self.chunk_size):
+                hasher.update(block)
+        
+        session = self.Session()
+        try:
+            snapshot = Snapshot(
+                snapshot_hash=hasher.hexdigest(),
+                version_id=version_id,
+                name=name,
+                description=description,
+                size_bytes=size_bytes,
+                compressed=True,
+                metadata_state={
+                    "format": SNAPSHOT_FORMAT,
+                    "path": os.path.abspath(path),
+                    "counts": counts,
+                    "graph_included": include_graph,
+                    "vectors_included": include_vectors,
+                    "export_seconds": round(time.time() - started, 3)
+                }
+            )
+            session.add(snapshot)
+            session.commit()
+            
+            logger.info(f"Created snapshot {snapshot.snapshot_hash[:8]} ({size_bytes} bytes) at {path}")
+            return snapshot
+            
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error creating snapshot: {e}")
+            raise
+        finally:
+            session.close()
+    
+    def restore_snapshot(self, snapshot_hash: str) -> Dict[str, int]:
+        """Restore archive state from a snapshot by hash"""
+        session = self.Session()
+        try:
+            snapshot = session.query(Snapshot).filter_by(snapshot_hash=snapshot_hash).first()
+            if not snapshot:
+                raise ValueError(f"Snapshot {snapshot_hash} not found")
+            counts = self._restore_snapshot(session, snapshot)
+            session.commit()
+            return counts or {}
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error restoring snapshot: {e}")
+            raise
+        finally:
+            session.close()
+    
     def _restore_snapshot(self, session, snapshot: Snapshot):
         """Restore system state from snapshot"""
         logger.info(f"Restoring snapshot {snapshot.snapshot_hash[:8]}")
         
+        meta = snapshot.metadata_state or {}
+        if meta.get("path"):
+            # Streamed snapshot — restore on the session's own transaction
+            try:
+                from Vera.Memory.Archive.snapshot_stream import restore_from_file
+            except ImportError:
+                from Memory.Archive.snapshot_stream import restore_from_file
+            raw_conn = session.connection().connection
+            counts = restore_from_file(raw_conn, meta["path"], version_id=snapshot.version_id)
+            logger.info(f"Restored {counts} from {meta['path']}")
+            return counts
+        
         # Restore graph
         if snapshot.graph_state:
             graph_json = gzip.decompress(snapshot.graph_state)
@@ -1141,6 +1437,7 @@ class PostgresArchive:
                     entity_type=node["type"],
                     labels=node["labels"],
                     properties=node["properties"],
+                    version_id=snapshot.version_id,
                     is_active=True
                 )
                 session.add(entity)
@@ -1154,6 +1451,7 @@ class PostgresArchive:
                     target_id=edge["target"],
                     relationship_type=edge["type"],
                     properties=edge["properties"],
+                    version_id=snapshot.version_id,
                     is_active=True
                 )
                 session.add(entity)
@@ -1173,6 +1471,7 @@ class PostgresArchive:
                     text=vector["text"],
                     embedding=vector["embedding"],
                     metadata=vector["metadata"],
+                    version_id=snapshot.version_id,
                     is_active=True
                 )
                 session.add(vec_entity)
@@ -1696,10 +1995,25 @@ class HybridMemoryWithArchive:
     Wrapper to integrate PostgreSQL archive with HybridMemory
     """
     
-    def __init__(self, hybrid_memory, postgres_archive: PostgresArchive):
+    def __init__(self, hybrid_memory, postgres_archive: PostgresArchive, sync_batch_size: int = 1000):
         self.memory = hybrid_memory
         self.archive = postgres_archive
         self._operation_id = None
+        self._sync_batch_size = sync_batch_size
+        self._sync_engine = None
+
+    @property
+    def sync_engine(self):
+        """Incremental CDC sync engine (see sync.py), created on first use."""
+        if self._sync_engine is None:
+            try:
+                from Vera.Memory.Archive.sync import ArchiveSyncEngine
+            except ImportError:
+                from Memory.Archive.sync import ArchiveSyncEngine
+            self._sync_engine = ArchiveSyncEngine(
+                self.memory, self.archive, batch_size=self._sync_batch_size
+            )
+        return self._sync_engine
     
     def begin_operation(self, description: str, author: str = "system") -> str:
         """Begin a tracked operation"""
@@ -1723,8 +2037,19 @@ class HybridMemoryWithArchive:
         self._operation_id = None
         return version
     
-    def sync_graph_to_archive(self):
-        """Sync Neo4j graph to PostgreSQL archive"""
+    def sync_graph_to_archive(self, full: bool = False):
+        """
+        Sync Neo4j graph changes since the last checkpoint to the archive.
+        ``full=True`` re-archives every node and edge row by row, replacing
+        each one's active archive row (slow; for repairing the archive).
+        """
+        if not full:
+            return self.sync_engine.sync_graph()
+        try:
+            from Vera.Memory.Archive.sync import _edge_entity_id
+        except ImportError:
+            from Memory.Archive.sync import _edge_entity_id
+
         logger.info("Syncing graph to archive...")
         
         # Get all entities from Neo4j
@@ -1744,19 +2069,26 @@ class HybridMemoryWithArchive:
             edge_result = sess.run("MATCH (a)-[r:REL]->(b) RETURN a.id AS src, b.id AS dst, r")
             for record in edge_result:
                 rel = record["r"]
-                edge_id = f"{record['src']}-{record['dst']}-{rel.get('rel', 'REL')}"
+                edge_id = _edge_entity_id(record["src"], record["dst"], rel.get("rel") or "REL")
                 self.archive.archive_graph_edge(
                     edge_id=edge_id,
                     source_id=record["src"],
                     target_id=record["dst"],
-                    relationship_type=rel.get("rel", "REL"),
+                    relationship_type=rel.get("rel") or "REL",
                     properties=dict(rel)
                 )
         
         logger.info("Graph sync complete")
     
-    def sync_vectors_to_archive(self):
-        """Sync Chroma vectors to PostgreSQL archive"""
+    def sync_vectors_to_archive(self, full: bool = False):
+        """
+        Sync vector-store changes since the last checkpoint to the archive.
+        ``full=True`` re-archives the whole long_term_docs collection,
+        replacing each vector's active archive row.
+        """
+        if not full:
+            return self.sync_engine.sync_vectors()
+
         logger.info("Syncing vectors to archive...")
         
         # Sync long-term documents
@@ -1775,11 +2107,15 @@ class HybridMemoryWithArchive:
         
         logger.info("Vector sync complete")
     
+    def sync_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stream sync lag, rows and rows/sec"""
+        return self.sync_engine.metrics()
+    
     def create_full_backup(self, backup_name: str) -> Snapshot:
         """Create a complete backup of the system"""
         logger.info(f"Creating full backup: {backup_name}")
         
-        # Sync everything first
+        # Bring the archive up to date (incremental since last checkpoint)
         self.sync_graph_to_archive()
         self.sync_vectors_to_archive()
         
@@ -2099,9 +2435,11 @@ integrated.commit_operation("Processed user query", tag="query-v1.0")
 # Create periodic backups
 integrated.create_full_backup("daily_backup_2024_01_15")
 
-# Sync to archive
+# Sync to archive (incremental; run integrated.sync_engine.backfill_sequence()
+# once on graphs created before nodes carried updated_at)
 integrated.sync_graph_to_archive()
 integrated.sync_vectors_to_archive()
+print(integrated.sync_metrics())
 
 KEY FEATURES:
 
@@ -2132,8 +2470,8 @@ KEY FEATURES:
 
 6. Snapshots:
    - Point-in-time backups
-   - Compressed storage
-   - Fast restoration
+   - Streamed NDJSON files (gzip/zstd), packed float32 embeddings
+   - Bounded-memory export and restoration
 
 BEST PRACTICES:
 
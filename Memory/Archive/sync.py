@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+"""
+Incremental (change-data-capture) sync from the live graph / vector store
+into PostgresArchive.
+
+The old ``HybridMemoryWithArchive.sync_graph_to_archive`` walked the whole
+Neo4j graph and inserted one archive row per entity per call, so each sync
+cost grew with total history.  This engine instead follows a watermark:
+
+- Neo4j ``Entity`` nodes and ``REL`` edges carry ``updated_at`` (epoch ms,
+  set by ``GraphClient`` on every write, indexed).
+- Vector metadata carries ``updated_at`` (epoch ms, set by
+  ``HybridVectorStore.add_texts``).  Vectors written before that carry
+  none and are stamped by ``backfill_sequence``.
+- Each stream (nodes / edges / vectors:<collection>) has a checkpoint row in
+  ``archive_sync_state``.  A run pulls only rows changed after the
+  checkpoint, in keyset-paginated batches ordered by ``(updated_at, key)``.
+- Each batch is upserted with ``execute_values`` and the checkpoint is
+  advanced in the same Postgres transaction, so a crashed run resumes from
+  the last committed batch and re-runs are idempotent.
+- Rows newer than ``now - settle_ms`` are left for the next run, so writes
+  whose transactions commit slightly out of timestamp order are not skipped.
+- Deletes leave no row to follow, so the engine listens for ``GraphClient``
+  "node_delete" events and retires the node's archive rows (its edges, and
+  its vector in the reported collection) at the start of the next run.
+  Deletes made while no engine is attached are not seen.
+
+Usage:
+    sync = ArchiveSyncEngine(hybrid_memory, archive)
+    sync.backfill_sequence()      # one-off: stamp legacy nodes/edges/vectors
+    sync.sync_all()
+    print(sync.metrics())
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from psycopg2.extras import execute_values, Json
+
+try:
+    from Vera.Memory.Archive.archive import PostgresArchive, ChangeType, EntityType
+except ImportError:
+    from Memory.Archive.archive import PostgresArchive, ChangeType, EntityType
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================================================
+# SCHEMA
+# =====================================================================
+
+SYNC_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS archive_sync_state (
+    stream       TEXT             PRIMARY KEY,
+    watermark    DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_key     TEXT             NOT NULL DEFAULT '',
+    rows_synced  BIGINT           NOT NULL DEFAULT 0,
+    updated_at   TIMESTAMPTZ      NOT NULL DEFAULT NOW()
+);
+"""
+
+# Upserts need one active row per logical entity.  Older full syncs appended
+# a new active row per run, so collapse those duplicates before indexing.
+DEDUPE_GRAPH = """
+UPDATE graph_archive g SET is_active = FALSE, deleted_at = NOW()
+FROM (
+    SELECT entity_id, (entity_type = 'EDGE') AS is_edge, MAX(id) AS keep_id
+    FROM graph_archive WHERE is_active
+    GROUP BY 1, 2 HAVING COUNT(*) > 1
+) d
+WHERE g.is_active
+  AND g.entity_id = d.entity_id
+  AND (g.entity_type = 'EDGE') = d.is_edge
+  AND g.id <> d.keep_id;
+"""
+
+DEDUPE_VECTORS = """
+UPDATE vector_archive v SET is_active = FALSE, deleted_at = NOW()
+FROM (
+    SELECT vector_id, collection, MAX(id) AS keep_id
+    FROM vector_archive WHERE is_active
+    GROUP BY 1, 2 HAVING COUNT(*) > 1
+) d
+WHERE v.is_active
+  AND v.vector_id = d.vector_id
+  AND v.collection = d.collection
+  AND v.id <> d.keep_id;
+"""
+
+RETIRE_GRAPH = """
+UPDATE graph_archive SET is_active = FALSE, deleted_at = NOW()
+WHERE is_active
+  AND ((entity_type <> 'EDGE' AND entity_id = ANY(%(ids)s))
+       OR (entity_type = 'EDGE' AND (source_id = ANY(%(ids)s) OR target_id = ANY(%(ids)s))))
+"""
+
+RETIRE_VECTORS = """
+UPDATE vector_archive SET is_active = FALSE, deleted_at = NOW()
+WHERE is_active AND collection = %(collection)s AND vector_id = ANY(%(ids)s)
+"""
+
+UPSERT_INDEXES = {
+    "uq_graph_active_node": (
+        "CREATE UNIQUE INDEX uq_graph_active_node ON graph_archive (entity_id) "
+        "WHERE is_active AND entity_type <> 'EDGE'",
+        DEDUPE_GRAPH,
+    ),
+    "uq_graph_active_edge": (
+        "CREATE UNIQUE INDEX uq_graph_active_edge ON graph_archive (entity_id) "
+        "WHERE is_active AND entity_type = 'EDGE'",
+        DEDUPE_GRAPH,
+    ),
+    "uq_vector_active": (
+        "CREATE UNIQUE INDEX uq_vector_active ON vector_archive (vector_id, collection) "
+        "WHERE is_active",
+        DEDUPE_VECTORS,
+    ),
+}
+
+UPSERT_NODES = """
+INSERT INTO graph_archive
+    (entity_id, entity_type, labels, properties, version_id, is_active, created_at, updated_at)
+VALUES %s
+ON CONFLICT (entity_id) WHERE is_active AND entity_type <> 'EDGE'
+DO UPDATE SET
+    entity_type = EXCLUDED.entity_type,
+    labels      = EXCLUDED.labels,
+    properties  = EXCLUDED.properties,
+    version_id  = COALESCE(EXCLUDED.version_id, graph_archive.version_id),
+    updated_at  = NOW()
+"""
+
+UPSERT_EDGES = """
+INSERT INTO graph_archive
+    (entity_id, entity_type, source_id, target_id, relationship_type, properties,
+     version_id, is_active, created_at, updated_at)
+VALUES %s
+ON CONFLICT (entity_id) WHERE is_active AND entity_type = 'EDGE'
+DO UPDATE SET
+    source_id         = EXCLUDED.source_id,
+    target_id         = EXCLUDED.target_id,
+    relationship_type = EXCLUDED.relationship_type,
+    properties        = EXCLUDED.properties,
+    version_id        = COALESCE(EXCLUDED.version_id, graph_archive.version_id),
+    updated_at        = NOW()
+"""
+
+UPSERT_VECTORS = """
+INSERT INTO vector_archive
+    (vector_id, collection, text, embedding, metadata, version_id, is_active, created_at, updated_at)
+VALUES %s
+ON CONFLICT (vector_id, collection) WHERE is_active
+DO UPDATE SET
+    text       = EXCLUDED.text,
+    embedding  = EXCLUDED.embedding,
+    metadata   = EXCLUDED.metadata,
+    version_id = COALESCE(EXCLUDED.version_id, vector_archive.version_id),
+    updated_at = NOW()
+"""
+
+_TEMPLATES = {
+    UPSERT_NODES:   "(%s, %s, %s, %s, %s, TRUE, NOW(), NOW())",
+    UPSERT_EDGES:   "(%s, %s, %s, %s, %s, %s, %s, TRUE, NOW(), NOW())",
+    UPSERT_VECTORS: "(%s, %s, %s, %s, %s, %s, TRUE, NOW(), NOW())",
+}
+
+SAVE_CHECKPOINT = """
+INSERT INTO archive_sync_state (stream, watermark, last_key, rows_synced, updated_at)
+VALUES (%s, %s, %s, %s, NOW())
+ON CONFLICT (stream) DO UPDATE SET
+    watermark   = EXCLUDED.watermark,
+    last_key    = EXCLUDED.last_key,
+    rows_synced = archive_sync_state.rows_synced + EXCLUDED.rows_synced,
+    updated_at  = NOW()
+"""
+
+# Keyset-paginated change queries.  ``updated_at`` is indexed by GraphClient.
+NODE_CHANGES = """
+MATCH (n:Entity)
+WHERE n.updated_at <= $upper
+  AND (n.updated_at > $wm OR (n.updated_at = $wm AND n.id > $last_key))
+RETURN n.id AS key, n.type AS type, labels(n) AS labels,
+       properties(n) AS props, n.updated_at AS ts
+ORDER BY n.updated_at, n.id
+LIMIT $limit
+"""
+
+EDGE_CHANGES = """
+MATCH (a)-[r:REL]->(b)
+WHERE r.updated_at <= $upper
+  AND (r.updated_at > $wm OR (r.updated_at = $wm AND elementId(r) > $last_key))
+RETURN elementId(r) AS key, a.id AS src, b.id AS dst, r.rel AS rel,
+       properties(r) AS props, r.updated_at AS ts
+ORDER BY r.updated_at, key
+LIMIT $limit
+"""
+
+BACKFILL_NODES = """
+MATCH (n:Entity) WHERE n.updated_at IS NULL
+WITH n LIMIT $limit
+SET n.updated_at = timestamp()
+RETURN count(n) AS c
+"""
+
+BACKFILL_EDGES = """
+MATCH ()-[r:REL]->() WHERE r.updated_at IS NULL
+WITH r LIMIT $limit
+SET r.updated_at = timestamp()
+RETURN count(r) AS c
+"""
+
+
+# graph_archive.entity_id is String(255)
+_MAX_ENTITY_ID = 255
+
+
+def _json(value: Any) -> Json:
+    return Json(value, dumps=lambda o: json.dumps(o, default=str))
+
+
+def _edge_entity_id(src: str, dst: str, rel: str) -> str:
+    """``src-dst-rel``, or a stable digest of it when that would not fit the column."""
+    entity_id = f"{src}-{dst}-{rel}"
+    if len(entity_id) <= _MAX_ENTITY_ID:
+        return entity_id
+    return "edge:" + hashlib.sha256(entity_id.encode("utf-8")).hexdigest()
+
+
+# =====================================================================
+# METRICS
+# =====================================================================
+
+@dataclass
+class SyncStats:
+    stream: str
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    watermark: float = 0.0
+    last_run: Optional[float] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def lag_seconds(self) -> Optional[float]:
+        """Age of the newest change archived so far (None before the first sync)."""
+        if not self.watermark:
+            return None
+        return max(0.0, time.time() - self.watermark / 1000.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["rows_per_sec"] = round(self.rows_per_sec, 1)
+        d["lag_seconds"] = None if self.lag_seconds is None else round(self.lag_seconds, 3)
+        return d
+
+
+# =====================================================================
+# SYNC ENGINE
+# =====================================================================
+
+class ArchiveSyncEngine:
+    """
+    Watermark-driven incremental sync of HybridMemory into PostgresArchive.
+    """
+
+    def __init__(
+        self,
+        hybrid_memory,
+        archive: PostgresArchive,
+        batch_size: int = 1000,
+        settle_ms: int = 2000,
+        vector_collections: Optional[Dict[str, Any]] = None,
+    ):
+        self.memory = hybrid_memory
+        self.archive = archive
+        self.batch_size = batch_size
+        self.settle_ms = settle_ms
+        self._vector_collections = vector_collections
+        self._stats: Dict[str, SyncStats] = {}
+        self._schema_ready = False
+        self._deleted_nodes: set = set()
+        self._deleted_vectors: Dict[str, set] = {}
+        self._deleted_lock = threading.Lock()
+        graph = getattr(hybrid_memory, "graph", None)
+        if hasattr(graph, "add_write_listener"):
+            graph.add_write_listener(self._on_write)
+
+    # ================================================================
+    # PUBLIC API
+    # ================================================================
+
+    def sync_all(self) -> Dict[str, Dict[str, Any]]:
+        """Sync nodes, edges and vectors; return per-stream run stats."""
+        results = {}
+        results.update(self.sync_graph())
+        results.update(self.sync_vectors())
+        return results
+
+    def sync_graph(self) -> Dict[str, Dict[str, Any]]:
+        self.ensure_schema()
+        self.retire_deleted()
+        return {
+            "nodes": self._run_stream("nodes", self._node_batches, UPSERT_NODES, self._node_rows),
+            "edges": self._run_stream("edges", self._edge_batches, UPSERT_EDGES, self._edge_rows),
+        }
+
+    def sync_vectors(self) -> Dict[str, Dict[str, Any]]:
+        self.ensure_schema()
+        self.retire_deleted()
+        results = {}
+        for name, backend in self._vector_backends().items():
+            stream = f"vectors:{name}"
+            results[stream] = self._run_stream(
+                stream,
+                lambda wm, key, upper, b=backend: self._vector_batches(b, wm, key, upper),
+                UPSERT_VECTORS,
+                lambda batch, n=name: self._vector_rows(n, batch),
+            )
+        return results
+
+    def retire_deleted(self) -> int:
+        """Deactivate archive rows of nodes deleted since the last run."""
+        with self._deleted_lock:
+            nodes, self._deleted_nodes = self._deleted_nodes, set()
+            vectors, self._deleted_vectors = self._deleted_vectors, {}
+        if not nodes and not vectors:
+            return 0
+
+        retired = 0
+        conn = self.archive.engine.raw_connection()
+        try:
+            with conn.cursor() as cur:
+                if nodes:
+                    cur.execute(RETIRE_GRAPH, {"ids": sorted(nodes)})
+                    retired += cur.rowcount
+                for collection, ids in vectors.items():
+                    cur.execute(RETIRE_VECTORS, {"collection": collection, "ids": sorted(ids)})
+                    retired += cur.rowcount
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            # Keep them for the next run
+            with self._deleted_lock:
+                self._deleted_nodes |= nodes
+                for collection, ids in vectors.items():
+                    self._deleted_vectors.setdefault(collection, set()).update(ids)
+            logger.error(f"Archive sync failed to retire {len(nodes)} deleted nodes: {e}")
+            raise
+        finally:
+            conn.close()
+
+        if retired:
+            logger.info(f"Archive sync retired {retired} rows of {len(nodes)} deleted nodes")
+        return retired
+
+    def backfill_sequence(self, limit: int = 10_000) -> int:
+        """
+        One-off: stamp ``updated_at`` on nodes, edges and vectors written
+        before the sequence field existed, so the next sync picks them up.
+        """
+        total = 0
+        with self.memory.graph._driver.session() as sess:
+            for cypher in (BACKFILL_NODES, BACKFILL_EDGES):
+                while True:
+                    count = sess.run(cypher, {"limit": limit}).single()["c"]
+                    total += count
+                    if count < limit:
+                        break
+        logger.info(f"Backfilled updated_at on {total} graph elements")
+
+        for name, backend in self._vector_backends().items():
+            count = self._backfill_vectors(backend)
+            if count:
+                logger.info(f"Backfilled updated_at on {count} vectors in {name}")
+            total += count
+        return total
+
+    def reset(self, stream: Optional[str] = None):
+        """Forget checkpoints (all streams, or one) to force a full resync."""
+        self.ensure_schema()
+        conn = self.archive.engine.raw_connection()
+        try:
+            with conn.cursor() as cur:
+                if stream:
+                    cur.execute("DELETE FROM archive_sync_state WHERE stream = %s", (stream,))
+                else:
+                    cur.execute("DELETE FROM archive_sync_state")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def _on_write(self, kind: str, payload: Dict[str, Any]):
+        if kind != "node_delete" or not payload.get("id"):
+            return
+        with self._deleted_lock:
+            self._deleted_nodes.add(payload["id"])
+            if payload.get("collection"):
+                self._deleted_vectors.setdefault(payload["collection"], set()).add(payload["id"])
+
+    # ================================================================
+    # SCHEMA
+    # ================================================================
+
+    def ensure_schema(self):
+        if self._schema_ready:
+            return
+        conn = self.archive.engine.raw_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SYNC_STATE_DDL)
+                cur.execute("SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)",
+                            (list(UPSERT_INDEXES),))
+                existing = {row[0] for row in cur.fetchall()}
+                for name, (ddl, dedupe) in UPSERT_INDEXES.items():
+                    if name in existing:
+                        continue
+                    cur.execute(dedupe)
+                    if cur.rowcount:
+                        logger.info(f"Deactivated {cur.rowcount} duplicate archive rows before {name}")
+                    cur.execute(ddl)
+            conn.commit()
+        finally:
+            conn.close()
+        self._schema_ready = True
+
+    # ================================================================
+    # STREAM DRIVER
+    # ================================================================
+
+    def _run_stream(self, stream: str, fetch_batches, upsert_sql: str, to_rows) -> Dict[str, Any]:
+        template = _TEMPLATES[upsert_sql]
+        stats = self._stats.setdefault(stream, SyncStats(stream=stream))
+        conn = self.archive.engine.raw_connection()
+        started = time.perf_counter()
+        run_rows = 0
+        try:
+            watermark, last_key = self._load_checkpoint(conn, stream)
+            stats.watermark = watermark
+            upper = time.time() * 1000 - self.settle_ms
+
+            for batch in fetch_batches(watermark, last_key, upper):
+                if not batch:
+                    break
+                rows = to_rows(batch)
+                watermark, last_key = batch[-1]["ts"], str(batch[-1]["key"])
+                with conn.cursor() as cur:
+                    if rows:
+                        execute_values(cur, upsert_sql, rows, template=template,
+                                       page_size=len(rows))
+                    cur.execute(SAVE_CHECKPOINT, (stream, watermark, last_key, len(batch)))
+                conn.commit()
+
+                run_rows += len(batch)
+                stats.batches += 1
+                stats.watermark = watermark
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Archive sync of {stream} failed after {run_rows} rows: {e}")
+            raise
+        finally:
+            conn.close()
+
+        elapsed = time.perf_counter() - started
+        stats.rows += run_rows
+        stats.seconds += elapsed
+        stats.last_run = time.time()
+
+        if run_rows:
+            self.archive._track_change(
+                change_type=ChangeType.UPDATE,
+                entity_type=EntityType.EDGE if stream == "edges" else (
+                    EntityType.NODE if stream == "nodes" else EntityType.DOCUMENT
+                ),
+                entity_id=f"sync:{stream}",
+                after_state={"rows": run_rows, "watermark": stats.watermark},
+            )
+            self._log_metrics(stream, run_rows, elapsed, stats)
+
+        logger.info(
+            f"Archive sync {stream}: {run_rows} rows in {elapsed:.2f}s "
+            f"({run_rows / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+        run = {"rows": run_rows, "seconds": round(elapsed, 3)}
+        run.update(stats.to_dict())
+        return run
+
+    def _load_checkpoint(self, conn, stream: str) -> Tuple[float, str]:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT watermark, last_key FROM archive_sync_state WHERE stream = %s",
+                (stream,),
+            )
+            row = cur.fetchone()
+        return (row[0], row[1]) if row else (0.0, "")
+
+    def _log_metrics(self, stream: str, rows: int, elapsed: float, stats: SyncStats):
+        try:
+            self.archive.log_metric("archive_sync", f"{stream}.rows_per_sec",
+                                    rows / elapsed if elapsed else 0.0, "rows/s")
+            if stats.lag_seconds is not None:
+                self.archive.log_metric("archive_sync", f"{stream}.lag", stats.lag_seconds, "s")
+        except Exception as e:
+            logger.debug(f"Could not log sync metrics: {e}")
+
+    # ================================================================
+    # GRAPH SOURCES
+    # ================================================================
+
+    def _graph_batches(self, cypher: str, watermark: float, last_key: str, upper: float) -> Iterator[List[Dict]]:
+        with self.memory.graph._driver.session() as sess:
+            while True:
+                batch = [dict(r) for r in sess.run(cypher, {
+                    "wm": watermark, "last_key": last_key, "upper": upper, "limit": self.batch_size,
+                })]
+                if not batch:
+                    return
+                yield batch
+                if len(batch) < self.batch_size:
+                    return
+                watermark, last_key = batch[-1]["ts"], str(batch[-1]["key"])
+
+    def _node_batches(self, watermark, last_key, upper):
+        return self._graph_batches(NODE_CHANGES, watermark, last_key, upper)
+
+    def _edge_batches(self, watermark, last_key, upper):
+        return self._graph_batches(EDGE_CHANGES, watermark, last_key, upper)
+
+    def _version_id(self) -> Optional[int]:
+        version = self.archive.current_version
+        return version.id if version else None
+
+    def _node_rows(self, batch: List[Dict]) -> List[tuple]:
+        version_id = self._version_id()
+        return [
+            (r["key"], r.get("type") or "unknown", list(r.get("labels") or []),
+             _json(r.get("props") or {}), version_id)
+            for r in batch if r.get("key") is not None
+        ]
+
+    def _edge_rows(self, batch: List[Dict]) -> List[tuple]:
+        version_id = self._version_id()
+        rows = []
+        for r in batch:
+            rel = r.get("rel") or "REL"
+            rows.append((
+                _edge_entity_id(r["src"], r["dst"], rel), EntityType.EDGE.value,
+                r["src"], r["dst"], rel, _json(r.get("props") or {}),
+                version_id,
+            ))
+        return rows
+
+    # ================================================================
+    # VECTOR SOURCES
+    # ================================================================
+
+    def _vector_backends(self) -> Dict[str, Any]:
+        if self._vector_collections is not None:
+            return self._vector_collections
+        vec = self.memory.vec
+        backends = {"long_term_docs": getattr(vec, "_lt_backend", None),
+                    "vera_memory": getattr(vec, "_backend", None)}
+        if backends["long_term_docs"] is backends["vera_memory"]:
+            backends.pop("long_term_docs")
+        return {k: b for k, b in backends.items() if b is not None}
+
+    def _vector_batches(self, backend, watermark: float, last_key: str, upper: float) -> Iterator[List[Dict]]:
+        """
+        Chroma cannot order by metadata, so the changed ``(updated_at, id)``
+        keys are paged in first (metadata only) and sorted; documents and
+        embeddings are then fetched one batch of ids at a time, in that
+        order, so checkpoints advance monotonically, as for the graph.
+        """
+        where = {"$and": [{"updated_at": {"$gte": watermark}}, {"updated_at": {"$lte": upper}}]}
+        col = getattr(backend, "_col", None)
+
+        if col is None:
+            hits = backend.get_all(where=where)
+            items = [{"key": h["id"], "text": h.get("text"), "embedding": None,
+                      "metadata": h.get("metadata") or {},
+                      "ts": float((h.get("metadata") or {}).get("updated_at") or 0)} for h in hits]
+            items = [i for i in items if (i["ts"], i["key"]) > (watermark, last_key)]
+            items.sort(key=lambda i: (i["ts"], i["key"]))
+            for start in range(0, len(items), self.batch_size):
+                yield items[start:start + self.batch_size]
+            return
+
+        keys: List[Tuple[float, str]] = []
+        for ids, metas in self._chroma_pages(col, where, include=["metadatas"]):
+            for vid, meta in zip(ids, metas or [{}] * len(ids)):
+                key = (float((meta or {}).get("updated_at") or 0), vid)
+                if key > (watermark, last_key):
+                    keys.append(key)
+        keys.sort()
+
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            res = col.get(ids=[vid for _, vid in chunk],
+                          include=["documents", "metadatas", "embeddings"])
+            docs = res.get("documents")
+            metas = res.get("metadatas")
+            embs = res.get("embeddings")
+            found = {}
+            for i, vid in enumerate(res.get("ids") or []):
+                emb = embs[i] if embs is not None and len(embs) > i else None
+                found[vid] = {
+                    "key": vid,
+                    "text": docs[i] if docs else None,
+                    "embedding": [float(x) for x in emb] if emb is not None else None,
+                    "metadata": metas[i] if metas else {},
+                }
+            batch = []
+            for ts, vid in chunk:
+                item = found.get(vid)
+                if item is not None:     # deleted since the key scan
+                    item["ts"] = ts
+                    batch.append(item)
+            if batch:
+                yield batch
+
+    def _chroma_pages(self, col, where: Optional[Dict], include: List[str]) -> Iterator[Tuple[list, list]]:
+        """``(ids, metadatas)`` pages of a Chroma collection, ``batch_size`` at a time."""
+        offset = 0
+        while True:
+            kwargs: Dict[str, Any] = {"include": include, "limit": self.batch_size, "offset": offset}
+            if where:
+                kwargs["where"] = where
+            res = col.get(**kwargs)
+            ids = res.get("ids") or []
+            if not len(ids):
+                return
+            yield ids, res.get("metadatas")
+            offset += len(ids)
+            if len(ids) < self.batch_size:
+                return
+
+    def _backfill_vectors(self, backend) -> int:
+        """Stamp ``updated_at`` on vectors that have none; returns the count."""
+        now = int(time.time() * 1000)
+        col = getattr(backend, "_col", None)
+
+        if col is None:
+            stale = [h for h in backend.get_all()
+                     if (h.get("metadata") or {}).get("updated_at") is None]
+            if stale:
+                backend.add([h["id"] for h in stale], [h.get("text") or "" for h in stale],
+                            [dict(h.get("metadata") or {}, updated_at=now) for h in stale])
+            return len(stale)
+
+        # Stamping does not change the id set, so offset paging stays stable
+        total = 0
+        for ids, metas in self._chroma_pages(col, None, include=["metadatas"]):
+            metas = metas or [{}] * len(ids)
+            stale = [(vid, dict(meta or {}, updated_at=now))
+                     for vid, meta in zip(ids, metas)
+                     if (meta or {}).get("updated_at") is None]
+            if stale:
+                col.update(ids=[vid for vid, _ in stale], metadatas=[m for _, m in stale])
+                total += len(stale)
+        return total
+
+    def _vector_rows(self, collection: str, batch: List[Dict]) -> List[tuple]:
+        version_id = self._version_id()
+        return [
+            (v["key"], collection, v.get("text"), v.get("embedding"),
+             _json(v.get("metadata") or {}), version_id)
+            for v in batch
+        ]
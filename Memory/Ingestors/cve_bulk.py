@@ -0,0 +1,863 @@
+#!/usr/bin/env python3
+"""
+Offline bulk import of vulnerability feeds into the graph memory.
+
+``VulnerabilityIngestor`` fetches records one at a time over HTTP and writes
+each CVE with a dozen single-row Cypher round trips, so a full NVD backfill
+takes hours.  This module imports the downloadable feeds instead:
+
+    * NVD 2.0 JSON feeds  (nvdcve-2.0-<year>.json, .json.gz, .json.zip)
+    * OSV dumps           (all.zip / <ecosystem>/all.zip, or a directory
+                           of per-advisory .json files)
+
+Pipeline:
+    1. Stream   — NVD feeds are read item-by-item from the "vulnerabilities"
+                  array (ijson when a C backend is installed, otherwise an
+                  incremental ``json.JSONDecoder.raw_decode`` reader), so a
+                  feed is never fully loaded.  OSV zips are read per member.
+    2. Normalise — batches of raw records are parsed in a process pool using
+                  the ingestor's own ``_parse_nvd_cve`` / ``_parse_osv`` and
+                  turned into node and edge rows with the same deterministic
+                  ids the online ingestor uses.
+    3. Write    — each batch is written in one transaction of ``UNWIND``
+                  ``MERGE`` statements (one per label combination).
+
+Re-runs are idempotent (everything is MERGEd on deterministic ids) and
+resumable: a JSON checkpoint records, per file, how many records have been
+committed, and finished files are skipped while their size and mtime are
+unchanged.
+
+Usage:
+    importer = BulkFeedImporter(memory, checkpoint_path="./cve_bulk.ckpt.json")
+    stats = importer.run(["feeds/nvd", "feeds/osv/all.zip"])
+
+Benchmark (synthetic 250k-record NVD feed, no database):
+    python -m Vera.Memory.Ingestors.cve_bulk --records 250000
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from Vera.Memory.Ingestors.cve_ingestor import VulnerabilityIngestor, VulnerabilityRecord
+except ImportError:
+    from Memory.Ingestors.cve_ingestor import VulnerabilityIngestor, VulnerabilityRecord
+
+try:
+    import ijson
+    # The pure-python backend is slower than raw_decode; only use C backends
+    IJSON_AVAILABLE = getattr(ijson, "backend", "python") in ("yajl2_c", "yajl2_cffi")
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SOURCE_NVD = "nvd"
+SOURCE_OSV = "osv"
+
+_SOURCE_PROCESS = "cve_bulk.py:BulkFeedImporter"
+
+
+# =====================================================================
+# STREAMING READERS
+# =====================================================================
+
+def iter_json_array(fp, key: str, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yield the items of the top-level array ``key`` from a text stream
+    without loading the whole document.
+    """
+    decoder = json.JSONDecoder()
+    marker = f'"{key}"'
+    buf = ""
+    eof = False
+
+    def fill():
+        nonlocal buf, eof
+        data = fp.read(chunk_size)
+        if not data:
+            eof = True
+        buf += data
+
+    # Locate the opening bracket of the array
+    while True:
+        i = buf.find(marker)
+        if i >= 0:
+            j = buf.find("[", i + len(marker))
+            if j >= 0:
+                buf = buf[j + 1:]
+                break
+            buf = buf[i:]
+        elif len(buf) > len(marker):
+            buf = buf[-len(marker):]
+        if eof:
+            return
+        fill()
+
+    pos = 0
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                return
+            buf, pos = "", 0
+            fill()
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            buf, pos = buf[pos:], 0
+            fill()
+            continue
+        yield item
+        pos = end
+
+
+def _open_binary(path: str):
+    """Open a feed file as a binary stream (.gz and single-member .zip aware)."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zip"):
+        zf = zipfile.ZipFile(path)
+        names = [n for n in zf.namelist() if n.endswith(".json")]
+        if len(names) != 1:
+            zf.close()
+            raise ValueError(f"{path}: expected a single JSON member, found {len(names)}")
+        return zf.open(names[0])
+    return open(path, "rb")
+
+
+def iter_nvd_feed(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield ``{"cve": {...}}`` wrappers from an NVD 2.0 JSON feed file."""
+    with _open_binary(path) as raw:
+        if IJSON_AVAILABLE:
+            yield from ijson.items(raw, "vulnerabilities.item", use_float=True)
+        else:
+            text = io.TextIOWrapper(raw, encoding="utf-8")
+            yield from iter_json_array(text, "vulnerabilities")
+
+
+def iter_osv_dump(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield OSV records from an OSV zip dump or a directory of .json files."""
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    with open(os.path.join(root, name), "rb") as fh:
+                        yield json.load(fh)
+        return
+
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.endswith(".json"):
+                continue
+            with zf.open(info) as fh:
+                yield json.load(fh)
+
+
+def classify_feed(path: str) -> Optional[str]:
+    """Guess whether a path is an NVD feed or an OSV dump."""
+    name = os.path.basename(path).lower()
+    if os.path.isdir(path):
+        return SOURCE_OSV
+    if "nvdcve" in name or name.startswith("nvd"):
+        return SOURCE_NVD
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            members = [n for n in zf.namelist() if n.endswith(".json")]
+        if len(members) == 1 and "nvd" in members[0].lower():
+            return SOURCE_NVD
+        return SOURCE_OSV
+    if name.endswith((".json", ".json.gz")):
+        return SOURCE_NVD
+    return None
+
+
+def expand_paths(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Resolve files/directories into ``(path, source)`` pairs.  A directory
+    containing NVD feed files is expanded; any other directory is treated
+    as an unpacked OSV dump.
+    """
+    resolved: List[Tuple[str, str]] = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            feeds = sorted(
+                os.path.join(path, n) for n in os.listdir(path)
+                if n.lower().startswith("nvdcve") or n.lower().endswith(".zip")
+            )
+            if feeds:
+                resolved.extend((f, classify_feed(f)) for f in feeds)
+                continue
+        source = classify_feed(path)
+        if source is None:
+            logger.warning(f"[CVE-BULK] Skipping unrecognised feed: {path}")
+            continue
+        resolved.append((path, source))
+    return resolved
+
+
+# =====================================================================
+# NORMALISATION (runs in worker processes)
+# =====================================================================
+
+_gen_id = VulnerabilityIngestor._generate_id
+
+
+def _record_rows(vuln: VulnerabilityRecord, rows: Dict[str, List[Dict[str, Any]]],
+                 include_references: bool, created_at: str):
+    """Mirror ``VulnerabilityIngestor._ingest_vulnerability`` as row dicts."""
+    vuln_entity_id = _gen_id(f"vuln_{vuln.id}")
+
+    rows["vulns"].append({
+        "id": vuln_entity_id,
+        "severity": vuln.severity,
+        "created_at": created_at,
+        "props": {
+            "vuln_id": vuln.id,
+            "summary": vuln.summary,
+            "details": vuln.details,
+            "severity": vuln.severity,
+            "cvss_score": vuln.cvss_score,
+            "cvss_vector": vuln.cvss_vector,
+            "published": vuln.published,
+            "modified": vuln.modified,
+            "source": vuln.source,
+            "aliases": vuln.aliases,
+            "source_process": _SOURCE_PROCESS,
+        },
+    })
+    rows["docs"].append({
+        "entity_id": vuln_entity_id,
+        "doc_id": f"doc_{vuln.id}",
+        "text": f"{vuln.summary}\n\n{vuln.details}",
+        "source": vuln.source,
+    })
+
+    edges = rows["edges"]
+    for alias in vuln.aliases:
+        alias_id = _gen_id(f"vuln_{alias}")
+        rows["aliases"].append({
+            "id": alias_id,
+            "created_at": created_at,
+            "props": {"alias_id": alias, "primary_id": vuln.id, "source_process": _SOURCE_PROCESS},
+        })
+        edges.append({"src": vuln_entity_id, "dst": alias_id, "rel": "HAS_ALIAS", "props": {}})
+
+    for cwe_id in vuln.cwe_ids:
+        cwe_entity_id = _gen_id(f"cwe_{cwe_id}")
+        cwe_num = cwe_id.replace("CWE-", "")
+        rows["cwes"].append({
+            "id": cwe_entity_id,
+            "created_at": created_at,
+            "props": {
+                "cwe_id": cwe_id,
+                "cwe_number": cwe_num,
+                "reference_url": f"https://cwe.mitre.org/data/definitions/{cwe_num}.html",
+                "source_process": _SOURCE_PROCESS,
+            },
+        })
+        edges.append({"src": vuln_entity_id, "dst": cwe_entity_id, "rel": "EXPLOITS_WEAKNESS", "props": {}})
+
+    for pkg in vuln.affected_packages:
+        ecosystem, vendor = pkg.get("ecosystem"), pkg.get("vendor")
+        name = pkg.get("name") or "UNKNOWN"
+        pkg_entity_id = _gen_id(f"pkg_{ecosystem}:{vendor}:{name}")
+        rows["packages"].append({
+            "id": pkg_entity_id,
+            "ecosystem": ecosystem,
+            "created_at": created_at,
+            "props": {"ecosystem": ecosystem, "name": name, "vendor": vendor,
+                      "source_process": _SOURCE_PROCESS},
+        })
+        edges.append({
+            "src": vuln_entity_id, "dst": pkg_entity_id, "rel": "AFFECTS_PACKAGE",
+            "props": {
+                "version_start": pkg.get("version_start"),
+                "version_end": pkg.get("version_end"),
+                "version": pkg.get("version"),
+            },
+        })
+
+    if include_references:
+        for i, ref in enumerate(vuln.references):
+            ref_id = _gen_id(f"ref_{vuln.id}_{i}")
+            rows["refs"].append({
+                "id": ref_id,
+                "created_at": created_at,
+                "props": {"url": ref.get("url"), "source": ref.get("source"),
+                          "tags": ref.get("tags", []), "source_process": _SOURCE_PROCESS},
+            })
+            edges.append({"src": vuln_entity_id, "dst": ref_id, "rel": "HAS_REFERENCE", "props": {}})
+
+
+def normalise_batch(source: str, items: List[Dict[str, Any]],
+                    include_references: bool = True) -> Dict[str, Any]:
+    """
+    Parse a batch of raw feed records into graph rows.  Top-level so it can
+    be shipped to a ``ProcessPoolExecutor``.
+    """
+    rows: Dict[str, Any] = {k: [] for k in ("vulns", "aliases", "cwes", "packages", "refs", "edges", "docs")}
+    failed: List[Tuple[str, str]] = []
+    created_at = datetime.utcnow().isoformat()
+
+    for item in items:
+        try:
+            if source == SOURCE_NVD:
+                cve = item.get("cve") or item
+                vuln = VulnerabilityIngestor._parse_nvd_cve(cve)
+            else:
+                vuln = VulnerabilityIngestor._parse_osv(item)
+            _record_rows(vuln, rows, include_references, created_at)
+        except Exception as e:
+            rec = item.get("cve", item) if isinstance(item, dict) else {}
+            failed.append((str(rec.get("id", "UNKNOWN")), str(e)))
+
+    rows["failed"] = failed
+    return rows
+
+
+# =====================================================================
+# GRAPH WRITER
+# =====================================================================
+
+def _label(name: str) -> str:
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def _group_by(rows: List[Dict[str, Any]], key: str) -> Dict[Any, List[Dict[str, Any]]]:
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(row.get(key), []).append(row)
+    return groups
+
+
+_NODE_CYPHER = """
+UNWIND $rows AS row
+MERGE (n:Entity {{id: row.id}})
+WITH n, row, n.updated_at IS NULL AS created
+SET n:{labels}
+SET n.type = $type,
+    n += row.props
+SET n.created_at = coalesce(n.created_at, row.created_at),
+    n.created_ts = coalesce(n.created_ts, timestamp()),
+    n.updated_at = timestamp()
+RETURN row.id AS id, created
+"""
+
+_EDGE_CYPHER = """
+UNWIND $rows AS row
+MATCH (a:Entity {id: row.src})
+MATCH (b:Entity {id: row.dst})
+MERGE (a)-[r:REL {rel: row.rel}]->(b)
+WITH r, row, r.updated_at IS NULL AS created
+SET r += row.props
+SET r.updated_at = timestamp()
+RETURN row.src AS src, row.dst AS dst, row.rel AS rel, created
+"""
+
+_DOC_CYPHER = """
+UNWIND $rows AS row
+MERGE (d:Entity {id: row.doc_id})
+WITH d, row, d.updated_at IS NULL AS doc_created
+SET d:Document
+SET d.type = 'vulnerability_details',
+    d.entity_id = row.entity_id,
+    d.node_id = row.doc_id,
+    d.source = row.source
+SET d.created_at = coalesce(d.created_at, $created_at),
+    d.created_ts = coalesce(d.created_ts, timestamp()),
+    d.updated_at = timestamp()
+WITH d, row, doc_created
+MATCH (v:Entity {id: row.entity_id})
+MERGE (v)-[r:REL {rel: 'HAS_DOCUMENT'}]->(d)
+WITH row, doc_created, r.updated_at IS NULL AS created
+SET r.updated_at = timestamp()
+RETURN row.doc_id AS id, row.entity_id AS src, doc_created, created
+"""
+
+
+class BulkGraphWriter:
+    """
+    Writes normalised batches with one ``UNWIND`` statement per label set.
+    With ``memory`` set, each committed batch goes through
+    ``memory.record_bulk_write`` so write listeners and the archive see it.
+    """
+
+    def __init__(self, driver, database: Optional[str] = None, memory: Any = None):
+        self.driver = driver
+        self.database = database
+        self.memory = memory
+
+    def _session(self):
+        if self.database:
+            return self.driver.session(database=self.database)
+        return self.driver.session()
+
+    def ensure_schema(self):
+        with self._session() as sess:
+            sess.run("CREATE CONSTRAINT IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE")
+
+    def write(self, rows: Dict[str, Any], with_documents: bool = False) -> int:
+        statements: List[Tuple[str, Dict[str, Any]]] = []
+        kinds: List[Tuple[str, List[str]]] = []   # ("node", labels) | ("edge", []) | ("doc", [])
+
+        def add_nodes(group, etype, *labels):
+            cypher_labels = ":".join(_label(l) for l in labels)
+            statements.append((_NODE_CYPHER.format(labels=cypher_labels), {"rows": group, "type": etype}))
+            kinds.append(("node", ["Entity", *labels]))
+
+        for severity, group in _group_by(rows["vulns"], "severity").items():
+            add_nodes(group, "vulnerability", "Vulnerability", *([severity] if severity else []))
+        if rows["aliases"]:
+            add_nodes(rows["aliases"], "vulnerability_alias", "VulnerabilityAlias")
+        if rows["cwes"]:
+            add_nodes(rows["cwes"], "weakness", "CWE", "Weakness")
+        for ecosystem, group in _group_by(rows["packages"], "ecosystem").items():
+            add_nodes(group, "package", "Package", *([ecosystem] if ecosystem else []))
+        if rows["refs"]:
+            add_nodes(rows["refs"], "reference", "Reference")
+        if rows["edges"]:
+            statements.append((_EDGE_CYPHER, {"rows": rows["edges"]}))
+            kinds.append(("edge", []))
+        if with_documents and rows["docs"]:
+            statements.append((_DOC_CYPHER, {
+                "rows": [{k: d[k] for k in ("entity_id", "doc_id", "source")} for d in rows["docs"]],
+                "created_at": datetime.utcnow().isoformat(),
+            }))
+            kinds.append(("doc", []))
+
+        def _tx(tx):
+            return [tx.run(cypher, params).data() for cypher, params in statements]
+
+        with self._session() as sess:
+            results = sess.execute_write(_tx)
+
+        if self.memory is not None and hasattr(self.memory, "record_bulk_write"):
+            try:
+                self.memory.record_bulk_write(*self._payloads(statements, kinds, results or []))
+            except Exception as e:
+                logger.warning(f"[CVE-BULK] Write notification failed: {e}")
+        return len(statements)
+
+    @staticmethod
+    def _payloads(statements, kinds, results) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Node and edge payloads (GraphClient shape) for the rows a batch wrote"""
+        nodes: List[Dict[str, Any]] = []
+        edges: List[Dict[str, Any]] = []
+        for (_, params), (kind, labels), result in zip(statements, kinds, results):
+            if kind == "node":
+                created = {r["id"]: r["created"] for r in result}
+                nodes.extend({
+                    "id": row["id"], "type": params["type"], "labels": labels,
+                    "properties": row["props"], "created": bool(created.get(row["id"])),
+                } for row in params["rows"])
+            elif kind == "edge":
+                created = {(r["src"], r["dst"], r["rel"]): r["created"] for r in result}
+                edges.extend({
+                    "src": row["src"], "dst": row["dst"], "rel": row["rel"],
+                    "properties": row["props"], "created": bool(created[key]),
+                } for row in params["rows"]
+                    for key in [(row["src"], row["dst"], row["rel"])] if key in created)
+            else:
+                sources = {row["doc_id"]: row["source"] for row in params["rows"]}
+                for r in result:
+                    properties = {"entity_id": r["src"], "node_id": r["id"], "source": sources.get(r["id"])}
+                    nodes.append({
+                        "id": r["id"], "type": "vulnerability_details", "labels": ["Entity", "Document"],
+                        "properties": properties, "created": bool(r["doc_created"]),
+                    })
+                    edges.append({
+                        "src": r["src"], "dst": r["id"], "rel": "HAS_DOCUMENT",
+                        "properties": {}, "created": bool(r["created"]),
+                    })
+        return nodes, edges
+
+
+class _NullWriter:
+    """Counts rows instead of writing them (benchmarks / dry runs)."""
+
+    def __init__(self):
+        self.rows = 0
+
+    def ensure_schema(self):
+        pass
+
+    def write(self, rows: Dict[str, Any], with_documents: bool = False) -> int:
+        self.rows += sum(len(v) for k, v in rows.items() if k not in ("failed", "docs"))
+        return 0
+
+
+# =====================================================================
+# CHECKPOINT
+# =====================================================================
+
+class BulkCheckpoint:
+    """
+    Per-file progress, persisted atomically as JSON.  A file's progress is
+    only trusted while its size and mtime match what was recorded.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    self.files = json.load(fh).get("files", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"[CVE-BULK] Ignoring unreadable checkpoint {path}: {e}")
+
+    @staticmethod
+    def _fingerprint(path: str) -> Dict[str, Any]:
+        if os.path.isdir(path):
+            return {"size": None, "mtime": os.stat(path).st_mtime}
+        st = os.stat(path)
+        return {"size": st.st_size, "mtime": st.st_mtime}
+
+    def progress(self, path: str) -> Tuple[int, bool]:
+        """Return ``(records_committed, done)`` for a file."""
+        entry = self.files.get(path)
+        if not entry or {k: entry.get(k) for k in ("size", "mtime")} != self._fingerprint(path):
+            return 0, False
+        return entry.get("records", 0), entry.get("done", False)
+
+    def update(self, path: str, records: int, done: bool = False):
+        self.files[path] = {**self._fingerprint(path), "records": records, "done": done,
+                            "updated": datetime.utcnow().isoformat()}
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"files": self.files}, fh)
+        os.replace(tmp, self.path)
+
+
+# =====================================================================
+# IMPORTER
+# =====================================================================
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process plus its (finished) worker processes."""
+    try:
+        import resource
+        peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+@dataclass
+class BulkImportStats:
+    files: int = 0
+    files_skipped: int = 0
+    records: int = 0
+    records_skipped: int = 0
+    failed: int = 0
+    vulnerabilities: int = 0
+    packages: int = 0
+    cwes: int = 0
+    edges: int = 0
+    documents: int = 0
+    batches: int = 0
+    elapsed_s: float = 0.0
+    records_per_s: float = 0.0
+    peak_rss_mb: float = 0.0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BulkFeedImporter:
+    """
+    Streams feed files through a process pool into ``UNWIND`` batches.
+
+    Args:
+        memory: HybridMemory (uses ``memory.graph._driver`` and, when
+            ``embed_documents`` is set, ``memory.vec``).  May be None when
+            ``writer`` is given.
+        checkpoint_path: JSON file used to resume interrupted runs.
+        batch_size: Raw records per worker task / write transaction.
+        workers: Worker processes (default: CPU count - 1, min 1).  0 parses
+            inline, which is mostly useful for debugging.
+        include_references: Create Reference nodes like the online ingestor.
+        embed_documents: Also create Document nodes and embed summaries into
+            the ``long_term_docs`` collection (much slower).
+        writer: Object with ``ensure_schema()`` and ``write(rows, with_documents)``.
+    """
+
+    MAX_ERRORS = 100
+
+    def __init__(
+        self,
+        memory: Any = None,
+        checkpoint_path: Optional[str] = None,
+        batch_size: int = 2000,
+        workers: Optional[int] = None,
+        include_references: bool = True,
+        embed_documents: bool = False,
+        writer: Any = None,
+    ):
+        self.memory = memory
+        self.batch_size = batch_size
+        self.workers = max(1, (os.cpu_count() or 2) - 1) if workers is None else workers
+        self.include_references = include_references
+        self.embed_documents = embed_documents and memory is not None
+        self.checkpoint = BulkCheckpoint(checkpoint_path)
+        self.writer = writer or BulkGraphWriter(memory.graph._driver, memory=memory)
+
+        # Package / CWE nodes recur across thousands of CVEs; only MERGE once per run
+        self._seen_shared: set = set()
+
+    # -----------------------------------------------------------------
+
+    def run(self, paths: Iterable[str]) -> BulkImportStats:
+        stats = BulkImportStats()
+        started = time.perf_counter()
+        self.writer.ensure_schema()
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 0 else None
+        try:
+            for path, source in expand_paths(paths):
+                stats.files += 1
+                done_records, done = self.checkpoint.progress(path)
+                if done:
+                    stats.files_skipped += 1
+                    logger.info(f"[CVE-BULK] {path} already imported, skipping")
+                    continue
+                self._import_file(pool, path, source, done_records, stats)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        stats.elapsed_s = round(time.perf_counter() - started, 2)
+        stats.records_per_s = round(stats.records / stats.elapsed_s, 1) if stats.elapsed_s else 0.0
+        stats.peak_rss_mb = round(_peak_rss_mb(), 1)
+        logger.info(f"[CVE-BULK] Done: {stats.records} records in {stats.elapsed_s}s "
+                    f"({stats.records_per_s}/s, peak RSS {stats.peak_rss_mb} MB)")
+        return stats
+
+    def _iter_batches(self, path: str, source: str, skip: int) -> Iterator[List[Dict[str, Any]]]:
+        reader = iter_nvd_feed(path) if source == SOURCE_NVD else iter_osv_dump(path)
+        batch: List[Dict[str, Any]] = []
+        for n, item in enumerate(reader):
+            if n < skip:
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _import_file(self, pool: Optional[ProcessPoolExecutor], path: str, source: str,
+                     committed: int, stats: BulkImportStats):
+        logger.info(f"[CVE-BULK] Importing {source} feed {path}"
+                    + (f" (resuming after {committed} records)" if committed else ""))
+        stats.records_skipped += committed
+
+        # Results are consumed in submission order so the checkpoint only
+        # ever advances past records that are fully written.
+        inflight: deque = deque()
+        max_inflight = max(2, self.workers * 2)
+
+        def drain_one():
+            nonlocal committed
+            size, fut = inflight.popleft()
+            rows = fut.result() if isinstance(fut, Future) else fut
+            self._commit(rows, stats)
+            committed += size
+            stats.records += size
+            self.checkpoint.update(path, committed)
+
+        for batch in self._iter_batches(path, source, committed):
+            if pool is None:
+                inflight.append((len(batch), normalise_batch(source, batch, self.include_references)))
+            else:
+                inflight.append((len(batch), pool.submit(normalise_batch, source, batch,
+                                                         self.include_references)))
+            if len(inflight) >= max_inflight:
+                drain_one()
+        while inflight:
+            drain_one()
+
+        self.checkpoint.update(path, committed, done=True)
+
+    def _commit(self, rows: Dict[str, Any], stats: BulkImportStats):
+        for key in ("cwes", "packages"):
+            fresh = {}
+            for row in rows[key]:
+                if row["id"] not in self._seen_shared and row["id"] not in fresh:
+                    fresh[row["id"]] = row
+            rows[key] = list(fresh.values())
+
+        self.writer.write(rows, with_documents=self.embed_documents)
+        self._seen_shared.update(r["id"] for r in rows["cwes"])
+        self._seen_shared.update(r["id"] for r in rows["packages"])
+
+        if self.embed_documents and rows["docs"]:
+            self.memory.vec.add_texts(
+                collection="long_term_docs",
+                ids=[d["doc_id"] for d in rows["docs"]],
+                texts=[d["text"] for d in rows["docs"]],
+                metadatas=[{"entity_id": d["entity_id"], "node_id": d["doc_id"],
+                            "type": "vulnerability_details", "source": d["source"]}
+                           for d in rows["docs"]],
+            )
+            stats.documents += len(rows["docs"])
+
+        stats.batches += 1
+        stats.vulnerabilities += len(rows["vulns"])
+        stats.packages += len(rows["packages"])
+        stats.cwes += len(rows["cwes"])
+        stats.edges += len(rows["edges"])
+        stats.failed += len(rows["failed"])
+        for vuln_id, error in rows["failed"]:
+            if len(stats.errors) < self.MAX_ERRORS:
+                stats.errors.append({"vuln_id": vuln_id, "error": error})
+
+
+# =====================================================================
+# BENCHMARK
+# =====================================================================
+
+def write_synthetic_nvd_feed(path: str, records: int = 250_000, seed: int = 1) -> str:
+    """Write an NVD 2.0-shaped .json.gz feed of ``records`` synthetic CVEs."""
+    import random
+
+    rng = random.Random(seed)
+    vendors = [f"vendor{i}" for i in range(2000)]
+    severities = [("CRITICAL", 9.8), ("HIGH", 7.5), ("MEDIUM", 5.3), ("LOW", 2.1)]
+
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as fh:
+        fh.write('{"resultsPerPage": %d, "startIndex": 0, "totalResults": %d, '
+                 '"format": "NVD_CVE", "version": "2.0", "vulnerabilities": [' % (records, records))
+        for i in range(records):
+            sev, score = rng.choice(severities)
+            vendor = rng.choice(vendors)
+            cve = {
+                "id": f"CVE-{2000 + i % 25}-{i:06d}",
+                "published": "2024-01-01T00:00:00.000",
+                "lastModified": "2024-06-01T00:00:00.000",
+                "descriptions": [{"lang": "en", "value": f"Synthetic issue {i} in {vendor} allows "
+                                                         "remote attackers to do something bad."}],
+                "metrics": {"cvssMetricV31": [{"cvssData": {
+                    "baseScore": score, "baseSeverity": sev,
+                    "vectorString": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"}}]},
+                "weaknesses": [{"description": [{"lang": "en", "value": f"CWE-{rng.randrange(20, 900)}"}]}],
+                "configurations": [{"nodes": [{"cpeMatch": [
+                    {"vulnerable": True,
+                     "criteria": f"cpe:2.3:a:{vendor}:product{rng.randrange(5)}:{v}.0:*:*:*:*:*:*:*"}
+                    for v in range(rng.randrange(1, 4))
+                ]}]}],
+                "references": [{"url": f"https://example.org/advisory/{i}/{r}", "source": "example.org",
+                                "tags": ["Vendor Advisory"]} for r in range(2)],
+            }
+            if i:
+                fh.write(",")
+            fh.write(json.dumps({"cve": cve}, separators=(",", ":")))
+        fh.write("]}")
+    return path
+
+
+def benchmark_bulk_import(records: int = 250_000, workers: Optional[int] = None,
+                          batch_size: int = 2000, directory: Optional[str] = None,
+                          driver: Any = None) -> Dict[str, Any]:
+    """
+    Generate a synthetic feed and import it, reporting records/sec and peak
+    RSS.  Without ``driver`` rows go to a counting writer, which measures the
+    stream + normalise + batch pipeline; pass a neo4j driver to include the
+    database writes.
+    """
+    import tempfile
+
+    directory = directory or tempfile.mkdtemp(prefix="vera_cve_bulk_")
+    feed = os.path.join(directory, "nvdcve-2.0-synthetic.json.gz")
+
+    t0 = time.perf_counter()
+    write_synthetic_nvd_feed(feed, records)
+    gen_s = time.perf_counter() - t0
+
+    writer = BulkGraphWriter(driver) if driver is not None else _NullWriter()
+    importer = BulkFeedImporter(writer=writer, workers=workers, batch_size=batch_size,
+                                checkpoint_path=os.path.join(directory, "checkpoint.json"))
+    stats = importer.run([feed])
+
+    # Second run must be a no-op thanks to the checkpoint
+    rerun = BulkFeedImporter(writer=_NullWriter(), workers=workers, batch_size=batch_size,
+                             checkpoint_path=os.path.join(directory, "checkpoint.json")).run([feed])
+
+    return {
+        "feed": feed,
+        "feed_mb": round(os.path.getsize(feed) / 1e6, 1),
+        "generate_s": round(gen_s, 2),
+        "parser": "ijson" if IJSON_AVAILABLE else "raw_decode",
+        "workers": importer.workers,
+        "records": stats.records,
+        "failed": stats.failed,
+        "vulnerabilities": stats.vulnerabilities,
+        "packages": stats.packages,
+        "edges": stats.edges,
+        "elapsed_s": stats.elapsed_s,
+        "records_per_s": stats.records_per_s,
+        "peak_rss_mb": stats.peak_rss_mb,
+        "rerun_files_skipped": rerun.files_skipped,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline NVD/OSV bulk import")
+    parser.add_argument("paths", nargs="*", help="Feed files/directories to import")
+    parser.add_argument("--records", type=int, default=250_000, help="Synthetic benchmark size")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--checkpoint", default="./cve_bulk.ckpt.json")
+    parser.add_argument("--neo4j-uri", default=None)
+    parser.add_argument("--neo4j-user", default="neo4j")
+    parser.add_argument("--neo4j-password", default="password")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    driver = None
+    if args.neo4j_uri:
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(args.neo4j_uri, auth=(args.neo4j_user, args.neo4j_password))
+
+    if args.paths:
+        if driver is None:
+            parser.error("--neo4j-uri is required to import feeds")
+        result = BulkFeedImporter(writer=BulkGraphWriter(driver), workers=args.workers,
+                                  batch_size=args.batch_size,
+                                  checkpoint_path=args.checkpoint).run(args.paths).as_dict()
+    else:
+        result = benchmark_bulk_import(records=args.records, workers=args.workers,
+                                       batch_size=args.batch_size, driver=driver)
+    print(json.dumps(result, indent=2))
+    if driver is not None:
+        driver.close()
@@ -19,6 +19,9 @@ Usage:
     # Bulk ingest from NVD feed
     await ingestor.ingest_nvd_feed(start_date="2024-01-01", end_date="2024-12-31")
     
+    # Offline bulk import from downloaded feed files / OSV dumps
+    await ingestor.ingest_local_feeds(["nvdcve-2.0-2024.json.gz", "osv/all.zip"])
+    
     # Query vulnerabilities affecting specific package
     vulns = ingestor.query_package_vulnerabilities("log4j", version="2.14.1")
 """
@@ -157,7 +160,8 @@ class VulnerabilityIngestor:
         
         return None
     
-    def _parse_nvd_cve(self, cve_data: Dict[str, Any]) -> VulnerabilityRecord:
+    @staticmethod
+    def _parse_nvd_cve(cve_data: Dict[str, Any]) -> VulnerabilityRecord:
         """Parse NVD CVE JSON into normalized record"""
         cve_id = cve_data.get("id", "UNKNOWN")
         
@@ -276,7 +280,8 @@ class VulnerabilityIngestor:
         
         return None
     
-    def _parse_osv(self, osv_data: Dict[str, Any]) -> VulnerabilityRecord:
+    @staticmethod
+    def _parse_osv(osv_data: Dict[str, Any]) -> VulnerabilityRecord:
         """Parse OSV JSON into normalized record"""
         osv_id = osv_data.get("id", "UNKNOWN")
         
@@ -296,6 +301,13 @@ class VulnerabilityIngestor:
         for sev in severity_data:
             if sev.get("type") == "CVSS_V3":
                 cvss_score = sev.get("score")
+                # OSV dumps carry the vector string here, not a number
+                if isinstance(cvss_score, str):
+                    try:
+                        cvss_score = float(cvss_score)
+                    except ValueError:
+                        cvss_vector, cvss_score = cvss_score, None
+                        continue
                 # Map score to severity
                 if cvss_score >= 9.0:
                     severity = "CRITICAL"
@@ -557,7 +569,8 @@ class VulnerabilityIngestor:
         self.package_cache[cache_key] = entity_id
         return entity_id
     
-    def _generate_id(self, key: str) -> str:
+    @staticmethod
+    def _generate_id(key: str) -> str:
         """Generate consistent entity ID from key"""
         return hashlib.md5(key.encode()).hexdigest()[:16]
     
@@ -637,6 +650,24 @@ class VulnerabilityIngestor:
         
         return results
     
+    async def ingest_local_feeds(self, paths: List[str], **options) -> Dict[str, Any]:
+        """
+        Bulk import local NVD JSON feed files and OSV zip dumps without
+        touching the network.  Runs ``BulkFeedImporter`` in a worker thread;
+        see ``cve_bulk`` for the accepted ``options``.
+
+        Args:
+            paths: Feed files or directories (.json, .json.gz, .zip)
+        """
+        try:
+            from Vera.Memory.Ingestors.cve_bulk import BulkFeedImporter
+        except ImportError:
+            from Memory.Ingestors.cve_bulk import BulkFeedImporter
+
+        importer = BulkFeedImporter(self.memory, **options)
+        stats = await asyncio.to_thread(importer.run, paths)
+        return stats.as_dict()
+    
     async def ingest_osv_ecosystem(self, ecosystem: str, max_vulns: int = 1000) -> Dict[str, Any]:
         """
         Bulk ingest vulnerabilities for an entire ecosystem from OSV.
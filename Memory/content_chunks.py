@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Content-defined chunking and content addressing for file ingestion.
+
+Fixed-offset chunking (and greedy text splitters) shift every later chunk
+boundary when a few lines are inserted near the top of a file, so nothing
+after the edit deduplicates.  Here boundaries are chosen by the content of
+each line instead: a chunk ends after a line whose CRC32 hits a divisor
+(once the chunk has reached ``min_size``), or when it reaches ``max_size``.
+An edit therefore only changes the chunk(s) it touches; the boundaries
+re-synchronise on the next qualifying line.
+
+Each chunk is addressed by the SHA-256 of its bytes.  A file version is an
+ordered manifest of chunk hashes, so storage layers only need to persist /
+embed chunks whose hash they have not seen before.
+
+Used by:
+    PostgresArchive.store_file   (binary chunks, content_chunks table)
+    HybridMemory.store_file      (text sections -> embedded sub-chunks)
+"""
+
+import hashlib
+import io
+import zlib
+from typing import BinaryIO, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T", str, bytes)
+
+# Rough line length used to turn a target average chunk size into a per-line
+# boundary probability.  It only needs to be fixed (not accurate) for
+# boundaries to stay stable across edits.
+_ASSUMED_LINE_BYTES = 64
+
+
+def chunk_digest(data) -> str:
+    """SHA-256 hex digest of a chunk (str is UTF-8 encoded)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _split_long(line: T, max_size: int) -> Iterator[T]:
+    for start in range(0, len(line), max_size):
+        yield line[start:start + max_size]
+
+
+def _chunk_lines(lines: Iterable[T], empty: T, avg_size: int, min_size: int, max_size: int) -> Iterator[T]:
+    divisor = max(1, avg_size // _ASSUMED_LINE_BYTES)
+    parts: List[T] = []
+    size = 0
+
+    for raw_line in lines:
+        pieces = _split_long(raw_line, max_size) if len(raw_line) > max_size else (raw_line,)
+        for line in pieces:
+            if size and size + len(line) > max_size:
+                yield empty.join(parts)
+                parts, size = [], 0
+
+            parts.append(line)
+            size += len(line)
+
+            key = line.encode("utf-8", "surrogatepass") if isinstance(line, str) else line
+            if size >= min_size and zlib.crc32(key) % divisor == 0:
+                yield empty.join(parts)
+                parts, size = [], 0
+
+    if parts:
+        yield empty.join(parts)
+
+
+def _read_lines(fp: BinaryIO, max_size: int) -> Iterator[bytes]:
+    # readline(limit) caps a newline-free run (binary files) at max_size
+    while True:
+        line = fp.readline(max_size)
+        if not line:
+            return
+        yield line
+
+
+def iter_content_defined_chunks(
+    fp: BinaryIO,
+    avg_size: int = 64 * 1024,
+    min_size: int = 16 * 1024,
+    max_size: int = 1024 * 1024,
+) -> Iterator[bytes]:
+    """
+    Content-defined chunks of a binary stream, read line by line, so at
+    most one chunk (``max_size``) is held in memory at a time.
+    """
+    return _chunk_lines(_read_lines(fp, max_size), b"", avg_size, min_size, max_size)
+
+
+def content_defined_chunks(
+    data: bytes,
+    avg_size: int = 64 * 1024,
+    min_size: int = 16 * 1024,
+    max_size: int = 1024 * 1024,
+) -> List[bytes]:
+    """Split bytes into content-defined chunks on line boundaries."""
+    if not data:
+        return []
+    return list(iter_content_defined_chunks(io.BytesIO(data), avg_size, min_size, max_size))
+
+
+def content_defined_sections(
+    text: str,
+    avg_size: int = 8000,
+    min_size: int = 2000,
+    max_size: int = 32000,
+) -> List[str]:
+    """Split text into content-defined sections on line boundaries."""
+    if not text:
+        return []
+    return list(_chunk_lines(text.splitlines(keepends=True), "", avg_size, min_size, max_size))
+
@@ -3,16 +3,180 @@ import pandas as pd
 from typing import List, Dict, Any, Optional
 import json
 import os
+import sqlite3
 import sys
+import threading
+import time
+
+# Labels carrying an indexed change timestamp (GraphClient._ensure_indexes):
+# Entity nodes and REL edges get updated_at on every upsert, Session nodes
+# only ever get created_ts.
+CHANGE_TS_NODES = (("Entity", "updated_at"), ("Session", "created_ts"))
+CHANGE_TS_EDGES = (("REL", "updated_at"),)
+
+
+class AuditStore:
+    """
+    SQLite store for audit runs and per-entity findings.
+
+    Findings are keyed (type, key) with the same keys collect_all_issues()
+    uses, so the resolutions file applies to both.  An incremental run
+    re-checks an entity and either refreshes its finding or marks it
+    cleared, so the table always reflects the latest state of every
+    entity that has been audited.
+    """
+
+    def __init__(self, path="Output/graph_audit.db"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+        CREATE TABLE IF NOT EXISTS audit_runs (
+            run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            mode        TEXT NOT NULL,
+            started_at  REAL NOT NULL,
+            finished_at REAL,
+            watermark   INTEGER,
+            nodes_checked INTEGER DEFAULT 0,
+            edges_checked INTEGER DEFAULT 0,
+            findings    INTEGER DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS findings (
+            type        TEXT NOT NULL,
+            key         TEXT NOT NULL,
+            entity_id   TEXT,
+            status      TEXT NOT NULL DEFAULT 'open',
+            description TEXT,
+            details     TEXT,
+            first_run   INTEGER,
+            last_run    INTEGER,
+            first_seen  REAL,
+            last_seen   REAL,
+            PRIMARY KEY (type, key)
+        );
+        CREATE INDEX IF NOT EXISTS findings_status ON findings(status, type);
+        CREATE INDEX IF NOT EXISTS findings_entity ON findings(entity_id);
+        CREATE TABLE IF NOT EXISTS audit_state (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    # ── watermark ──
+
+    def get_watermark(self) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM audit_state WHERE key = 'watermark'").fetchone()
+        return int(row[0]) if row else None
+
+    def set_watermark(self, value: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO audit_state(key, value) VALUES ('watermark', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (str(value),)
+            )
+
+    # ── runs ──
+
+    def start_run(self, mode: str, watermark: Optional[int]) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO audit_runs(mode, started_at, watermark) VALUES (?, ?, ?)",
+                (mode, time.time(), watermark),
+            )
+            return cur.lastrowid
+
+    def finish_run(self, run_id: int, nodes: int, edges: int, findings: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE audit_runs SET finished_at = ?, nodes_checked = ?, edges_checked = ?, findings = ? "
+                "WHERE run_id = ?",
+                (time.time(), nodes, edges, findings, run_id),
+            )
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        cur = self._conn.execute("SELECT * FROM audit_runs ORDER BY run_id DESC LIMIT ?", (limit,))
+        cols = [c[0] for c in cur.description]
+        return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    # ── findings ──
+
+    def record(self, run_id: int, issues: List[Dict[str, Any]]):
+        """Upsert open findings (same shape as collect_all_issues() entries)."""
+        now = time.time()
+        rows = [
+            (i['type'], str(i['key']), i.get('entity_id'), i.get('description', ''),
+             json.dumps(i.get('details', {}), default=str), run_id, run_id, now, now)
+            for i in issues
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO findings(type, key, entity_id, description, details,
+                                     first_run, last_run, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(type, key) DO UPDATE SET
+                    status = 'open', description = excluded.description,
+                    details = excluded.details, last_run = excluded.last_run,
+                    last_seen = excluded.last_seen
+            """, rows)
+
+    def clear(self, run_id: int, issue_type: str, entity_ids: List[str]):
+        """Close open findings of this type on entities that were re-checked and came back clean."""
+        if not entity_ids:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE findings SET status = 'cleared', last_run = ? "
+                "WHERE type = ? AND entity_id = ? AND status = 'open' AND last_run < ?",
+                [(run_id, issue_type, eid, run_id) for eid in entity_ids],
+            )
+
+    def clear_stale(self, run_id: int, issue_types: List[str]):
+        """Close open findings of these types that run ``run_id`` did not report again."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE findings SET status = 'cleared', last_run = ? "
+                "WHERE type = ? AND status = 'open' AND last_run < ?",
+                [(run_id, issue_type, run_id) for issue_type in issue_types],
+            )
+
+    def findings(self, issue_type: Optional[str] = None, status: str = 'open',
+                 limit: int = 500) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM findings WHERE status = ?"
+        params: List[Any] = [status]
+        if issue_type:
+            sql += " AND type = ?"
+            params.append(issue_type)
+        sql += " ORDER BY last_seen DESC LIMIT ?"
+        params.append(limit)
+        cur = self._conn.execute(sql, params)
+        cols = [c[0] for c in cur.description]
+        out = []
+        for row in cur.fetchall():
+            item = dict(zip(cols, row))
+            item['details'] = json.loads(item['details'] or '{}')
+            out.append(item)
+        return out
+
+    def summary(self) -> Dict[str, int]:
+        cur = self._conn.execute(
+            "SELECT type, count(*) FROM findings WHERE status = 'open' GROUP BY type ORDER BY 2 DESC"
+        )
+        return dict(cur.fetchall())
+
 
 class Neo4jGraphAuditor:
-    def __init__(self, uri, user, password):
+    def __init__(self, uri, user, password, store_file="Output/graph_audit.db"):
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
         self.resolutions_file = "Output/graph_audit_resolutions.json"
         self.resolutions = self.load_resolutions()
+        self.store = AuditStore(store_file)
     
     def close(self):
         self.driver.close()
+        self.store.close()
     
     def load_resolutions(self):
         """Load previously saved resolutions"""
@@ -114,7 +278,7 @@ class Neo4jGraphAuditor:
         query = """
         MATCH (n)
         WHERE NOT (n)--()
-        RETURN labels(n) as labels, count(*) as count
+        RETURN labels(n) as labels, count(*) as count, collect(elementId(n)) as node_ids
         ORDER BY count DESC
         """
         return self.run_query(query)
@@ -519,6 +683,217 @@ class Neo4jGraphAuditor:
         except:
             return []
     
+    # ── Incremental audit ─────────────────────────────────────────────────
+    
+    def _changed_batches(self, since, batch_size, edges=False):
+        """Yield elementId batches changed at or after `since` (epoch ms), keyset-paged on the change-timestamp indexes"""
+        for label, prop in (CHANGE_TS_EDGES if edges else CHANGE_TS_NODES):
+            pattern = f"()-[x:{label}]->()" if edges else f"(x:{label})"
+            last_ts, last_id = since, ""
+            while True:
+                rows = self.run_query(f"""
+                MATCH {pattern}
+                WHERE x.{prop} >= $last_ts
+                WITH elementId(x) AS eid, x.{prop} AS ts
+                WHERE ts > $last_ts OR eid > $last_id
+                RETURN eid, ts
+                ORDER BY ts, eid
+                LIMIT $limit
+                """, {"last_ts": last_ts, "last_id": last_id, "limit": batch_size})
+                if not rows:
+                    break
+                yield [r['eid'] for r in rows]
+                last_ts, last_id = rows[-1]['ts'], rows[-1]['eid']
+                if len(rows) < batch_size:
+                    break
+    
+    def _check_node_batch(self, ids, high_degree_threshold=50, max_length=100):
+        """Per-node checks for one batch. Returns (issues, {type: entity ids checked})"""
+        issues = []
+        rows = self.run_query("""
+        UNWIND $ids AS eid
+        MATCH (n) WHERE elementId(n) = eid
+        RETURN eid, labels(n) AS labels, size([(n)--() | 1]) AS degree,
+               coalesce(n.name, n.title, n.id) AS identifier,
+               [k IN keys(n) | [k, n[k]]] AS props
+        """, {"ids": ids})
+        
+        checked = {'orphaned_node': [], 'high_degree_node': [], 'long_property': [], 'duplicate_nodes': []}
+        identifiers_by_label = {}
+        for row in rows:
+            eid, labels = row['eid'], row['labels']
+            checked['orphaned_node'].append(eid)
+            checked['high_degree_node'].append(eid)
+            checked['long_property'].append(eid)
+            if row['degree'] == 0:
+                issues.append({
+                    'type': 'orphaned_node', 'key': eid, 'entity_id': eid,
+                    'description': f"Orphaned node with labels {labels}",
+                    'details': {'node_id': eid, 'labels': labels},
+                })
+            elif row['degree'] > high_degree_threshold:
+                issues.append({
+                    'type': 'high_degree_node', 'key': eid, 'entity_id': eid,
+                    'description': f"High degree node ({row['degree']} connections) with labels {labels}",
+                    'details': {'node_id': eid, 'labels': labels, 'degree': row['degree']},
+                })
+            for key, raw_value in row['props']:
+                value_str = self.safe_to_string(raw_value)
+                if len(value_str) > max_length:
+                    issues.append({
+                        'type': 'long_property', 'key': f"{eid}_{key}", 'entity_id': eid,
+                        'description': f"Long property {key} ({len(value_str)} chars) in {labels}",
+                        'details': {
+                            'node_id': eid, 'labels': labels, 'key': key, 'length': len(value_str),
+                            'preview': value_str[:50] + "..." if len(value_str) > 50 else value_str,
+                        },
+                    })
+            if row['identifier'] is not None and labels:
+                identifiers_by_label.setdefault(labels[0], set()).add(self.safe_to_string(row['identifier']))
+        
+        # Duplicates: per identifier property an IN lookup (index seek where
+        # the label has one) for the batch's identifiers only
+        for label, identifiers in identifiers_by_label.items():
+            dup_rows = self.run_query(f"""
+            CALL {{
+                MATCH (m:`{label}`) WHERE m.name IN $identifiers RETURN m
+                UNION
+                MATCH (m:`{label}`) WHERE m.title IN $identifiers RETURN m
+                UNION
+                MATCH (m:`{label}`) WHERE m.id IN $identifiers RETURN m
+            }}
+            WITH coalesce(m.name, m.title, m.id) AS identifier, m
+            WHERE identifier IN $identifiers
+            WITH identifier, labels(m) AS node_labels, collect(elementId(m)) AS node_ids
+            WHERE size(node_ids) > 1
+            RETURN identifier, node_labels, size(node_ids) AS duplicate_count, node_ids
+            """, {"identifiers": list(identifiers)})
+            for dup in dup_rows:
+                issues.append({
+                    'type': 'duplicate_nodes', 'key': f"duplicate_{dup['identifier']}",
+                    'entity_id': dup['identifier'],
+                    'description': f"{dup['duplicate_count']} duplicate nodes with identifier {dup['identifier']}",
+                    'details': dup,
+                })
+            checked['duplicate_nodes'].extend(identifiers)
+        
+        return issues, checked
+    
+    def _check_edge_batch(self, ids, max_depth=3):
+        """Self-loops and short cycles through the changed relationships"""
+        issues = []
+        rows = self.run_query(f"""
+        UNWIND $ids AS eid
+        MATCH (a)-[r]->(b) WHERE elementId(r) = eid
+        WITH eid, r, a, b, head([p = (b)-[*1..{max(1, int(max_depth) - 1)}]->(a) | p]) AS p
+        RETURN eid, type(r) AS rel_type, labels(a) AS labels, a = b AS self_loop,
+               CASE WHEN p IS NULL THEN null ELSE length(p) + 1 END AS cycle_length,
+               CASE WHEN p IS NULL THEN [] ELSE [x IN relationships(p) | type(x)] END AS rel_types
+        """, {"ids": ids})
+        
+        checked = {'self_relationship': [], 'circular_reference': []}
+        for row in rows:
+            eid = row['eid']
+            checked['self_relationship'].append(eid)
+            checked['circular_reference'].append(eid)
+            if row['self_loop']:
+                issues.append({
+                    'type': 'self_relationship', 'key': eid, 'entity_id': eid,
+                    'description': f"Self relationship {row['rel_type']} on {row['labels']}",
+                    'details': {'rel_id': eid, 'rel_type': row['rel_type'], 'labels': row['labels']},
+                })
+            elif row['cycle_length']:
+                issues.append({
+                    'type': 'circular_reference', 'key': eid, 'entity_id': eid,
+                    'description': f"Cycle of length {row['cycle_length']} through {row['rel_type']} on {row['labels']}",
+                    'details': {
+                        'rel_id': eid, 'labels': row['labels'], 'path_length': row['cycle_length'],
+                        'rel_types': [row['rel_type']] + row['rel_types'],
+                    },
+                })
+        return issues, checked
+    
+    def _store_batch(self, run_id, issues, checked):
+        issues = [
+            i for i in issues
+            if not self.is_issue_ignored(i['type'], i['key']) and not self.is_issue_resolved(i['type'], i['key'])
+        ]
+        self.store.record(run_id, issues)
+        for issue_type, entity_ids in checked.items():
+            self.store.clear(run_id, issue_type, entity_ids)
+        return len(issues)
+    
+    def run_incremental_audit(self, batch_size=500, pause_s=0.05, high_degree_threshold=50,
+                              max_length=100, max_depth=3):
+        """
+        Audit only nodes and relationships changed since the last run's
+        high-water mark (the first run covers everything).  Work proceeds in
+        batches of `batch_size` with `pause_s` between them so the audit
+        never holds the database for long; findings go to the AuditStore.
+        """
+        started = time.time()
+        watermark = self.run_query("RETURN timestamp() AS now")[0]['now']
+        since = self.store.get_watermark() or 0
+        run_id = self.store.start_run("incremental", since)
+        
+        nodes = edges = found = 0
+        for ids in self._changed_batches(since, batch_size):
+            issues, checked = self._check_node_batch(ids, high_degree_threshold, max_length)
+            found += self._store_batch(run_id, issues, checked)
+            nodes += len(ids)
+            time.sleep(pause_s)
+        for ids in self._changed_batches(since, batch_size, edges=True):
+            issues, checked = self._check_edge_batch(ids, max_depth)
+            found += self._store_batch(run_id, issues, checked)
+            edges += len(ids)
+            time.sleep(pause_s)
+        
+        # Advance only after every batch succeeded; writes made during the run
+        # carry timestamps >= watermark and are picked up next time
+        self.store.set_watermark(watermark)
+        self.store.finish_run(run_id, nodes, edges, found)
+        
+        return {
+            "run_id": run_id,
+            "since": since,
+            "watermark": watermark,
+            "nodes_checked": nodes,
+            "edges_checked": edges,
+            "findings": found,
+            "duration_s": round(time.time() - started, 2),
+            "open_findings": self.store.summary(),
+        }
+    
+    def benchmark_incremental(self, churn=0.01, batch_size=500):
+        """
+        Full audit vs incremental audit after touching `churn` of Entity
+        nodes.  Touching only bumps updated_at; no data changes.
+        """
+        import tempfile
+        
+        t0 = time.time()
+        with tempfile.NamedTemporaryFile(suffix=".json") as tmp:
+            self.generate_audit_report(output_file=tmp.name)
+        full_s = time.time() - t0
+        
+        self.run_incremental_audit(batch_size=batch_size, pause_s=0)   # bring the watermark current
+        
+        total = self.run_query("MATCH (n:Entity) RETURN count(n) AS c")[0]['c']
+        touched = max(1, int(total * churn))
+        self.run_query(
+            "MATCH (n:Entity) WITH n LIMIT $n SET n.updated_at = timestamp()", {"n": touched}
+        )
+        
+        result = self.run_incremental_audit(batch_size=batch_size, pause_s=0)
+        return {
+            "entities": total,
+            "touched": touched,
+            "full_audit_s": round(full_s, 2),
+            "incremental_audit_s": result["duration_s"],
+            "speedup": round(full_s / max(result["duration_s"], 1e-3), 1),
+            "incremental": result,
+        }
+    
     def generate_audit_report(self, output_file="Output/graph_audit_report.json"):
         """Generate a comprehensive audit report"""
         print("Generating audit report...")
@@ -550,6 +925,25 @@ class Neo4jGraphAuditor:
                         return str(obj)
             json.dump(report, f, indent=2, cls=CustomEncoder)
         
+        # Findings also go to the queryable store.  Orphan and high-degree
+        # checks cover every node, so their findings this run did not report
+        # again are cleared.  The other checks are sampled (LIMITs), so the
+        # incremental watermark is left alone: advancing it would skip
+        # entities this run never looked at.
+        run_id = self.store.start_run("full", self.store.get_watermark())
+        issues = self._issues_from_results(
+            report["orphaned_nodes"], report["high_degree_nodes"], report["long_properties"],
+            report["data_type_issues"], report["duplicate_nodes"],
+        )
+        issues = [
+            i for i in issues
+            if not self.is_issue_ignored(i['type'], i['key']) and not self.is_issue_resolved(i['type'], i['key'])
+        ]
+        self.store.record(run_id, issues)
+        self.store.clear_stale(run_id, ['orphaned_node', 'high_degree_node'])
+        self.store.finish_run(run_id, report["database_statistics"]["nodeCount"],
+                              report["database_statistics"]["relCount"], len(issues))
+        
         return report
     
     def print_summary(self):
@@ -703,55 +1097,65 @@ class Neo4jGraphAuditor:
     
     def collect_all_issues(self):
         """Collect all issues from the audit"""
+        return self._issues_from_results(
+            self.find_orphaned_nodes(),
+            self.find_high_degree_nodes(threshold=50),
+            self.check_property_lengths(),
+            self.check_data_types(),
+            self.find_duplicate_nodes(),
+        )
+    
+    def _issues_from_results(self, orphans, high_degree, long_props, type_issues, duplicates):
+        """Turn whole-graph check results into issue entries"""
         issues = []
         
-        # Orphaned nodes
-        orphans = self.find_orphaned_nodes()
+        # Orphaned nodes, one per node as in _check_node_batch
         for orphan in orphans:
-            if orphan['count'] > 0:
+            for node_id in orphan.get('node_ids', []):
                 issues.append({
-                    'type': 'orphaned_nodes',
-                    'key': f"orphaned_{orphan['labels']}",
-                    'description': f"{orphan['count']} orphaned nodes with labels {orphan['labels']}",
-                    'details': orphan
+                    'type': 'orphaned_node',
+                    'key': node_id,
+                    'entity_id': node_id,
+                    'description': f"Orphaned node with labels {orphan['labels']}",
+                    'details': {'node_id': node_id, 'labels': orphan['labels']}
                 })
         
         # High degree nodes
-        high_degree = self.find_high_degree_nodes(threshold=50)
         for node in high_degree:
             issues.append({
                 'type': 'high_degree_node',
                 'key': node['node_id'],
+                'entity_id': node['node_id'],
                 'description': f"High degree node ({node['degree']} connections) with labels {node['labels']}",
                 'details': node
             })
         
         # Long properties
-        long_props = self.check_property_lengths()
         for prop in long_props:
             issues.append({
                 'type': 'long_property',
                 'key': f"{prop['node_id']}_{prop['key']}",
+                'entity_id': prop['node_id'],
                 'description': f"Long property {prop['key']} ({prop['length']} chars) in {prop['labels']}",
                 'details': prop
             })
         
         # Data type issues
-        type_issues = self.check_data_types()
         for issue in type_issues:
             issues.append({
                 'type': 'data_type_issue',
                 'key': f"{issue['node_id']}_{issue['key']}",
+                'entity_id': issue['node_id'],
                 'description': f"{issue['issue_type']} in {issue['labels']}.{issue['key']}",
                 'details': issue
             })
         
         # Duplicate nodes
-        duplicates = self.find_duplicate_nodes()
         for dup in duplicates:
             issues.append({
                 'type': 'duplicate_nodes',
                 'key': f"duplicate_{dup.get('identifier', 'unknown')}",
+                'entity_id': dup.get('identifier'),
                 'description': f"{dup['duplicate_count']} duplicate nodes with identifier {dup.get('identifier', 'unknown')}",
                 'details': dup
             })
@@ -764,7 +1168,7 @@ class Neo4jGraphAuditor:
         details = issue['details']
         
         try:
-            if issue_type == 'orphaned_nodes':
+            if issue_type == 'orphaned_node':
                 return self.resolve_orphaned_nodes("connect_to_root")
             elif issue_type == 'high_degree_node':
                 return self.resolve_high_degree_nodes(details['node_id'], "add_clustering")
@@ -783,7 +1187,7 @@ class Neo4jGraphAuditor:
         """Show manual resolution options for an issue type"""
         issue_type = issue['type']
         
-        if issue_type == 'orphaned_nodes':
+        if issue_type == 'orphaned_node':
             print("- Run: MATCH (n) WHERE NOT (n)--() DELETE n")
             print("- Create relationships to connect orphaned nodes")
             print("- Add labels to categorize orphaned nodes")
@@ -811,7 +1215,7 @@ class Neo4jGraphAuditor:
     def show_resolution_help(self, issue_type):
         """Show help for resolving specific issue types"""
         help_texts = {
-            'orphaned_nodes': """
+            'orphaned_node': """
 Orphaned nodes have no relationships. They can:
 - Be deleted if not needed
 - Be connected to other nodes
@@ -858,6 +1262,13 @@ if __name__ == "__main__":
         stats = auditor.get_database_stats()
         print("✓ Connected successfully!")
         
+        if "--incremental" in sys.argv:
+            print(json.dumps(auditor.run_incremental_audit(), indent=2))
+            sys.exit(0)
+        if "--bench" in sys.argv:
+            print(json.dumps(auditor.benchmark_incremental(churn=0.01), indent=2, default=str))
+            sys.exit(0)
+        
         # Generate report
         report = auditor.generate_audit_report()
         
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Indexed creation timestamps and cached counters for graph statistics.
+
+Creation time used to be derived per query: a regex over ``n.id`` for
+embedded 13-digit millisecond timestamps, falling back to parsing the ISO
+``created_at`` string.  Every /stats, /timerange and /recent call therefore
+scanned the whole graph.
+
+Instead, nodes now carry ``created_ts`` (epoch ms), written once by
+``GraphClient`` and range-indexed on ``INDEXED_LABELS``.  ``created_at``
+stays an ISO string for the existing readers (dashboard, context probe).
+``created_ts`` resolves the same way the old "auto" mode ordered nodes,
+except that ``updated_at`` is skipped — it is bumped on every write, so it
+says when a node last changed, not when it was created:
+
+    id timestamp -> created_at -> timestamp property
+
+``GraphStatsCounters`` holds the figures that still need a scan (nodes by
+type, relationships by their ``rel`` name, timestamp coverage).  A background recount refreshes them and
+write-event deltas from ``GraphClient`` keep them current in between, so
+reads are O(1).
+
+One-off migration for existing graphs:
+    python -m Vera.Memory.graph_stats --uri bolt://localhost:7687 --user neo4j --password ...
+"""
+import argparse
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Labels whose created_ts is range-indexed (GraphClient._ensure_indexes)
+INDEXED_LABELS = ("Entity", "Session")
+
+CREATED_TS_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.created_ts)" for label in INDEXED_LABELS
+]
+
+# Nodes with no usable timestamp get created_ts = 0: indexed, but outside
+# every real time window and excluded from "nodes_with_timestamps".
+NO_TIMESTAMP = 0
+
+_ID_TIMESTAMP = re.compile(r"_(\d{13})(?!\d)")
+_NUMERIC = re.compile(r"[-+]?\d+(\.\d+)?")
+
+
+# ============================================================
+# Timestamp resolution
+# ============================================================
+
+def timestamp_from_id(node_id: Any) -> Optional[int]:
+    """Millisecond timestamp embedded in ids like ``mem_1764443851444``."""
+    if not node_id:
+        return None
+    match = _ID_TIMESTAMP.search(str(node_id))
+    return int(match.group(1)) if match else None
+
+
+def to_epoch_ms(value: Any) -> Optional[int]:
+    """ISO string, epoch-ms number/string, datetime or neo4j temporal -> epoch ms (naive = UTC)."""
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if _NUMERIC.fullmatch(text):
+            return int(float(text)) if len(text) >= 10 else None
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00").replace(" ", "T", 1))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def created_ms(node_id: Any, properties: Optional[Dict[str, Any]] = None,
+               default: Optional[int] = None) -> Optional[int]:
+    """Creation time from the id, then ``created_at``, then ``timestamp`` (never ``updated_at``)."""
+    ts = timestamp_from_id(node_id)
+    if ts is not None:
+        return ts
+    for key in ("created_at", "timestamp"):
+        ts = to_epoch_ms((properties or {}).get(key))
+        if ts is not None:
+            return ts
+    return default
+
+
+# ============================================================
+# Migration
+# ============================================================
+
+def backfill_created_ts(driver, batch_size: int = 2000, database: Optional[str] = None) -> Dict[str, int]:
+    """
+    Set ``created_ts`` on every node that lacks it, derived from the
+    id-embedded timestamp (or created_at / timestamp).
+    Safe to re-run: nodes that already have a value are skipped.
+    """
+    stats = {"scanned": 0, "updated": 0, "no_timestamp": 0, "batches": 0}
+    started = time.perf_counter()
+
+    def write(rows):
+        with driver.session(database=database) as write_sess:
+            write_sess.execute_write(lambda tx: tx.run("""
+                UNWIND $rows AS row
+                MATCH (n)
+                WHERE elementId(n) = row.eid
+                SET n.created_ts = coalesce(n.created_ts, row.ts)
+            """, {"rows": rows}).consume())
+        stats["updated"] += len(rows)
+        stats["batches"] += 1
+
+    with driver.session(database=database) as read_sess:
+        result = read_sess.run("""
+            MATCH (n)
+            WHERE n.created_ts IS NULL
+            RETURN elementId(n) AS eid, n.id AS id, n.created_at AS created_at,
+                   n.timestamp AS timestamp
+        """)
+        rows = []
+        for record in result:
+            stats["scanned"] += 1
+            ts = created_ms(record["id"], record.data())
+            if ts is None:
+                stats["no_timestamp"] += 1
+                ts = NO_TIMESTAMP
+            rows.append({"eid": record["eid"], "ts": ts})
+            if len(rows) >= batch_size:
+                write(rows)
+                rows = []
+                if stats["batches"] % 10 == 0:
+                    logger.info(f"[GraphStats] Backfill progress: {stats}")
+        if rows:
+            write(rows)
+
+    stats["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+    logger.info(f"[GraphStats] Backfill complete: {stats}")
+    return stats
+
+
+# ============================================================
+# Indexed queries (O(1) count store / O(log n) index seeks)
+# ============================================================
+
+def live_time_stats(db_sess, since_ms: int) -> Dict[str, Any]:
+    """Totals from the count store; oldest/newest/recent from the created_ts indexes."""
+    out = {
+        "total_nodes": db_sess.run("MATCH (n) RETURN count(n) AS c").single()["c"],
+        "total_relationships": db_sess.run("MATCH ()-[r]->() RETURN count(r) AS c").single()["c"],
+    }
+    oldest = newest = None
+    recent = 0
+    for label in INDEXED_LABELS:
+        first = db_sess.run(f"""
+            MATCH (n:{label}) WHERE n.created_ts > {NO_TIMESTAMP}
+            RETURN n.created_ts AS ts ORDER BY ts ASC LIMIT 1
+        """).single()
+        last = db_sess.run(f"""
+            MATCH (n:{label}) WHERE n.created_ts > {NO_TIMESTAMP}
+            RETURN n.created_ts AS ts ORDER BY ts DESC LIMIT 1
+        """).single()
+        if first:
+            oldest = first["ts"] if oldest is None else min(oldest, first["ts"])
+        if last:
+            newest = last["ts"] if newest is None else max(newest, last["ts"])
+        recent += db_sess.run(
+            f"MATCH (n:{label}) WHERE n.created_ts >= $since RETURN count(n) AS c", {"since": since_ms}
+        ).single()["c"]
+
+    out["oldest_timestamp_ms"] = oldest
+    out["newest_timestamp_ms"] = newest
+    out["nodes_since"] = recent
+    return out
+
+
+# ============================================================
+# Cached counters
+# ============================================================
+
+class GraphStatsCounters:
+    """
+    Scan-based statistics cached between background recounts.
+
+    ``refresh(db_sess)`` does the one full pass; ``on_write`` is a
+    ``GraphClient`` write listener that adds newly created nodes/edges on
+    top until the next refresh.  ``fully_indexed`` is True once every node
+    has ``created_ts`` and every timestamped node carries an indexed label,
+    i.e. when the index-backed /timerange path returns the same rows as the
+    old scan.
+    """
+
+    def __init__(self, refresh_interval: float = 300.0, top_n: int = 20):
+        self.refresh_interval = refresh_interval
+        self.top_n = top_n
+        self.fully_indexed = False
+        self._lock = threading.Lock()
+        self._base: Optional[Dict[str, Any]] = None
+        self._refreshed_at = 0.0
+        self._refresh_ms = 0.0
+        self._node_types: Counter = Counter()
+        self._rel_types: Counter = Counter()
+        self._delta_nodes: Counter = Counter()
+        self._delta_rels: Counter = Counter()
+        self._removed_nodes: Counter = Counter()
+        self._removed_rels: Counter = Counter()
+
+    @property
+    def ready(self) -> bool:
+        return self._base is not None
+
+    def needs_refresh(self) -> bool:
+        return self._base is None or time.time() - self._refreshed_at > self.refresh_interval
+
+    def on_write(self, kind: str, payload: Dict[str, Any]):
+        if kind == "node_delete":
+            with self._lock:
+                self._removed_nodes[payload.get("type") or "unknown"] += 1
+                self._removed_rels.update(payload.get("rels") or ())
+            return
+        if not payload.get("created"):
+            return
+        with self._lock:
+            if kind == "node":
+                self._delta_nodes[payload.get("type") or "unknown"] += 1
+            elif kind == "edge":
+                self._delta_rels[payload.get("rel") or "REL"] += 1
+
+    def refresh(self, db_sess) -> Dict[str, Any]:
+        started = time.perf_counter()
+        labels = " OR ".join(f"n:{label}" for label in INDEXED_LABELS)
+        node_types: Counter = Counter()
+        with_ts = unindexed = 0
+        for r in db_sess.run(f"""
+            MATCH (n)
+            RETURN coalesce(n.type, labels(n)[0], 'unknown') AS type,
+                   count(*) AS count,
+                   count(CASE WHEN n.created_ts > {NO_TIMESTAMP} THEN 1 END) AS with_ts,
+                   count(CASE WHEN n.created_ts IS NULL
+                                OR (n.created_ts > {NO_TIMESTAMP} AND NOT ({labels})) THEN 1 END) AS unindexed
+        """):
+            node_types[r["type"]] += r["count"]
+            with_ts += r["with_ts"]
+            unindexed += r["unindexed"]
+
+        # GraphClient writes every edge as :REL {rel: ...}, so group by the
+        # rel name (as on_write does) and fall back to the Neo4j type
+        rel_types: Counter = Counter()
+        for r in db_sess.run("""
+            MATCH ()-[r]->()
+            RETURN coalesce(r.rel, type(r)) AS t, count(*) AS c
+        """):
+            rel_types[r["t"]] += r["c"]
+
+        with self._lock:
+            self._node_types = node_types
+            self._rel_types = rel_types
+            self._delta_nodes = Counter()
+            self._delta_rels = Counter()
+            self._removed_nodes = Counter()
+            self._removed_rels = Counter()
+            self._base = {"nodes_with_timestamps": with_ts, "unindexed_nodes": unindexed}
+            self.fully_indexed = unindexed == 0
+            self._refreshed_at = time.time()
+            self._refresh_ms = (time.perf_counter() - started) * 1000
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._base is None:
+                return {}
+            # Counter subtraction drops types that reach zero
+            node_types = self._node_types + self._delta_nodes - self._removed_nodes
+            rel_types = self._rel_types + self._delta_rels - self._removed_rels
+            return {
+                "nodes_by_type": dict(node_types.most_common(self.top_n)),
+                "relationships_by_type": dict(rel_types.most_common(self.top_n)),
+                "nodes_with_timestamps": max(0, self._base["nodes_with_timestamps"]
+                                             + sum(self._delta_nodes.values())
+                                             - sum(self._removed_nodes.values())),
+                "counters": {
+                    "refreshed_at": self._refreshed_at,
+                    "age_s": round(time.time() - self._refreshed_at, 1),
+                    "refresh_ms": round(self._refresh_ms, 1),
+                    "pending_node_deltas": sum(self._delta_nodes.values()),
+                    "pending_edge_deltas": sum(self._delta_rels.values()),
+                    "pending_node_removals": sum(self._removed_nodes.values()),
+                    "unindexed_nodes": self._base["unindexed_nodes"],
+                    "fully_indexed": self.fully_indexed,
+                },
+            }
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+if __name__ == "__main__":
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="Backfill created_ts on existing graph nodes")
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        with driver.session(database=args.database) as sess:
+            for stmt in CREATED_TS_INDEXES:
+                sess.run(stmt)
+        print(backfill_created_ts(driver, batch_size=args.batch_size, database=args.database))
+    finally:
+        driver.close()
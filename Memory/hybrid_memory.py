@@ -34,6 +34,7 @@ from __future__ import annotations
 import json
 import logging
 import threading
+import time
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
@@ -269,6 +270,12 @@ class HybridVectorStore:
     ) -> None:
         metas = [dict(m) if m else {} for m in (metadatas or [{}] * len(ids))]
 
+        # Epoch-ms change marker — lets the archive sync pull only new writes.
+        # Always overwritten: metadata copied from an older item carries its stamp.
+        updated_at = int(time.time() * 1000)
+        for m in metas:
+            m["updated_at"] = updated_at
+
         if collection.startswith("session_"):
             sid = collection[len("session_"):]
             for m in metas:
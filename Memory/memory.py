@@ -45,7 +45,7 @@ import threading
 from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Set
+from typing import Any, Callable, Dict, List, Optional, Tuple, Set
 from collections import defaultdict
 
 from neo4j import GraphDatabase, Driver
@@ -68,6 +68,11 @@ try:
 except ImportError:
     from Memory.nlp import NLPExtractor
 
+try:
+    from Vera.Memory.content_chunks import content_defined_sections, chunk_digest
+except ImportError:
+    from Memory.content_chunks import content_defined_sections, chunk_digest
+
 # ── PATCH: import HybridVectorStore; VectorClient alias keeps old imports working
 try:
     from Vera.Memory.hybrid_memory import HybridVectorStore, VectorClient
@@ -80,6 +85,11 @@ try:
 except ImportError:
     from Memory.entity_resolver import EntityResolver
     from Memory.relationship_builder import SemanticRelationshipExtractor
+
+try:
+    from Vera.Memory.graph_stats import CREATED_TS_INDEXES, created_ms
+except ImportError:
+    from Memory.graph_stats import CREATED_TS_INDEXES, created_ms
  
  
 
@@ -212,16 +222,47 @@ class ExtractedRelation(BaseModel):
 class GraphClient:
     def __init__(self, uri: str, user: str, password: str):
         self._driver: Driver = GraphDatabase.driver(uri, auth=(user, password))
+        self._write_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
         self._ensure_indexes()
 
     def close(self):
         self._driver.close()
 
+    def add_write_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """
+        Call ``callback(kind, payload)`` after each successful write through
+        this client: kind "node" ({id, type, labels, properties, created}) or
+        "edge" ({src, dst, rel, properties, created}), where ``created`` is
+        False for updates of existing elements, or "node_delete" ({id, type,
+        labels, rels, collection}) for a detach-deleted node, where ``rels``
+        names the edges removed with it and ``collection`` is its vector
+        collection, if any.  Runs on the writer's thread, so callbacks
+        should only queue the event.
+        """
+        if callback not in self._write_listeners:
+            self._write_listeners.append(callback)
+
+    def remove_write_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        if callback in self._write_listeners:
+            self._write_listeners.remove(callback)
+
+    def _notify_write(self, kind: str, payload: Dict[str, Any]):
+        for callback in list(self._write_listeners):
+            try:
+                callback(kind, payload)
+            except Exception as e:
+                logger.debug(f"[GraphClient] Write listener failed: {e}")
+
     def _ensure_indexes(self):
         cypher_stmts = [
             "CREATE CONSTRAINT IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE",
             "CREATE CONSTRAINT IF NOT EXISTS FOR (s:Session) REQUIRE s.id IS UNIQUE",
             "CREATE INDEX IF NOT EXISTS FOR (n:Entity) ON (n.type)",
+            # updated_at (epoch ms) drives incremental archive sync
+            "CREATE INDEX IF NOT EXISTS FOR (n:Entity) ON (n.updated_at)",
+            "CREATE INDEX IF NOT EXISTS FOR ()-[r:REL]-() ON (r.updated_at)",
+            # created_ts (epoch ms) backs /stats, /timerange and /recent
+            *CREATED_TS_INDEXES,
         ]
         with self._driver.session() as sess:
             for stmt in cypher_stmts:
@@ -239,10 +280,13 @@ class GraphClient:
 
         cypher = f"""
         MERGE (n:Entity {{id: $id}})
+        WITH n, n.updated_at IS NULL AS created
         SET n:{labels_str}
         SET n.type = $type,
             n += $properties
-        RETURN n
+        SET n.created_ts = coalesce(n.created_ts, $created_ts),
+            n.updated_at = timestamp()
+        RETURN n, created
         """
 
         with self._driver.session() as sess:
@@ -252,13 +296,18 @@ class GraphClient:
                         "id": node.id,
                         "type": node.type,
                         "properties": node.properties,
+                        "created_ts": created_ms(node.id, node.properties, int(time.time() * 1000)),
                     }).single()
                 )
                 logger.debug(f"[GraphClient] Upsert result: {result}")
-                return result
             except Exception as e:
                 logger.error(f"[GraphClient] Upsert failed for {node.id}: {e}")
                 raise
+        self._notify_write("node", {
+            "id": node.id, "type": node.type, "labels": labels, "properties": node.properties,
+            "created": bool(result and result["created"]),
+        })
+        return result
 
     def upsert_session(self, session: Session):
         logger.debug(f"[GraphClient] Upserting session: {session.id}")
@@ -266,13 +315,15 @@ class GraphClient:
         MERGE (s:Session {id: $id})
         ON CREATE SET s.started_at = $started_at, s.metadata = $metadata
         ON MATCH SET s.metadata = coalesce(s.metadata, {}) + $metadata
+        SET s.created_ts = coalesce(s.created_ts, $created_ts)
         RETURN s
         """
         with self._driver.session() as sess:
             sess.run(cypher, {
                 "id": session.id,
                 "started_at": session.started_at,
-                "metadata": session.metadata or {}
+                "metadata": session.metadata or {},
+                "created_ts": created_ms(session.id, {"created_at": session.started_at}, int(time.time() * 1000)),
             })
 
     def end_session(self, session_id: str):
@@ -300,8 +351,10 @@ class GraphClient:
         MATCH (a:Entity {id: $src})
         MATCH (b:Entity {id: $dst})
         MERGE (a)-[r:REL {rel: $rel}]->(b)
+        WITH r, r.updated_at IS NULL AS created
         SET r += $properties
-        RETURN r
+        SET r.updated_at = timestamp()
+        RETURN r, created
         """
         with self._driver.session() as sess:
             result = sess.execute_write(
@@ -313,6 +366,11 @@ class GraphClient:
                 }).single()
             )
         logger.debug(f"[GraphClient] Edge upsert result: {result}")
+        if result is not None:
+            self._notify_write("edge", {
+                "src": edge.src, "dst": edge.dst, "rel": edge.rel, "properties": safe_props,
+                "created": bool(result["created"]),
+            })
         return result
 
     def link_session_to_entity(self, session_id: str, entity_id: str, rel: str = "FOCUSES_ON"):
@@ -321,10 +379,17 @@ class GraphClient:
         MATCH (s:Session {id: $sid})
         MATCH (e:Entity {id: $eid})
         MERGE (s)-[r:REL {rel: $rel}]->(e)
-        RETURN r
+        WITH r, r.updated_at IS NULL AS created
+        SET r.updated_at = timestamp()
+        RETURN r, created
         """
         with self._driver.session() as sess:
-            sess.run(cypher, {"sid": session_id, "eid": entity_id, "rel": rel})
+            result = sess.run(cypher, {"sid": session_id, "eid": entity_id, "rel": rel}).single()
+        if result is not None:
+            self._notify_write("edge", {
+                "src": session_id, "dst": entity_id, "rel": rel, "properties": {},
+                "created": bool(result["created"]),
+            })
 
     def get_subgraph(self, seed_ids: List[str], depth: int = 2) -> Dict[str, Any]:
         cypher = f"""
@@ -1274,15 +1339,22 @@ class HybridMemory:
         MATCH (src {{ {src_property}: $src_value }})
         MATCH (dst {{ {dst_property}: $dst_value }})
         MERGE (src)-[r:REL {{rel: $rel}}]->(dst)
+        WITH src, dst, r, r.updated_at IS NULL AS created
         SET r += $properties
-        RETURN r
+        SET r.updated_at = timestamp()
+        RETURN src.id AS src, dst.id AS dst, created
         """
         with self.graph._driver.session() as sess:
-            sess.run(cypher, {
+            linked = sess.run(cypher, {
                 "src_value": src_value,
                 "dst_value": dst_value,
                 "rel": rel,
                 "properties": properties or {},
+            }).data()
+        for row in linked:
+            self.graph._notify_write("edge", {
+                "src": row["src"], "dst": row["dst"], "rel": rel, "properties": properties or {},
+                "created": bool(row["created"]),
             })
         self.archive.write({
             "type": "edge_upsert_by_property",
@@ -1294,6 +1366,27 @@ class HybridMemory:
             "properties": properties or {},
         })
 
+    def record_bulk_write(self, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]):
+        """
+        Emit the write-listener events and archive records for rows a bulk
+        ``UNWIND`` writer stored straight through the driver, as
+        upsert_entity / link would have.  Payloads use the GraphClient shape
+        (nodes: id, type, labels, properties, created; edges: src, dst, rel,
+        properties, created).
+        """
+        for node in nodes:
+            self.graph._notify_write("node", node)
+            self.archive.write({"type": "entity_upsert", "node": {
+                "id": node["id"], "type": node["type"],
+                "labels": [l for l in node.get("labels", []) if l != "Entity"],
+                "properties": node.get("properties", {}),
+            }})
+        for edge in edges:
+            self.graph._notify_write("edge", edge)
+            self.archive.write({"type": "edge_upsert", "edge": {
+                k: edge.get(k) for k in ("src", "dst", "rel", "properties")
+            }})
+
     def attach_document(
         self,
         entity_id: str,
@@ -1326,6 +1419,38 @@ class HybridMemory:
         self._track_node_creation(doc_id)
         return doc_node
 
+    def detach_documents(self, entity_id: str, doc_ids: List[str]) -> int:
+        """Undo ``attach_document``: drop the vectors, Document nodes and HAS_DOCUMENT edges."""
+        if not doc_ids:
+            return 0
+        logger.info(f"[MEMORY] Detaching {len(doc_ids)} documents from entity {entity_id}")
+        self.vec.delete("long_term_docs", doc_ids)
+        cypher = """
+        MATCH (d:Document) WHERE d.id IN $ids
+        OPTIONAL MATCH (d)-[r]-()
+        WITH d, d.id AS id, d.type AS type, labels(d) AS labels,
+             collect(coalesce(r.rel, type(r))) AS rels
+        DETACH DELETE d
+        RETURN id, type, labels, rels
+        """
+        with self.graph._driver.session() as sess:
+            rows = sess.run(cypher, {"ids": doc_ids}).data()
+        for row in rows:
+            self.graph._notify_write("node_delete", {
+                "id": row["id"],
+                "type": row.get("type"),
+                "labels": row.get("labels") or [],
+                "rels": row.get("rels") or [],
+                "collection": "long_term_docs",
+            })
+        deleted = len(rows)
+        self.archive.write({
+            "type": "document_detach",
+            "entity_id": entity_id,
+            "doc_ids": doc_ids,
+        })
+        return deleted
+
     def semantic_retrieve(
         self,
         query: str,
@@ -1393,45 +1518,115 @@ class HybridMemory:
         return self.graph.get_subgraph(seed_entity_ids, depth=depth)
 
     def store_file(self, file_path: str, chunk_size: int = 1000, chunk_overlap: int = 100):
+        """
+        Ingest a text file as content-addressed chunks.
+
+        The text is cut into content-defined sections (see content_chunks.py)
+        and each section is split with the usual text splitter, so an edit
+        only changes the chunks around it.  Chunk vectors are keyed by the
+        SHA-256 of their text and stored once across all files; the File
+        node keeps the ordered ``chunk_manifest``.  Only chunks not already
+        in the vector store are embedded, and an unchanged file is a
+        metadata-only update.  Chunks the previous version had and this one
+        dropped are deleted unless another File's manifest still uses them.
+        """
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File {file_path} not found")
 
         file_name = os.path.basename(file_path)
-        file_id = f"file_{hash(file_path) & 0xffffffff}"
-
-        file_node = Node(
-            id=file_id,
-            type="file",
-            labels=["File"],
-            properties={"name": file_name, "path": file_path},
-        )
-        self.graph.upsert_entity(file_node)
+        file_id = f"file_{hashlib.sha256(file_path.encode()).hexdigest()[:16]}"
 
         with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
             text = f.read()
+        content_hash = chunk_digest(text)
+
+        props = {
+            "name": file_name,
+            "path": file_path,
+            "content_hash": content_hash,
+            "last_ingested_at": datetime.utcnow().isoformat(),
+        }
+
+        with self.graph._driver.session() as sess:
+            rec = sess.run(
+                "MATCH (n:Entity {id: $id}) RETURN n.content_hash AS h, n.chunk_manifest AS manifest",
+                {"id": file_id},
+            ).single()
+        if rec and rec["h"] == content_hash:
+            self.graph.upsert_entity(Node(id=file_id, type="file", labels=["File"], properties=props))
+            logger.info(f"[MEMORY] {file_name} unchanged — metadata-only re-ingest")
+            return file_id
 
         splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
         )
-        chunks = splitter.split_text(text)
+        chunks: List[str] = []
+        for section in content_defined_sections(
+            text, avg_size=chunk_size * 8, min_size=chunk_size * 2, max_size=chunk_size * 32
+        ):
+            chunks.extend(splitter.split_text(section))
+
+        manifest = [chunk_digest(c) for c in chunks]
+        unique = dict(zip(manifest, chunks))
+
+        # Which chunk hashes are already embedded (by any file)?
+        known: Set[str] = set()
+        backend = self.vec._route("long_term_docs")
+        hashes = list(unique)
+        for start in range(0, len(hashes), 200):
+            batch = hashes[start:start + 200]
+            for hit in backend.get_all(where={"chunk_hash": {"$in": batch}}):
+                known.add((hit.get("metadata") or {}).get("chunk_hash"))
+
+        new_hashes = [h for h in hashes if h not in known]
+        if new_hashes:
+            self.vec.add_texts(
+                "long_term_docs",
+                ids=[f"chunk_{h[:32]}" for h in new_hashes],
+                texts=[unique[h] for h in new_hashes],
+                metadatas=[
+                    {"file_id": file_id, "chunk_hash": h, "node_id": f"chunk_{h[:32]}"}
+                    for h in new_hashes
+                ],
+            )
 
-        ids = [f"{file_id}_{i}" for i in range(len(chunks))]
-        metadatas = [
-            {"file_id": file_id, "chunk_index": i, "node_id": f"{file_id}_{i}"}
-            for i in range(len(chunks))
-        ]
-        self.vec.add_texts("long_term_docs", ids=ids, texts=chunks, metadatas=metadatas)
+        props.update({"chunk_manifest": manifest, "chunk_count": len(manifest)})
+        self.graph.upsert_entity(Node(id=file_id, type="file", labels=["File"], properties=props))
 
+        pruned = self._prune_file_chunks(file_id, set((rec and rec["manifest"]) or []) - set(unique))
+        logger.info(
+            f"[MEMORY] Stored {file_name}: {len(manifest)} chunks, "
+            f"{len(new_hashes)} newly embedded, {pruned} pruned"
+        )
         return file_id
 
+    def _prune_file_chunks(self, file_id: str, dropped: Set[str]) -> int:
+        """Delete chunk vectors a file no longer uses and no other File references"""
+        if not dropped:
+            return 0
+        with self.graph._driver.session() as sess:
+            shared = {
+                r["h"] for r in sess.run(
+                    "MATCH (f:File) WHERE f.id <> $id AND f.chunk_manifest IS NOT NULL "
+                    "UNWIND f.chunk_manifest AS h WITH DISTINCT h WHERE h IN $hashes RETURN h",
+                    {"id": file_id, "hashes": list(dropped)},
+                )
+            }
+        orphaned = [h for h in dropped if h not in shared]
+        if orphaned:
+            self.vec.delete("long_term_docs", [f"chunk_{h[:32]}" for h in orphaned])
+        return len(orphaned)
+
     def retrieve_file(self, file_id: str, query: Optional[str] = None, top_k: int = 5):
         with self.graph._driver.session() as sess:
             rec = sess.run(
-                "MATCH (n:File {id: $id}) RETURN n.path AS path", id=file_id
+                "MATCH (n:File {id: $id}) RETURN n.path AS path, n.chunk_manifest AS manifest",
+                id=file_id,
             ).single()
             if not rec:
                 raise ValueError(f"No file with ID {file_id} found")
             file_path = rec["path"]
+            manifest = set(rec["manifest"] or [])
 
         with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
             full_text = f.read()
@@ -1440,8 +1635,12 @@ class HybridMemory:
             return {"file_path": file_path, "full_text": full_text}
 
         hits = self.semantic_retrieve(query, k=top_k)
+        # Chunks are shared between files, so match on the manifest;
+        # file_id covers files ingested before content addressing.
         relevant_chunks = [
-            hit for hit in hits if hit["metadata"].get("file_id") == file_id
+            hit for hit in hits
+            if hit["metadata"].get("chunk_hash") in manifest
+            or hit["metadata"].get("file_id") == file_id
         ]
         return {"file_path": file_path, "relevant_chunks": relevant_chunks}
 
@@ -1500,7 +1699,8 @@ class HybridMemory:
         MATCH (s:Session {id: $sid})
         MATCH (e:ToolExecution {id: $eid})
         MERGE (s)-[r:REL {rel: $rel}]->(e)
-        SET r.timestamp = $timestamp
+        SET r.timestamp = $timestamp,
+            r.updated_at = timestamp()
         RETURN r
         """
         with self.graph._driver.session() as sess:
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Capacity arbiter: interactive chat first, background cognition second.
+
+Live chat (VeraChat) and background work (ProactiveCognition scheduler,
+ProactiveFocus loops) share the same Ollama pool.  The arbiter keeps a
+process-wide count of interactive demand — chat turns in flight plus
+untagged pool acquisitions holding or waiting for a slot — and gates
+background acquisitions against it:
+
+    interactive demand present      → background waits (or is shed after
+                                      ``shed_after_s``)
+    < idle_grace_s since last turn  → background waits
+    idle                            → background admitted up to
+                                      ``background_share`` of pool slots
+
+Work is tagged through a context variable, so the pool needs no new
+arguments: anything not inside ``arbiter.background()`` counts as
+interactive.  ``contextvars`` follow asyncio tasks and asyncio.to_thread,
+but not plain threading.Thread — a thread doing background work must
+enter ``background()`` itself.
+
+The decision logic is the pure ``ArbiterPolicy.decide`` so it can be
+exercised on its own; ``simulate()`` measures interactive time-to-first-
+token with background load against an unarbitrated pool:
+
+    python -m Vera.Ollama.capacity_arbiter --simulate
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+ADMIT = "admit"
+WAIT = "wait"
+SHED = "shed"
+
+_workload: contextvars.ContextVar = contextvars.ContextVar("vera_workload", default=INTERACTIVE)
+
+
+def current_workload() -> str:
+    return _workload.get()
+
+
+class BackgroundShed(RuntimeError):
+    """Background work dropped because interactive demand did not clear in time."""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Policy
+# ──────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ArbiterPolicy:
+    background_share: float = 0.5         # fraction of pool slots background may hold when idle
+    idle_grace_s: float = 2.0             # quiet period after interactive work before background resumes
+    shed_after_s: Optional[float] = None  # give up on background waits longer than this (None = wait)
+
+    def background_limit(self, capacity: int) -> int:
+        if self.background_share <= 0:
+            return 0
+        return max(1, int(capacity * self.background_share))
+
+    def decide(
+        self,
+        interactive_demand: int,
+        background_active: int,
+        capacity: int,
+        quiet_for: float,
+        waited: float = 0.0,
+    ) -> str:
+        """ADMIT, WAIT or SHED for one background acquisition."""
+        blocked = (
+            interactive_demand > 0
+            or quiet_for < self.idle_grace_s
+            or background_active >= self.background_limit(capacity)
+        )
+        if not blocked:
+            return ADMIT
+        if self.shed_after_s is not None and waited >= self.shed_after_s:
+            return SHED
+        return WAIT
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Arbiter
+# ──────────────────────────────────────────────────────────────────────────────
+
+class CapacityArbiter:
+    """Process-wide gate between interactive and background LLM work."""
+
+    def __init__(self, policy: Optional[ArbiterPolicy] = None, capacity: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = policy or ArbiterPolicy()
+        self.capacity = capacity
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._interactive = 0
+        self._background = 0
+        self._last_interactive = float("-inf")
+
+        self._latency = {"background_on": deque(maxlen=500), "background_off": deque(maxlen=500)}
+        self._counters = {"admitted": 0, "waited": 0, "shed": 0, "wait_s": 0.0, "interactive": 0}
+
+    # ── capacity ──────────────────────────────────────────────────────────
+
+    def set_capacity(self, capacity: int):
+        with self._cond:
+            self.capacity = max(1, capacity)
+            self._cond.notify_all()
+
+    # ── interactive side ──────────────────────────────────────────────────
+
+    def begin_interactive(self):
+        with self._cond:
+            self._interactive += 1
+            self._counters["interactive"] += 1
+            self._last_interactive = self._clock()
+
+    def end_interactive(self):
+        with self._cond:
+            self._interactive = max(0, self._interactive - 1)
+            self._last_interactive = self._clock()
+            self._cond.notify_all()
+
+    @contextmanager
+    def interactive(self):
+        """Mark a chat turn (or any user-facing call) in flight."""
+        token = _workload.set(INTERACTIVE)
+        self.begin_interactive()
+        try:
+            yield
+        finally:
+            self.end_interactive()
+            _workload.reset(token)
+
+    def record_interactive_latency(self, seconds: float, background_was_active: bool):
+        bucket = "background_on" if background_was_active else "background_off"
+        with self._cond:
+            self._latency[bucket].append(seconds)
+
+    @property
+    def background_active(self) -> int:
+        return self._background
+
+    @property
+    def interactive_demand(self) -> int:
+        return self._interactive
+
+    # ── background side ───────────────────────────────────────────────────
+
+    def _quiet_for(self) -> float:
+        return self._clock() - self._last_interactive
+
+    def _wait_step(self) -> float:
+        # Wake for the end of the idle grace period even without a notify
+        remaining = self.policy.idle_grace_s - self._quiet_for()
+        return min(max(remaining, 0.05), 0.5)
+
+    def should_yield(self) -> bool:
+        """True while background work should not start its next step."""
+        with self._cond:
+            return self.policy.decide(self._interactive, 0, self.capacity, self._quiet_for()) != ADMIT
+
+    def wait_for_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until background work may run (ignores slot accounting)."""
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while self.policy.decide(self._interactive, 0, self.capacity, self._quiet_for()) != ADMIT:
+                if deadline is not None and self._clock() >= deadline:
+                    return False
+                self._cond.wait(self._wait_step())
+        return True
+
+    def acquire_background(self, timeout: Optional[float] = None) -> Optional[Callable[[], None]]:
+        """
+        Reserve one background slot.  Returns a release callable, or None if
+        the request was shed (policy) or timed out.
+        """
+        start = self._clock()
+        waited_once = False
+        with self._cond:
+            while True:
+                waited = self._clock() - start
+                decision = self.policy.decide(
+                    self._interactive, self._background, self.capacity, self._quiet_for(), waited
+                )
+                if decision == ADMIT:
+                    self._background += 1
+                    self._counters["admitted"] += 1
+                    self._counters["wait_s"] += waited
+                    break
+                if decision == SHED or (timeout is not None and waited >= timeout):
+                    self._counters["shed"] += 1
+                    logger.info(f"[arbiter] background request shed after {waited:.1f}s "
+                                f"(interactive={self._interactive})")
+                    return None
+                if not waited_once:
+                    self._counters["waited"] += 1
+                    waited_once = True
+                step = self._wait_step()
+                if timeout is not None:
+                    step = min(step, max(timeout - waited, 0.01))
+                self._cond.wait(step)
+
+        released = threading.Event()
+
+        def release():
+            if released.is_set():
+                return
+            released.set()
+            with self._cond:
+                self._background = max(0, self._background - 1)
+                self._cond.notify_all()
+
+        return release
+
+    @contextmanager
+    def background(self, label: str = ""):
+        """Tag the enclosed work as background; pool acquisitions inside are gated."""
+        token = _workload.set(BACKGROUND)
+        try:
+            yield
+        finally:
+            _workload.reset(token)
+
+    @asynccontextmanager
+    async def background_async(self, label: str = "", timeout: Optional[float] = None):
+        """Wait (off the event loop) for idle, then tag the enclosed work as background."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Wait in short slices so cancellation (loop shutdown) is not held up
+        while self.should_yield() and not await asyncio.to_thread(self.wait_for_idle, 1.0):
+            if deadline is not None and time.monotonic() >= deadline:
+                with self._cond:
+                    self._counters["shed"] += 1
+                raise BackgroundShed(f"{label or 'background work'} shed: interactive demand persisted")
+        token = _workload.set(BACKGROUND)
+        try:
+            yield
+        finally:
+            _workload.reset(token)
+
+    # ── metrics ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _percentiles(samples) -> Dict[str, float]:
+        if not samples:
+            return {"n": 0}
+        data = sorted(samples)
+        pick = lambda q: data[min(len(data) - 1, int(q * len(data)))]
+        return {"n": len(data), "p50_ms": round(pick(0.5) * 1000, 1),
+                "p95_ms": round(pick(0.95) * 1000, 1), "max_ms": round(data[-1] * 1000, 1)}
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "background_limit": self.policy.background_limit(self.capacity),
+                "interactive_demand": self._interactive,
+                "background_active": self._background,
+                "quiet_for_s": round(min(self._quiet_for(), 1e9), 1),
+                "policy": {
+                    "background_share": self.policy.background_share,
+                    "idle_grace_s": self.policy.idle_grace_s,
+                    "shed_after_s": self.policy.shed_after_s,
+                },
+                "counters": {k: round(v, 3) if isinstance(v, float) else v for k, v in self._counters.items()},
+                "interactive_latency": {k: self._percentiles(v) for k, v in self._latency.items()},
+            }
+
+
+_default: Optional[CapacityArbiter] = None
+_default_lock = threading.Lock()
+
+
+def get_arbiter() -> CapacityArbiter:
+    """The process-wide arbiter shared by the pool, chat and background loops."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = CapacityArbiter()
+        return _default
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Simulation
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _FifoSlots:
+    """Counting semaphore that serves waiters in arrival order, like a server queue."""
+
+    def __init__(self, slots: int):
+        self._free = slots
+        self._lock = threading.Lock()
+        self._queue = deque()
+
+    def __enter__(self):
+        with self._lock:
+            if self._free and not self._queue:
+                self._free -= 1
+                return self
+            turn = threading.Event()
+            self._queue.append(turn)
+        turn.wait()
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            if self._queue:
+                self._queue.popleft().set()  # hand the slot straight to the next waiter
+            else:
+                self._free += 1
+
+
+def simulate(
+    slots: int = 2,
+    background_workers: int = 4,
+    background_job_s: float = 1.5,
+    interactive_requests: int = 20,
+    interactive_gap_s: float = 0.6,
+    interactive_job_s: float = 0.2,
+    arbitrated: bool = True,
+    time_scale: float = 0.1,
+) -> Dict[str, object]:
+    """
+    Threads contending for ``slots`` model slots: ``background_workers``
+    loop on long jobs, interactive requests arrive every
+    ``interactive_gap_s`` and need a slot to produce their first token.
+    Reports interactive slot-wait (≈ added TTFT) and background throughput.
+    ``time_scale`` shrinks all durations to keep the run short.
+    """
+    slot_sem = _FifoSlots(slots)
+    arbiter = CapacityArbiter(ArbiterPolicy(idle_grace_s=0.5 * time_scale), capacity=slots)
+    stop = threading.Event()
+    background_done = [0]
+    ttft = []
+
+    def background_worker():
+        while not stop.is_set():
+            release = arbiter.acquire_background(timeout=1.0) if arbitrated else (lambda: None)
+            if release is None:
+                continue
+            try:
+                with slot_sem:
+                    time.sleep(background_job_s * time_scale)
+                background_done[0] += 1
+            finally:
+                release()
+
+    def interactive_request():
+        t0 = time.perf_counter()
+        if arbitrated:
+            arbiter.begin_interactive()
+        try:
+            with slot_sem:
+                ttft.append(time.perf_counter() - t0)
+                time.sleep(interactive_job_s * time_scale)
+        finally:
+            if arbitrated:
+                arbiter.end_interactive()
+
+    workers = [threading.Thread(target=background_worker, daemon=True) for _ in range(background_workers)]
+    for w in workers:
+        w.start()
+    time.sleep(background_job_s * time_scale)  # let background saturate the slots
+
+    started = time.perf_counter()
+    requests_ = []
+    for _ in range(interactive_requests):
+        t = threading.Thread(target=interactive_request)
+        t.start()
+        requests_.append(t)
+        time.sleep(interactive_gap_s * time_scale)
+    for t in requests_:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for w in workers:
+        w.join(timeout=5)
+
+    data = sorted(ttft)
+    scale = 1000 / time_scale  # report in unscaled ms
+    return {
+        "arbitrated": arbitrated,
+        "interactive_wait_p50_ms": round(data[len(data) // 2] * scale, 1),
+        "interactive_wait_p95_ms": round(data[min(len(data) - 1, int(0.95 * len(data)))] * scale, 1),
+        "interactive_wait_max_ms": round(data[-1] * scale, 1),
+        "background_jobs_per_s": round(background_done[0] / (elapsed / time_scale), 2),
+        "arbiter": arbiter.stats()["counters"] if arbitrated else None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Interactive/background capacity arbiter")
+    parser.add_argument("--simulate", action="store_true")
+    args = parser.parse_args()
+
+    if args.simulate:
+        for arbitrated in (False, True):
+            print(json.dumps(simulate(arbitrated=arbitrated), indent=2))
+    else:
+        parser.print_help()
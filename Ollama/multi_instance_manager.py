@@ -11,7 +11,8 @@ import time
 import queue
 import requests
 import json
-from typing import List, Dict, Any, Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, Iterable
 from dataclasses import dataclass, field
 from collections import defaultdict
 
@@ -28,6 +29,7 @@ except ImportError:
     from Configuration.config_manager import OllamaConfig, OllamaInstanceConfig
 
 from Vera.Ollama.manager import ThoughtCapture  # Reuse the existing implementation
+from Vera.Ollama.capacity_arbiter import get_arbiter, current_workload, BACKGROUND
 
 
 # ── Logging helpers ────────────────────────────────────────────────────────────
@@ -74,6 +76,10 @@ class InstanceStats:
     last_request_time: float = 0.0
     is_healthy: bool = True
     last_health_check: float = 0.0
+    consecutive_failures: int = 0
+    probe_interval: float = 0.0     # current adaptive interval
+    next_probe_at: float = 0.0      # 0 → probe on the first health pass
+    probe_latency: float = 0.0
 
 
 class OllamaInstancePool:
@@ -101,11 +107,29 @@ class OllamaInstancePool:
         self.request_queue = queue.Queue(maxsize=config.max_queue_size)
         self.queue_enabled = config.enable_request_queue
 
+        # Adaptive health probing: every instance is probed concurrently on its
+        # own schedule — back to health_min_interval after a failure, doubling
+        # up to health_check_interval while it stays healthy.
         self.health_check_interval = 30.0
+        self.health_min_interval   = 2.0
+        self.health_probe_timeout  = 2.0
         self.health_check_thread: Optional[threading.Thread] = None
+        self._health_wake = threading.Event()
+        self._health_executor: Optional[ThreadPoolExecutor] = None
         self.running = False
 
+        # instance name → model names, refreshed by every successful probe
+        self.model_locations: Dict[str, set] = {}
+        # model name → time a probe last listed it on any instance
+        self.model_seen_at: Dict[str, float] = {}
+        self._probe_requested_at: float = 0.0
+
         self._initialize_instances()
+
+        # Interactive-vs-background gate shared with VeraChat and the cognition loops
+        self.arbiter = get_arbiter()
+        self.arbiter.set_capacity(sum(i.max_concurrent for i in self.instances.values()) or 1)
+
         self.start()
 
         if self.logger:
@@ -135,6 +159,9 @@ class OllamaInstancePool:
         if self.running:
             return
         self.running = True
+        self._health_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.instances)), thread_name_prefix="ollama-health"
+        )
         self.health_check_thread = threading.Thread(
             target=self._health_check_loop, daemon=True
         )
@@ -144,40 +171,142 @@ class OllamaInstancePool:
 
     def stop(self):
         self.running = False
+        self._health_wake.set()
         if self.health_check_thread:
             self.health_check_thread.join(timeout=5.0)
+        if self._health_executor:
+            self._health_executor.shutdown(wait=False)
+            self._health_executor = None
 
     # ── Health monitoring ─────────────────────────────────────────────────────
 
     def _health_check_loop(self):
         while self.running:
-            for name in list(self.instances.keys()):
-                self._check_instance_health(name)
-            time.sleep(self.health_check_interval)
+            now = time.time()
+            due = [name for name, s in self.stats.items() if s.next_probe_at <= now]
+            if due:
+                self.probe_instances(due)
+
+            next_at = min(
+                (s.next_probe_at for s in self.stats.values()),
+                default=time.time() + self.health_check_interval,
+            )
+            # Sleeps until the next instance is due; mark_unhealthy() wakes it early
+            self._health_wake.wait(max(0.05, next_at - time.time()))
+            self._health_wake.clear()
 
-    def _check_instance_health(self, name: str):
+    def probe_instances(self, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        Probe instances concurrently and return {name: healthy}.  A slow or
+        dead host costs at most health_probe_timeout and delays no other host.
+        """
+        names    = list(self.instances if names is None else names)
+        executor = self._health_executor
+        if executor is None or len(names) <= 1:
+            return {name: self._check_instance_health(name) for name in names}
+        futures = {name: executor.submit(self._check_instance_health, name) for name in names}
+        return {name: f.result() for name, f in futures.items()}
+
+    def request_probe(self):
+        """
+        Make every instance due and wake the health loop, without waiting
+        for the probes.  Repeated requests within health_min_interval
+        coalesce into one pass.
+        """
+        now = time.time()
+        with self._global_lock:
+            if now - self._probe_requested_at < self.health_min_interval:
+                return
+            self._probe_requested_at = now
+            for stats in self.stats.values():
+                stats.next_probe_at = min(stats.next_probe_at, now)
+        self._health_wake.set()
+
+    def _check_instance_health(self, name: str) -> bool:
         instance = self.instances[name]
         stats    = self.stats[name]
+        started  = time.time()
+        models   = None
         try:
-            response = requests.get(f"{instance.api_url}/api/tags", timeout=5)
-            was_unhealthy   = not stats.is_healthy
-            stats.is_healthy = response.status_code == 200
-            stats.last_health_check = time.time()
-            if was_unhealthy and stats.is_healthy and self.logger:
+            response = requests.get(
+                f"{instance.api_url}/api/tags", timeout=self.health_probe_timeout
+            )
+            healthy = response.status_code == 200
+            reason  = None if healthy else f"HTTP {response.status_code}"
+            if healthy:
+                try:
+                    models = {
+                        m.get("name", m.get("model", ""))
+                        for m in response.json().get("models", [])
+                    }
+                except ValueError:
+                    pass
+        except Exception as e:
+            healthy, reason = False, e
+        stats.probe_latency = time.time() - started
+
+        if models is not None:
+            self.model_locations[name] = models
+            for model in models:
+                self.model_seen_at[model] = started
+        self._record_probe(name, healthy, reason)
+        return healthy
+
+    def _record_probe(self, name: str, healthy: bool, reason=None):
+        stats = self.stats[name]
+        now   = time.time()
+        with self._global_lock:
+            was_healthy = stats.is_healthy
+            stats.is_healthy        = healthy
+            stats.last_health_check = now
+            if healthy:
+                stats.consecutive_failures = 0
+                stats.probe_interval = min(
+                    self.health_check_interval,
+                    max(stats.probe_interval * 2, self.health_min_interval * 2),
+                )
+            else:
+                stats.consecutive_failures += 1
+                stats.probe_interval = min(
+                    self.health_check_interval,
+                    self.health_min_interval * 2 ** (stats.consecutive_failures - 1),
+                )
+            stats.next_probe_at = now + stats.probe_interval
+
+        if self.logger:
+            if healthy and not was_healthy:
                 self.logger.success(
                     f"[health] Instance '{name}' recovered  "
                     f"cluster: {_cluster_snapshot(self.instances, self.stats)}"
                 )
-        except Exception as e:
-            was_healthy      = stats.is_healthy
-            stats.is_healthy = False
-            stats.last_health_check = time.time()
-            if was_healthy and self.logger:
+            elif was_healthy and not healthy:
                 self.logger.warning(
-                    f"[health] Instance '{name}' went UNHEALTHY: {e}  "
+                    f"[health] Instance '{name}' went UNHEALTHY: {reason}  "
+                    f"next probe in {stats.probe_interval:.0f}s  "
                     f"cluster: {_cluster_snapshot(self.instances, self.stats)}"
                 )
 
+    def mark_unhealthy(self, name: str, reason: str = ""):
+        """
+        Take an instance out of rotation on a live request error (5xx, timeout,
+        refused connection) without waiting for its next scheduled probe, and
+        schedule a fast re-probe so it rejoins as soon as it answers again.
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            return
+        with self._global_lock:
+            stats.is_healthy           = False
+            stats.consecutive_failures += 1
+            stats.probe_interval       = self.health_min_interval
+            stats.next_probe_at        = time.time() + self.health_min_interval
+        if self.logger:
+            self.logger.debug(
+                f"[health] '{name}' marked unhealthy by live request ({reason})  "
+                f"re-probe in {self.health_min_interval:.0f}s"
+            )
+        self._health_wake.set()
+
     # ── Instance selection (MUST be called while holding _global_lock) ────────
 
     def _select_instance(self, candidates: List[str]) -> str:
@@ -248,6 +377,62 @@ class OllamaInstancePool:
         timeout: float = 30.0,
         allowed_instances: Optional[List[str]] = None,
         caller_hint: str = "",
+    ) -> Optional[tuple]:
+        """
+        Acquire an instance slot, arbitrated between interactive and background work.
+
+        Calls made inside ``arbiter.background()`` first wait for the capacity
+        arbiter to admit them (no interactive demand, idle grace elapsed,
+        under the background share); if the arbiter sheds them this returns
+        None exactly like a timeout.  Every other call counts as interactive
+        demand from the moment it starts waiting until its slot is released.
+
+        Returns:
+            (instance_name, instance_config, release_fn)  or  None on timeout/shed.
+        """
+        start_time = time.time()
+        hint       = f"[{caller_hint}] " if caller_hint else ""
+
+        if current_workload() == BACKGROUND:
+            gate_release = self.arbiter.acquire_background(timeout=timeout)
+            if gate_release is None:
+                if self.logger:
+                    self.logger.info(
+                        f"{hint}background acquire shed by arbiter after "
+                        f"{time.time() - start_time:.1f}s  "
+                        f"(interactive={self.arbiter.interactive_demand})"
+                    )
+                return None
+        else:
+            self.arbiter.begin_interactive()
+            gate_release = self.arbiter.end_interactive
+
+        remaining = max(timeout - (time.time() - start_time), 0.1)
+        acquired  = self._acquire_slot(remaining, allowed_instances, caller_hint)
+        if acquired is None:
+            gate_release()
+            return None
+
+        name, inst, slot_release = acquired
+        released = threading.Event()
+
+        def release(_slot=slot_release, _gate=gate_release):
+            # Some callers release on both the error path and in `finally`
+            if released.is_set():
+                return
+            released.set()
+            try:
+                _slot()
+            finally:
+                _gate()
+
+        return (name, inst, release)
+
+    def _acquire_slot(
+        self,
+        timeout: float,
+        allowed_instances: Optional[List[str]],
+        caller_hint: str,
     ) -> Optional[tuple]:
         """
         Atomically select and acquire an instance.
@@ -425,9 +610,16 @@ class OllamaInstancePool:
                     "avg_duration":      stats.total_duration / max(stats.total_requests, 1),
                     "is_healthy":        stats.is_healthy,
                     "last_health_check": stats.last_health_check,
+                    "consecutive_failures": stats.consecutive_failures,
+                    "probe_interval":    stats.probe_interval,
+                    "probe_latency":     stats.probe_latency,
                 }
             return result
 
+    def get_arbiter_stats(self) -> Dict[str, Any]:
+        """Interactive demand, background admission counters and TTFT percentiles."""
+        return self.arbiter.stats()
+
 
 # ---------------------------------------------------------------------------
 # MultiInstanceOllamaManager
@@ -582,32 +774,22 @@ class MultiInstanceOllamaManager:
 
     # ── Model location cache ──────────────────────────────────────────────────
 
-    def _refresh_model_location_cache(self):
+    def _refresh_model_location_cache(self, force: bool = False):
+        """
+        The cache is the pool's model_locations map, which every health probe
+        already keeps current.  A full refresh probes all instances in
+        parallel; it runs on TTL expiry or, with force=True, on a routing
+        miss for a model some probe listed within the TTL.
+        """
         current_time = time.time()
-        if current_time - self._model_location_cache_time < self._model_location_cache_ttl:
+        self._model_location_cache = self.pool.model_locations
+        if not force and current_time - self._model_location_cache_time < self._model_location_cache_ttl:
             return
 
         if self.logger:
-            self.logger.debug("Refreshing model location cache…")
-
-        self._model_location_cache = {}
-
-        for name, instance in self.pool.instances.items():
-            if not self.pool.stats[name].is_healthy:
-                continue
-            try:
-                response = requests.get(f"{instance.api_url}/api/tags", timeout=5)
-                if response.status_code == 200:
-                    data   = response.json()
-                    models = data.get("models", [])
-                    self._model_location_cache[name] = {
-                        m.get("name", m.get("model", "")) for m in models
-                    }
-            except Exception as e:
-                if self.logger:
-                    self.logger.debug(f"[cache] Failed to query {name}: {e}")
-                continue
+            self.logger.debug(f"Refreshing model location cache… (force={force})")
 
+        self.pool.probe_instances()
         self._model_location_cache_time = current_time
 
         if self.logger:
@@ -632,6 +814,23 @@ class MultiInstanceOllamaManager:
                 name for name, models in self._model_location_cache.items()
                 if model_to_find in models and self.pool.stats[name].is_healthy
             ]
+            # Routing miss.  A model seen recently is most likely on a host
+            # that just dropped out, so re-probe now (rate-limited) and keep
+            # the request.  An unknown model (typo, not pulled yet) must not
+            # stall the request path: queue a background probe instead, so a
+            # fresh pull is routable on a later call.
+            if not instances_with_model:
+                now = time.time()
+                recently_seen = (now - self.pool.model_seen_at.get(model_to_find, 0.0)
+                                 < self._model_location_cache_ttl)
+                if not recently_seen:
+                    self.pool.request_probe()
+                elif now - self._model_location_cache_time >= self.pool.health_min_interval:
+                    self._refresh_model_location_cache(force=True)
+                    instances_with_model = [
+                        name for name, models in self._model_location_cache.items()
+                        if model_to_find in models and self.pool.stats[name].is_healthy
+                    ]
         else:
             instances_with_model = []
             for name, instance in self.pool.instances.items():
@@ -1699,7 +1898,7 @@ class PooledOllamaLLM(LLM):
                         )
                     if response.status_code >= 500:
                         if hasattr(self.pool, 'stats') and instance_name in self.pool.stats:
-                            self.pool.stats[instance_name].is_healthy = False
+                            self.pool.mark_unhealthy(instance_name, f"HTTP {response.status_code}")
                         if self.logger:
                             self.logger.warning(
                                 f"{hint}Marking '{instance_name}' UNHEALTHY (5xx)  "
@@ -1724,7 +1923,7 @@ class PooledOllamaLLM(LLM):
                         f"elapsed={elapsed:.1f}s  limit={self.timeout}s"
                     )
                 if hasattr(self.pool, 'stats') and instance_name in self.pool.stats:
-                    self.pool.stats[instance_name].is_healthy = False
+                    self.pool.mark_unhealthy(instance_name, "timeout")
                     self.pool.stats[instance_name].total_failures += 1
                 if self.logger:
                     self.logger.warning(
@@ -1747,6 +1946,8 @@ class PooledOllamaLLM(LLM):
                     )
                 if hasattr(self.pool, 'stats') and instance_name in self.pool.stats:
                     self.pool.stats[instance_name].total_failures += 1
+                    if isinstance(e, requests.exceptions.ConnectionError):
+                        self.pool.mark_unhealthy(instance_name, "connection error")
                 last_error = e
                 if attempts < max_attempts:
                     if self.logger:
@@ -1892,7 +2093,7 @@ class PooledOllamaLLM(LLM):
                         )
                     if response.status_code >= 500:
                         if hasattr(self.pool, 'stats') and instance_name in self.pool.stats:
-                            self.pool.stats[instance_name].is_healthy = False
+                            self.pool.mark_unhealthy(instance_name, f"HTTP {response.status_code}")
                         if self.logger:
                             self.logger.warning(
                                 f"{hint}Marking '{instance_name}' UNHEALTHY (5xx)  "
@@ -1966,6 +2167,9 @@ class PooledOllamaLLM(LLM):
                             f"elapsed={elapsed:.2f}s  "
                             f"error={stream_err}"
                         )
+                    if isinstance(stream_err, (requests.exceptions.ConnectionError,
+                                               requests.exceptions.Timeout)):
+                        self.pool.mark_unhealthy(instance_name, "stream interrupted")
                     last_error = stream_err
                     if attempts < max_attempts:
                         if self.logger:
@@ -1985,6 +2189,8 @@ class PooledOllamaLLM(LLM):
                     )
                 if hasattr(self.pool, 'stats') and instance_name in self.pool.stats:
                     self.pool.stats[instance_name].total_failures += 1
+                    if isinstance(e, requests.exceptions.ConnectionError):
+                        self.pool.mark_unhealthy(instance_name, "connection error")
                 last_error = e
                 if attempts < max_attempts:
                     if self.logger:
@@ -2005,4 +2211,107 @@ class PooledOllamaLLM(LLM):
             )
         raise last_error or RuntimeError(
             f"Stream failed after {attempts} attempts"
-        )
\ No newline at end of file
+        )
+
+# ---------------------------------------------------------------------------
+# Health-check benchmark against local stub servers
+# ---------------------------------------------------------------------------
+
+def _start_stub_ollama(latency: float = 0.0, models=("llama3:latest",)):
+    """Serve /api/tags on 127.0.0.1 with injected latency; returns (server, url)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(self.server.latency)
+            body = json.dumps({"models": [{"name": m} for m in self.server.models]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.models = list(models)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def benchmark_health(healthy: int = 4, latency: float = 0.05, hung_latency: float = 10.0) -> Dict[str, Any]:
+    """
+    ``healthy`` fast stubs, one hung stub (answers after ``hung_latency``)
+    and one refused port.  Compares a sequential sweep with the old 5s
+    timeout against the concurrent probe, then measures how quickly an
+    instance marked unhealthy by a live error is re-probed back in.
+    """
+    import socket
+    from types import SimpleNamespace
+
+    servers, urls = [], []
+    for i in range(healthy):
+        server, url = _start_stub_ollama(latency)
+        servers.append(server)
+        urls.append(url)
+    hung, hung_url = _start_stub_ollama(hung_latency)
+    servers.append(hung)
+    urls.append(hung_url)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        urls.append(f"http://127.0.0.1:{s.getsockname()[1]}")   # closed → refused
+
+    config = SimpleNamespace(
+        instances=[
+            SimpleNamespace(name=f"stub{i}", api_url=url, enabled=True, priority=1, max_concurrent=2)
+            for i, url in enumerate(urls)
+        ],
+        load_balance_strategy="least_loaded",
+        max_queue_size=16,
+        enable_request_queue=False,
+    )
+    pool = OllamaInstancePool(config)
+    results: Dict[str, Any] = {"instances": len(urls)}
+    try:
+        t0 = time.perf_counter()
+        for inst in pool.instances.values():
+            try:
+                requests.get(f"{inst.api_url}/api/tags", timeout=5)
+            except Exception:
+                pass
+        results["sequential_sweep_s"] = round(time.perf_counter() - t0, 2)
+
+        t0 = time.perf_counter()
+        status = pool.probe_instances()
+        results["concurrent_probe_s"] = round(time.perf_counter() - t0, 2)
+        results["healthy_after_probe"] = sum(status.values())
+
+        # Live error on a good instance → fast re-probe brings it back
+        pool.health_min_interval = 0.5
+        pool.mark_unhealthy("stub0", "benchmark")
+        t0 = time.perf_counter()
+        while not pool.stats["stub0"].is_healthy and time.perf_counter() - t0 < 10:
+            time.sleep(0.02)
+        results["recovery_after_live_error_s"] = round(time.perf_counter() - t0, 2)
+        results["intervals"] = {n: round(s.probe_interval, 1) for n, s in pool.stats.items()}
+    finally:
+        pool.stop()
+        for server in servers:
+            server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ollama instance pool")
+    parser.add_argument("--bench", action="store_true", help="health-check benchmark on local stubs")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark_health(), indent=2))
+    else:
+        parser.print_help()
@@ -44,7 +44,8 @@ from enum import Enum, auto
 from datetime import datetime
 from functools import wraps
 from collections import defaultdict
-import psutil
+
+from Vera.Logging.telemetry import get_telemetry
 
 # Optional Redis for pub/sub (graceful degradation if not available)
 try:
@@ -134,6 +135,9 @@ class TaskResult:
     is_streaming: bool = False
     stream_queue: Optional[queue.Queue] = None
     
+    # Set by TaskQueue.cancel(); the worker stops a streaming task at the next chunk
+    cancel_requested: bool = False
+    
     @property
     def duration(self) -> Optional[float]:
         if self.started_at and self.completed_at:
@@ -354,6 +358,10 @@ class Worker(threading.Thread):
                 collected_chunks = []
                 try:
                     for chunk in output:
+                        if result.cancel_requested:
+                            # Closing the generator closes the model stream
+                            output.close()
+                            break
                         result.stream_queue.put(chunk)
                         # Also collect for non-streaming callers
                         try:
@@ -385,7 +393,7 @@ class Worker(threading.Thread):
             self.stats.tasks_completed += 1
             self.stats.total_duration += duration
             
-            result.status = TaskStatus.COMPLETED
+            result.status = TaskStatus.CANCELLED if result.cancel_requested else TaskStatus.COMPLETED
             result.completed_at = completed_at
             result.worker_id = self.worker_id
             
@@ -543,9 +551,8 @@ class TaskQueue:
         self._lock = threading.Lock()
         self.cpu_threshold = cpu_threshold
         self.logger = logging.getLogger("TaskQueue")
-        self._last_cpu_check = 0
+        self._telemetry = get_telemetry()  # shared sampler; reads never block
         self._cached_cpu = 0
-        self._cpu_check_interval = 1.0  # Check once per second
         
         self.logger.info(f"TaskQueue initialized (cpu_threshold={cpu_threshold}%)")
     
@@ -612,16 +619,22 @@ class TaskQueue:
     
     def get_next(self, worker_type: TaskType, timeout: float = 1.0) -> Tuple[Optional[str], ...]:
         """Get next task for a worker of the given type"""
-        # Check CPU usage (cached)
-        now = time.time()
-        if now - self._last_cpu_check > self._cpu_check_interval:
-            self._cached_cpu = psutil.cpu_percent(interval=0.1)
-            self._last_cpu_check = now
+        # Check CPU usage (latest shared telemetry sample)
+        self._cached_cpu = self._telemetry.snapshot().cpu_percent
         
         if self._cached_cpu >= self.cpu_threshold:
             if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"CPU throttle: {self._cached_cpu:.1f}% >= {self.cpu_threshold}%")
-            return None, None, None, None, None
+            # Block until a sample shows CPU below the threshold; returning at
+            # once would have every idle worker spin and hold the CPU up
+            sample = self._telemetry.wait_for(
+                lambda s: s.cpu_percent < self.cpu_threshold, timeout=timeout
+            )
+            if sample is None:
+                return None, None, None, None, None
+            self._cached_cpu = sample.cpu_percent
+        
+        now = time.time()
         
         with self._lock:
             queue = self._queues[worker_type]
@@ -673,6 +686,32 @@ class TaskQueue:
                     f"(pending={len(self._pending)}, completed={len(self._completed)})"
                 )
     
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a task.  A queued task is removed before any worker picks it
+        up; a running streaming task stops at its next chunk, which frees the
+        worker.  Returns False if the task is unknown or already finished.
+        """
+        with self._lock:
+            result = self._pending.get(task_id)
+            if result is None:
+                return False
+            result.cancel_requested = True
+            
+            for queued in self._queues.values():
+                for i, item in enumerate(queued):
+                    if item[2] == task_id:
+                        del queued[i]
+                        result.status = TaskStatus.CANCELLED
+                        result.completed_at = time.time()
+                        self._completed[task_id] = result
+                        del self._pending[task_id]
+                        self.logger.info(f"Cancelled queued task: {task_id[:8]}...")
+                        return True
+        
+        self.logger.info(f"Cancel requested for running task: {task_id[:8]}...")
+        return True
+    
     def get_result(self, task_id: str, timeout: Optional[float] = None) -> Optional[TaskResult]:
         """Get task result (blocking if timeout specified)"""
         start = time.time()
@@ -1052,6 +1091,20 @@ class Orchestrator:
         """Submit a task for execution"""
         return self.task_queue.submit(task_name, *args, **kwargs)
     
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a queued or streaming task (see TaskQueue.cancel)"""
+        return self.task_queue.cancel(task_id)
+    
+    def idle_workers(self, task_type: TaskType) -> int:
+        """Workers of ``task_type`` that are neither busy nor spoken for by queued tasks"""
+        pool = self.worker_pools.get(task_type)
+        if pool is None:
+            return 0
+        busy = sum(1 for worker in pool.workers if worker.current_task)
+        with self.task_queue._lock:
+            queued = len(self.task_queue._queues.get(task_type, ()))
+        return max(0, len(pool.workers) - busy - queued)
+    
     def wait_for_result(self, task_id: str, timeout: Optional[float] = None) -> Optional[TaskResult]:
         """Wait for a task to complete and return its result"""
         return self.task_queue.get_result(task_id, timeout=timeout)
@@ -908,6 +908,10 @@ async def build_cognition_from_vera(
         )
 
     # ── Assemble ──
+    # Share the pool's capacity arbiter so tasks and background cycles
+    # yield to live chat instead of competing with it for model slots.
+    from Vera.Ollama.capacity_arbiter import get_arbiter
+
     manager = CognitionManager(
         llm=llm,
         memory=memory,
@@ -915,6 +919,7 @@ async def build_cognition_from_vera(
         tools=tools,
         event_bus=event_bus,
         config=config,
+        arbiter=get_arbiter(),
     )
 
     if vera_logger:
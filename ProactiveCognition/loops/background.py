@@ -83,12 +83,14 @@ class BackgroundLoop:
         messaging: MessagingGateway,
         config: Optional[BackgroundConfig] = None,
         on_task_proposed=None,         # async callback(Task)
+        arbiter=None,                  # CapacityArbiter — cycles wait out interactive chat
     ):
         self.llm = llm
         self.memory = memory
         self.messaging = messaging
         self.config = config or BackgroundConfig()
         self._on_task_proposed = on_task_proposed
+        self._arbiter = arbiter
         self._task: Optional[asyncio.Task] = None
         self._running = False
         self._cycle_count = 0
@@ -122,7 +124,11 @@ class BackgroundLoop:
     async def _loop(self):
         while self._running:
             try:
-                await self._run_cycle()
+                if self._arbiter is not None:
+                    async with self._arbiter.background_async("background cycle"):
+                        await self._run_cycle()
+                else:
+                    await self._run_cycle()
             except asyncio.CancelledError:
                 break
             except Exception:
@@ -75,6 +75,7 @@ class CognitionManager:
         tools: ToolRouter,
         event_bus: Optional[EventBus] = None,
         config: Optional[CognitionConfig] = None,
+        arbiter=None,
     ):
         self.llm = llm
         self.memory = memory
@@ -84,7 +85,8 @@ class CognitionManager:
         self.config = config or CognitionConfig()
 
         # scheduler
-        self.scheduler = Scheduler(max_workers=self.config.max_workers)
+        self.arbiter = arbiter
+        self.scheduler = Scheduler(max_workers=self.config.max_workers, arbiter=arbiter)
         self.scheduler.set_handler(self._task_handler)
 
         # focused loop (stateless — the scheduler calls it)
@@ -103,6 +105,7 @@ class CognitionManager:
             messaging=messaging,
             config=self.config.background,
             on_task_proposed=self._on_task_proposed,
+            arbiter=arbiter,
         )
 
         self._running = False
@@ -263,6 +266,7 @@ class CognitionManager:
                 "running": self.background.is_running,
                 "cycles": self.background._cycle_count,
             },
+            "arbiter": self.arbiter.stats() if self.arbiter else None,
             "tasks": {
                 "active": len([t for t in active if not t.is_terminal()]),
                 "blocked": len([t for t in active if t.status == TaskStatus.BLOCKED]),
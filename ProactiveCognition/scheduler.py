@@ -51,8 +51,9 @@ class Scheduler:
         await scheduler.shutdown()
     """
 
-    def __init__(self, max_workers: int = 3):
+    def __init__(self, max_workers: int = 3, arbiter=None):
         self.max_workers = max_workers
+        self._arbiter = arbiter   # CapacityArbiter: hold tasks while chat is in flight
         self._queue: asyncio.PriorityQueue[PriorityEntry] = asyncio.PriorityQueue()
         self._handler: Optional[Callable[[Task], Awaitable[None]]] = None
         self._workers: list[asyncio.Task] = []
@@ -156,7 +157,11 @@ class Scheduler:
                         "Worker %d processing task %s [%s]",
                         worker_id, task.id, task.status.value,
                     )
-                    await self._handler(task)
+                    if self._arbiter is not None:
+                        async with self._arbiter.background_async(f"task {task.id}"):
+                            await self._handler(task)
+                    else:
+                        await self._handler(task)
                 except Exception:
                     logger.exception(
                         "Worker %d: unhandled error on task %s", worker_id, task.id
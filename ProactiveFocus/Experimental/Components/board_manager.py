@@ -1,18 +1,38 @@
 # board_manager.py — FIXED VERSION
-"""Focus board data structure and persistence."""
+"""Focus board data structure and persistence.
 
+Persistence layout in ``boards_dir``:
+
+    <name>.json         snapshot (same format as before, plus ``log_seq``)
+    <name>.log.jsonl    append-only change log since the snapshot; one
+                        record per save with item-level add/update/move/
+                        remove changes and the new order of touched
+                        categories
+    .board_index        focus/project/timestamps per snapshot, so listing
+                        and matching boards doesn't open every file
+
+Repeated saves of the same focus append to the log; every
+``compact_every`` records the log is folded back into the snapshot.
+"""
+
+import hashlib
 import json
 import os
 import re
+import threading
+import uuid
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
 
 
 class FocusBoard:
     """Manages focus board state and persistence."""
     
-    def __init__(self, boards_dir: str = "./Output/Projects/focus_boards"):
+    LOG_SUFFIX = ".log.jsonl"
+    INDEX_FILE = ".board_index"
+    
+    def __init__(self, boards_dir: str = "./Output/Projects/focus_boards", compact_every: int = 50):
         self.boards_dir = boards_dir
         os.makedirs(boards_dir, exist_ok=True)
         
@@ -25,6 +45,21 @@ class FocusBoard:
             "completed": [],
             "questions": []
         }
+        self.board = self.focus_board
+        
+        # Change-log state for the board file currently being written
+        self.compact_every = compact_every
+        self.current_file: Optional[str] = None
+        self.current_focus: Optional[str] = None
+        self.last_changes: List[Dict[str, Any]] = []
+        self._created_at: Optional[str] = None
+        self._seq = 0
+        self._log_records = 0
+        self._saved_items: Dict[str, Tuple[str, str]] = {}   # id -> (category, digest)
+        self._saved_order: Dict[str, List[str]] = {}
+        self._ids_assigned = False
+        self._snapshot_stale = False   # loaded snapshot lacks the item ids the log refers to
+        self._index_lock = threading.Lock()
     
     def add_item(self, category: str, note: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Add item to category."""
@@ -129,6 +164,79 @@ class FocusBoard:
         
         return safe
     
+    # ------------------------------------------------------------
+    # Item identity and diffing
+    # ------------------------------------------------------------
+    
+    @staticmethod
+    def _digest(item: Any) -> str:
+        blob = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(blob.encode('utf-8')).hexdigest()
+    
+    def _state(self) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, List[str]]]:
+        """(id -> (category, digest), category -> ordered ids); assigns ids to new dict items."""
+        items: Dict[str, Tuple[str, str]] = {}
+        order: Dict[str, List[str]] = {}
+        self._ids_assigned = False
+        for category, entries in self.board.items():
+            ids = []
+            for item in entries:
+                if isinstance(item, dict):
+                    if not item.get("id") or item["id"] in items:
+                        item["id"] = uuid.uuid4().hex[:12]
+                        self._ids_assigned = True
+                    item_id = item["id"]
+                else:
+                    item_id = "h_" + self._digest(item)[:12]
+                items[item_id] = (category, self._digest(item))
+                ids.append(item_id)
+            order[category] = ids
+        return items, order
+    
+    def _diff(self, items: Dict[str, Tuple[str, str]], order: Dict[str, List[str]]):
+        """Item-level changes and touched category orders since the last save/load."""
+        by_id = {}
+        for category, entries in self.board.items():
+            for item_id, item in zip(order[category], entries):
+                by_id[item_id] = item
+        
+        changes = []
+        for item_id, (category, digest) in items.items():
+            prev = self._saved_items.get(item_id)
+            if prev is None:
+                op = "add"
+            elif prev[0] != category:
+                op = "move"
+            elif prev[1] != digest:
+                op = "update"
+            else:
+                continue
+            change = {"op": op, "id": item_id, "category": category, "item": by_id[item_id]}
+            if op == "move":
+                change["from"] = prev[0]
+            changes.append(change)
+        
+        for item_id, (category, _) in self._saved_items.items():
+            if item_id not in items:
+                changes.append({"op": "remove", "id": item_id, "category": category})
+        
+        touched = {c: ids for c, ids in order.items() if self._saved_order.get(c) != ids}
+        touched.update({c: None for c in self._saved_order if c not in order})
+        return changes, touched
+    
+    def _log_path(self, filepath: str) -> str:
+        return (filepath[:-5] if filepath.endswith('.json') else filepath) + self.LOG_SUFFIX
+    
+    def _write_snapshot(self, filepath: str, data: Dict[str, Any]):
+        tmp = f"{filepath}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, filepath)
+        # Everything up to data["log_seq"] is in the snapshot now
+        with open(self._log_path(filepath), 'w', encoding='utf-8'):
+            pass
+        self._log_records = 0
+    
     def save(
         self,
         focus: str,
@@ -138,6 +246,11 @@ class FocusBoard:
     ) -> Optional[str]:
         """Save board to file.
         
+        Saves of the same focus append a change record to the board's log
+        (compacted into the snapshot every ``compact_every`` records); a new
+        focus or explicit filename writes a fresh snapshot.  The item-level
+        changes are left in ``self.last_changes``.
+        
         FIX: Better filename generation and None guards.
         """
         # FIX: Guard against None focus
@@ -145,36 +258,108 @@ class FocusBoard:
             print("[FocusBoard] Cannot save: no focus provided")
             return None
         
-        if not filename:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            # FIX: Use robust sanitizer instead of simple regex
-            safe_focus = self._sanitize_filename(focus)
-            filename = f"{safe_focus}_{timestamp}.json"
-        
         # FIX: Ensure directory exists (handles race conditions)
         os.makedirs(self.boards_dir, exist_ok=True)
         
+        append = (
+            (not filename or filename == self.current_file)
+            and self.current_file is not None
+            and self.current_focus == focus
+            and os.path.exists(os.path.join(self.boards_dir, self.current_file))
+        )
+        
+        if append:
+            filename = self.current_file
+        else:
+            if not filename:
+                timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+                # FIX: Use robust sanitizer instead of simple regex
+                safe_focus = self._sanitize_filename(focus)
+                filename = f"{safe_focus}_{timestamp}.json"
+            # New board file: everything on it is new
+            self._saved_items, self._saved_order = {}, {}
+            self._seq = 0
+            self._created_at = datetime.utcnow().isoformat()
+        
         filepath = os.path.join(self.boards_dir, filename)
         
         # FIX: Resolve to absolute path to avoid Windows short name issues
         filepath = str(Path(filepath).resolve())
         
+        items, order = self._state()
+        changes, touched = self._diff(items, order)
+        self.last_changes = changes
+        now = datetime.utcnow().isoformat()
+        
+        if append and (changes or touched):
+            self._seq += 1
+            record = {"seq": self._seq, "ts": now, "changes": changes, "order": touched}
+            with open(self._log_path(filepath), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self._log_records += 1
+        
         data = {
             "focus": focus,
             "project_id": project_id,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": self._created_at or now,
+            "updated_at": now,
+            "log_seq": self._seq,
             "board": self.board,
             "metadata": {
                 "session_id": agent.sess.id if agent and hasattr(agent, 'sess') else None
             }
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if not append or self._snapshot_stale or self._log_records >= self.compact_every:
+            self._write_snapshot(filepath, data)
+            self._snapshot_stale = False
+        
+        self.current_file = filename
+        self.current_focus = focus
+        self._saved_items, self._saved_order = items, order
+        self._update_index(filename, data)
         
-        print(f"[FocusBoard] Saved: {filepath}")
+        print(f"[FocusBoard] Saved: {filepath} ({len(changes)} changes)")
         return filepath
     
+    def _replay_log(self, filepath: str, board: Dict[str, List], seq: int) -> Tuple[Dict[str, List], int, int]:
+        """Apply log records newer than ``seq`` to a snapshot board."""
+        log_path = self._log_path(filepath)
+        if not os.path.exists(log_path):
+            return board, seq, 0
+        
+        self.board = board
+        items, order = self._state()
+        by_id = {}
+        for category, entries in board.items():
+            for item_id, item in zip(order[category], entries):
+                by_id[item_id] = item
+        
+        applied = 0
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn final write
+                if record.get("seq", 0) <= seq:
+                    continue
+                for change in record.get("changes", []):
+                    if change["op"] == "remove":
+                        by_id.pop(change["id"], None)
+                    else:
+                        by_id[change["id"]] = change["item"]
+                for category, ids in record.get("order", {}).items():
+                    if ids is None:
+                        order.pop(category, None)
+                    else:
+                        order[category] = ids
+                seq = record["seq"]
+                applied += 1
+        
+        board = {c: [by_id[i] for i in ids if i in by_id] for c, ids in order.items()}
+        return board, seq, applied
+    
     def load(self, filename: str) -> Optional[Dict[str, Any]]:
         """Load board from file.
         
@@ -202,8 +387,18 @@ class FocusBoard:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
+            # Pre-log snapshots have no item ids; rewrite before appending to the log
+            stale = any(
+                isinstance(item, dict) and not item.get("id")
+                for items in data.get("board", {}).values() if isinstance(items, list)
+                for item in items
+            )
+            
             # FIX: Validate board structure
-            loaded_board = data.get("board", {})
+            loaded_board, seq, applied = self._replay_log(
+                filepath, data.get("board", {}), data.get("log_seq", 0)
+            )
+            data["board"] = loaded_board
             
             # Ensure all expected categories exist
             for category in ["progress", "next_steps", "issues", "ideas", "actions", "completed", "questions"]:
@@ -212,6 +407,19 @@ class FocusBoard:
             
             self.board = loaded_board
             
+            # Subsequent saves of this focus append to this file's log
+            if os.path.dirname(os.path.abspath(filepath)) == os.path.abspath(self.boards_dir):
+                self.current_file = os.path.basename(filepath)
+            else:
+                self.current_file = None
+            self.current_focus = data.get("focus")
+            self._created_at = data.get("created_at")
+            self._seq = seq
+            self._log_records = applied
+            self._saved_items, self._saved_order = self._state()
+            self._snapshot_stale = stale or self._ids_assigned
+            self.last_changes = []
+            
             print(f"[FocusBoard] Loaded: {filepath}")
             print(f"[FocusBoard] Focus: {data.get('focus')}")
             print(f"[FocusBoard] Items: {sum(len(v) for v in self.board.values())}")
@@ -284,8 +492,79 @@ class FocusBoard:
         
         return project_id
     
+    # ------------------------------------------------------------
+    # Board index
+    # ------------------------------------------------------------
+    
+    def _index_path(self) -> str:
+        return os.path.join(self.boards_dir, self.INDEX_FILE)
+    
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_index(self, index: Dict[str, Dict[str, Any]]):
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp, self._index_path())
+    
+    @staticmethod
+    def _index_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+        board = data.get("board") or {}
+        return {
+            "focus": data.get("focus"),
+            "project_id": data.get("project_id"),
+            "created_at": data.get("created_at"),
+            "updated_at": data.get("updated_at") or data.get("created_at"),
+            "items": sum(len(v) for v in board.values() if isinstance(v, list)),
+        }
+    
+    def _update_index(self, filename: str, data: Dict[str, Any]):
+        with self._index_lock:
+            index = self._read_index()
+            index[filename] = self._index_entry(data)
+            self._write_index(index)
+    
+    def list_boards(self) -> List[Dict[str, Any]]:
+        """Index entries for every saved board, reconciled against the directory.
+        
+        Only snapshots the index hasn't seen (e.g. copied in by hand) are
+        opened; entries for deleted snapshots are dropped with their logs.
+        """
+        if not os.path.exists(self.boards_dir):
+            return []
+        
+        with self._index_lock:
+            index = self._read_index()
+            on_disk = {f for f in os.listdir(self.boards_dir) if f.endswith('.json')}
+            dirty = False
+            
+            for filename in set(index) - on_disk:
+                del index[filename]
+                log_path = self._log_path(os.path.join(self.boards_dir, filename))
+                if os.path.exists(log_path):
+                    os.remove(log_path)
+                dirty = True
+            
+            for filename in on_disk - set(index):
+                try:
+                    with open(os.path.join(self.boards_dir, filename), 'r', encoding='utf-8') as f:
+                        index[filename] = self._index_entry(json.load(f))
+                    dirty = True
+                except Exception as e:
+                    print(f"[FocusBoard] Error reading {filename}: {e}")
+            
+            if dirty:
+                self._write_index(index)
+        
+        return [{"filename": filename, **entry} for filename, entry in index.items()]
+    
     def _find_matching_board(self, focus: str) -> Optional[Dict[str, Any]]:
-        """Find matching saved board.
+        """Find matching saved board (most recently updated first).
         
         FIX: Better error handling and logging.
         """
@@ -295,49 +574,37 @@ class FocusBoard:
         focus_lower = focus.lower().strip()
         
         try:
-            if not os.path.exists(self.boards_dir):
-                return None
-            
-            for filename in os.listdir(self.boards_dir):
-                if not filename.endswith('.json'):
-                    continue
-                
-                filepath = os.path.join(self.boards_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    saved_focus = data.get('focus', '').lower().strip()
-                    
-                    if not saved_focus:
-                        continue
-                    
-                    # Exact match
-                    if saved_focus == focus_lower:
-                        print(f"[FocusBoard] Exact match: {filename}")
-                        return {
-                            "filename": filename,
-                            "focus": data.get('focus'),
-                            "project_id": data.get('project_id'),
-                            "created_at": data.get('created_at')
-                        }
-                    
-                    # Partial match (one contains the other)
-                    if focus_lower in saved_focus or saved_focus in focus_lower:
-                        print(f"[FocusBoard] Partial match: {filename}")
-                        return {
-                            "filename": filename,
-                            "focus": data.get('focus'),
-                            "project_id": data.get('project_id'),
-                            "created_at": data.get('created_at')
-                        }
-                except Exception as e:
-                    print(f"[FocusBoard] Error reading {filename}: {e}")
-                    continue
+            boards = sorted(self.list_boards(), key=lambda b: b.get("updated_at") or "", reverse=True)
         except Exception as e:
             print(f"[FocusBoard] Error scanning boards dir: {e}")
+            return None
+        
+        partial = None
+        for entry in boards:
+            saved_focus = (entry.get('focus') or '').lower().strip()
+            
+            if not saved_focus:
+                continue
+            
+            match = {
+                "filename": entry["filename"],
+                "focus": entry.get('focus'),
+                "project_id": entry.get('project_id'),
+                "created_at": entry.get('created_at')
+            }
+            
+            # Exact match
+            if saved_focus == focus_lower:
+                print(f"[FocusBoard] Exact match: {entry['filename']}")
+                return match
+            
+            # Partial match (one contains the other)
+            if partial is None and (focus_lower in saved_focus or saved_focus in focus_lower):
+                partial = match
         
-        return None
+        if partial:
+            print(f"[FocusBoard] Partial match: {partial['filename']}")
+        return partial
     
     def restore_from_memory(self, hybrid_memory) -> Optional[Dict[str, Any]]:
         """Restore most recent focus from memory.
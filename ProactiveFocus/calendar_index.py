@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Calendar Index for Proactive Focus
+==================================
+Interval index over calendar occurrences, so the scheduler's questions
+("what is coming up?", "is this slot free?") no longer scan every parsed
+event.
+
+Features:
+- Recurrences expanded once into a bounded window (re-expanded only when a
+  query reaches past it)
+- Centered interval tree over the expanded occurrences: overlap and
+  stabbing queries in O(log n + k)
+- Start-sorted array for "starting between" queries (bisect + slice)
+- Incremental updates: changed events go to a small pending set with
+  tombstones for the old ones; the tree is rebuilt only once the pending
+  set grows past a fraction of the index
+- ICS change detection by mtime/size, then content hash, then per-VEVENT
+  hash, so only changed events are re-parsed
+
+Benchmark with a synthetic 50k-event calendar:
+    python -m Vera.ProactiveFocus.calendar_index --bench
+"""
+
+import hashlib
+import re
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Any, Tuple, Iterable, Set
+import logging
+
+from dateutil.rrule import rrulestr
+
+logger = logging.getLogger(__name__)
+
+
+def to_ts(value: Any) -> float:
+    """datetime / Arrow / epoch -> epoch seconds (naive datetimes are UTC)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if hasattr(value, 'datetime'):
+        value = value.datetime
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def from_ts(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+@dataclass(frozen=True)
+class Occurrence:
+    """One concrete [start, end) instance of a calendar event"""
+    start: float
+    end: float
+    key: str
+    version: int
+    payload: Any = None
+
+
+# ============================================================
+# Static interval tree
+# ============================================================
+
+class _Node:
+    __slots__ = ('center', 'left', 'right', 'by_start', 'starts', 'by_end', 'neg_ends')
+
+    def __init__(self, center: float, overlapping: List[Occurrence]):
+        self.center = center
+        self.left: Optional['_Node'] = None
+        self.right: Optional['_Node'] = None
+        self.by_start = sorted(overlapping, key=lambda o: o.start)
+        self.starts = [o.start for o in self.by_start]
+        self.by_end = sorted(overlapping, key=lambda o: -o.end)
+        self.neg_ends = [-o.end for o in self.by_end]
+
+
+def _build(items: List[Occurrence]) -> Optional[_Node]:
+    """Centered interval tree; every node holds the intervals containing its center"""
+    if not items:
+        return None
+    points = sorted(p for o in items for p in (o.start, o.end))
+    center = points[len(points) // 2]
+    left = [o for o in items if o.end <= center]
+    right = [o for o in items if o.start > center]
+    here = [o for o in items if o.start <= center < o.end]
+    if not here and (not left or not right):
+        # Degenerate split (e.g. zero-length intervals); keep them here
+        here, left, right = [o for o in items if o.start <= center], [], [o for o in items if o.start > center]
+    node = _Node(center, here)
+    node.left = _build(left)
+    node.right = _build(right)
+    return node
+
+
+def _query(node: Optional[_Node], start: float, end: float, out: List[Occurrence]):
+    """Collect intervals overlapping [start, end)"""
+    while node is not None:
+        if end <= node.center:
+            # Node intervals reach past center >= end; overlap iff they start before end
+            out.extend(o for o in node.by_start[:bisect_left(node.starts, end)] if o.end > start)
+            node = node.left
+        elif start > node.center:
+            # Node intervals start at/before center < start; overlap iff they end after start
+            out.extend(o for o in node.by_end[:bisect_left(node.neg_ends, -start)] if o.start < end)
+            node = node.right
+        else:
+            out.extend(o for o in node.by_start if o.end > start and o.start < end)
+            _query(node.left, start, end, out)
+            node = node.right
+
+
+# ============================================================
+# Calendar index
+# ============================================================
+
+class CalendarIndex:
+    """
+    Occurrence index keyed by event key (UID).
+
+    ``set_event`` / ``remove_event`` are cheap: the new occurrences go to a
+    pending list and the old version is tombstoned.  Queries merge the tree
+    with the pending list and drop stale versions; the tree is rebuilt when
+    pending + tombstoned occurrences exceed ``rebuild_ratio`` of the index.
+    """
+
+    def __init__(
+        self,
+        lookback_days: int = 30,
+        horizon_days: int = 180,
+        rebuild_ratio: float = 0.05,
+        min_rebuild: int = 256
+    ):
+        self.lookback = timedelta(days=lookback_days)
+        self.horizon = timedelta(days=horizon_days)
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild = min_rebuild
+
+        now = datetime.now(timezone.utc)
+        self.window_start = to_ts(now - self.lookback)
+        self.window_end = to_ts(now + self.horizon)
+
+        # key -> (begin, end, rrule, payload), the inputs needed to re-expand
+        self._events: Dict[str, Tuple[float, float, Optional[str], Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._occurrences: Dict[str, List[Occurrence]] = {}
+
+        self._tree: Optional[_Node] = None
+        self._sorted: List[Occurrence] = []
+        self._sorted_starts: List[float] = []
+        self._pending: List[Occurrence] = []
+        self._stale = 0
+
+        self.stats = {'rebuilds': 0, 'expansions': 0, 'window_extensions': 0}
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._occurrences.values())
+
+    # -- updates -------------------------------------------------------
+
+    def load(self, events: Iterable[Tuple[str, Any, Any, Optional[str], Any]]):
+        """Bulk add (key, begin, end, rrule, payload) tuples with a single rebuild"""
+        for key, begin, end, rrule, payload in events:
+            self.set_event(key, begin, end, rrule, payload, rebuild=False)
+        self.rebuild()
+
+    def set_event(
+        self,
+        key: str,
+        begin: Any,
+        end: Any,
+        rrule: Optional[str] = None,
+        payload: Any = None,
+        rebuild: bool = True
+    ):
+        """Add or replace an event (and its recurrences)"""
+        begin_ts, end_ts = to_ts(begin), to_ts(end)
+        if end_ts < begin_ts:
+            end_ts = begin_ts
+        if key in self._events:
+            self._tombstone(key)
+        self._events[key] = (begin_ts, end_ts, rrule, payload)
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        occurrences = self._expand(key, version)
+        self._occurrences[key] = occurrences
+        self._pending.extend(occurrences)
+        if rebuild:
+            self._maybe_rebuild()
+
+    def remove_event(self, key: str) -> bool:
+        if key not in self._events:
+            return False
+        self._tombstone(key)
+        del self._events[key]
+        self._versions[key] += 1
+        self._maybe_rebuild()
+        return True
+
+    def keys(self) -> Set[str]:
+        return set(self._events)
+
+    def _tombstone(self, key: str):
+        self._stale += len(self._occurrences.pop(key, ()))
+
+    def _expand(self, key: str, version: int) -> List[Occurrence]:
+        begin, end, rule, payload = self._events[key]
+        duration = end - begin
+        if not rule:
+            return [Occurrence(begin, end, key, version, payload)]
+
+        self.stats['expansions'] += 1
+        dtstart = from_ts(begin)
+        try:
+            rule_set = rrulestr(rule.replace('RRULE:', '', 1), dtstart=dtstart, forceset=True)
+            starts = rule_set.between(
+                from_ts(self.window_start - duration), from_ts(self.window_end), inc=True
+            )
+        except (ValueError, TypeError) as e:
+            logger.warning(f"[CalendarIndex] Bad RRULE on {key} ({rule}): {e}")
+            return [Occurrence(begin, end, key, version, payload)]
+        return [Occurrence(s.timestamp(), s.timestamp() + duration, key, version, payload) for s in starts]
+
+    def _live(self, occurrence: Occurrence) -> bool:
+        return self._versions.get(occurrence.key) == occurrence.version
+
+    def _maybe_rebuild(self):
+        size = len(self._sorted)
+        if len(self._pending) + self._stale > max(self.min_rebuild, self.rebuild_ratio * size):
+            self.rebuild()
+
+    def rebuild(self):
+        items = [o for occurrences in self._occurrences.values() for o in occurrences]
+        items.sort(key=lambda o: o.start)
+        self._sorted = items
+        self._sorted_starts = [o.start for o in items]
+        self._tree = _build(items)
+        self._pending = []
+        self._stale = 0
+        self.stats['rebuilds'] += 1
+
+    def ensure_window(self, start: float, end: float):
+        """Re-expand recurring events if a query reaches outside the expanded window"""
+        if start >= self.window_start and end <= self.window_end:
+            return
+        self.window_start = min(self.window_start, start - self.lookback.total_seconds())
+        self.window_end = max(self.window_end, end + self.horizon.total_seconds())
+        recurring = [k for k, (_, _, rule, _) in self._events.items() if rule]
+        for key in recurring:
+            self._tombstone(key)
+            version = self._versions[key] + 1
+            self._versions[key] = version
+            self._occurrences[key] = self._expand(key, version)
+        self.stats['window_extensions'] += 1
+        self.rebuild()
+
+    # -- queries -------------------------------------------------------
+
+    def overlapping(self, start: Any, end: Any) -> List[Occurrence]:
+        """Occurrences overlapping [start, end), sorted by start"""
+        start, end = to_ts(start), to_ts(end)
+        self.ensure_window(start, end)
+        found: List[Occurrence] = []
+        _query(self._tree, start, end, found)
+        found.extend(o for o in self._pending if o.start < end and o.end > start)
+        found = [o for o in found if self._live(o)]
+        found.sort(key=lambda o: o.start)
+        return found
+
+    def starting_between(self, start: Any, end: Any) -> List[Occurrence]:
+        """Occurrences with start in [start, end], sorted by start"""
+        start, end = to_ts(start), to_ts(end)
+        self.ensure_window(start, end)
+        lo = bisect_left(self._sorted_starts, start)
+        hi = bisect_right(self._sorted_starts, end)
+        found = [o for o in self._sorted[lo:hi] if self._live(o)]
+        if self._pending:
+            found.extend(o for o in self._pending if start <= o.start <= end and self._live(o))
+            found.sort(key=lambda o: o.start)
+        return found
+
+    def is_free(self, start: Any, end: Any) -> bool:
+        return not self.overlapping(start, end)
+
+    def busy(self, start: Any, end: Any) -> List[Tuple[float, float]]:
+        """Merged busy intervals clipped to [start, end)"""
+        start, end = to_ts(start), to_ts(end)
+        merged: List[List[float]] = []
+        for o in self.overlapping(start, end):
+            s, e = max(o.start, start), min(o.end, end)
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        return [(s, e) for s, e in merged]
+
+    def free_windows(self, start: Any, end: Any, min_duration: float = 0.0) -> List[Tuple[float, float]]:
+        """Gaps of at least ``min_duration`` seconds in [start, end)"""
+        start, end = to_ts(start), to_ts(end)
+        windows = []
+        cursor = start
+        for s, e in self.busy(start, end):
+            if s - cursor >= min_duration and s > cursor:
+                windows.append((cursor, s))
+            cursor = max(cursor, e)
+        if end - cursor >= min_duration and end > cursor:
+            windows.append((cursor, end))
+        return windows
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'events': len(self._events),
+            'occurrences': len(self),
+            'pending': len(self._pending),
+            'stale': self._stale,
+            'window_start': from_ts(self.window_start).isoformat(),
+            'window_end': from_ts(self.window_end).isoformat(),
+            **self.stats,
+        }
+
+
+# ============================================================
+# ICS change detection
+# ============================================================
+
+_VEVENT = re.compile(r'^BEGIN:VEVENT\r?\n(.*?)^END:VEVENT\r?$', re.M | re.S)
+_FOLD = re.compile(r'\r?\n[ \t]')
+
+
+def _line_value(block: str, name: str) -> Optional[str]:
+    match = re.search(rf'^{name}(?:;[^:\r\n]*)?:(.*?)\r?$', block, re.M)
+    return match.group(1).strip() if match else None
+
+
+def event_key(uid: Optional[str], recurrence_id: Optional[str] = None) -> str:
+    return f"{uid}|{recurrence_id}" if recurrence_id else str(uid)
+
+
+def split_vevents(content: str) -> Dict[str, Tuple[str, str]]:
+    """VEVENT key -> (content hash, unfolded block), from raw ICS text (first calendar only)"""
+    content = _FOLD.sub('', content)
+    end = content.find('END:VCALENDAR')
+    if end != -1:
+        content = content[:end]
+    out: Dict[str, Tuple[str, str]] = {}
+    for match in _VEVENT.finditer(content):
+        block = match.group(1)
+        digest = hashlib.sha1(block.encode('utf-8', 'replace')).hexdigest()
+        uid = _line_value(block, 'UID')
+        key = event_key(uid, _line_value(block, 'RECURRENCE-ID')) if uid else f"nouid:{digest}"
+        out[key] = (digest, block)
+    return out
+
+
+class ICSWatcher:
+    """
+    Detects ICS file changes cheaply: stat first, then whole-file hash,
+    then per-VEVENT hashes to report which event keys were added,
+    changed or removed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._signature: Optional[Tuple[float, int]] = None
+        self._digest: Optional[str] = None
+        self._events: Dict[str, str] = {}
+
+    def record(self, content: str):
+        """Remember ``content`` as the current state (e.g. after our own save)"""
+        try:
+            st = self.path.stat()
+            self._signature = (st.st_mtime, st.st_size)
+        except OSError:
+            self._signature = None
+        self._digest = hashlib.sha1(content.encode('utf-8', 'replace')).hexdigest()
+        self._events = {k: digest for k, (digest, _) in split_vevents(content).items()}
+
+    def poll(self) -> Optional[Tuple[Dict[str, str], Set[str]]]:
+        """
+        Returns None if unchanged, else ({changed_or_added_key: block},
+        removed_keys).
+        """
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        signature = (st.st_mtime, st.st_size)
+        if signature == self._signature:
+            return None
+        self._signature = signature
+
+        with open(self.path, 'r') as f:
+            content = f.read()
+        digest = hashlib.sha1(content.encode('utf-8', 'replace')).hexdigest()
+        if digest == self._digest:
+            return None
+        self._digest = digest
+
+        events = split_vevents(content)
+        changed = {k: block for k, (h, block) in events.items() if self._events.get(k) != h}
+        removed = set(self._events) - set(events)
+        self._events = {k: h for k, (h, _) in events.items()}
+        return changed, removed
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+
+def benchmark(n_events: int = 50_000, queries: int = 2_000, recurring_ratio: float = 0.05,
+              updates: int = 100, seed: int = 7) -> Dict[str, Any]:
+    """
+    Synthetic calendar: ``n_events`` events over ~4 years of history plus
+    the next year, ``recurring_ratio`` of them weekly/daily recurring.
+    Compares the previous linear scan (re-expanding recurrences per query)
+    with the index for overlap, free/busy and upcoming queries, and times
+    incremental updates.
+    """
+    import random
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    span_start = now - timedelta(days=4 * 365)
+    span_days = 5 * 365
+
+    events = []
+    for i in range(n_events):
+        begin = span_start + timedelta(days=rng.random() * span_days)
+        begin = begin.replace(minute=rng.choice((0, 15, 30, 45)), second=0, microsecond=0)
+        end = begin + timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120)))
+        rule = None
+        if rng.random() < recurring_ratio:
+            rule = rng.choice(("FREQ=WEEKLY;COUNT=52", "FREQ=DAILY;COUNT=30", "FREQ=WEEKLY"))
+        events.append((f"evt-{i}", begin, end, rule))
+
+    def linear_overlap(q_start: datetime, q_end: datetime) -> int:
+        hits = 0
+        for _, begin, end, rule in events:
+            duration = end - begin
+            if rule:
+                for s in rrulestr(rule, dtstart=begin).between(q_start - duration, q_end, inc=True):
+                    if s < q_end and s + duration > q_start:
+                        hits += 1
+            elif begin < q_end and end > q_start:
+                hits += 1
+        return hits
+
+    index = CalendarIndex(horizon_days=365)
+    t0 = time.perf_counter()
+    index.load((key, begin, end, rule, None) for key, begin, end, rule in events)
+    build_s = time.perf_counter() - t0
+
+    windows = []
+    for _ in range(queries):
+        q_start = now + timedelta(days=rng.uniform(-30, 180))
+        windows.append((q_start, q_start + timedelta(hours=rng.choice((1, 2, 4, 24)))))
+
+    linear_n = max(1, queries // 100)
+    t0 = time.perf_counter()
+    linear_hits = [linear_overlap(s, e) for s, e in windows[:linear_n]]
+    linear_ms = (time.perf_counter() - t0) * 1000 / linear_n
+
+    t0 = time.perf_counter()
+    index_hits = [len(index.overlapping(s, e)) for s, e in windows]
+    index_ms = (time.perf_counter() - t0) * 1000 / queries
+    mismatches = sum(1 for a, b in zip(linear_hits, index_hits) if a != b)
+
+    t0 = time.perf_counter()
+    for s, _ in windows:
+        index.free_windows(s, s + timedelta(days=1), min_duration=1800)
+    free_ms = (time.perf_counter() - t0) * 1000 / queries
+
+    t0 = time.perf_counter()
+    for s, _ in windows:
+        index.starting_between(s, s + timedelta(days=7))
+    upcoming_ms = (time.perf_counter() - t0) * 1000 / queries
+
+    t0 = time.perf_counter()
+    for key, begin, end, rule in rng.sample(events, updates):
+        shift = timedelta(minutes=rng.choice((-60, 30, 90)))
+        index.set_event(key, begin + shift, end + shift, rule)
+    update_ms = (time.perf_counter() - t0) * 1000 / updates
+    t0 = time.perf_counter()
+    for s, e in windows[:200]:
+        index.overlapping(s, e)
+    pending_query_ms = (time.perf_counter() - t0) * 1000 / 200
+
+    return {
+        'events': n_events,
+        'index': index.info(),
+        'build_s': round(build_s, 2),
+        'overlap_linear_ms': round(linear_ms, 2),
+        'overlap_index_ms': round(index_ms, 4),
+        'overlap_speedup': round(linear_ms / max(index_ms, 1e-9)),
+        'overlap_mismatches': mismatches,
+        'free_windows_day_ms': round(free_ms, 4),
+        'upcoming_week_ms': round(upcoming_ms, 4),
+        'incremental_update_ms': round(update_ms, 4),
+        'overlap_with_pending_ms': round(pending_query_ms, 4),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Calendar index benchmark")
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    args = parser.parse_args()
+
+    if args.bench:
+        logging.basicConfig(level=logging.INFO)
+        print(json.dumps(benchmark(args.events, args.queries), indent=2))
+    else:
+        parser.print_help()
@@ -10,17 +10,23 @@ Features:
 - Intelligent wait/pause mechanisms
 - Priority-based resource allocation
 - Background service coordination
+
+Sampling overhead with 2,000 extra processes on the host:
+    python -m Vera.ProactiveFocus.manager --bench
 """
 
 import psutil
 import time
 import threading
-from typing import Optional, Dict, List, Callable
+from collections import deque
+from typing import Any, Optional, Dict, List, Callable, Deque, Tuple
 from dataclasses import dataclass
 from enum import IntEnum
 from datetime import datetime, timedelta
 import logging
 
+from Vera.Logging.telemetry import TelemetryService, TelemetrySample, get_telemetry
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,16 +100,48 @@ class ResourceState:
 
 
 class ResourceMonitor:
-    """Monitor system resources continuously"""
+    """
+    Monitor system resources continuously.
+
+    Readings come from the process-wide TelemetryService, which samples the
+    host once per interval for every consumer and tracks Ollama processes
+    through cached ``psutil.Process`` handles.  This monitor subscribes to
+    it, keeps raw readings in a ring buffer and serves the EWMA-smoothed
+    view from ``get_state()``.  Waiters register a threshold subscription
+    and are woken when a sample satisfies them instead of polling.
+    """
     
-    def __init__(self, limits: Optional[ResourceLimits] = None, poll_interval: float = 2.0):
+    def __init__(
+        self,
+        limits: Optional[ResourceLimits] = None,
+        poll_interval: float = 2.0,
+        history_size: int = 300,
+        smoothing: float = 0.5,
+        rescan_interval: float = 60.0,
+        telemetry: Optional[TelemetryService] = None
+    ):
         self.limits = limits or ResourceLimits()
         self.poll_interval = poll_interval
+        self.smoothing = smoothing
         self.running = False
-        self.thread: Optional[threading.Thread] = None
         self.current_state: Optional[ResourceState] = None
+        self.history: Deque[ResourceState] = deque(maxlen=history_size)
         self._lock = threading.Lock()
         self._state_callbacks: List[Callable[[ResourceState], None]] = []
+        self._waiters: List[Tuple[ResourcePriority, threading.Event]] = []
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._release_interval: Optional[Callable[[], None]] = None
+        self._last_sample: Optional[TelemetrySample] = None
+        
+        self.telemetry = telemetry or get_telemetry()
+        self.telemetry.process_rescan_interval = min(
+            self.telemetry.process_rescan_interval, rescan_interval
+        )
+        self.telemetry.watch_process('ollama')
+        
+        # Fold overhead (sampling cost is reported by the telemetry service)
+        self._samples = 0
+        self._fold_cpu_s = 0.0
     
     def start(self):
         """Start monitoring"""
@@ -111,76 +149,102 @@ class ResourceMonitor:
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        self._release_interval = self.telemetry.request_interval(self.poll_interval)
+        self._sample()  # publish a first state
+        self._unsubscribe = self.telemetry.subscribe(self._on_sample, every=self.poll_interval)
         logger.info("Resource monitor started")
     
     def stop(self):
         """Stop monitoring"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5.0)
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._release_interval:
+            self._release_interval()
+            self._release_interval = None
         logger.info("Resource monitor stopped")
     
     def register_state_callback(self, callback: Callable[[ResourceState], None]):
         """Register callback for state changes"""
         self._state_callbacks.append(callback)
     
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        while self.running:
+    def _on_sample(self, sample: TelemetrySample):
+        """Telemetry subscription: fold the sample and notify callbacks"""
+        state = self._fold(sample)
+        for callback in self._state_callbacks:
             try:
-                state = self._get_current_state()
-                
-                with self._lock:
-                    self.current_state = state
-                
-                # Notify callbacks
-                for callback in self._state_callbacks:
-                    try:
-                        callback(state)
-                    except Exception as e:
-                        logger.error(f"State callback error: {e}")
-                
-                time.sleep(self.poll_interval)
-                
+                callback(state)
             except Exception as e:
-                logger.error(f"Monitor loop error: {e}")
-                time.sleep(self.poll_interval)
+                logger.error(f"State callback error: {e}")
     
-    def _get_current_state(self) -> ResourceState:
-        """Get current resource state"""
-        cpu_percent = psutil.cpu_percent(interval=0.5)
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        memory_available_mb = memory.available / (1024 * 1024)
-        
-        # Count Ollama processes
-        ollama_processes = 0
-        ollama_cpu = 0.0
+    def _sample(self) -> ResourceState:
+        """Fold the latest telemetry sample (sampling now if it is stale)"""
+        return self._fold(self.telemetry.snapshot(max_age=self.poll_interval))
+    
+    def _fold(self, sample: TelemetrySample) -> ResourceState:
+        """Fold one sample into the EWMA and wake satisfied waiters"""
+        cpu_start = time.process_time()
+        ollama = sample.processes.get('ollama')
+        raw = ResourceState(
+            cpu_percent=sample.cpu_percent,
+            memory_percent=sample.memory_percent,
+            memory_available_mb=int(sample.memory_available_mb),
+            ollama_processes=ollama.count if ollama else 0,
+            ollama_cpu_percent=ollama.cpu_percent if ollama else 0.0,
+            timestamp=datetime.fromtimestamp(sample.timestamp)
+        )
         
-        for proc in psutil.process_iter(['name', 'cpu_percent']):
-            try:
-                if 'ollama' in proc.info['name'].lower():
-                    ollama_processes += 1
-                    ollama_cpu += proc.info['cpu_percent'] or 0.0
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        with self._lock:
+            if sample is self._last_sample:
+                return self.current_state
+            self._last_sample = sample
+            self.history.append(raw)
+            prev = self.current_state
+            if prev is None:
+                state = raw
+            else:
+                a = self.smoothing
+                state = ResourceState(
+                    cpu_percent=a * raw.cpu_percent + (1 - a) * prev.cpu_percent,
+                    memory_percent=a * raw.memory_percent + (1 - a) * prev.memory_percent,
+                    memory_available_mb=int(a * raw.memory_available_mb + (1 - a) * prev.memory_available_mb),
+                    ollama_processes=raw.ollama_processes,
+                    ollama_cpu_percent=a * raw.ollama_cpu_percent + (1 - a) * prev.ollama_cpu_percent,
+                    timestamp=raw.timestamp
+                )
+            self.current_state = state
+            
+            for priority, event in self._waiters:
+                if state.can_run(priority, self.limits):
+                    event.set()
+            
+            self._samples += 1
+            self._fold_cpu_s += time.process_time() - cpu_start
         
-        return ResourceState(
-            cpu_percent=cpu_percent,
-            memory_percent=memory_percent,
-            memory_available_mb=memory_available_mb,
-            ollama_processes=ollama_processes,
-            ollama_cpu_percent=ollama_cpu,
-            timestamp=datetime.now()
-        )
+        return state
     
     def get_state(self) -> Optional[ResourceState]:
-        """Get current state snapshot"""
+        """Get current (smoothed) state snapshot"""
         with self._lock:
             return self.current_state
     
+    def get_history(self, limit: Optional[int] = None) -> List[ResourceState]:
+        """Raw samples from the ring buffer, oldest first"""
+        with self._lock:
+            samples = list(self.history)
+        return samples[-limit:] if limit else samples
+    
+    def overhead(self) -> Dict[str, Any]:
+        """Average cost of folding one sample, plus the shared sampler's own cost"""
+        with self._lock:
+            n = max(self._samples, 1)
+            return {
+                'samples': self._samples,
+                'fold_ms_per_sample': 1000 * self._fold_cpu_s / n,
+                'telemetry': self.telemetry.overhead(),
+            }
+    
     def wait_for_resources(
         self, 
         priority: ResourcePriority,
@@ -190,28 +254,49 @@ class ResourceMonitor:
         """
         Wait until resources available for given priority.
         Returns True if resources became available, False if timeout.
-        """
-        start_time = time.time()
         
-        while True:
-            state = self.get_state()
-            
+        The waiter is woken by the sampler when a sample satisfies the
+        priority; ``check_interval`` only paces sampling when the monitor
+        thread is not running.
+        """
+        event = threading.Event()
+        with self._lock:
+            state = self.current_state
             if state and state.can_run(priority, self.limits):
                 logger.debug(f"Resources available for {priority.name}")
                 return True
-            
-            if timeout and (time.time() - start_time) > timeout:
-                logger.warning(f"Resource wait timeout for {priority.name}")
-                return False
-            
+            self._waiters.append((priority, event))
+        
+        if state:
             logger.debug(
                 f"Waiting for resources ({priority.name}): "
                 f"CPU={state.cpu_percent:.1f}%, "
                 f"Mem={state.memory_percent:.1f}%, "
                 f"Ollama={state.ollama_processes}"
             )
-            
-            time.sleep(check_interval)
+        
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            while True:
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    logger.warning(f"Resource wait timeout for {priority.name}")
+                    return False
+                
+                if self.running:
+                    ready = event.wait(remaining)
+                else:
+                    ready = event.wait(min(check_interval, remaining) if remaining else check_interval)
+                    if not ready:
+                        self._sample()
+                        ready = event.is_set()
+                
+                if ready:
+                    logger.debug(f"Resources available for {priority.name}")
+                    return True
+        finally:
+            with self._lock:
+                self._waiters.remove((priority, event))
     
     def is_idle(self) -> bool:
         """Check if system is idle"""
@@ -458,8 +543,73 @@ class AdaptiveScheduler:
         )
 
 
+def benchmark_sampling(processes: int = 2000, rounds: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the old full-scan sampler with a telemetry sample folded into
+    ``ResourceMonitor`` while ``processes`` extra idle processes are running.
+    Reports CPU and wall ms per sample.
+    """
+    import subprocess
+    import sys
+    
+    def legacy_scan():
+        # Previous implementation: blocking 0.5s CPU window + full process_iter
+        psutil.cpu_percent(interval=0.5)
+        psutil.virtual_memory()
+        for proc in psutil.process_iter(['name', 'cpu_percent']):
+            try:
+                'ollama' in (proc.info['name'] or '').lower()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    
+    def measure(fn) -> Dict[str, float]:
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return {
+            'cpu_ms_per_sample': round(1000 * (time.process_time() - cpu_start) / rounds, 2),
+            'wall_ms_per_sample': round(1000 * (time.perf_counter() - wall_start) / rounds, 2),
+        }
+    
+    children = []
+    try:
+        for _ in range(processes):
+            children.append(subprocess.Popen(
+                [sys.executable, '-c', 'import time; time.sleep(600)'] if sys.platform == 'win32'
+                else ['sleep', '600'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            ))
+        
+        monitor = ResourceMonitor(telemetry=TelemetryService(enable_gpu=False))
+        monitor._fold(monitor.telemetry.sample())  # first sample builds the PID cache
+        results = {
+            'host_processes': {'count': len(psutil.pids())},
+            'legacy_scan': measure(legacy_scan),
+            'shared_telemetry': measure(lambda: monitor._fold(monitor.telemetry.sample())),
+        }
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+    return results
+
+
 # Example usage
 if __name__ == "__main__":
+    import argparse
+    import json
+    
+    parser = argparse.ArgumentParser(description="Resource manager demo")
+    parser.add_argument("--bench", action="store_true", help="measure sampling overhead")
+    parser.add_argument("--processes", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    
+    if args.bench:
+        print(json.dumps(benchmark_sampling(args.processes, args.rounds), indent=2))
+        raise SystemExit(0)
+    
     logging.basicConfig(level=logging.DEBUG)
     
     # Create monitor
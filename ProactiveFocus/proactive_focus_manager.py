@@ -4,11 +4,9 @@ import asyncio
 import threading
 import time
 import json
-import os
 import re
 from datetime import datetime
 from typing import Optional, Callable, Dict, List, Any, Set
-import psutil
 from pathlib import Path
 
 from Vera.ProactiveFocus.Experimental.Components.board_manager import FocusBoard
@@ -17,6 +15,8 @@ from Vera.ProactiveFocus.Experimental.Components.stage_executor import StageExec
 from Vera.ProactiveFocus.Experimental.Components.context_manager import ContextEnricher
 from Vera.ProactiveFocus.Experimental.Components.documentation_writer import DocumentationGenerator
 from Vera.ProactiveFocus.Experimental.Components.resource_extractor import ResourceExtractor
+from Vera.Ollama.capacity_arbiter import get_arbiter
+from Vera.Logging.telemetry import get_telemetry
 
 
 class ProactiveFocusManager:
@@ -62,6 +62,7 @@ class ProactiveFocusManager:
         self.proactive_callback: Optional[Callable[[str], None]] = None
         self.pause_event = threading.Event()
         self.pause_event.set()  # FIX: Start un-paused (set = not paused)
+        self.arbiter = get_arbiter()  # Yield model slots to live chat
         
         # WebSocket streaming
         self._websockets = []
@@ -122,23 +123,19 @@ class ProactiveFocusManager:
         Called by: GET /{session_id}/boards/list
                    GET /{session_id}/similar
         """
-        boards = []
-        for filename in os.listdir(self.focus_boards_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.focus_boards_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    boards.append({
-                        "filename": filename,
-                        "focus": data.get("focus"),
-                        "created_at": data.get("created_at"),
-                        "project_id": data.get("project_id")
-                    })
-                except Exception as e:
-                    print(f"[FocusManager] Error reading {filename}: {e}")
+        boards = [
+            {
+                "filename": entry["filename"],
+                "focus": entry.get("focus"),
+                "created_at": entry.get("created_at"),
+                "updated_at": entry.get("updated_at"),
+                "project_id": entry.get("project_id"),
+                "items": entry.get("items", 0)
+            }
+            for entry in self.board.list_boards()
+        ]
         
-        return sorted(boards, key=lambda x: x.get("created_at", ""), reverse=True)
+        return sorted(boards, key=lambda x: x.get("created_at") or "", reverse=True)
     
     def _find_matching_focus_board(self, focus: str) -> Optional[Dict[str, Any]]:
         """Find matching saved board. Delegated to board component.
@@ -492,6 +489,8 @@ class ProactiveFocusManager:
                 "metadata": new_metadata or old_item.get("metadata", {}),
                 "previous_note": old_item.get("note")
             }
+            if old_item.get("id"):
+                items[index]["id"] = old_item["id"]  # same item for the change log
             self._broadcast_sync("board_item_updated", {
                 "category": category, "index": index, "item": items[index]
             })
@@ -517,25 +516,51 @@ class ProactiveFocusManager:
             filename
         )
         
-        # Save to hybrid memory
+        # Embed only the items that changed since the last save, one document per item
         if self.hybrid_memory and self.project_id and filepath:
+            self._sync_board_documents(self.board.last_changes, filepath)
+        
+        self._broadcast_sync("board_saved", {"filepath": filepath})
+        return filepath
+    
+    def _sync_board_documents(self, changes: List[Dict[str, Any]], filepath: str):
+        """Upsert/delete item-level documents for a save's changes.
+        
+        Doc ids are stable per item, so an update replaces the previous
+        embedding instead of adding another.
+        """
+        removed = []
+        for change in changes:
+            doc_id = f"focus_item_{self.project_id}_{change['id']}"
+            if change["op"] == "remove":
+                removed.append(doc_id)
+                continue
+            
+            item = change.get("item")
+            note = item.get("note") if isinstance(item, dict) else item
+            if not isinstance(note, str):
+                note = json.dumps(item, ensure_ascii=False, default=str)
             try:
-                doc_id = f"focus_board_{self.project_id}_{int(time.time()*1000)}"
                 self.hybrid_memory.attach_document(
                     entity_id=self.project_id,
                     doc_id=doc_id,
-                    text=json.dumps(self.focus_board, indent=2),
+                    text=f"[{change['category']}] {note}",
                     metadata={
-                        "type": "focus_board_snapshot",
+                        "type": "focus_board_item",
+                        "category": change["category"],
+                        "item_id": change["id"],
                         "filepath": filepath,
                         "focus": self.focus
                     }
                 )
             except Exception as e:
-                print(f"[FocusManager] Error saving to hybrid memory: {e}")
+                print(f"[FocusManager] Error saving item {change['id']} to hybrid memory: {e}")
         
-        self._broadcast_sync("board_saved", {"filepath": filepath})
-        return filepath
+        if removed:
+            try:
+                self.hybrid_memory.detach_documents(self.project_id, removed)
+            except Exception as e:
+                print(f"[FocusManager] Error removing board item documents: {e}")
     
     def load_focus_board(self, filename: str) -> bool:
         """Load focus board from file.
@@ -606,11 +631,13 @@ class ProactiveFocusManager:
             return
         
         try:
-            self.iteration_manager.run(
-                max_iterations=max_iterations,
-                iteration_interval=iteration_interval,
-                auto_execute=auto_execute
-            )
+            # Stage LLM calls made from this thread queue behind interactive chat
+            with self.arbiter.background("focus_workflow"):
+                self.iteration_manager.run(
+                    max_iterations=max_iterations,
+                    iteration_interval=iteration_interval,
+                    auto_execute=auto_execute
+                )
         finally:
             self.workflow_active = False
     
@@ -688,8 +715,9 @@ class ProactiveFocusManager:
         self._broadcast_sync("proactive_loop_started", {"interval": self.proactive_interval})
         
         while self.running:
-            # Check CPU
-            cpu_usage = psutil.cpu_percent(interval=0.1)
+            # Check CPU (latest shared telemetry sample)
+            telemetry = get_telemetry()
+            cpu_usage = telemetry.snapshot().cpu_percent
             if cpu_usage >= self.cpu_threshold:
                 print(f"[FocusManager] High CPU ({cpu_usage:.1f}%) - pausing...")
                 self._broadcast_sync("proactive_paused", {
@@ -698,8 +726,11 @@ class ProactiveFocusManager:
                 })
                 
                 self.pause_event.clear()
-                while self.running and psutil.cpu_percent() >= self.cpu_threshold:
-                    time.sleep(2)
+                # Woken by the sampler; the timeout re-checks self.running
+                while self.running and telemetry.wait_for(
+                    lambda s: s.cpu_percent < self.cpu_threshold, timeout=2
+                ) is None:
+                    pass
                 
                 print("[FocusManager] CPU dropped - resuming...")
                 self._broadcast_sync("proactive_resumed", {})
@@ -707,8 +738,18 @@ class ProactiveFocusManager:
             
             self.pause_event.wait()
             
+            # Hold off while a chat turn is in flight
+            if self.arbiter.should_yield():
+                print("[FocusManager] Interactive request in flight - pausing...")
+                self._broadcast_sync("proactive_paused", {"reason": "interactive_demand"})
+                while self.running and not self.arbiter.wait_for_idle(timeout=2):
+                    pass
+                print("[FocusManager] Interactive load cleared - resuming...")
+                self._broadcast_sync("proactive_resumed", {})
+            
             # Generate proactive thought
-            thought = self._generate_proactive_thought_streaming()
+            with self.arbiter.background("proactive_thought"):
+                thought = self._generate_proactive_thought_streaming()
             
             if thought and self.proactive_callback:
                 self.proactive_callback(thought)
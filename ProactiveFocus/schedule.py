@@ -10,10 +10,13 @@ Features:
 - Calendar-aware execution
 - Automatic rescheduling based on system availability
 - Integration with existing calendar UI
+- Interval-indexed queries (see calendar_index.py); the ICS file is
+  re-read incrementally when it changes on disk
 """
 
+import copy
 import os
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 import logging
@@ -22,6 +25,10 @@ from ics.grammar.parse import ContentLine
 from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY
 import uuid
 
+from Vera.ProactiveFocus.calendar_index import (
+    CalendarIndex, ICSWatcher, event_key, from_ts, to_ts
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,7 +97,7 @@ Metadata:
         priority = "normal"
         recurrence_rule = None
         
-        for extra_line in event.extra:
+        for extra_line in map(str, event.extra):
             if extra_line.startswith('X-PROACTIVE-FOCUS:'):
                 focus = extra_line.split(':', 1)[1]
             elif extra_line.startswith('X-PROACTIVE-STAGES:'):
@@ -126,36 +133,135 @@ Metadata:
         return thought_event
 
 
+def _extra_value(event: Event, name: str) -> Optional[str]:
+    for line in event.extra:
+        if getattr(line, 'name', None) == name:
+            return line.value
+    return None
+
+
 class CalendarScheduler:
     """Manages scheduling of proactive thoughts in local calendar"""
     
-    def __init__(self, calendar_file: str = "./local_calendar.ics"):
+    def __init__(
+        self,
+        calendar_file: str = "./local_calendar.ics",
+        horizon_days: int = 180
+    ):
         self.calendar_file = Path(calendar_file)
         self.calendar = Calendar()
+        self.index = CalendarIndex(horizon_days=horizon_days)
+        self._watcher = ICSWatcher(self.calendar_file)
+        self._events_by_key: Dict[str, Event] = {}
+        content = ""
         
         if os.path.exists(self.calendar_file):
             with open(self.calendar_file, 'r') as f:
                 content = f.read()
-                
-                if not content.strip():
-                    logger.info("[Calendar] File is empty, creating new calendar")
-                    self.calendar = Calendar()
-                else:
-                    try:
-                        # Try normal parsing first
-                        self.calendar = Calendar(content)
-                    except NotImplementedError:
-                        # Handle multiple calendars in one file
-                        calendars = list(Calendar.parse_multiple(content))
-                        self.calendar = calendars[0] if calendars else Calendar()
-                        if len(calendars) > 1:
-                            logger.info(f"[Calendar] Using first of {len(calendars)} calendars")
+            if not content.strip():
+                logger.info("[Calendar] File is empty, creating new calendar")
+            self.calendar = self._parse_calendar(content)
+        
+        self._watcher.record(content)
+        self._reindex()
+    
+    @staticmethod
+    def _parse_calendar(content: str) -> Calendar:
+        """Parse ICS text; files holding several VCALENDARs use the first"""
+        if not content.strip():
+            return Calendar()
+        try:
+            # Try normal parsing first
+            return Calendar(content)
+        except NotImplementedError:
+            # Handle multiple calendars in one file
+            calendars = list(Calendar.parse_multiple(content))
+            if len(calendars) > 1:
+                logger.info(f"[Calendar] Using first of {len(calendars)} calendars")
+            return calendars[0] if calendars else Calendar()
+    
+    # ------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------
+    
+    @staticmethod
+    def _key(event: Event) -> str:
+        return event_key(event.uid, _extra_value(event, 'RECURRENCE-ID'))
+    
+    def _index_entry(self, event: Event):
+        """(key, begin, end, rrule, payload) for the index, or None if unschedulable"""
+        if not event.begin:
+            return None
+        try:
+            thought = ProactiveThoughtEvent.from_ics_event(event)
+        except Exception:
+            thought = None
+        return (self._key(event), event.begin, event.end or event.begin,
+                _extra_value(event, 'RRULE'), thought)
+    
+    def _reindex(self):
+        """Full rebuild from self.calendar"""
+        self._events_by_key = {self._key(e): e for e in self.calendar.events}
+        self.index = CalendarIndex(
+            lookback_days=int(self.index.lookback.days),
+            horizon_days=int(self.index.horizon.days)
+        )
+        self.index.load(
+            entry for entry in map(self._index_entry, self.calendar.events) if entry
+        )
+        logger.debug(f"[Calendar] Indexed {len(self.calendar.events)} events")
+    
+    def _index_event(self, event: Event):
+        entry = self._index_entry(event)
+        self._events_by_key[self._key(event)] = event
+        if entry:
+            self.index.set_event(*entry)
+    
+    def _unindex_event(self, event: Event):
+        key = self._key(event)
+        self._events_by_key.pop(key, None)
+        self.index.remove_event(key)
+    
+    def refresh(self) -> bool:
+        """
+        Pick up external edits to the ICS file.  Only VEVENTs whose text
+        changed are re-parsed; returns True if anything changed.
+        """
+        change = self._watcher.poll()
+        if change is None:
+            return False
+        changed, removed = change
+        
+        if any(k.startswith('nouid:') for k in list(changed) + list(removed)):
+            # No stable key to diff on; re-read the whole file
+            with open(self.calendar_file, 'r') as f:
+                self.calendar = self._parse_calendar(f.read())
+            self._reindex()
+            return True
+        
+        for key in list(changed) + list(removed):
+            old = self._events_by_key.get(key)
+            if old is not None:
+                self.calendar.events.discard(old)
+                self._unindex_event(old)
+        
+        if changed:
+            blocks = "".join(f"BEGIN:VEVENT\n{block}END:VEVENT\n" for block in changed.values())
+            parsed = Calendar(f"BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:vera\n{blocks}END:VCALENDAR\n")
+            for event in parsed.events:
+                self.calendar.events.add(event)
+                self._index_event(event)
+        
+        logger.info(f"[Calendar] Reloaded {len(changed)} changed / {len(removed)} removed events")
+        return True
     
     def save_calendar(self):
         """Save calendar to file"""
         try:
+            content = "".join(self.calendar.serialize_iter())
             with open(self.calendar_file, 'w') as f:
-                f.writelines(self.calendar.serialize_iter())
+                f.write(content)
+            self._watcher.record(content)
             logger.debug("[Calendar] Calendar saved successfully")
         except Exception as e:
             logger.error(f"Failed to save calendar: {e}")
@@ -199,7 +305,9 @@ class CalendarScheduler:
             # Weekly for 4 weeks
             event.extra.append(ContentLine(name="RRULE", value="FREQ=WEEKLY;COUNT=4"))
         
+        self.refresh()
         self.calendar.events.add(event)
+        self._index_event(event)
         self.save_calendar()
         
         # Create ProactiveThoughtEvent for return
@@ -290,30 +398,27 @@ class CalendarScheduler:
         self,
         days_ahead: int = 7
     ) -> List[ProactiveThoughtEvent]:
-        """Get upcoming proactive thought sessions"""
-        now = datetime.now()
+        """Get upcoming proactive thought sessions (recurrences expanded)"""
+        self.refresh()
+        # Aware local time: the index reads naive datetimes as UTC
+        now = datetime.now().astimezone()
         future_limit = now + timedelta(days=days_ahead)
         
         upcoming = []
         
-        for event in self.calendar.events:
-            # Check if it's a proactive thought event
-            thought_event = ProactiveThoughtEvent.from_ics_event(event)
+        for occurrence in self.index.starting_between(now, future_limit):
+            thought_event = occurrence.payload
+            if not thought_event:
+                continue  # Not a proactive thought event
             
-            if thought_event:
-                event_time = thought_event.begin
-                
-                if event_time.tzinfo is None:
-                    event_time = event_time.replace(tzinfo=timezone.utc)
-                
-                now_aware = now if now.tzinfo else now.replace(tzinfo=timezone.utc)
-                future_aware = future_limit if future_limit.tzinfo else future_limit.replace(tzinfo=timezone.utc)
-                
-                if now_aware <= event_time <= future_aware:
-                    upcoming.append(thought_event)
-        
-        # Sort by start time
-        upcoming.sort(key=lambda e: e.begin)
+            if to_ts(thought_event.begin) != occurrence.start:
+                # Recurring instance: same session, shifted
+                instance = copy.copy(thought_event)
+                instance.begin = from_ts(occurrence.start)
+                instance.end = from_ts(occurrence.end)
+                thought_event = instance
+            
+            upcoming.append(thought_event)
         
         logger.debug(f"[Calendar] Found {len(upcoming)} upcoming thought sessions")
         return upcoming
@@ -329,9 +434,11 @@ class CalendarScheduler:
     
     def cancel_thought_session(self, event_uid: str) -> bool:
         """Cancel a scheduled thought session"""
+        self.refresh()
         for event in list(self.calendar.events):
             if event.uid == event_uid:
                 self.calendar.events.remove(event)
+                self._unindex_event(event)
                 self.save_calendar()
                 logger.info(f"Cancelled thought session: {event_uid}")
                 return True
@@ -346,7 +453,8 @@ class CalendarScheduler:
         new_duration_minutes: Optional[int] = None
     ) -> bool:
         """Reschedule a thought session"""
-        for event in self.calendar.events:
+        self.refresh()
+        for event in list(self.calendar.events):
             if event.uid == event_uid:
                 # Extract thought event
                 thought_event = ProactiveThoughtEvent.from_ics_event(event)
@@ -356,6 +464,7 @@ class CalendarScheduler:
                 
                 # Remove old event
                 self.calendar.events.remove(event)
+                self._unindex_event(event)
                 
                 # Calculate new duration
                 if new_duration_minutes is None:
@@ -399,14 +508,10 @@ class CalendarScheduler:
         if preferred_hours is None:
             preferred_hours = [9, 10, 11, 14, 15, 16]  # Default work hours
         
-        now = datetime.now()
-        
-        # Get all events in the next week
-        future_events = [
-            event for event in self.calendar.events
-            if hasattr(event.begin, 'datetime') and
-            now <= event.begin.datetime <= now + timedelta(days=days_ahead)
-        ]
+        self.refresh()
+        # Aware local time, so preferred_hours are local hours and the index
+        # (which reads naive datetimes as UTC) compares the right instants
+        now = datetime.now().astimezone()
         
         # Check each day
         for day_offset in range(days_ahead):
@@ -428,18 +533,7 @@ class CalendarScheduler:
                 candidate_end = candidate_time + timedelta(minutes=duration_minutes)
                 
                 # Check if this time slot is free
-                is_free = True
-                
-                for event in future_events:
-                    event_start = event.begin.datetime if hasattr(event.begin, 'datetime') else event.begin
-                    event_end = event.end.datetime if hasattr(event.end, 'datetime') else event.end
-                    
-                    # Check for overlap
-                    if not (candidate_end <= event_start or candidate_time >= event_end):
-                        is_free = False
-                        break
-                
-                if is_free:
+                if self.index.is_free(candidate_time, candidate_end):
                     logger.info(f"Suggested optimal time: {candidate_time}")
                     return candidate_time
         
@@ -0,0 +1,409 @@
+"""
+crawl_fetcher.py  —  shared HTTP fetcher + on-disk crawl cache for the Researcher
+─────────────────────────────────────────────────────────────────────────────────
+
+deep_crawl_url() used to open a new httpx.AsyncClient per URL, with no
+concurrency cap, no per-host politeness and no cache, so a deep research run
+re-opened connections and re-fetched pages it had seen minutes earlier.
+
+CrawlFetcher gives every crawl:
+  • one pooled httpx.AsyncClient (HTTP/2 when the `h2` package is installed)
+  • a global concurrency cap and a per-host cap + minimum request spacing
+  • a content-addressed disk cache
+        <cache_dir>/meta/ab/<sha256(url)>.json   url, status, validators, fetched_at
+        <cache_dir>/blobs/cd/<sha256(body)>      body (identical pages stored once)
+    fresh for `ttl` seconds; after that the entry is revalidated with
+    If-None-Match / If-Modified-Since and a 304 refreshes it in place
+  • in-flight dedupe: concurrent fetches of one URL share a single request
+  • counters: hit / revalidated / miss / error / joined, hit rate, latency p50/p95
+
+Stub-server self test (no network needed):
+    python -m Vera.Researcher.crawl_fetcher --selftest
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+log = logging.getLogger("vera.researcher.crawl")
+
+CACHEABLE_TYPES = ("text/", "application/xhtml", "application/xml", "application/json")
+
+
+@dataclass
+class FetchResult:
+    url:          str
+    status:       int
+    text:         str
+    content_type: str   = ""
+    cache:        str   = "miss"      # hit | revalidated | miss | bypass
+    elapsed_ms:   float = 0.0
+
+
+class CrawlFetcher:
+    """Pooled, rate-limited, cached page fetcher shared by all crawls."""
+
+    def __init__(self,
+                 cache_dir:       Path | str = "crawl_cache",
+                 ttl:             float = 3600.0,
+                 max_connections: int   = 32,
+                 per_host:        int   = 4,
+                 host_interval:   float = 0.1,
+                 timeout:         float = 8.0,
+                 max_body:        int   = 2_000_000,
+                 max_cache_mb:    int   = 512,
+                 user_agent:      str   = "Vera-Research/1.0"):
+        self.cache_dir     = Path(cache_dir)
+        self.ttl           = ttl
+        self.max_connections = max_connections
+        self.per_host      = per_host
+        self.host_interval = host_interval
+        self.timeout       = timeout
+        self.max_body      = max_body
+        self.max_cache_mb  = max_cache_mb
+        self.user_agent    = user_agent
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global = asyncio.Semaphore(max_connections)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._host_next: dict[str, float] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._writes_since_prune = 0
+
+        self.counters = {"requests": 0, "hit": 0, "revalidated": 0, "miss": 0,
+                         "bypass": 0, "error": 0, "joined": 0, "bytes_fetched": 0}
+        self._latency = {"cache": deque(maxlen=1000), "network": deque(maxlen=1000)}
+
+    # ── client ────────────────────────────────────────────────────────────────
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                headers={"User-Agent": self.user_agent},
+            )
+        return self._client
+
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, for non-page requests (JSON APIs) that should share its connections."""
+        return self._get_client()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ── public API ────────────────────────────────────────────────────────────
+
+    async def fetch(self, url: str, timeout: Optional[float] = None) -> FetchResult:
+        """GET *url* through the cache; concurrent calls for one URL share a request."""
+        self.counters["requests"] += 1
+        url = url.split("#", 1)[0]
+        pending = self._inflight.get(url)
+        if pending is not None:
+            self.counters["joined"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            result = await self._fetch(url, timeout)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody joined
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    async def get_text(self, url: str, timeout: Optional[float] = None) -> str:
+        return (await self.fetch(url, timeout)).text
+
+    # ── fetch path ────────────────────────────────────────────────────────────
+
+    async def _fetch(self, url: str, timeout: Optional[float]) -> FetchResult:
+        started = time.perf_counter()
+        meta = await asyncio.to_thread(self._read_meta, url)
+        if meta and time.time() - meta["fetched_at"] < self.ttl:
+            text = await asyncio.to_thread(self._read_blob, meta["body_sha"])
+            if text is not None:
+                return self._done(FetchResult(url, meta["status"], text, meta.get("content_type", ""),
+                                              "hit"), started)
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            async with self._slot(url):
+                r = await self._get_client().get(url, headers=headers,
+                                                 timeout=timeout or self.timeout)
+        except Exception:
+            self.counters["error"] += 1
+            raise
+
+        if r.status_code == 304 and meta:
+            text = await asyncio.to_thread(self._read_blob, meta["body_sha"])
+            if text is not None:
+                meta["fetched_at"] = time.time()
+                await asyncio.to_thread(self._write_meta, url, meta)
+                return self._done(FetchResult(url, meta["status"], text, meta.get("content_type", ""),
+                                              "revalidated"), started)
+            async with self._slot(url):  # blob lost: refetch unconditionally
+                r = await self._get_client().get(url, timeout=timeout or self.timeout)
+
+        body = r.content[:self.max_body]
+        self.counters["bytes_fetched"] += len(body)
+        text = body.decode(r.encoding or "utf-8", errors="replace")
+        content_type = r.headers.get("content-type", "")
+        cacheable = r.status_code == 200 and content_type.startswith(CACHEABLE_TYPES) \
+            and "no-store" not in r.headers.get("cache-control", "")
+        if cacheable:
+            await asyncio.to_thread(self._store, url, r, text, content_type)
+        return self._done(FetchResult(str(r.url), r.status_code, text, content_type,
+                                      "miss" if cacheable else "bypass"), started)
+
+    def _done(self, result: FetchResult, started: float) -> FetchResult:
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        self.counters[result.cache] += 1
+        self._latency["cache" if result.cache == "hit" else "network"].append(result.elapsed_ms)
+        return result
+
+    def _slot(self, url: str):
+        fetcher = self
+        host = urlparse(url).netloc
+
+        class _Slot:
+            async def __aenter__(self):
+                await fetcher._global.acquire()
+                sem = fetcher._hosts.setdefault(host, asyncio.Semaphore(fetcher.per_host))
+                try:
+                    await sem.acquire()
+                except BaseException:
+                    fetcher._global.release()
+                    raise
+                # politeness: space request starts to one host by host_interval
+                now = time.monotonic()
+                start_at = max(now, fetcher._host_next.get(host, 0.0))
+                fetcher._host_next[host] = start_at + fetcher.host_interval
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+
+            async def __aexit__(self, *exc):
+                fetcher._hosts[host].release()
+                fetcher._global.release()
+                return False
+
+        return _Slot()
+
+    # ── disk cache ────────────────────────────────────────────────────────────
+
+    def _meta_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / "meta" / key[:2] / f"{key}.json"
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.cache_dir / "blobs" / sha[:2] / sha
+
+    def _read_meta(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self._meta_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _read_blob(self, sha: str) -> Optional[str]:
+        try:
+            return self._blob_path(sha).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write_meta(self, url: str, meta: dict):
+        path = self._meta_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _store(self, url: str, r: httpx.Response, text: str, content_type: str):
+        data = text.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        blob = self._blob_path(sha)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, blob)
+        self._write_meta(url, {
+            "url": url, "status": r.status_code, "content_type": content_type,
+            "etag": r.headers.get("etag"), "last_modified": r.headers.get("last-modified"),
+            "fetched_at": time.time(), "body_sha": sha,
+        })
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= 200:
+            self._writes_since_prune = 0
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop the oldest entries (and unreferenced blobs) once the cache exceeds max_cache_mb."""
+        metas = []
+        for path in (self.cache_dir / "meta").glob("*/*.json"):
+            try:
+                meta = json.loads(path.read_text(encoding="utf-8"))
+                metas.append((meta["fetched_at"], path, meta["body_sha"]))
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+        blobs = {p.name: p for p in (self.cache_dir / "blobs").glob("*/*") if p.suffix != ".tmp"}
+        total = sum(p.stat().st_size for p in blobs.values())
+        limit = self.max_cache_mb * 1024 * 1024
+        removed = 0
+        metas.sort()
+        while total > limit and metas:
+            _, path, _ = metas.pop(0)
+            path.unlink(missing_ok=True)
+            removed += 1
+            live = {sha for _, _, sha in metas}
+            for sha in [s for s in blobs if s not in live]:
+                total -= blobs[sha].stat().st_size
+                blobs.pop(sha).unlink(missing_ok=True)
+        if removed:
+            log.info("Crawl cache pruned %d entries", removed)
+        return removed
+
+    # ── reporting ─────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        c = self.counters
+        served = c["hit"] + c["revalidated"] + c["miss"] + c["bypass"]
+
+        def pct(samples) -> dict:
+            s = sorted(samples)
+            if not s:
+                return {}
+            return {"p50": round(statistics.median(s), 2),
+                    "p95": round(s[min(len(s) - 1, int(len(s) * 0.95))], 2), "n": len(s)}
+
+        return {
+            **c,
+            "hit_rate": round((c["hit"] + c["revalidated"] + c["joined"]) / c["requests"], 3) if c["requests"] else 0.0,
+            "served": served,
+            "latency_ms": {k: pct(v) for k, v in self._latency.items()},
+            "http2": HTTP2_AVAILABLE,
+            "inflight": len(self._inflight),
+            "hosts": len(self._hosts),
+        }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Stub-server self test
+# ══════════════════════════════════════════════════════════════════════════════
+
+async def selftest(pages: int = 20, delay: float = 0.05) -> dict:
+    """Crawl a local stub server twice (plus stale revalidation) and report counters."""
+    import shutil
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits = {"requests": 0, "not_modified": 0, "max_concurrent": 0}
+    active = [0]
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                hits["requests"] += 1
+                active[0] += 1
+                hits["max_concurrent"] = max(hits["max_concurrent"], active[0])
+            try:
+                time.sleep(delay)
+                n = int(self.path.strip("/").split("/")[-1] or 0)
+                etag = f'"page-{n}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with lock:
+                        hits["not_modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                body = "".join(f'<a href="/page/{(n * 3 + k) % pages}">link</a>' for k in range(3))
+                body = f"<html><body><p>page {n}</p>{body}</body></html>".encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    cache_dir = tempfile.mkdtemp(prefix="vera_crawl_")
+    fetcher = CrawlFetcher(cache_dir=cache_dir, per_host=4, host_interval=0.0)
+    report = {}
+    try:
+        urls = [f"{base}/page/{i}" for i in range(pages)]
+        for phase in ("cold", "warm"):
+            t0 = time.perf_counter()
+            # every URL requested three times concurrently: in-flight dedupe
+            await asyncio.gather(*[fetcher.fetch(u) for u in urls * 3])
+            report[phase] = {"ms": round((time.perf_counter() - t0) * 1000, 1),
+                             "server_requests": hits["requests"]}
+        fetcher.ttl = 0  # everything stale -> conditional GETs
+        t0 = time.perf_counter()
+        await asyncio.gather(*[fetcher.fetch(u) for u in urls])
+        report["stale"] = {"ms": round((time.perf_counter() - t0) * 1000, 1),
+                           "server_requests": hits["requests"], "not_modified": hits["not_modified"]}
+        report["server_max_concurrent"] = hits["max_concurrent"]
+        report["fetcher"] = fetcher.stats()
+    finally:
+        await fetcher.aclose()
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Researcher crawl fetcher")
+    parser.add_argument("--selftest", action="store_true", help="Run against a local stub HTTP server")
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+    if args.selftest:
+        print(json.dumps(asyncio.run(selftest(pages=args.pages)), indent=2))
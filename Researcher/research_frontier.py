@@ -0,0 +1,366 @@
+"""
+research_frontier.py  —  concurrent research frontier for recursive_research
+─────────────────────────────────────────────────────────────────────────────
+
+recursive_research() used to walk its question tree as a serial BFS
+(queue.pop(0)): every sub-question waited for the previous one's searches,
+crawls and LLM calls, near-duplicate sub-questions were all researched, and
+the only stop condition was a question count.
+
+ResearchFrontier replaces that loop:
+  • priority queue of sub-questions, scored by relevance to the root query
+    (embedding cosine) minus a per-depth penalty
+  • up to `concurrency` branches researched at once
+  • near-identical sub-questions (cosine ≥ dedupe_threshold against anything
+    already queued or researched) are dropped
+  • global ResearchBudget in wall time, LLM tokens, pages and questions
+  • early stop once the frontier converges: `convergence_window` finished
+    branches in a row that added no new sub-question and no new source
+
+Embeddings come from a caller-supplied async function (Ollama /api/embed in
+researcher.py); lexical_embedding() is the dependency-free fallback.
+
+Serial BFS vs frontier comparison (simulated latencies, no LLM needed):
+    python -m Vera.Researcher.research_frontier --simulate
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Awaitable, Callable, Optional
+
+log = logging.getLogger("vera.researcher.frontier")
+
+Embedder = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Budget + usage
+# ══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class ResearchBudget:
+    """Global limits for one research job (0 = unlimited)."""
+    max_seconds:   float = 900.0
+    max_tokens:    int   = 60000
+    max_pages:     int   = 150
+    max_questions: int   = 16
+
+
+@dataclass
+class ResearchUsage:
+    """Counters filled in by research_node and the frontier."""
+    llm_calls:   int   = 0
+    tokens:      int   = 0
+    pages:       int   = 0
+    questions:   int   = 0
+    deduped:     int   = 0
+    cancelled:   int   = 0
+    max_inflight:int   = 0
+    wall_s:      float = 0.0
+    stop_reason: str   = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Similarity
+# ══════════════════════════════════════════════════════════════════════════════
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def lexical_embedding(text: str, dim: int = 256) -> list[float]:
+    """Hashed bag of words + bigrams, L2-normalised (fallback when no embed model)."""
+    words = _WORD.findall(text.lower())
+    vec = [0.0] * dim
+    for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        h = int.from_bytes(hashlib.blake2b(term.encode(), digest_size=4).digest(), "little")
+        vec[h % dim] += 1.0 if " " not in term else 0.5
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+async def lexical_embedder(texts: list[str]) -> list[list[float]]:
+    return [lexical_embedding(t) for t in texts]
+
+
+def cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a)) or 1.0
+    nb = math.sqrt(sum(y * y for y in b)) or 1.0
+    return dot / (na * nb)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Frontier
+# ══════════════════════════════════════════════════════════════════════════════
+
+class ResearchFrontier:
+    """
+    Drives a research tree concurrently.
+
+    make_node(question, depth, parent) builds a node with at least
+    .question/.depth/.sub_questions/.citations; research(node, usage) fills
+    it in.  run() returns the finished nodes in completion order.
+    """
+
+    def __init__(self,
+                 root_question:      str,
+                 make_node:          Callable[[str, int, Optional[str]], Any],
+                 research:           Callable[[Any, ResearchUsage], Awaitable[None]],
+                 embed:              Optional[Embedder] = None,
+                 budget:             Optional[ResearchBudget] = None,
+                 concurrency:        int   = 3,
+                 max_depth:          int   = 3,
+                 dedupe_threshold:   float = 0.9,
+                 depth_penalty:      float = 0.15,
+                 convergence_window: int   = 3,
+                 should_stop:        Callable[[], bool] = lambda: False):
+        self.root_question = root_question
+        self.make_node = make_node
+        self.research = research
+        self.embed = embed or lexical_embedder
+        self.budget = budget or ResearchBudget()
+        self.concurrency = max(1, concurrency)
+        self.max_depth = max_depth
+        self.dedupe_threshold = dedupe_threshold
+        self.depth_penalty = depth_penalty
+        self.convergence_window = convergence_window
+        self.should_stop = should_stop
+
+        self.usage = ResearchUsage()
+        self._heap: list[tuple[float, int, Any]] = []
+        self._order = itertools.count()
+        self._seen_texts: list[str] = []
+        self._seen_vecs: list[list[float]] = []
+        self._root_vec: list[float] = []
+        self._seen_urls: set[str] = set()
+        self._stale = 0
+
+    async def _embed(self, texts: list[str]) -> list[list[float]]:
+        try:
+            return await self.embed(texts)
+        except Exception as e:
+            log.debug("embedder failed, using lexical vectors: %s", e)
+            # switch every stored vector too, so all comparisons share one space
+            self.embed = lexical_embedder
+            self._seen_vecs = [lexical_embedding(t) for t in self._seen_texts]
+            if self._root_vec:
+                self._root_vec = lexical_embedding(self.root_question)
+            return await lexical_embedder(texts)
+
+    async def _offer(self, questions: list[str], depth: int, parent: Optional[str]) -> int:
+        """Score and enqueue new questions; returns how many were accepted."""
+        questions = [q.strip() for q in questions if q and q.strip()]
+        if not questions:
+            return 0
+        vecs = await self._embed(questions)
+        accepted = 0
+        for q, vec in zip(questions, vecs):
+            if any(cosine(vec, seen) >= self.dedupe_threshold for seen in self._seen_vecs):
+                self.usage.deduped += 1
+                continue
+            self._seen_texts.append(q)
+            self._seen_vecs.append(vec)
+            relevance = cosine(vec, self._root_vec) if self._root_vec else 1.0
+            score = relevance - self.depth_penalty * depth
+            heapq.heappush(self._heap, (-score, next(self._order), self.make_node(q, depth, parent)))
+            accepted += 1
+        return accepted
+
+    def _exhausted(self, started: float) -> str:
+        b, u = self.budget, self.usage
+        if self.should_stop():
+            return "cancelled"
+        if b.max_seconds and time.monotonic() - started >= b.max_seconds:
+            return "time"
+        if b.max_tokens and u.tokens >= b.max_tokens:
+            return "tokens"
+        if b.max_pages and u.pages >= b.max_pages:
+            return "pages"
+        if b.max_questions and u.questions >= b.max_questions:
+            return "questions"
+        if self._stale >= self.convergence_window:
+            return "converged"
+        return ""
+
+    async def run(self, on_progress: Optional[Callable[[Any, ResearchUsage], Awaitable[None]]] = None) -> list[Any]:
+        started = time.monotonic()
+        self._root_vec = (await self._embed([self.root_question]))[0]
+        self._seen_texts.append(self.root_question)
+        self._seen_vecs.append(self._root_vec)
+        root = self.make_node(self.root_question, 0, None)
+        heapq.heappush(self._heap, (-1.0, next(self._order), root))
+
+        done_nodes: list[Any] = []
+        running: dict[asyncio.Task, Any] = {}
+        try:
+            while True:
+                reason = self._exhausted(started)
+                while not reason and self._heap and len(running) < self.concurrency:
+                    _, _, node = heapq.heappop(self._heap)
+                    self.usage.questions += 1
+                    running[asyncio.ensure_future(self.research(node, self.usage))] = node
+                    reason = self._exhausted(started)
+                self.usage.max_inflight = max(self.usage.max_inflight, len(running))
+                if not running:
+                    self.usage.stop_reason = reason or "exhausted"
+                    break
+
+                timeout = None
+                if self.budget.max_seconds:
+                    timeout = max(0.0, self.budget.max_seconds - (time.monotonic() - started))
+                finished, _ = await asyncio.wait(running, timeout=timeout,
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                if not finished:  # hard time limit: abandon in-flight branches
+                    self.usage.stop_reason = "time"
+                    break
+
+                for task in finished:
+                    node = running.pop(task)
+                    if task.cancelled():
+                        self.usage.cancelled += 1
+                        continue
+                    if task.exception() is not None:
+                        log.warning("research branch failed (%s): %s", node.question[:60], task.exception())
+                        continue
+                    done_nodes.append(node)
+                    urls = {c.url for c in getattr(node, "citations", []) if getattr(c, "url", "")}
+                    new_urls = urls - self._seen_urls
+                    self._seen_urls |= urls
+                    self.usage.pages += len(new_urls)
+                    accepted = 0
+                    if node.depth < self.max_depth:
+                        accepted = await self._offer(list(node.sub_questions), node.depth + 1, node.question)
+                    self._stale = 0 if (accepted or new_urls) else self._stale + 1
+                    if on_progress:
+                        await on_progress(node, self.usage)
+        finally:
+            for task in running:
+                task.cancel()
+                self.usage.cancelled += 1
+            # Let cancelled branches unwind (close their HTTP streams) before returning
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self.usage.wall_s = round(time.monotonic() - started, 3)
+        return done_nodes
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Simulation: serial BFS vs frontier
+# ══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class _SimNode:
+    question: str
+    depth: int
+    parent: Optional[str] = None
+    citations: list = field(default_factory=list)
+    sub_questions: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _SimCitation:
+    url: str
+
+
+async def simulate(search_s: float = 0.4, extract_s: float = 1.2, plan_s: float = 0.6,
+                   fanout: int = 4, max_depth: int = 3, concurrency: int = 3,
+                   max_questions: int = 16) -> dict:
+    """
+    Same synthetic research tree (4 follow-ups per node, one of them a
+    rephrasing of an earlier question, sources overlapping between siblings)
+    through the old serial BFS and through ResearchFrontier.
+
+    The default frontier dedupes and may stop early, so it researches fewer
+    questions than the serial loop; ``frontier_matched`` turns dedupe and
+    convergence off so both research ``max_questions`` questions and the
+    speedup compares like with like.
+    """
+    topics = ["latency", "throughput", "memory", "scheduling", "caching", "batching",
+              "replication", "compression", "indexing", "tracing"]
+
+    async def research(node: _SimNode, usage: ResearchUsage):
+        await asyncio.sleep(search_s)
+        h = int(hashlib.md5(node.question.encode()).hexdigest(), 16)
+        node.citations = [_SimCitation(f"https://example.org/{(h >> k) % 40}") for k in range(4)]
+        await asyncio.sleep(extract_s)
+        usage.llm_calls += 1
+        usage.tokens += 600
+        if node.depth < max_depth:
+            await asyncio.sleep(plan_s)
+            usage.llm_calls += 1
+            usage.tokens += 80
+            base = node.question.split(" — ")[0]
+            node.sub_questions = [f"{base} — {topics[(h >> (3 * k)) % len(topics)]} detail {node.depth}.{k}"
+                                  for k in range(fanout - 1)]
+            node.sub_questions.append(f"{node.question} (rephrased)")
+
+    # Old loop, verbatim semantics
+    serial = ResearchUsage()
+    t0 = time.monotonic()
+    queue = [_SimNode("how do inference servers trade latency for throughput", 0)]
+    count = 0
+    seen_urls: set[str] = set()
+    while queue and count < max_questions:
+        node = queue.pop(0)
+        await research(node, serial)
+        count += 1
+        serial.pages += len({c.url for c in node.citations} - seen_urls)
+        seen_urls |= {c.url for c in node.citations}
+        for sq in node.sub_questions:
+            if count + len(queue) >= max_questions:
+                break
+            queue.append(_SimNode(sq, node.depth + 1, node.question))
+    serial.questions = count
+    serial.wall_s = round(time.monotonic() - t0, 3)
+
+    def make_frontier(**overrides) -> ResearchFrontier:
+        return ResearchFrontier(
+            "how do inference servers trade latency for throughput",
+            make_node=lambda q, d, p: _SimNode(q, d, p), research=research,
+            budget=ResearchBudget(max_questions=max_questions), concurrency=concurrency,
+            max_depth=max_depth, **overrides,
+        )
+
+    frontier = make_frontier()
+    await frontier.run()
+    matched = make_frontier(dedupe_threshold=2.0, convergence_window=max_questions + 1)
+    await matched.run()
+
+    def per_question(usage: ResearchUsage) -> float:
+        return round(usage.wall_s / max(usage.questions, 1), 3)
+
+    return {
+        "serial": serial.to_dict(),
+        "frontier": frontier.usage.to_dict(),
+        "frontier_matched": matched.usage.to_dict(),
+        "speedup": round(serial.wall_s / max(frontier.usage.wall_s, 1e-6), 2),
+        "speedup_matched": round(serial.wall_s / max(matched.usage.wall_s, 1e-6), 2),
+        "s_per_question": {"serial": per_question(serial), "frontier": per_question(frontier.usage),
+                           "frontier_matched": per_question(matched.usage)},
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Research frontier vs serial BFS")
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--questions", type=int, default=16)
+    args = parser.parse_args()
+    if args.simulate:
+        print(json.dumps(asyncio.run(simulate(concurrency=args.concurrency,
+                                              max_questions=args.questions)), indent=2))
@@ -47,6 +47,8 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
 from Vera.ChatUI.research_db import DB  # local persistence layer
+from Vera.Researcher.crawl_fetcher import CrawlFetcher
+from Vera.Researcher.research_frontier import ResearchBudget, ResearchFrontier, ResearchUsage
 
 log = logging.getLogger("vera.researcher")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
@@ -55,6 +57,7 @@ SCREENSHOT_DIR = Path("screenshots")
 PROJECTS_DIR   = Path("projects")
 SCREENSHOT_DIR.mkdir(exist_ok=True)
 PROJECTS_DIR.mkdir(exist_ok=True)
+CRAWL_CACHE_DIR = Path(os.getenv("VERA_CRAWL_CACHE", "crawl_cache"))
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  Enums
@@ -481,6 +484,11 @@ def extract_links(html: str, base_url: str) -> list[str]:
     return list(dict.fromkeys(out))  # dedupe, preserve order
 
 
+# One pooled client, global + per-host limits, ETag/Last-Modified disk cache
+fetcher = CrawlFetcher(cache_dir=CRAWL_CACHE_DIR,
+                       ttl=float(os.getenv("VERA_CRAWL_TTL", "3600")))
+
+
 def html_to_text(html: str) -> str:
     """Very simple HTML → plain text."""
     text = re.sub(r"<script[^>]*>[\s\S]*?</script>", " ", html, flags=re.I)
@@ -499,9 +507,7 @@ async def deep_crawl_url(url: str, depth: int, breadth: int, timeout: float) ->
         if u in visited or len(collected) > 20: return
         visited.add(u)
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as c:
-                r = await c.get(u, headers={"User-Agent":"Vera-Research/1.0"})
-                html = r.text
+            html = await fetcher.get_text(u, timeout=timeout)
             text = html_to_text(html)
             if text:
                 collected.append(f"[{u}]\n{text[:3000]}")
@@ -1491,6 +1497,13 @@ MAX_RECURSIVE_DEPTH   = 3     # levels deep
 MAX_QUESTIONS_PER_LEVEL = 4   # sub-questions per node
 MAX_TOTAL_QUESTIONS   = 16    # circuit-breaker
 
+# Concurrent frontier (see research_frontier.py)
+RESEARCH_CONCURRENCY  = int(os.getenv("VERA_RESEARCH_CONCURRENCY", "3"))  # branches in flight
+RESEARCH_TIME_BUDGET  = 900.0   # seconds per job
+RESEARCH_TOKEN_BUDGET = 60000   # streamed LLM tokens per job
+RESEARCH_PAGE_BUDGET  = 150     # distinct source URLs per job
+EMBED_MODEL           = os.getenv("VERA_EMBED_MODEL", "nomic-embed-text")
+
 
 @dataclass
 class ResearchNode:
@@ -1502,6 +1515,23 @@ class ResearchNode:
     sub_questions: list[str] = field(default_factory=list)
 
 
+_embed_unavailable: set[str] = set()   # base URLs whose embed endpoint failed
+
+
+async def embed_texts(inst: OllamaInstance, texts: list[str]) -> list[list[float]]:
+    """Embed *texts* with EMBED_MODEL on *inst*; raises if unavailable (frontier falls back)."""
+    if inst.base_url in _embed_unavailable:
+        raise RuntimeError("embed model unavailable")
+    try:
+        r = await fetcher.client().post(f"{inst.base_url}/api/embed",
+                                        json={"model": EMBED_MODEL, "input": texts}, timeout=10.0)
+        r.raise_for_status()
+        return r.json()["embeddings"]
+    except Exception:
+        _embed_unavailable.add(inst.base_url)
+        raise
+
+
 async def research_node(
     node: ResearchNode,
     job: ResearchJob,
@@ -1509,6 +1539,7 @@ async def research_node(
     writer: OllamaInstance,
     all_citations: list[Citation],
     knowledge_base: list[str],
+    usage: Optional[ResearchUsage] = None,
 ) -> None:
     """
     Research one question node:
@@ -1553,6 +1584,9 @@ async def research_node(
         findings_parts.append(tok)
         if cancel_flags.get(job.id): break
     node.findings = "".join(findings_parts)
+    if usage:
+        usage.llm_calls += 1
+        usage.tokens += len(findings_parts)
 
     # Identify sub-questions (only if we have depth budget)
     if node.depth < MAX_RECURSIVE_DEPTH:
@@ -1568,7 +1602,15 @@ async def research_node(
             f"not yet covered. Return {MAX_QUESTIONS_PER_LEVEL} questions as a JSON array."
         )
         plan_inst = thinker or writer
-        raw = await collect_ollama(plan_inst, sub_prompt, sub_sys, job.id, timeout_secs=THINKER_PLAN_TIMEOUT)
+        # Streamed like the extraction so both count tokens the same way (chunks)
+        raw_parts: list[str] = []
+        async for tok in stream_ollama(plan_inst, sub_prompt, sub_sys, job.id, timeout_secs=THINKER_PLAN_TIMEOUT):
+            raw_parts.append(tok)
+            if cancel_flags.get(job.id): break
+        raw = "".join(raw_parts)
+        if usage:
+            usage.llm_calls += 1
+            usage.tokens += len(raw_parts)
         try:
             qs = json.loads(raw[raw.index("["):raw.rindex("]")+1])
             node.sub_questions = [str(q) for q in qs[:MAX_QUESTIONS_PER_LEVEL]]
@@ -1589,34 +1631,41 @@ async def recursive_research(
     project: Optional[Project],
 ) -> tuple[list[ResearchNode], list[Citation], str]:
     """
-    Run the full recursive research tree.
+    Run the full recursive research tree on a concurrent frontier: most
+    relevant open sub-questions first, RESEARCH_CONCURRENCY at a time,
+    near-duplicates dropped, stopping on budget or convergence.
     Returns (nodes, all_citations, accumulated_context).
     """
     proj_ctx = (f"\nProject context:\n{project.context_summary}" if project else "")
-    all_nodes: list[ResearchNode] = []
     all_citations: list[Citation] = []
     knowledge_base: list[str] = []
-    question_count = 0
-
-    # Root node
-    root = ResearchNode(question=job.query, depth=0)
-    queue: list[ResearchNode] = [root]
-
-    while queue and question_count < MAX_TOTAL_QUESTIONS:
-        node = queue.pop(0)
-        if cancel_flags.get(job.id): break
-
-        await research_node(node, job, thinker, writer, all_citations, knowledge_base)
-        all_nodes.append(node)
-        question_count += 1
 
-        # Enqueue sub-questions
-        for sq in node.sub_questions:
-            if question_count + len(queue) >= MAX_TOTAL_QUESTIONS: break
-            queue.append(ResearchNode(question=sq, depth=node.depth+1, parent=node.question))
+    async def research(node: ResearchNode, usage: ResearchUsage):
+        await research_node(node, job, thinker, writer, all_citations, knowledge_base, usage)
 
+    async def progress(node: ResearchNode, usage: ResearchUsage):
         await step_emit(job, "Progress",
-            f"{question_count} questions investigated, {len(all_citations)} sources")
+            f"{usage.questions} questions investigated, {len(all_citations)} sources")
+
+    frontier = ResearchFrontier(
+        job.query,
+        make_node=lambda q, depth, parent: ResearchNode(question=q, depth=depth, parent=parent),
+        research=research,
+        embed=lambda texts: embed_texts(writer, texts),
+        budget=ResearchBudget(max_seconds=RESEARCH_TIME_BUDGET, max_tokens=RESEARCH_TOKEN_BUDGET,
+                              max_pages=RESEARCH_PAGE_BUDGET, max_questions=MAX_TOTAL_QUESTIONS),
+        concurrency=RESEARCH_CONCURRENCY,
+        max_depth=MAX_RECURSIVE_DEPTH,
+        should_stop=lambda: bool(cancel_flags.get(job.id)),
+    )
+    all_nodes = await frontier.run(on_progress=progress)
+    all_nodes.sort(key=lambda n: n.depth)  # keep the level-ordered context layout
+
+    u = frontier.usage
+    await step_emit(job, "Research tree",
+        f"{len(all_nodes)} nodes in {u.wall_s:.0f}s · {u.llm_calls} LLM calls · "
+        f"{u.pages} pages · {u.deduped} duplicates skipped · stop: {u.stop_reason}")
+    await broadcast(job.id, {"type": "research_stats", "stats": u.to_dict()})
 
     # Build full context string for synthesis
     ctx_parts = [f"## Recursive Research Results ({len(all_nodes)} nodes)\n"]
@@ -2253,6 +2302,7 @@ async def lifespan(app: FastAPI):
         except Exception:
             pass
         _pw_browser = None
+    await fetcher.aclose()
     await DB.close()
     log.info("Vera Researcher shut down")
 
@@ -2708,6 +2758,12 @@ async def db_stats():
     return await DB.get_stats()
 
 
+@app.get("/api/crawl/stats")
+async def crawl_stats():
+    """Crawl fetcher counters: cache hit rate, dedupe joins, fetch latency."""
+    return fetcher.stats()
+
+
 @app.get("/api/db/search")
 async def db_search(
     q:           str = Query(""),
@@ -21,15 +21,21 @@ DEPENDENCIES:
     sudo apt-get install nmap  # For nmap features
 """
 
+import asyncio
+import errno
+import queue
+import random
 import socket
+import struct
 import subprocess
+import threading
 import requests
 import json
 import re
 import time
 import ssl
 import ipaddress
-from typing import List, Dict, Any, Optional, Set, Iterator, Tuple
+from typing import List, Dict, Any, Optional, Set, Iterator, AsyncIterator, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -104,6 +110,16 @@ class NetworkScanConfig:
     max_port_threads: int = 100
     use_nmap_scan: bool = False  # Use nmap if available
     
+    # Async scan engine (used instead of thread pools when nmap is not in play)
+    use_async_engine: bool = True
+    max_inflight: int = 512  # Concurrent connects, clamped to the fd limit
+    min_scan_timeout: float = 0.25  # Floor for RTT-adapted connect timeouts
+    randomize_order: bool = True
+    # TCP ports probed for host discovery (connect or refusal = alive);
+    # hosts that answer none of them get one ICMP echo if icmp_fallback is set
+    discovery_ports: List[int] = field(default_factory=lambda: [80, 443, 22, 21])
+    icmp_fallback: bool = True
+    
     # Service detection
     grab_banners: bool = True
     banner_timeout: float = 3.0
@@ -132,6 +148,8 @@ class NetworkScanConfig:
     rate_limit: Optional[float] = None
     
     # Graph options
+    graph_batch_size: int = 500
+    graph_flush_interval: float = 2.0
     link_to_session: bool = True
     create_topology_map: bool = True
     reuse_existing_nodes: bool = True
@@ -435,7 +453,7 @@ class HostDiscovery:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         
-        for port in [80, 443, 22, 21]:
+        for port in self.config.discovery_ports:
             if self._check_tcp_port(host, port, timeout):
                 hostname = None
                 try:
@@ -589,6 +607,558 @@ class PortScanner:
         except Exception as e:
             logger.error(f"Nmap scan failed: {e}")
 
+# =============================================================================
+# ASYNC SCAN ENGINE
+# =============================================================================
+
+class _RttEstimator:
+    """Smoothed RTT and variance (RFC 6298 style) used to size connect timeouts"""
+
+    __slots__ = ("srtt", "rttvar", "samples")
+
+    def __init__(self):
+        self.srtt: Optional[float] = None
+        self.rttvar: float = 0.0
+        self.samples = 0
+
+    def observe(self, rtt: float):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    def timeout(self, floor: float, ceiling: float) -> Optional[float]:
+        if self.samples < 3:
+            return None
+        return min(ceiling, max(floor, self.srtt + 4 * self.rttvar))
+
+
+def _fd_budget(requested: int) -> int:
+    """Clamp in-flight sockets to the process file descriptor limit"""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY:
+            return max(1, min(requested, soft - 64))
+    except (ImportError, ValueError):
+        pass
+    return requested
+
+
+class AsyncScanEngine:
+    """
+    asyncio TCP connect scanner.
+
+    - A fixed pool of ``max_inflight`` worker tasks pulls (host, port) pairs
+      from one shared iterator, so in-flight sockets and memory stay bounded
+      no matter how large the target space is.
+    - Connect timeouts follow the RTTs measured so far (per host once it has
+      answered a few probes, network-wide before that), bounded by
+      ``min_scan_timeout`` and ``scan_timeout``.  Silent hosts on a fast
+      network are therefore given up on quickly.
+    - Targets are visited port-major over shuffled host and port lists, so
+      each host sees at most one probe per round instead of a sequential
+      burst.
+    - Open sockets are closed with SO_LINGER=0 (RST), which keeps large
+      scans from exhausting local ports in TIME_WAIT.
+    """
+
+    def __init__(self, config: NetworkScanConfig, service_names: Optional[Dict[int, str]] = None):
+        self.config = config
+        self.service_names = service_names or {}
+        self.max_inflight = _fd_budget(config.max_inflight)
+        self._rng = random.Random()
+        self._global_rtt = _RttEstimator()
+        self._host_rtt: Dict[str, _RttEstimator] = {}
+        self._next_slot = 0.0
+        self.stats = {"probes": 0, "open": 0, "closed": 0, "timeouts": 0, "errors": 0}
+
+    # ---- timing ------------------------------------------------------------
+
+    def _timeout_for(self, host: str) -> float:
+        floor, ceiling = self.config.min_scan_timeout, self.config.scan_timeout
+        est = self._host_rtt.get(host)
+        timeout = est.timeout(floor, ceiling) if est else None
+        if timeout is None:
+            timeout = self._global_rtt.timeout(floor, ceiling)
+        return ceiling if timeout is None else timeout
+
+    def _observe(self, host: str, rtt: float):
+        self._global_rtt.observe(rtt)
+        est = self._host_rtt.get(host)
+        if est is None:
+            est = self._host_rtt[host] = _RttEstimator()
+        est.observe(rtt)
+
+    async def _pace(self):
+        if not self.config.rate_limit:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.config.rate_limit
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    # ---- probing -----------------------------------------------------------
+
+    @staticmethod
+    async def _wait_writable(loop, sock: socket.socket, timeout: float) -> bool:
+        """Wait for a non-blocking connect to finish; False on timeout"""
+        fut = loop.create_future()
+        fd = sock.fileno()
+
+        def settle(value):
+            if not fut.done():
+                fut.set_result(value)
+
+        loop.add_writer(fd, settle, True)
+        timer = loop.call_later(timeout, settle, False)
+        try:
+            return await fut
+        finally:
+            loop.remove_writer(fd)
+            timer.cancel()
+
+    async def probe(self, host: str, port: int) -> Tuple[Optional[str], Optional[float]]:
+        """Return ``("open" | "closed" | None, rtt)`` for one TCP connect"""
+        loop = asyncio.get_running_loop()
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+
+        self.stats["probes"] += 1
+        start = time.perf_counter()
+        try:
+            # Raw non-blocking connect: no Task / wait_for per probe.  Loopback
+            # and LAN refusals often complete synchronously.
+            err = sock.connect_ex((host, port))
+            if err in (errno.EINPROGRESS, errno.EAGAIN, errno.EWOULDBLOCK):
+                if not await self._wait_writable(loop, sock, self._timeout_for(host)):
+                    self.stats["timeouts"] += 1
+                    return None, None
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        except OSError:
+            err = -1
+        finally:
+            sock.close()
+
+        if err == 0:
+            state = "open"
+        elif err == errno.ECONNREFUSED:
+            state = "closed"
+        else:
+            self.stats["errors"] += 1
+            return None, None
+
+        rtt = time.perf_counter() - start
+        self._observe(host, rtt)
+        self.stats[state] += 1
+        return state, rtt
+
+    def _targets(self, hosts: List[str], ports: List[int]) -> Iterator[Tuple[str, int]]:
+        # Probes connect by address; unresolved names would block the loop
+        valid = []
+        for host in hosts:
+            try:
+                ipaddress.ip_address(host)
+                valid.append(host)
+            except ValueError:
+                logger.warning(f"Skipping unresolved target {host}")
+        hosts, ports = valid, list(ports)
+        if self.config.randomize_order:
+            self._rng.shuffle(hosts)
+            self._rng.shuffle(ports)
+        for port in ports:
+            for host in hosts:
+                yield host, port
+
+    async def _run_workers(self, targets: Iterator, work, total: int,
+                           concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run ``work(item, emit)`` over ``targets`` with bounded concurrency"""
+        out: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def worker():
+            for item in targets:
+                await self._pace()
+                await work(item, out.put_nowait)
+
+        limit = concurrency or self.max_inflight
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, min(limit, total)))]
+
+        async def finisher():
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                out.put_nowait(done)
+
+        finish = asyncio.ensure_future(finisher())
+        try:
+            while True:
+                item = await out.get()
+                if item is done:
+                    break
+                yield item
+            await finish
+        finally:
+            for task in workers:
+                task.cancel()
+            finish.cancel()
+
+    async def scan(self, hosts: List[str], ports: List[int],
+                   include_closed: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Yield port results as they are found (open ports, optionally closed)"""
+        async def work(target, emit):
+            host, port = target
+            state, rtt = await self.probe(host, port)
+            if state == "open" or (include_closed and state == "closed"):
+                emit({
+                    "ip": host,
+                    "port": port,
+                    "state": state,
+                    "service": self.service_names.get(port, f"unknown-{port}"),
+                    "rtt_ms": round(rtt * 1000, 2),
+                    "method": "async",
+                })
+
+        async for result in self._run_workers(self._targets(hosts, ports), work, len(hosts) * len(ports)):
+            yield result
+
+    async def _ping(self, host: str) -> Optional[float]:
+        """One ICMP echo via the system ``ping``; RTT in seconds, or None"""
+        timeout = self.config.ping_timeout
+        start = time.perf_counter()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "ping", "-c", "1", "-W", str(timeout), host,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            raise  # no ping binary; discover() turns the fallback off
+        except OSError:
+            return None
+        try:
+            code = await asyncio.wait_for(proc.wait(), timeout + 1)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        return time.perf_counter() - start if code == 0 else None
+
+    async def discover(self, hosts: List[str], ports: Optional[List[int]] = None,
+                       resolve_hostnames: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        TCP host discovery.  A host is alive as soon as any probe port
+        answers, whether it accepts or refuses the connection.  Hosts that
+        answer none of ``ports`` (default ``config.discovery_ports``) get one
+        ICMP echo when ``config.icmp_fallback`` is set, as the threaded
+        ``HostDiscovery`` always did.
+        """
+        ports = ports or self.config.discovery_ports
+        alive: Set[str] = set()
+        loop = asyncio.get_running_loop()
+
+        async def resolve(host: str) -> Optional[str]:
+            if not resolve_hostnames:
+                return None
+            try:
+                name, _ = await asyncio.wait_for(
+                    loop.getnameinfo((host, 0), socket.NI_NAMEREQD), self.config.ping_timeout
+                )
+                return name
+            except (asyncio.TimeoutError, OSError):
+                return None
+
+        async def work(target, emit):
+            host, port = target
+            if host in alive:
+                return
+            state, rtt = await self.probe(host, port)
+            if state is None or host in alive:
+                return
+            alive.add(host)
+            emit({"ip": host, "hostname": await resolve(host), "alive": True, "port": port,
+                  "rtt_ms": round(rtt * 1000, 2), "method": "tcp-async"})
+
+        async for result in self._run_workers(self._targets(hosts, ports), work, len(hosts) * len(ports)):
+            yield result
+
+        if not self.config.icmp_fallback:
+            return
+        silent = [h for h, _ in self._targets(hosts, ports[:1]) if h not in alive]
+        ping_missing = False
+
+        async def ping_work(host, emit):
+            nonlocal ping_missing
+            if ping_missing:
+                return
+            try:
+                rtt = await self._ping(host)
+            except FileNotFoundError:
+                ping_missing = True
+                logger.warning("ping not available; skipping ICMP discovery fallback")
+                return
+            if rtt is None:
+                return
+            alive.add(host)
+            emit({"ip": host, "hostname": await resolve(host), "alive": True, "port": None,
+                  "rtt_ms": round(rtt * 1000, 2), "method": "icmp"})
+
+        # One ping subprocess per worker, so use the thread-pool bound, not max_inflight
+        async for result in self._run_workers(iter(silent), ping_work, len(silent),
+                                              concurrency=self.config.max_discovery_threads):
+            yield result
+
+    def run(self, agen_factory) -> Iterator[Dict[str, Any]]:
+        """
+        Drive an engine coroutine (e.g. ``lambda: engine.scan(h, p)``) on a
+        private event loop thread and yield its results synchronously, so the
+        generator-based tool functions can use it from any thread.
+        """
+        results: "queue.Queue" = queue.Queue()
+        running: Dict[str, Any] = {}
+        done = object()
+
+        async def main():
+            running["loop"], running["task"] = asyncio.get_running_loop(), asyncio.current_task()
+            agen = agen_factory()
+            try:
+                async for item in agen:
+                    results.put(item)
+            finally:
+                await agen.aclose()
+
+        def runner():
+            try:
+                asyncio.run(main())
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(done)
+
+        thread = threading.Thread(target=runner, name="async-scan", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Consumer stopped early: cancel the scan instead of finishing it
+            if thread.is_alive() and "task" in running:
+                try:
+                    running["loop"].call_soon_threadsafe(running["task"].cancel)
+                except RuntimeError:
+                    pass
+
+# =============================================================================
+# BATCHED GRAPH WRITER
+# =============================================================================
+
+class BatchedGraphWriter:
+    """
+    Buffers host, port and service nodes plus their edges and writes them
+    with one ``UNWIND`` statement per node type / edge set, instead of an
+    upsert + link round trip per discovery.
+
+    Flushes when ``batch_size`` rows are pending or ``flush_interval``
+    seconds have passed (checked on each add), and on ``flush()``.  Falls
+    back to per-row ``upsert_entity`` / ``link`` when the memory has no
+    Neo4j driver.
+
+    A failed flush puts its rows back in the buffer (newer updates win) and
+    they go out with the next flush; after ``max_retries`` failures in a row
+    the batch is dropped and counted in ``stats["dropped"]``.  Bulk flushes
+    go through ``mem.record_bulk_write`` so write listeners and the archive
+    see every row.
+    """
+
+    NODE_LABELS = {
+        "network_host": "NetworkHost:IP",
+        "network_port": "NetworkPort:Port",
+        "network_service": "NetworkService:Service",
+    }
+
+    NODE_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (n:Entity {{id: row.id}})
+    WITH n, row, n.updated_at IS NULL AS created
+    SET n:{labels}
+    SET n.type = $type,
+        n += row.props
+    SET n.created_at = coalesce(n.created_at, row.created_at),
+        n.created_ts = coalesce(n.created_ts, timestamp()),
+        n.updated_at = timestamp()
+    RETURN row.id AS id, created
+    """
+
+    EDGE_CYPHER = """
+    UNWIND $rows AS row
+    MATCH (a:Entity {id: row.src})
+    MATCH (b:Entity {id: row.dst})
+    MERGE (a)-[r:REL {rel: row.rel}]->(b)
+    WITH r, row, r.updated_at IS NULL AS created
+    SET r += row.props
+    SET r.updated_at = timestamp()
+    RETURN row.src AS src, row.dst AS dst, row.rel AS rel, created
+    """
+
+    def __init__(self, mem, batch_size: int = 500, flush_interval: float = 2.0,
+                 max_retries: int = 3):
+        self.mem = mem
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._failures = 0
+        self._driver = getattr(getattr(mem, "graph", None), "_driver", None)
+        self._nodes: Dict[str, Dict[str, Dict[str, Any]]] = {t: {} for t in self.NODE_LABELS}
+        self._edges: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.stats = {"nodes": 0, "edges": 0, "flushes": 0, "statements": 0,
+                      "failed_flushes": 0, "dropped": 0}
+
+    def add_node(self, node_id: str, etype: str, properties: Dict[str, Any]):
+        with self._lock:
+            pending = self._nodes[etype].get(node_id)
+            if pending is None:
+                self._nodes[etype][node_id] = dict(properties)
+            else:
+                pending.update(properties)
+        self.maybe_flush()
+
+    def add_edge(self, src: str, dst: str, rel: str, properties: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._edges.setdefault((src, dst, rel), {}).update(properties or {})
+        self.maybe_flush()
+
+    @property
+    def pending(self) -> int:
+        return sum(len(n) for n in self._nodes.values()) + len(self._edges)
+
+    def maybe_flush(self):
+        if self.pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            nodes, self._nodes = self._nodes, {t: {} for t in self.NODE_LABELS}
+            edges, self._edges = self._edges, {}
+            self._last_flush = time.monotonic()
+
+        node_count = sum(len(n) for n in nodes.values())
+        if not node_count and not edges:
+            return
+
+        try:
+            if self._driver is not None:
+                written = self._write_bulk(nodes, edges)
+            else:
+                self._write_rows(nodes, edges)
+        except Exception as e:
+            self.stats["failed_flushes"] += 1
+            self._failures += 1
+            if self._failures > self.max_retries:
+                self._failures = 0
+                self.stats["dropped"] += node_count + len(edges)
+                logger.error(f"[BatchedGraphWriter] Dropping {node_count} nodes / {len(edges)} edges "
+                             f"after {self.max_retries + 1} failed flushes: {e}")
+                return
+            logger.warning(f"[BatchedGraphWriter] Flush of {node_count} nodes / {len(edges)} edges failed, "
+                           f"re-queued ({self._failures}/{self.max_retries}): {e}")
+            self._requeue(nodes, edges)
+            return
+        self._failures = 0
+
+        record = getattr(self.mem, "record_bulk_write", None)
+        if self._driver is not None and record:
+            try:
+                record(*written)
+            except Exception as e:
+                logger.warning(f"[BatchedGraphWriter] Write notification failed: {e}")
+
+        track = getattr(self.mem, "_track_node_creation", None)
+        if track:
+            for by_id in nodes.values():
+                for node_id in by_id:
+                    track(node_id)
+
+        self.stats["nodes"] += node_count
+        self.stats["edges"] += len(edges)
+        self.stats["flushes"] += 1
+
+    def _requeue(self, nodes, edges):
+        """Merge a failed batch back under anything buffered since"""
+        with self._lock:
+            for etype, by_id in nodes.items():
+                pending = self._nodes[etype]
+                for node_id, props in by_id.items():
+                    pending[node_id] = {**props, **pending.get(node_id, {})}
+            for key, props in edges.items():
+                self._edges[key] = {**props, **self._edges.get(key, {})}
+
+    def _write_bulk(self, nodes, edges):
+        """Write one transaction; returns (node payloads, edge payloads) for record_bulk_write"""
+        created_at = datetime.utcnow().isoformat()
+        statements = []
+        for etype, by_id in nodes.items():
+            if by_id:
+                rows = [
+                    {"id": node_id, "created_at": created_at,
+                     "props": {**props, "source_process": "network_scanning.py:BatchedGraphWriter"}}
+                    for node_id, props in by_id.items()
+                ]
+                statements.append((self.NODE_CYPHER.format(labels=self.NODE_LABELS[etype]),
+                                   {"rows": rows, "type": etype}))
+        if edges:
+            rows = [{"src": s, "dst": d, "rel": r, "props": p} for (s, d, r), p in edges.items()]
+            statements.append((self.EDGE_CYPHER, {"rows": rows}))
+
+        def _tx(tx):
+            return [tx.run(cypher, params).data() for cypher, params in statements]
+
+        with self._driver.session() as sess:
+            results = sess.execute_write(_tx)
+
+        node_payloads, edge_payloads = [], []
+        for (cypher, params), result in zip(statements, results or []):
+            if "type" in params:
+                created = {row["id"]: row["created"] for row in result}
+                labels = ["Entity"] + self.NODE_LABELS[params["type"]].split(":")
+                for row in params["rows"]:
+                    node_payloads.append({
+                        "id": row["id"], "type": params["type"], "labels": labels,
+                        "properties": row["props"], "created": bool(created.get(row["id"])),
+                    })
+            else:
+                created = {(row["src"], row["dst"], row["rel"]): row["created"] for row in result}
+                for row in params["rows"]:
+                    key = (row["src"], row["dst"], row["rel"])
+                    if key in created:   # both endpoints matched
+                        edge_payloads.append({
+                            "src": row["src"], "dst": row["dst"], "rel": row["rel"],
+                            "properties": row["props"], "created": bool(created[key]),
+                        })
+        return node_payloads, edge_payloads
+        self.stats["statements"] += len(statements)
+
+    def _write_rows(self, nodes, edges):
+        for etype, by_id in nodes.items():
+            for node_id, props in by_id.items():
+                self.mem.upsert_entity(node_id, etype, labels=self.NODE_LABELS[etype].split(":"),
+                                       properties=props)
+                self.stats["statements"] += 1
+        for (src, dst, rel), props in edges.items():
+            self.mem.link(src, dst, rel, props)
+            self.stats["statements"] += 1
+
 # =============================================================================
 # SERVICE DETECTOR
 # =============================================================================
@@ -1192,6 +1762,10 @@ class NetworkMapper:
         self.host_discovery = HostDiscovery(config)
         self.port_scanner = PortScanner(config)
         self.service_detector = ServiceDetector(config)
+        self.scan_engine = AsyncScanEngine(config, self.port_scanner.common_ports)
+        self.graph_writer = BatchedGraphWriter(
+            agent.mem, config.graph_batch_size, config.graph_flush_interval
+        )
         
         # Optional components
         self.dns_recon = None
@@ -1255,23 +1829,9 @@ class NetworkMapper:
         if hostname:
             properties["hostname"] = hostname
         
-        try:
-            self.agent.mem.upsert_entity(
-                node_id,
-                "network_host",
-                labels=["NetworkHost", "IP"],
-                properties=properties
-            )
-            
-            if self.scan_node_id:
-                self.agent.mem.link(
-                    self.scan_node_id,
-                    node_id,
-                    "DISCOVERED_IP",
-                    {"ip": ip}
-                )
-        except Exception:
-            pass
+        self.graph_writer.add_node(node_id, "network_host", properties)
+        if self.scan_node_id:
+            self.graph_writer.add_edge(self.scan_node_id, node_id, "DISCOVERED_IP", {"ip": ip})
         
         self.discovered_ips[ip] = node_id
         return node_id
@@ -1285,35 +1845,17 @@ class NetworkMapper:
         
         port_node_id = f"{ip_node_id}_port_{port}"
         
-        try:
-            self.agent.mem.upsert_entity(
-                port_node_id,
-                "network_port",
-                labels=["NetworkPort", "Port"],
-                properties={
-                    "port_number": port,
-                    "protocol": "tcp",
-                    "state": state,
-                    "discovered_at": datetime.now().isoformat(),
-                }
-            )
-            
-            self.agent.mem.link(
-                ip_node_id,
-                port_node_id,
-                "HAS_PORT",
-                {"port": port, "state": state}
+        self.graph_writer.add_node(port_node_id, "network_port", {
+            "port_number": port,
+            "protocol": "tcp",
+            "state": state,
+            "discovered_at": datetime.now().isoformat(),
+        })
+        self.graph_writer.add_edge(ip_node_id, port_node_id, "HAS_PORT", {"port": port, "state": state})
+        if self.scan_node_id:
+            self.graph_writer.add_edge(
+                self.scan_node_id, port_node_id, "FOUND_PORT", {"port": port, "ip": ip}
             )
-            
-            if self.scan_node_id:
-                self.agent.mem.link(
-                    self.scan_node_id,
-                    port_node_id,
-                    "FOUND_PORT",
-                    {"port": port, "ip": ip}
-                )
-        except Exception:
-            pass
         
         self.discovered_ports[cache_key] = port_node_id
         return port_node_id
@@ -1323,46 +1865,33 @@ class NetworkMapper:
         """Create or update service node"""
         service_node_id = f"{port_node_id}_service"
         
-        try:
-            properties = {
-                "service_name": service_data["service"],
-                "confidence": service_data["confidence"],
-                "discovered_at": datetime.now().isoformat(),
-            }
-            
-            if service_data.get("version"):
-                properties["version"] = service_data["version"]
-            if service_data.get("banner"):
-                properties["banner"] = service_data["banner"][:500]
-            
-            self.agent.mem.upsert_entity(
-                service_node_id,
-                "network_service",
-                labels=["NetworkService", "Service"],
-                properties=properties
-            )
-            
-            self.agent.mem.link(
-                port_node_id,
+        properties = {
+            "service_name": service_data["service"],
+            "confidence": service_data["confidence"],
+            "discovered_at": datetime.now().isoformat(),
+        }
+        
+        if service_data.get("version"):
+            properties["version"] = service_data["version"]
+        if service_data.get("banner"):
+            properties["banner"] = service_data["banner"][:500]
+        
+        self.graph_writer.add_node(service_node_id, "network_service", properties)
+        self.graph_writer.add_edge(
+            port_node_id, service_node_id, "RUNS_SERVICE", {"service": service_data["service"]}
+        )
+        if self.scan_node_id:
+            self.graph_writer.add_edge(
+                self.scan_node_id,
                 service_node_id,
-                "RUNS_SERVICE",
-                {"service": service_data["service"]}
+                "IDENTIFIED_SERVICE",
+                {
+                    "service": service_data["service"],
+                    "version": service_data.get("version"),
+                    "ip": ip,
+                    "port": port
+                }
             )
-            
-            if self.scan_node_id:
-                self.agent.mem.link(
-                    self.scan_node_id,
-                    service_node_id,
-                    "IDENTIFIED_SERVICE",
-                    {
-                        "service": service_data["service"],
-                        "version": service_data.get("version"),
-                        "ip": ip,
-                        "port": port
-                    }
-                )
-        except Exception:
-            pass
         
         self.discovered_services[(ip, port)] = (service_node_id, service_data)
         return service_node_id
@@ -1374,28 +1903,36 @@ class NetworkMapper:
     def discover_hosts(self, target: str, timeout: int = 2, use_nmap: bool = False) -> Iterator[str]:
         """Host discovery"""
         self._initialize_scan("discover_hosts", target)
-        
-        yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
-        yield f"║                     HOST DISCOVERY                           ║\n"
-        yield f"╚══════════════════════════════════════════════════════════════╝\n\n"
-        
-        targets = self.target_parser.parse(target)
-        yield f"Checking {len(targets)} target(s)...\n\n"
-        
-        live_count = 0
-        
-        for host_info in self.host_discovery.discover_live_hosts(targets):
-            if host_info["alive"]:
-                live_count += 1
-                ip = host_info["ip"]
-                hostname = host_info["hostname"]
-                
-                self._create_ip_node(ip, hostname)
-                
-                yield f"  [✓] {ip}"
-                if hostname:
-                    yield f" ({hostname})"
-                yield f"\n"
+        try:
+            yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
+            yield f"║                     HOST DISCOVERY                           ║\n"
+            yield f"╚══════════════════════════════════════════════════════════════╝\n\n"
+            
+            targets = self.target_parser.parse(target)
+            yield f"Checking {len(targets)} target(s)...\n\n"
+            
+            live_count = 0
+            
+            if self._use_async_discovery(targets):
+                host_stream = self.scan_engine.run(lambda: self.scan_engine.discover(targets))
+            else:
+                host_stream = self.host_discovery.discover_live_hosts(targets)
+            
+            for host_info in host_stream:
+                if host_info["alive"]:
+                    live_count += 1
+                    ip = host_info["ip"]
+                    hostname = host_info["hostname"]
+                    
+                    self._create_ip_node(ip, hostname)
+                    
+                    yield f"  [✓] {ip}"
+                    if hostname:
+                        yield f" ({hostname})"
+                    yield f"\n"
+        finally:
+            # An aborted scan (closed generator, error) still writes its buffered batch
+            self.graph_writer.flush()
         
         yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
         yield f"  Live Hosts: {live_count}/{len(targets)}\n"
@@ -1406,101 +1943,154 @@ class NetworkMapper:
                    use_nmap: bool = False) -> Iterator[str]:
         """Port scanning"""
         self._initialize_scan("scan_ports", target)
-        
-        yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
-        yield f"║                      PORT SCANNING                           ║\n"
-        yield f"╚══════════════════════════════════════════════════════════════╝\n\n"
-        
-        targets = self.target_parser.parse(target)
-        port_list = self.target_parser.parse_ports(ports)
-        
-        yield f"Targets: {len(targets)}\n"
-        yield f"Ports: {len(port_list)}\n\n"
-        
-        total_open = 0
-        
-        for ip in targets:
-            if only_live_hosts:
-                alive, hostname = self.host_discovery.is_host_alive(ip)
-                if not alive:
-                    continue
-            else:
-                hostname = None
+        try:
+            yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
+            yield f"║                      PORT SCANNING                           ║\n"
+            yield f"╚══════════════════════════════════════════════════════════════╝\n\n"
             
-            ip_node_id = self._create_ip_node(ip, hostname)
+            targets = self.target_parser.parse(target)
+            port_list = self.target_parser.parse_ports(ports)
             
-            yield f"\n  [•] Scanning {ip}...\n"
+            yield f"Targets: {len(targets)}\n"
+            yield f"Ports: {len(port_list)}\n\n"
             
-            port_count = 0
-            for port_info in self.port_scanner.scan_host(ip, port_list):
-                port_count += 1
-                total_open += 1
+            total_open = 0
+            
+            if self._use_async_scan(port_list):
+                total_open = yield from self._scan_ports_async(targets, port_list, only_live_hosts)
+                targets = []
+            
+            for ip in targets:
+                if only_live_hosts:
+                    alive, hostname = self.host_discovery.is_host_alive(ip)
+                    if not alive:
+                        continue
+                else:
+                    hostname = None
                 
-                self._create_port_node(
-                    ip_node_id, ip, port_info["port"], port_info["state"]
-                )
+                ip_node_id = self._create_ip_node(ip, hostname)
                 
-                yield f"      [✓] Port {port_info['port']}: {port_info['service']}\n"
-            
-            if port_count == 0:
-                yield f"      No open ports found\n"
+                yield f"\n  [•] Scanning {ip}...\n"
+                
+                port_count = 0
+                for port_info in self.port_scanner.scan_host(ip, port_list):
+                    port_count += 1
+                    total_open += 1
+                    
+                    self._create_port_node(
+                        ip_node_id, ip, port_info["port"], port_info["state"]
+                    )
+                    
+                    yield f"      [✓] Port {port_info['port']}: {port_info['service']}\n"
+                
+                if port_count == 0:
+                    yield f"      No open ports found\n"
+        finally:
+            # An aborted scan (closed generator, error) still writes its buffered batch
+            self.graph_writer.flush()
         
         yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
         yield f"  Total Open Ports: {total_open}\n"
         yield f"╚══════════════════════════════════════════════════════════════╝\n"
     
-    def detect_services(self, target: str, ports: Optional[str] = None,
-                       grab_banners: bool = True) -> Iterator[str]:
-        """Service detection"""
-        self._initialize_scan("detect_services", target)
+    def _use_async_discovery(self, targets: List[str]) -> bool:
+        return self.config.use_async_engine and not (self.host_discovery.nm and len(targets) > 10)
+    
+    def _use_async_scan(self, port_list: List[int]) -> bool:
+        return self.config.use_async_engine and not (self.port_scanner.nm and len(port_list) > 100)
+    
+    def _scan_ports_async(self, targets: List[str], port_list: List[int],
+                          only_live_hosts: bool) -> Iterator[str]:
+        """Scan every target concurrently; yields output lines, returns the open-port count"""
+        engine = self.scan_engine
         
-        yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
-        yield f"║                   SERVICE DETECTION                          ║\n"
-        yield f"╚══════════════════════════════════════════════════════════════╝\n\n"
+        if only_live_hosts:
+            live = {
+                h["ip"]: h["hostname"]
+                for h in engine.run(lambda: engine.discover(targets))
+            }
+            yield f"  [•] {len(live)}/{len(targets)} host(s) up\n"
+        else:
+            live = {ip: None for ip in targets}
         
-        targets = self.target_parser.parse(target)
+        ip_nodes = {ip: self._create_ip_node(ip, hostname) for ip, hostname in live.items()}
+        hosts = list(ip_nodes)
         
-        if not self.discovered_ports and not ports and self.config.auto_run_prerequisites:
-            yield f"  [!] No ports found - auto-scanning common ports...\n\n"
-            
-            for chunk in self.scan_ports(target, "21-23,25,53,80,110,143,443,445,3306,3389,5432,8080", only_live_hosts=True):
-                if not chunk.startswith("╔"):
-                    yield chunk
-            
-            yield f"\n  [•] Continuing with service detection...\n\n"
+        yield (f"\n  [•] Scanning {len(hosts)} host(s) x {len(port_list)} port(s) "
+               f"(async, {engine.max_inflight} in flight)...\n")
         
-        services_found = 0
+        started = time.perf_counter()
+        probes_before = engine.stats["probes"]
+        total_open = 0
         
-        for ip in targets:
-            if ip not in self.discovered_ips:
-                ip_node_id = self._create_ip_node(ip)
-            else:
-                ip_node_id = self.discovered_ips[ip]
+        for port_info in engine.run(lambda: engine.scan(hosts, port_list)):
+            total_open += 1
+            ip = port_info["ip"]
+            self._create_port_node(ip_nodes[ip], ip, port_info["port"], port_info["state"])
+            yield f"      [✓] {ip}:{port_info['port']}: {port_info['service']}\n"
+        
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        probes = engine.stats["probes"] - probes_before
+        if total_open == 0:
+            yield f"      No open ports found\n"
+        yield f"\n  [•] {probes} probes in {elapsed:.1f}s ({probes / elapsed:.0f}/s)\n"
+        return total_open
+    
+    def detect_services(self, target: str, ports: Optional[str] = None,
+                       grab_banners: bool = True) -> Iterator[str]:
+        """Service detection"""
+        self._initialize_scan("detect_services", target)
+        try:
+            yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
+            yield f"║                   SERVICE DETECTION                          ║\n"
+            yield f"╚══════════════════════════════════════════════════════════════╝\n\n"
             
-            if ports:
-                open_ports = self.target_parser.parse_ports(ports)
-            else:
-                open_ports = [p for (i, p) in self.discovered_ports.keys() if i == ip]
+            targets = self.target_parser.parse(target)
             
-            if not open_ports:
-                continue
+            if not self.discovered_ports and not ports and self.config.auto_run_prerequisites:
+                yield f"  [!] No ports found - auto-scanning common ports...\n\n"
+                
+                for chunk in self.scan_ports(target, "21-23,25,53,80,110,143,443,445,3306,3389,5432,8080", only_live_hosts=True):
+                    if not chunk.startswith("╔"):
+                        yield chunk
+                
+                yield f"\n  [•] Continuing with service detection...\n\n"
             
-            yield f"\n  [•] Detecting services on {ip}...\n"
+            services_found = 0
             
-            for port in open_ports:
-                port_node_id = self.discovered_ports.get((ip, port))
-                if not port_node_id:
-                    port_node_id = self._create_port_node(ip_node_id, ip, port)
+            for ip in targets:
+                if ip not in self.discovered_ips:
+                    ip_node_id = self._create_ip_node(ip)
+                else:
+                    ip_node_id = self.discovered_ips[ip]
+                
+                if ports:
+                    open_ports = self.target_parser.parse_ports(ports)
+                else:
+                    open_ports = [p for (i, p) in self.discovered_ports.keys() if i == ip]
                 
-                service_data = self.service_detector.detect_service(ip, port)
+                if not open_ports:
+                    continue
                 
-                self._create_service_node(port_node_id, ip, port, service_data)
-                services_found += 1
+                yield f"\n  [•] Detecting services on {ip}...\n"
                 
-                yield f"      [✓] Port {port}: {service_data['service']}"
-                if service_data.get("version"):
-                    yield f" {service_data['version']}"
-                yield f" ({service_data['confidence']} confidence)\n"
+                for port in open_ports:
+                    port_node_id = self.discovered_ports.get((ip, port))
+                    if not port_node_id:
+                        port_node_id = self._create_port_node(ip_node_id, ip, port)
+                    
+                    service_data = self.service_detector.detect_service(ip, port)
+                    
+                    self._create_service_node(port_node_id, ip, port, service_data)
+                    services_found += 1
+                    
+                    yield f"      [✓] Port {port}: {service_data['service']}"
+                    if service_data.get("version"):
+                        yield f" {service_data['version']}"
+                    yield f" ({service_data['confidence']} confidence)\n"
+        finally:
+            # An aborted scan (closed generator, error) still writes its buffered batch
+            self.graph_writer.flush()
         
         yield f"\n╔══════════════════════════════════════════════════════════════╗\n"
         yield f"  Services Detected: {services_found}\n"
@@ -1874,6 +2464,151 @@ class NetworkMapper:
         yield f"  Open Ports:     {len(self.discovered_ports)}\n"
         yield f"  Services:       {len(self.discovered_services)}\n"
 
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+class _ListenerFarm:
+    """
+    TCP listeners on loopback aliases (127.77.x.y), served from a background
+    event loop.  Linux routes all of 127.0.0.0/8 to lo, so every address
+    behaves like a distinct host with its own open and closed ports.
+    """
+
+    def __init__(self, hosts: int, ports: List[int], listeners_per_host: int, seed: int = 7):
+        rng = random.Random(seed)
+        self.hosts = [f"127.77.{(i + 1) // 256}.{(i + 1) % 256}" for i in range(hosts)]
+        self.open = {(h, p) for h in self.hosts for p in rng.sample(ports, listeners_per_host)}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._servers = []
+
+    async def _start(self):
+        async def handle(reader, writer):
+            writer.close()
+
+        for host, port in sorted(self.open):
+            self._servers.append(await asyncio.start_server(handle, host, port, backlog=512))
+
+    async def _stop(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+    def __enter__(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class _RecordingDriver:
+    """Neo4j driver stand-in that counts transactions and statements"""
+
+    def __init__(self):
+        self.transactions = 0
+        self.statements = 0
+        self.rows = 0
+        driver = self
+
+        class _Tx:
+            def run(self, cypher, params=None):
+                driver.statements += 1
+                driver.rows += len((params or {}).get("rows", ()))
+                return self
+
+            def consume(self):
+                return None
+
+            def data(self):
+                return []
+
+        class _Session:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute_write(self, fn):
+                driver.transactions += 1
+                return fn(_Tx())
+
+        self._session_cls = _Session
+
+    def session(self, **kwargs):
+        return self._session_cls()
+
+
+def benchmark_scan(hosts: int = 64, port_range: Tuple[int, int] = (20000, 20999),
+                   listeners_per_host: int = 3, max_inflight: int = 512) -> Dict[str, Any]:
+    """
+    Scan a loopback listener farm with the threaded socket scanner (one host
+    at a time, as ``scan_ports`` used to) and with ``AsyncScanEngine``
+    (all hosts at once), then feed the async results through
+    ``BatchedGraphWriter`` to count graph round trips.
+    """
+    ports = list(range(port_range[0], port_range[1] + 1))
+    config = NetworkScanConfig(scan_timeout=1.0, max_inflight=max_inflight)
+    result: Dict[str, Any] = {"hosts": hosts, "ports": len(ports), "probes": hosts * len(ports)}
+
+    with _ListenerFarm(hosts, ports, listeners_per_host) as farm:
+        result["listeners"] = len(farm.open)
+
+        scanner = PortScanner(config)
+        started = time.perf_counter()
+        found = {(h, r["port"]) for h in farm.hosts for r in scanner._socket_scan(h, ports)}
+        elapsed = time.perf_counter() - started
+        result["threaded"] = {
+            "seconds": round(elapsed, 2),
+            "probes_per_s": round(result["probes"] / elapsed),
+            "found": len(found),
+        }
+
+        engine = AsyncScanEngine(config, scanner.common_ports)
+        started = time.perf_counter()
+        open_ports = list(engine.run(lambda: engine.scan(farm.hosts, ports)))
+        elapsed = time.perf_counter() - started
+        result["async"] = {
+            "seconds": round(elapsed, 2),
+            "probes_per_s": round(result["probes"] / elapsed),
+            "found": len({(r["ip"], r["port"]) for r in open_ports}),
+            "in_flight": engine.max_inflight,
+            "timeouts": engine.stats["timeouts"],
+        }
+        result["speedup"] = round(result["threaded"]["seconds"] / max(elapsed, 1e-9), 1)
+        result["all_listeners_found"] = {(r["ip"], r["port"]) for r in open_ports} == farm.open
+
+    class _Mem:
+        graph = type("_Graph", (), {"_driver": _RecordingDriver()})()
+
+    writer = BatchedGraphWriter(_Mem(), batch_size=config.graph_batch_size, flush_interval=3600)
+    scan_id = "scan_bench"
+    for r in open_ports:
+        host_id = f"ip_{r['ip'].replace('.', '_')}"
+        port_id = f"{host_id}_port_{r['port']}"
+        writer.add_node(host_id, "network_host", {"ip_address": r["ip"], "status": "up"})
+        writer.add_edge(scan_id, host_id, "DISCOVERED_IP", {"ip": r["ip"]})
+        writer.add_node(port_id, "network_port", {"port_number": r["port"], "protocol": "tcp", "state": "open"})
+        writer.add_edge(host_id, port_id, "HAS_PORT", {"port": r["port"], "state": "open"})
+        writer.add_edge(scan_id, port_id, "FOUND_PORT", {"port": r["port"], "ip": r["ip"]})
+    writer.flush()
+
+    driver = _Mem.graph._driver
+    result["graph"] = {
+        # per-row path: upsert + link(s) per host and per port
+        "per_row_round_trips": len({r["ip"] for r in open_ports}) * 2 + len(open_ports) * 3,
+        "batched_transactions": driver.transactions,
+        "batched_statements": driver.statements,
+        "rows_written": driver.rows,
+    }
+    return result
+
 # =============================================================================
 # TOOL INTEGRATION
 # =============================================================================
@@ -2073,6 +2808,12 @@ def add_network_scanning_tools(tool_list: List, agent):
     return tool_list
 
 if __name__ == "__main__":
+    import sys
+    
+    if "--benchmark" in sys.argv:
+        print(json.dumps(benchmark_scan(), indent=2))
+        sys.exit(0)
+    
     print("Comprehensive Network Scanner - Integrated OSINT Toolkit")
     print("✓ Host discovery (ping, TCP, nmap)")
     print("✓ Port scanning (socket, nmap)")
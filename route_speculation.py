@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# route_speculation.py - Speculative routing for VeraChat
+"""
+Speculative route execution for chat turns.
+
+VeraChat runs triage and the preamble in parallel, but a continuation
+route (intermediate / reasoning / complex / coding) only starts once triage
+has classified the query and the preamble has finished.  With speculation,
+the most likely route is predicted from recent triage history and query
+features and its model is started alongside triage:
+
+    triage agrees     → the speculative stream is committed; chunks that
+                        arrived while the preamble streamed are served first
+    triage disagrees  → the orchestrator task is cancelled, its worker and
+                        Ollama stream are released
+
+Only side-effect-free LLM routes are ever speculated — action routes run
+tools and must wait for triage.  The speculative prompt uses the committed
+route's stage template but is built when triage starts: it has no preamble
+in its frame and its history does not yet include the triage turn.  A hit
+serves that output as-is; the response does not build on the preamble the
+user has already seen.
+
+Predictor accuracy and the modelled savings on a synthetic query mix:
+    python -m Vera.route_speculation --bench
+"""
+
+import math
+import re
+import threading
+import time
+import queue
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# route → (orchestrator task, context stage, streams thoughts)
+SPECULATIVE_ROUTES: Dict[str, Tuple[str, str, bool]] = {
+    "intermediate": ("llm.intermediate", "intermediate", False),
+    "reasoning":    ("llm.reasoning",    "reasoning",    True),
+    "complex":      ("llm.deep",         "reasoning",    True),
+    "coding":       ("llm.coding",       "coding",       False),
+}
+
+_KEYWORDS = {
+    "kw:code":    ("code", "function", "script", "class", "bug", "compile", "python",
+                   "javascript", "regex", "sql", "implement", "refactor"),
+    "kw:reason":  ("why", "prove", "derive", "reason", "step by step", "logic",
+                   "calculate", "solve", "puzzle"),
+    "kw:explain": ("explain", "how does", "what is", "describe", "difference",
+                   "compare", "overview", "summarise", "summarize"),
+    "kw:deep":    ("design", "architecture", "strategy", "plan", "trade-off",
+                   "tradeoff", "analyse", "analyze", "evaluate", "comprehensive"),
+    "kw:action":  ("search", "find", "run", "open", "list", "download", "schedule",
+                   "create a file", "execute", "look up", "fetch"),
+    "kw:chat":    ("hi", "hello", "thanks", "thank you", "hey", "good morning"),
+}
+_CODE_MARKERS = re.compile(r"```|\bdef \w+\(|\bTraceback\b|;\s*$|\{\s*$|=>", re.MULTILINE)
+
+
+def query_features(query: str) -> List[str]:
+    """Cheap categorical features of a query for route prediction."""
+    text = query.lower()
+    words = len(text.split())
+    if words <= 4:
+        length = "len:tiny"
+    elif words <= 15:
+        length = "len:short"
+    elif words <= 60:
+        length = "len:medium"
+    else:
+        length = "len:long"
+
+    features = [length]
+    padded = f" {re.sub(r'[^a-z0-9 ]+', ' ', text)} "
+    for name, keywords in _KEYWORDS.items():
+        if any(f" {kw} " in padded for kw in keywords):
+            features.append(name)
+    if _CODE_MARKERS.search(query):
+        features.append("code_block")
+    if text.rstrip().endswith("?"):
+        features.append("question")
+    if "\n" in query.strip():
+        features.append("multiline")
+    return features
+
+
+class RoutePredictor:
+    """
+    Online naive-Bayes route predictor over the last ``history_size`` triage
+    results.  Predicts nothing until ``min_history`` turns have been seen.
+    """
+
+    def __init__(self, history_size: int = 500, min_history: int = 10):
+        self.min_history = min_history
+        self._history: Deque[Tuple[Tuple[str, ...], str]] = deque(maxlen=history_size)
+        self._route_counts: Counter = Counter()
+        self._feature_counts: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, query: str, route: str):
+        """Record the route triage chose for ``query``."""
+        features = tuple(query_features(query))
+        with self._lock:
+            if len(self._history) == self._history.maxlen:
+                old_features, old_route = self._history[0]
+                self._route_counts[old_route] -= 1
+                self._feature_counts[old_route].subtract(old_features)
+            self._history.append((features, route))
+            self._route_counts[route] += 1
+            self._feature_counts.setdefault(route, Counter()).update(features)
+
+    def predict(self, query: str) -> Tuple[Optional[str], float]:
+        """Most likely route and its posterior probability."""
+        features = query_features(query)
+        with self._lock:
+            total = len(self._history)
+            if total < self.min_history:
+                return None, 0.0
+            routes = [r for r, n in self._route_counts.items() if n > 0]
+            log_scores = {}
+            for route in routes:
+                n = self._route_counts[route]
+                counts = self._feature_counts[route]
+                score = math.log((n + 1) / (total + len(routes)))
+                for feature in features:
+                    score += math.log((counts[feature] + 1) / (n + 2))
+                log_scores[route] = score
+
+        top = max(log_scores.values())
+        weights = {r: math.exp(s - top) for r, s in log_scores.items()}
+        route = max(weights, key=weights.get)
+        return route, weights[route] / sum(weights.values())
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+
+class SpeculationMetrics:
+    """Hit rate, time-to-first-token saved on hits and tokens wasted on misses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped: Counter = Counter()
+        self.ttft_saved_s = 0.0
+        self.tokens_wasted = 0
+        self.worker_s_wasted = 0.0
+        self.by_route: Dict[str, Counter] = {}
+
+    def record_skip(self, reason: str):
+        with self._lock:
+            self.skipped[reason] += 1
+
+    def record_hit(self, route: str, ttft_saved: float):
+        with self._lock:
+            self.hits += 1
+            self.ttft_saved_s += ttft_saved
+            self.by_route.setdefault(route, Counter())["hits"] += 1
+
+    def record_miss(self, route: str, tokens_wasted: int, worker_s: float = 0.0):
+        with self._lock:
+            self.misses += 1
+            self.tokens_wasted += tokens_wasted
+            self.worker_s_wasted += worker_s
+            self.by_route.setdefault(route, Counter())["misses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.hits + self.misses
+            return {
+                "attempts": attempts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / attempts, 3) if attempts else 0.0,
+                "ttft_saved_total_s": round(self.ttft_saved_s, 3),
+                "ttft_saved_avg_s": round(self.ttft_saved_s / self.hits, 3) if self.hits else 0.0,
+                "tokens_wasted": self.tokens_wasted,
+                "worker_s_wasted": round(self.worker_s_wasted, 3),
+                "skipped": dict(self.skipped),
+                "by_route": {r: dict(c) for r, c in self.by_route.items()},
+            }
+
+
+class SpeculativeStream:
+    """
+    A route started before triage finished.  A background thread buffers
+    its chunks until the stream is either committed (``commit()`` yields
+    the buffered chunks, then the live ones) or cancelled.  Each streamed
+    chunk is counted as one token — Ollama streams a token per chunk.
+    """
+
+    _DONE = object()
+
+    def __init__(self, route: str, task_id: str, chunks: Iterator[str]):
+        self.route = route
+        self.task_id = task_id
+        self.started_at = time.time()
+        self.first_chunk_at: Optional[float] = None
+        self.chunks_produced = 0
+        self.committed = False
+        self.cancelled = False
+        self._buffer: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._source = chunks
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def _consume(self):
+        try:
+            for chunk in self._source:
+                if self._stop.is_set():
+                    break
+                if self.first_chunk_at is None:
+                    self.first_chunk_at = time.time()
+                self.chunks_produced += 1
+                self._buffer.put(chunk)
+        except Exception as e:
+            self._buffer.put(e)
+        finally:
+            self._buffer.put(self._DONE)
+
+    def ttft_saved(self, committed_at: float) -> float:
+        """
+        Time-to-first-token saved against starting the route at
+        ``committed_at``, taking this stream's own TTFT as the estimate.
+        """
+        first = self.first_chunk_at if self.first_chunk_at is not None else committed_at
+        return max(0.0, min(first, committed_at) - self.started_at)
+
+    def commit(self) -> Iterator[str]:
+        """Stream the route's output: buffered chunks first, then live ones."""
+        self.committed = True
+        while True:
+            item = self._buffer.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def cancel(self, orchestrator) -> int:
+        """Stop the route and release its worker; returns tokens produced."""
+        self.cancelled = True
+        self._stop.set()
+        try:
+            orchestrator.cancel_task(self.task_id)
+        except Exception:
+            pass
+        return self.chunks_produced
+
+
+def benchmark_speculation(
+    turns: int = 400,
+    triage_latency: float = 0.8,
+    preamble_duration: float = 3.0,
+    route_ttft: float = 1.5,
+    token_rate: float = 30.0,
+    min_confidence: float = 0.6,
+    label_noise: float = 0.15,
+    jitter: float = 0.5,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    """
+    Replay a synthetic query mix through the predictor online and model
+    each turn's timeline: the speculative route starts at t=0, triage
+    classifies at ``triage_latency``, and without speculation the route
+    would start when the preamble ends.  Latencies vary per turn by up to
+    ``jitter`` (relative).  ``label_noise`` is the share of turns where
+    triage picks a neighbouring route for the same wording.
+
+    A miss is charged what the worker actually streams before it stops: it
+    only sees the cancel on its next chunk, so it always produces at least
+    the first token (after ``route_ttft``) and then ``token_rate`` tokens per
+    second for however long triage took beyond that.
+    """
+    import random
+    rng = random.Random(seed)
+    mix = [
+        ("simple", 0.40, ["hi there", "thanks!", "hello vera", "good morning, how are you?"]),
+        ("intermediate", 0.20, ["explain how {t} works", "what is the difference between {t} and {u}?",
+                                "summarize the idea behind {t}"]),
+        ("reasoning", 0.12, ["why does {t} fail when {u} is enabled? reason step by step",
+                             "solve this puzzle about {t}", "prove that {t} implies {u}"]),
+        ("complex", 0.08, ["design an architecture for {t} with {u}, evaluate the trade-offs",
+                           "plan a comprehensive strategy to migrate {t} to {u}"]),
+        ("coding", 0.10, ["write a python function that parses {t}", "fix this bug:\n```\ndef f(x):\n  return {t}\n```",
+                          "implement a class for {t} in javascript"]),
+        ("toolchain", 0.10, ["search the web for {t}", "list files in {t}", "fetch the latest news on {t}"]),
+    ]
+    neighbours = {
+        "simple": "intermediate", "intermediate": "reasoning", "reasoning": "complex",
+        "complex": "reasoning", "coding": "intermediate", "toolchain": "intermediate",
+    }
+    topics = ["caching", "raft", "neo4j", "ollama", "vector search", "tcp", "kubernetes", "bloom filters"]
+
+    predictor = RoutePredictor()
+    metrics = SpeculationMetrics()
+    for _ in range(turns):
+        r, acc = rng.random(), 0.0
+        for route, weight, templates in mix:
+            acc += weight
+            if r <= acc:
+                break
+        query = rng.choice(templates).format(t=rng.choice(topics), u=rng.choice(topics))
+        if rng.random() < label_noise:
+            route = neighbours[route]
+
+        triage_at = triage_latency * rng.uniform(1 - jitter, 1 + jitter)
+        ttft = route_ttft * rng.uniform(1 - jitter, 1 + jitter)
+        predicted, confidence = predictor.predict(query)
+        if predicted not in SPECULATIVE_ROUTES:
+            metrics.record_skip("no_speculative_route")
+        elif confidence < min_confidence:
+            metrics.record_skip("low_confidence")
+        elif predicted == route:
+            commit_at = preamble_duration
+            metrics.record_hit(route, min(ttft, commit_at))
+        else:
+            streamed = 1 + int(max(0.0, triage_at - ttft) * token_rate)
+            stopped_at = max(triage_at, ttft) + (0.0 if triage_at > ttft else 1.0 / token_rate)
+            metrics.record_miss(predicted, streamed, stopped_at)
+        predictor.observe(query, route)
+
+    stats = metrics.stats()
+    stats["model"] = {
+        "turns": turns, "triage_latency_s": triage_latency, "preamble_s": preamble_duration,
+        "route_ttft_s": route_ttft, "token_rate": token_rate, "min_confidence": min_confidence,
+        "label_noise": label_noise, "jitter": jitter,
+    }
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Speculative routing model")
+    parser.add_argument("--bench", action="store_true", help="replay a synthetic query mix")
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark_speculation(args.turns, min_confidence=args.min_confidence), indent=2))
+    else:
+        parser.print_help()
@@ -185,6 +185,9 @@ class Vera:
         self.logger.info("Initializing Ollama connection manager...")
         self.thoughts_captured = []
         self.thought_queue = queue.Queue()
+        # task_id -> thoughts held back from thought_queue (speculative routes)
+        self._held_thoughts: Dict[str, List[str]] = {}
+        self._held_thoughts_lock = threading.Lock()
         self.stream_thoughts_inline = self.config.logging.stream_thoughts_inline
         
         from Vera.Ollama.multi_instance_manager import MultiInstanceOllamaManager
@@ -998,8 +1001,30 @@ class Vera:
             self.logger.thought(thought, context=context)
         
         if self.stream_thoughts_inline:
+            # Orchestrator workers run the model stream, so the current
+            # thread says which task the thought belongs to
+            task_id = getattr(threading.current_thread(), 'current_task', None)
+            with self._held_thoughts_lock:
+                held = self._held_thoughts.get(task_id) if task_id else None
+                if held is not None:
+                    held.append(thought)
+                    return
             self.thought_queue.put(thought)
     
+    def hold_thoughts(self, task_id: str):
+        """Keep thoughts from ``task_id`` out of thought_queue until released"""
+        with self._held_thoughts_lock:
+            self._held_thoughts.setdefault(task_id, [])
+    
+    def release_thoughts(self, task_id: str, keep: bool = True) -> int:
+        """Stop holding ``task_id``'s thoughts; queue them (keep) or drop them"""
+        with self._held_thoughts_lock:
+            held = self._held_thoughts.pop(task_id, [])
+            if keep:
+                for thought in held:
+                    self.thought_queue.put(thought)
+        return len(held)
+    
     def _stream_with_thought_polling(self, llm, prompt):
         """Stream LLM output with immediate thought injection"""
         import threading
@@ -27,6 +27,14 @@ PATCH NOTES
    - _parallel_execute: action path saves action_response explicitly.
    - Direct route: all modes now call save_to_memory at the end.
 
+5. Speculative routing
+   When the LLM pool has a spare worker, the continuation route predicted
+   from recent triage history (route_speculation.RoutePredictor) starts
+   alongside triage.  A triage match commits the buffered stream; a
+   mismatch, an error or a closed generator cancels the task.  Its
+   thoughts are held back until it is committed.  speculation_stats()
+   reports hit rate, time-to-first-token saved and tokens wasted.
+
 Context strategy per stage (unchanged)
 ───────────────────────────────────────────────────────────────────────
 Stage           | Identity | Style | History | Vectors | Graph | Tools
@@ -49,6 +57,11 @@ from queue import Empty
 
 from Vera.Logging.logging import LogContext
 from Vera.context_builder import ContextBuilder
+from Vera.Ollama.capacity_arbiter import get_arbiter
+from Vera.Orchestration.orchestration import TaskType
+from Vera.route_speculation import (
+    SPECULATIVE_ROUTES, RoutePredictor, SpeculationMetrics, SpeculativeStream
+)
 
 
 def extract_chunk_text(chunk):
@@ -74,6 +87,12 @@ class VeraChat:
             "scheduling-agent", "idea-agent", "toolchain-expert"
         }
 
+        orch_cfg = getattr(getattr(vera_instance, 'config', None), 'orchestrator', None)
+        self.speculation_enabled = getattr(orch_cfg, 'speculative_routing', True)
+        self.speculation_min_confidence = getattr(orch_cfg, 'speculation_min_confidence', 0.6)
+        self.route_predictor = RoutePredictor()
+        self.speculation_metrics = SpeculationMetrics()
+
     # ====================================================================
     # MEMORY HELPERS
     # ====================================================================
@@ -341,6 +360,34 @@ class VeraChat:
         ramp_config: Optional[Dict] = None,
         routing_hints: Optional[Dict] = None,
     ) -> Iterator[str]:
+        """
+        Stream a chat turn.  The turn is registered with the capacity arbiter
+        as interactive demand for its whole lifetime, so background cognition
+        holds off until it finishes; time-to-first-chunk is recorded against
+        whether background work was running when the turn started.
+        """
+        arbiter = get_arbiter()
+        background_was_active = arbiter.background_active > 0
+        started = time.time()
+        first_chunk = True
+
+        arbiter.begin_interactive()
+        try:
+            for chunk in self._async_run(query, use_parallel, ramp_config, routing_hints):
+                if first_chunk:
+                    arbiter.record_interactive_latency(time.time() - started, background_was_active)
+                    first_chunk = False
+                yield chunk
+        finally:
+            arbiter.end_interactive()
+
+    def _async_run(
+        self,
+        query: str,
+        use_parallel: bool = True,
+        ramp_config: Optional[Dict] = None,
+        routing_hints: Optional[Dict] = None,
+    ) -> Iterator[str]:
 
         query_context = LogContext(
             session_id=self.vera.sess.id,
@@ -366,129 +413,137 @@ class VeraChat:
             yield "Error: Orchestrator not available. Please start the orchestrator."
             return
 
-        full_triage, preamble_response, classification, total_response, complete = yield from self._parallel_execute(
-            query, query_context, routing_hints
-        )
+        # Started here so one try/finally covers its whole lifetime: a
+        # client disconnect or error before commit must release the worker
+        speculation = self._start_speculation(query, query_context)
+        try:
+            full_triage, preamble_response, classification, total_response, complete, speculation = yield from self._parallel_execute(
+                query, query_context, routing_hints, speculation
+            )
 
-        # Save triage result as its own memory node
-        self._save_session(full_triage, "Triage", extra={"topic": "triage"})
+            # Save triage result as its own memory node
+            self._save_session(full_triage, "Triage", extra={"topic": "triage"})
 
-        # Flush any thoughts captured during parallel execution
-        self._flush_and_save_thoughts()
+            # Flush any thoughts captured during parallel execution
+            self._flush_and_save_thoughts()
 
-        if complete:
-            self.vera.save_to_memory(query, total_response)
-            total_duration = self.logger.stop_timer("total_query_processing", context=query_context)
-            self.logger.success(f"Query complete ({classification}): {len(total_response)} chars in {total_duration:.2f}s", context=query_context)
-            return
+            if complete:
+                self.vera.save_to_memory(query, total_response)
+                total_duration = self.logger.stop_timer("total_query_processing", context=query_context)
+                self.logger.success(f"Query complete ({classification}): {len(total_response)} chars in {total_duration:.2f}s", context=query_context)
+                return
 
-        # ── Continuation routes ──────────────────────────────────────────
-        route_context = LogContext(session_id=self.vera.sess.id, extra={"triage_result": classification})
+            # ── Continuation routes ──────────────────────────────────────────
+            route_context = LogContext(session_id=self.vera.sess.id, extra={"triage_result": classification})
 
-        if "focus" in classification:
-            yield from self._handle_focus_change(full_triage, route_context)
-            total_response += "[Focus changed]"
+            if "focus" in classification:
+                yield from self._handle_focus_change(full_triage, route_context)
+                total_response += "[Focus changed]"
 
-        elif "adaptive" in classification:
-            max_steps = 20
-            action_response = ""
-            try:
-                task_id = self.vera.orchestrator.submit_task(
-                    "toolchain.execute_adaptive", vera_instance=self.vera,
-                    query=query, max_steps=max_steps
+            elif "adaptive" in classification:
+                max_steps = 20
+                action_response = ""
+                try:
+                    task_id = self.vera.orchestrator.submit_task(
+                        "toolchain.execute_adaptive", vera_instance=self.vera,
+                        query=query, max_steps=max_steps
+                    )
+                    for chunk in self._stream_with_idle_timeout(task_id, idle_timeout=60.0, total_timeout=300.0):
+                        yield chunk
+                        action_response += chunk
+                        total_response += chunk
+                except Exception as e:
+                    self.logger.error(f"Adaptive toolchain failed: {e}", context=route_context)
+                    _atc = getattr(self.vera, '_adaptive_toolchain', None) \
+                        or getattr(self.vera, 'adaptive_toolchain', None) \
+                        or self.vera.toolchain
+                    for chunk in _atc.execute_adaptive(query, max_steps=max_steps):
+                        c = extract_chunk_text(chunk)
+                        yield c
+                        action_response += c
+                        total_response += c
+                # Save adaptive action response separately
+                self._save_session(action_response, "Response", agent="adaptive")
+                self._flush_and_save_thoughts()
+
+            elif classification == "proactive":
+                yield from self._handle_proactive(route_context)
+                total_response += "[Proactive thinking started]"
+
+            elif "counsel" in classification or "coun" in classification:
+                rh = routing_hints or {}
+                yield from self._execute_counsel_mode(
+                    query, query_context,
+                    counsel_mode=rh.get('counsel_mode', 'vote'),
+                    models=rh.get('models', ['fast', 'intermediate', 'deep']),
+                    model_overrides=rh.get('model_overrides', {}),
                 )
-                for chunk in self._stream_with_idle_timeout(task_id, idle_timeout=60.0, total_timeout=300.0):
+
+            elif classification == "reasoning":
+                yield "\n\n"
+                total_response += "\n\n"
+                prompt = self.ctx.build(query, stage="reasoning", preamble=preamble_response)
+                continuation = ""
+                for chunk in self._execute_reasoning_continuation(query, prompt, route_context, speculation):
                     yield chunk
-                    action_response += chunk
                     total_response += chunk
-            except Exception as e:
-                self.logger.error(f"Adaptive toolchain failed: {e}", context=route_context)
-                _atc = getattr(self.vera, '_adaptive_toolchain', None) \
-                    or getattr(self.vera, 'adaptive_toolchain', None) \
-                    or self.vera.toolchain
-                for chunk in _atc.execute_adaptive(query, max_steps=max_steps):
-                    c = extract_chunk_text(chunk)
-                    yield c
-                    action_response += c
-                    total_response += c
-            # Save adaptive action response separately
-            self._save_session(action_response, "Response", agent="adaptive")
-            self._flush_and_save_thoughts()
-
-        elif classification == "proactive":
-            yield from self._handle_proactive(route_context)
-            total_response += "[Proactive thinking started]"
-
-        elif "counsel" in classification or "coun" in classification:
-            rh = routing_hints or {}
-            yield from self._execute_counsel_mode(
-                query, query_context,
-                counsel_mode=rh.get('counsel_mode', 'vote'),
-                models=rh.get('models', ['fast', 'intermediate', 'deep']),
-                model_overrides=rh.get('model_overrides', {}),
-            )
+                    continuation += chunk
+                self._flush_and_save_thoughts()
+                if continuation.strip():
+                    yield "\n\n--- Conclusion ---\n"
+                    total_response += "\n\n--- Conclusion ---\n"
+                    for chunk in self._generate_conclusion(query, total_response, query_context):
+                        yield chunk
+                        total_response += chunk
 
-        elif classification == "reasoning":
-            yield "\n\n"
-            total_response += "\n\n"
-            prompt = self.ctx.build(query, stage="reasoning", preamble=preamble_response)
-            continuation = ""
-            for chunk in self._execute_reasoning_continuation(query, prompt, route_context):
-                yield chunk
-                total_response += chunk
-                continuation += chunk
-            self._flush_and_save_thoughts()
-            if continuation.strip():
-                yield "\n\n--- Conclusion ---\n"
-                total_response += "\n\n--- Conclusion ---\n"
-                for chunk in self._generate_conclusion(query, total_response, query_context):
+            elif classification == "complex":
+                yield "\n\n"
+                total_response += "\n\n"
+                prompt = self.ctx.build(query, stage="reasoning", preamble=preamble_response)
+                continuation = ""
+                for chunk in self._execute_deep_continuation(query, prompt, route_context, speculation):
                     yield chunk
                     total_response += chunk
+                    continuation += chunk
+                self._flush_and_save_thoughts()
+                if continuation.strip():
+                    yield "\n\n--- Conclusion ---\n"
+                    total_response += "\n\n--- Conclusion ---\n"
+                    for chunk in self._generate_conclusion(query, total_response, query_context):
+                        yield chunk
+                        total_response += chunk
 
-        elif classification == "complex":
-            yield "\n\n"
-            total_response += "\n\n"
-            prompt = self.ctx.build(query, stage="reasoning", preamble=preamble_response)
-            continuation = ""
-            for chunk in self._execute_deep_continuation(query, prompt, route_context):
-                yield chunk
-                total_response += chunk
-                continuation += chunk
-            self._flush_and_save_thoughts()
-            if continuation.strip():
-                yield "\n\n--- Conclusion ---\n"
-                total_response += "\n\n--- Conclusion ---\n"
-                for chunk in self._generate_conclusion(query, total_response, query_context):
+            elif classification == "intermediate":
+                yield "\n\n"
+                total_response += "\n\n"
+                prompt = self.ctx.build(query, stage="intermediate", preamble=preamble_response)
+                for chunk in self._execute_intermediate_continuation(query, prompt, route_context, speculation):
                     yield chunk
                     total_response += chunk
+                self._flush_and_save_thoughts()
 
-        elif classification == "intermediate":
-            yield "\n\n"
-            total_response += "\n\n"
-            prompt = self.ctx.build(query, stage="intermediate", preamble=preamble_response)
-            for chunk in self._execute_intermediate_continuation(query, prompt, route_context):
-                yield chunk
-                total_response += chunk
-            self._flush_and_save_thoughts()
-
-        elif classification == "coding":
-            yield "\n\n"
-            total_response += "\n\n"
-            for chunk in self._execute_coding(query):
-                yield chunk
-                total_response += chunk
+            elif classification == "coding":
+                yield "\n\n"
+                total_response += "\n\n"
+                for chunk in self._execute_coding(query, speculation):
+                    yield chunk
+                    total_response += chunk
 
-        if total_response:
-            self.vera.save_to_memory(query, total_response)
+            if total_response:
+                self.vera.save_to_memory(query, total_response)
 
-        total_duration = self.logger.stop_timer("total_query_processing", context=query_context)
-        self.logger.success(f"Query complete: {len(total_response)} chars in {total_duration:.2f}s", context=query_context)
+            total_duration = self.logger.stop_timer("total_query_processing", context=query_context)
+            self.logger.success(f"Query complete: {len(total_response)} chars in {total_duration:.2f}s", context=query_context)
+        finally:
+            if speculation is not None and not speculation.committed and not speculation.cancelled:
+                self._cancel_speculation(speculation, abandoned=True)
 
     # ====================================================================
     # PARALLEL EXECUTION
     # ====================================================================
 
-    def _parallel_execute(self, query: str, context: LogContext, routing_hints: Optional[Dict] = None) -> tuple:
+    def _parallel_execute(self, query: str, context: LogContext, routing_hints: Optional[Dict] = None,
+                          speculation: Optional[SpeculativeStream] = None) -> tuple:
         self.logger.info("🚀 Parallel execution: triage + preamble + action", context=context)
 
         triage_result   = queue.Queue()
@@ -647,6 +702,9 @@ class VeraChat:
                 event = triage_result.get_nowait()
                 if event[0] == "classified":
                     classification = event[1]
+                    if speculation and classification != speculation.route:
+                        self._cancel_speculation(speculation)
+                        speculation = None
                     if classification in self.ACTION_ROUTES:
                         action_started = True
                         if not transition_added:
@@ -661,8 +719,15 @@ class VeraChat:
                     classification = tokens[0].lower() if tokens else "simple"
                     classification = self._enhance_triage_classification(classification, query)
                     triage_done = True
+                    self.route_predictor.observe(query, classification)
+                    if speculation and classification != speculation.route:
+                        self._cancel_speculation(speculation)
+                        speculation = None
                 elif event[0] == "error":
                     full_triage = "simple"; classification = "simple"; triage_done = True
+                    if speculation:
+                        self._cancel_speculation(speculation)
+                        speculation = None
             except Empty:
                 pass
 
@@ -725,7 +790,7 @@ class VeraChat:
                     preamble_response += chunk
 
             self._save_session(total_response, "Response", agent="fast")
-            return full_triage, preamble_response, classification, total_response, True
+            return full_triage, preamble_response, classification, total_response, True, None
 
         elif classification in self.ACTION_ROUTES:
             if action_response.strip():
@@ -737,11 +802,85 @@ class VeraChat:
 
             # action_worker already saved action_response; save conclusion too
             self._save_session(total_response, "Response", agent=classification)
-            return full_triage, preamble_response, classification, total_response, True
+            return full_triage, preamble_response, classification, total_response, True, None
 
         else:
             self.logger.info(f"Preamble complete, continuing with {classification} route…")
-            return full_triage, preamble_response, classification, total_response, False
+            return full_triage, preamble_response, classification, total_response, False, speculation
+
+    # ====================================================================
+    # SPECULATIVE ROUTING
+    # ====================================================================
+
+    def _start_speculation(self, query: str, context: LogContext) -> Optional[SpeculativeStream]:
+        """
+        Start the predicted continuation route alongside triage when the
+        prediction is confident and an LLM worker is spare beyond the two
+        that triage and the preamble are about to take.
+        """
+        if not self.speculation_enabled:
+            return None
+        route, confidence = self.route_predictor.predict(query)
+        if route not in SPECULATIVE_ROUTES:
+            self.speculation_metrics.record_skip("no_prediction")
+            return None
+        if confidence < self.speculation_min_confidence:
+            self.speculation_metrics.record_skip("low_confidence")
+            return None
+        if self.vera.orchestrator.idle_workers(TaskType.LLM) < 3:
+            self.speculation_metrics.record_skip("no_capacity")
+            return None
+
+        task_name, stage, thinking = SPECULATIVE_ROUTES[route]
+        idle_timeout, total_timeout = (60.0, 180.0) if thinking else (45.0, 120.0)
+        try:
+            # Built before the preamble exists and before the triage turn is
+            # saved, so this prompt has no preamble in its frame and history
+            # one turn behind the one the committed route would build
+            prompt = self.ctx.build(query, stage=stage)
+            task_id = self.vera.orchestrator.submit_task(task_name, vera_instance=self.vera, prompt=prompt)
+        except Exception as e:
+            self.logger.warning(f"Speculation not started: {e}", context=context)
+            return None
+        if thinking and hasattr(self.vera, 'hold_thoughts'):
+            self.vera.hold_thoughts(task_id)
+        self.logger.info(f"🔮 Speculating {route} ({confidence:.2f})", context=context)
+        return SpeculativeStream(
+            route, task_id,
+            self._stream_with_idle_timeout(task_id, idle_timeout=idle_timeout, total_timeout=total_timeout)
+        )
+
+    def _cancel_speculation(self, speculation: SpeculativeStream, abandoned: bool = False):
+        """
+        Triage disagreed (or the turn ended before commit): cancel the task
+        and drop the thoughts it produced.  Abandoned turns are not misses.
+        """
+        busy = time.time() - speculation.started_at
+        wasted = speculation.cancel(self.vera.orchestrator)
+        if hasattr(self.vera, 'release_thoughts'):
+            self.vera.release_thoughts(speculation.task_id, keep=False)
+        if abandoned:
+            self.speculation_metrics.record_skip("abandoned")
+            self.logger.info(f"🔮 Speculation abandoned ({speculation.route}): {wasted} tokens discarded")
+            return
+        self.speculation_metrics.record_miss(speculation.route, wasted, busy)
+        self.logger.info(f"🔮 Speculation miss ({speculation.route}): {wasted} tokens discarded")
+
+    def _commit_speculation(self, speculation: SpeculativeStream) -> Iterator[str]:
+        """Triage agreed: serve the speculative stream as the route's output."""
+        saved = speculation.ttft_saved(time.time())
+        self.speculation_metrics.record_hit(speculation.route, saved)
+        self.logger.info(f"🔮 Speculation hit ({speculation.route}): {saved:.2f}s to first token saved")
+        if hasattr(self.vera, 'release_thoughts'):
+            self.vera.release_thoughts(speculation.task_id, keep=True)
+        return speculation.commit()
+
+    def speculation_stats(self) -> Dict[str, Any]:
+        """Hit rate, time-to-first-token saved and tokens wasted so far."""
+        stats = self.speculation_metrics.stats()
+        stats["enabled"] = self.speculation_enabled
+        stats["predictor_history"] = len(self.route_predictor)
+        return stats
 
     # ====================================================================
     # TRIAGE ENHANCEMENT
@@ -778,12 +917,17 @@ class VeraChat:
     # CONTINUATION ROUTES
     # ====================================================================
 
-    def _execute_intermediate_continuation(self, query: str, prompt: str, context: LogContext) -> Iterator[str]:
+    def _execute_intermediate_continuation(self, query: str, prompt: str, context: LogContext,
+                                           speculation: Optional[SpeculativeStream] = None) -> Iterator[str]:
         self.logger.start_timer("intermediate_continuation")
         response = ""
         try:
-            task_id = self.vera.orchestrator.submit_task("llm.intermediate", vera_instance=self.vera, prompt=prompt)
-            for chunk in self._stream_with_idle_timeout(task_id, idle_timeout=45.0, total_timeout=120.0):
+            if speculation:
+                chunks = self._commit_speculation(speculation)
+            else:
+                task_id = self.vera.orchestrator.submit_task("llm.intermediate", vera_instance=self.vera, prompt=prompt)
+                chunks = self._stream_with_idle_timeout(task_id, idle_timeout=45.0, total_timeout=120.0)
+            for chunk in chunks:
                 response += chunk; yield chunk
         except Exception as e:
             self.logger.error(f"Intermediate failed: {e}")
@@ -792,12 +936,17 @@ class VeraChat:
         duration = self.logger.stop_timer("intermediate_continuation", context=context)
         self._save_response(response, "intermediate", duration)
 
-    def _execute_reasoning_continuation(self, query: str, prompt: str, context: LogContext) -> Iterator[str]:
+    def _execute_reasoning_continuation(self, query: str, prompt: str, context: LogContext,
+                                        speculation: Optional[SpeculativeStream] = None) -> Iterator[str]:
         self.logger.start_timer("reasoning_continuation")
         response = ""
         try:
-            task_id = self.vera.orchestrator.submit_task("llm.reasoning", vera_instance=self.vera, prompt=prompt)
-            for chunk in self._stream_orchestrator_with_thoughts(task_id, idle_timeout=60.0, total_timeout=180.0):
+            if speculation:
+                chunks = self._interleave_thoughts(self._commit_speculation(speculation))
+            else:
+                task_id = self.vera.orchestrator.submit_task("llm.reasoning", vera_instance=self.vera, prompt=prompt)
+                chunks = self._stream_orchestrator_with_thoughts(task_id, idle_timeout=60.0, total_timeout=180.0)
+            for chunk in chunks:
                 response += chunk; yield chunk
         except Exception as e:
             self.logger.error(f"Reasoning failed: {e}")
@@ -806,12 +955,17 @@ class VeraChat:
         duration = self.logger.stop_timer("reasoning_continuation", context=context)
         self._save_response(response, "reasoning", duration)
 
-    def _execute_deep_continuation(self, query: str, prompt: str, context: LogContext) -> Iterator[str]:
+    def _execute_deep_continuation(self, query: str, prompt: str, context: LogContext,
+                                   speculation: Optional[SpeculativeStream] = None) -> Iterator[str]:
         self.logger.start_timer("deep_continuation")
         response = ""
         try:
-            task_id = self.vera.orchestrator.submit_task("llm.deep", vera_instance=self.vera, prompt=prompt)
-            for chunk in self._stream_orchestrator_with_thoughts(task_id, idle_timeout=60.0, total_timeout=180.0):
+            if speculation:
+                chunks = self._interleave_thoughts(self._commit_speculation(speculation))
+            else:
+                task_id = self.vera.orchestrator.submit_task("llm.deep", vera_instance=self.vera, prompt=prompt)
+                chunks = self._stream_orchestrator_with_thoughts(task_id, idle_timeout=60.0, total_timeout=180.0)
+            for chunk in chunks:
                 response += chunk; yield chunk
         except Exception as e:
             self.logger.error(f"Deep failed: {e}")
@@ -820,11 +974,15 @@ class VeraChat:
         duration = self.logger.stop_timer("deep_continuation", context=context)
         self._save_response(response, "deep", duration)
 
-    def _execute_coding(self, query: str) -> Iterator[str]:
+    def _execute_coding(self, query: str, speculation: Optional[SpeculativeStream] = None) -> Iterator[str]:
         prompt = self.ctx.build(query, stage="coding")
         try:
-            task_id = self.vera.orchestrator.submit_task("llm.coding", vera_instance=self.vera, prompt=prompt)
-            for chunk in self._stream_with_idle_timeout(task_id, idle_timeout=45.0, total_timeout=120.0):
+            if speculation:
+                chunks = self._commit_speculation(speculation)
+            else:
+                task_id = self.vera.orchestrator.submit_task("llm.coding", vera_instance=self.vera, prompt=prompt)
+                chunks = self._stream_with_idle_timeout(task_id, idle_timeout=45.0, total_timeout=120.0)
+            for chunk in chunks:
                 yield chunk
         except Exception:
             for chunk in self.vera.stream_llm(self.vera.fast_llm, prompt):
@@ -950,10 +1108,15 @@ class VeraChat:
         Thoughts are yielded inline AND saved as separate Thought memory nodes
         at stream end via _save_session().
         """
+        yield from self._interleave_thoughts(
+            self._stream_with_idle_timeout(task_id, idle_timeout=idle_timeout, total_timeout=total_timeout)
+        )
+
+    def _interleave_thoughts(self, chunks: Iterator[str]) -> Iterator[str]:
+        """Interleave thought_queue content with ``chunks`` (see above)."""
         last_check = time.time()
         in_thought = False
-        for chunk in self._stream_with_idle_timeout(task_id, idle_timeout=idle_timeout,
-                                                     total_timeout=total_timeout):
+        for chunk in chunks:
             if time.time() - last_check > 0.05:
                 try:
                     while True: